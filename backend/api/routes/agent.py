@@ -9,6 +9,8 @@ from backend.models.schemas import (
     AgentUpdateRequest,
     AgentResponse,
     AgentListResponse,
+    BulkDeleteRequest,
+    BulkDeleteResponse,
 )
 from backend.services.agent_service import AgentService, get_agent_service, ElevenLabsAgentError
 from backend.middleware.rate_limit import limiter, RATE_LIMITS
@@ -97,6 +99,15 @@ async def delete_agent(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.post("/bulk-delete", response_model=BulkDeleteResponse)
+async def bulk_delete_agents(
+    request: BulkDeleteRequest,
+    service: AgentService = Depends(get_agent_service),
+):
+    """Delete many agents locally and in ElevenLabs; one result per ID."""
+    return await service.delete_agents(request.ids)
+
+
 @router.get("/system-prompts")
 async def get_system_prompts(
     service: AgentService = Depends(get_agent_service),
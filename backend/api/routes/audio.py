@@ -1,26 +1,51 @@
 """Audio API routes."""
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 import json
 
+from backend.config import AUDIO_PROFILES, STANDARD_AUDIO_PROFILE
 from backend.models.schemas import (
+    AudioBackfillJobResponse,
+    AudioBackfillRequest,
+    AudioBatchJobResponse,
+    AudioBatchRequest,
     AudioGenerateRequest,
     AudioGenerateResponse,
     AudioListResponse,
+    AudioManifestResponse,
     AudioMetadata,
+    AudioPlaybackUrlsRequest,
+    AudioPlaybackUrlsResponse,
     AudioUpdateRequest,
+    BulkDeleteRequest,
+    BulkDeleteResponse,
     ScriptGenerateRequest,
     ScriptGenerateResponse,
     VoiceOption,
     ErrorResponse
 )
-from backend.services.audio_service import AudioService, get_audio_service
+from backend.services import audio_backfill, bulk_delete
+from backend.services.audio_service import AudioService, audio_filename, get_audio_service
+from backend.services.batch_audio_service import (
+    BatchAudioService,
+    BatchJobActiveError,
+    get_batch_audio_service,
+)
+from backend.services.data_service import DataServiceInterface, get_data_service
 from backend.services.elevenlabs_service import ElevenLabsTTSError
+from backend.services.storage_service import (
+    DEFAULT_SIGNED_URL_EXPIRATION_SECONDS,
+    StorageService,
+    get_storage_service,
+)
+from backend.services.task_queue import QueuedTask, TaskQueue, get_task_queue
+from backend.utils.http_range import RangeNotSatisfiable, etag_matches, parse_range
 from backend.middleware.rate_limit import limiter, RATE_LIMITS
 
 router = APIRouter(prefix="/api/audio", tags=["audio"])
@@ -76,6 +101,9 @@ async def generate_script_stream(
     - data: {"type": "token", "content": "..."}
     - data: {"type": "complete", "script": "...", "model_used": "..."}
     - data: {"type": "error", "message": "..."}
+    
+    When the script cache is enabled, a hit is replayed as token events and the
+    complete event carries "cached": true.
     """
     async def event_generator():
         try:
@@ -117,7 +145,13 @@ async def generate_audio(
     request: Request,
     service: AudioService = Depends(get_audio_service)
 ):
-    """Generate audio from script."""
+    """Generate audio from script.
+
+    Each requested variant is a separate ElevenLabs synthesis at a lower
+    output format (billed like the master), not transcoded from the master,
+    so its timing and intonation may differ slightly. Variants are stored
+    only after the master upload succeeds; a failed variant is omitted.
+    """
     # Exceptions bubble up to global handler which maps ElevenLabs errors correctly
     metadata = await service.generate_audio(
         script=payload.script,
@@ -126,6 +160,7 @@ async def generate_audio(
         doctor_id=payload.doctor_id,
         name=payload.name,
         description=payload.description,
+        variants=payload.variants,
     )
     return AudioGenerateResponse(
         audio_id=metadata.audio_id,
@@ -133,6 +168,9 @@ async def generate_audio(
         knowledge_id=metadata.knowledge_id,
         voice_id=metadata.voice_id,
         duration_seconds=metadata.duration_seconds,
+        bitrate_kbps=metadata.bitrate_kbps,
+        frame_count=metadata.frame_count,
+        variants=metadata.variants,
         script=metadata.script,
         created_at=metadata.created_at,
         doctor_id=metadata.doctor_id,
@@ -141,27 +179,216 @@ async def generate_audio(
     )
 
 
+@router.post(
+    "/batch",
+    response_model=AudioBatchJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={500: {"model": ErrorResponse}},
+)
+async def create_audio_batch(
+    payload: AudioBatchRequest,
+    batch_service: BatchAudioService = Depends(get_batch_audio_service)
+):
+    """Generate scripts and audio for many knowledge documents in the background.
+    
+    Returns immediately with the job; poll GET /api/audio/batch/{job_id} for
+    per-document progress.
+    """
+    job = await batch_service.create_job(payload)
+    await batch_service.start_job(job.job_id)
+    return AudioBatchJobResponse.from_job(job, is_active=batch_service.is_active(job.job_id))
+
+
+@router.get(
+    "/batch/{job_id}",
+    response_model=AudioBatchJobResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_audio_batch(
+    job_id: str,
+    batch_service: BatchAudioService = Depends(get_batch_audio_service)
+):
+    """Get batch job progress."""
+    job = await batch_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Batch job {job_id} not found")
+    return AudioBatchJobResponse.from_job(job, is_active=batch_service.is_active(job_id))
+
+
+@router.post(
+    "/batch/{job_id}/resume",
+    response_model=AudioBatchJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={404: {"model": ErrorResponse}, 409: {"model": ErrorResponse}},
+)
+async def resume_audio_batch(
+    job_id: str,
+    batch_service: BatchAudioService = Depends(get_batch_audio_service)
+):
+    """Resume an interrupted job, retrying failed and unfinished documents.
+    
+    Completed documents are skipped, and documents whose script was already
+    generated continue from text-to-speech.
+    """
+    try:
+        job = await batch_service.start_job(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except BatchJobActiveError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return AudioBatchJobResponse.from_job(job, is_active=batch_service.is_active(job_id))
+
+
+@router.post(
+    "/backfill-metadata",
+    response_model=AudioBackfillJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={500: {"model": ErrorResponse}},
+)
+async def backfill_audio_metadata(
+    request: AudioBackfillRequest,
+    task_queue: TaskQueue = Depends(get_task_queue),
+):
+    """Queue measuring duration, bitrate and frame count for stored audio missing them.
+
+    Each file is streamed from storage once and only its MP3 frame headers
+    are parsed; the audio is not decoded. Poll the returned job ID for the
+    report.
+    """
+    task = await audio_backfill.enqueue_audio_backfill(
+        force=request.force, concurrency=request.concurrency, queue=task_queue
+    )
+    return _backfill_job_response(task)
+
+
+@router.get(
+    "/backfill-metadata/{job_id}",
+    response_model=AudioBackfillJobResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_backfill_job(job_id: str, task_queue: TaskQueue = Depends(get_task_queue)):
+    """Get the status of an audio metadata backfill, with its report once finished."""
+    task = await task_queue.store.get(job_id)
+    if task is None or task.kind != audio_backfill.AUDIO_BACKFILL:
+        raise HTTPException(status_code=404, detail=f"Backfill job {job_id} not found")
+    return _backfill_job_response(task)
+
+
+def _backfill_job_response(task: QueuedTask) -> AudioBackfillJobResponse:
+    return AudioBackfillJobResponse(
+        job_id=task.task_id, status=task.status, report=task.result, error=task.last_error
+    )
+
+
+@router.post(
+    "/bulk-delete",
+    response_model=BulkDeleteResponse,
+    responses={500: {"model": ErrorResponse}},
+)
+async def bulk_delete_audio(
+    request: BulkDeleteRequest,
+    data_service: DataServiceInterface = Depends(get_data_service),
+    storage_service: StorageService = Depends(get_storage_service),
+):
+    """Delete many audio files, including their variant files.
+
+    Storage files are removed with GCS batch requests and metadata with
+    batched Firestore writes. Returns one result per ID.
+    """
+    return await bulk_delete.delete_audio_files(data_service, storage_service, request.ids)
+
+
 @router.get(
     "/stream/{audio_id}",
     response_class=StreamingResponse,
-    responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    responses={
+        206: {"description": "Requested byte range"},
+        304: {"description": "Not modified"},
+        404: {"model": ErrorResponse},
+        416: {"description": "Range not satisfiable"},
+        422: {"description": "Unknown profile"},
+        500: {"model": ErrorResponse},
+    },
 )
 async def stream_audio(
-    audio_id: str, service: AudioService = Depends(get_audio_service)
+    audio_id: str,
+    request: Request,
+    profile: Optional[str] = Query(
+        None, description=f"Delivery profile: {', '.join(AUDIO_PROFILES)} (default: standard)"
+    ),
+    service: AudioService = Depends(get_audio_service),
 ):
-    """Stream audio content."""
-    try:
-        return StreamingResponse(
-            service.stream_audio(audio_id),
-            media_type="audio/mpeg",
-             headers={
-                "Cache-Control": "public, max-age=3600",
-                "Content-Disposition": f"inline; filename={audio_id}.mp3"
-            }
+    """Stream audio content.
+
+    Supports single byte ranges (206 Partial Content) so players can seek
+    without downloading from the start, and ETag revalidation (304) so
+    repeat plays are not downloaded again. If-Range is honoured. Mock storage
+    files are sent as a FileResponse; GCS objects are streamed asynchronously.
+
+    With ?profile= a lower-bitrate variant is served; audio generated
+    without that variant falls back to the master. X-Audio-Profile names
+    the profile actually served.
+    """
+    if profile is not None and profile not in AUDIO_PROFILES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown audio profile: {profile}",
         )
+    profile = profile or STANDARD_AUDIO_PROFILE
+
+    try:
+        info = await asyncio.to_thread(service.get_audio_stream_info, audio_id, profile)
+        if info is None and profile != STANDARD_AUDIO_PROFILE:
+            profile = STANDARD_AUDIO_PROFILE
+            info = await asyncio.to_thread(service.get_audio_stream_info, audio_id)
     except Exception as e:
-        # If file not found or other storage error
+        logging.error(f"Failed to stat audio {audio_id}: {e}")
         raise HTTPException(status_code=404, detail=f"Audio not found: {str(e)}")
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Audio not found: {audio_id}")
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": info.etag,
+        "Cache-Control": "public, max-age=3600",
+        "Content-Disposition": f"inline; filename={audio_filename(audio_id, profile)}",
+        "X-Audio-Profile": profile,
+    }
+    if etag_matches(request.headers.get("if-none-match"), info.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range.strip() == info.etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), info.size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{info.size}"},
+            )
+
+    if byte_range is None:
+        local_path = service.get_audio_local_path(audio_id, profile)
+        if local_path is not None:
+            # Whole local files use the server's zero-copy file send where
+            # available; ranges stay on parse_range, as FileResponse only
+            # honours Range on newer Starlette releases
+            return FileResponse(local_path, media_type="audio/mpeg", headers=headers)
+
+    start, end = byte_range or (0, info.size - 1)
+    headers["Content-Length"] = str(max(0, end - start + 1))
+    status_code = status.HTTP_200_OK
+    if byte_range:
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+
+    return StreamingResponse(
+        service.stream_audio(audio_id, start=start, end=end, info=info, profile=profile),
+        status_code=status_code,
+        media_type="audio/mpeg",
+        headers=headers,
+    )
 
 
 @router.get(
@@ -186,6 +413,90 @@ async def list_audio_files(
     )
 
 
+@router.get(
+    "/manifest",
+    response_model=AudioManifestResponse,
+    responses={500: {"model": ErrorResponse}},
+)
+async def get_audio_manifest(
+    request: Request,
+    response: Response,
+    knowledge_id: Optional[str] = Query(None, description="Filter by knowledge document ID"),
+    doctor_id: Optional[str] = Query(None, description="Filter by doctor ID"),
+    service: AudioService = Depends(get_audio_service),
+):
+    """Get the compact playback manifest of an audio collection.
+
+    Lists id, name, duration and creation time without scripts or signed
+    URLs (see /playback-urls and /{audio_id}/metadata). The response carries
+    a collection ETag; clients revalidate with If-None-Match and get 304 Not
+    Modified while the collection is unchanged.
+    """
+    manifest = await service.get_audio_manifest(knowledge_id=knowledge_id, doctor_id=doctor_id)
+    headers = {"ETag": manifest.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), manifest.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return manifest
+
+
+@router.post(
+    "/playback-urls",
+    response_model=AudioPlaybackUrlsResponse,
+    responses={500: {"model": ErrorResponse}},
+)
+async def get_playback_urls(
+    payload: AudioPlaybackUrlsRequest,
+    service: AudioService = Depends(get_audio_service),
+):
+    """Sign playback URLs for manifest entries, typically those on screen."""
+    urls = await service.get_playback_urls(payload.audio_ids)
+    return AudioPlaybackUrlsResponse(
+        urls=urls, expires_in_seconds=DEFAULT_SIGNED_URL_EXPIRATION_SECONDS
+    )
+
+
+@router.get(
+    "/{audio_id}/peaks",
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_audio_peaks(
+    audio_id: str,
+    request: Request,
+    service: AudioService = Depends(get_audio_service),
+):
+    """Get the waveform peaks of an audio file for previews.
+
+    Returns the sidecar computed at generation time (audiowaveform JSON:
+    a min/max pair per peaks window in "data"). Peaks never change for an
+    audio file, so clients may cache them and revalidate with If-None-Match.
+    Audio generated before peaks were stored returns 404.
+    """
+    info = await asyncio.to_thread(service.get_audio_peaks_info, audio_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"No waveform peaks for audio {audio_id}")
+    headers = {"ETag": info.etag, "Cache-Control": "private, max-age=86400"}
+    if etag_matches(request.headers.get("if-none-match"), info.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    content = await asyncio.to_thread(service.read_audio_peaks, audio_id, info)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/{audio_id}/metadata",
+    response_model=AudioMetadata,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_audio_file(
+    audio_id: str, service: AudioService = Depends(get_audio_service)
+):
+    """Get one audio file with its script and signed URLs."""
+    audio = await service.get_audio_file(audio_id)
+    if not audio:
+        raise HTTPException(status_code=404, detail=f"Audio file {audio_id} not found")
+    return audio
+
+
 @router.get(
     "/{knowledge_id}",
     response_model=AudioListResponse,
@@ -229,9 +540,25 @@ async def delete_audio(
     response_model=List[VoiceOption],
     responses={502: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
 )
-async def get_available_voices(service: AudioService = Depends(get_audio_service)):
-    """Get available voices."""
-    return service.get_available_voices()
+async def get_available_voices(
+    request: Request,
+    response: Response,
+    service: AudioService = Depends(get_audio_service),
+):
+    """Get available voices.
+
+    Served from the backend voice catalog cache. The response carries an ETag
+    that changes with the catalog content; clients revalidate with
+    If-None-Match and get 304 Not Modified while it is unchanged.
+    """
+    voices = service.get_available_voices()
+    etag = service.voices_etag
+    if etag:
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+    return voices
 
 
 @router.put(
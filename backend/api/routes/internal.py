@@ -0,0 +1,127 @@
+"""Internal instance-to-instance and operations API routes.
+
+These endpoints let a backend instance that receives a patient message for a
+session it does not own hand the message to the instance holding the session's
+persistent WebSocket connection, and let a scheduler trigger maintenance jobs.
+They are not intended for browser clients.
+"""
+
+import base64
+import logging
+import secrets
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from backend.config import get_settings
+from backend.models.schemas import (
+    PatientMessageRequest,
+    PatientMessageResponse,
+    StorageGcRequest,
+    StorageGcResponse,
+    ErrorResponse,
+)
+from backend.services.data_service import DataServiceInterface, get_data_service
+from backend.services.session_affinity import INTERNAL_TOKEN_HEADER
+from backend.services.storage_gc import collect_storage_garbage
+from backend.services.storage_service import StorageService, get_storage_service
+from backend.services.websocket_manager import (
+    WebSocketConnectionManager,
+    get_connection_manager,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/internal", tags=["internal"])
+
+
+def verify_internal_token(
+    token: Optional[str] = Header(None, alias=INTERNAL_TOKEN_HEADER),
+) -> None:
+    """Reject requests that do not carry the shared internal token.
+
+    Without a configured token the endpoints stay open in development but are
+    refused in production.
+    """
+    settings = get_settings()
+    expected = settings.internal_api_token
+    if expected is None:
+        if settings.is_production():
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Internal API token is not configured",
+            )
+        return
+    if token is None or not secrets.compare_digest(token, expected):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid internal token",
+        )
+
+
+@router.post(
+    "/sessions/{session_id}/message",
+    response_model=PatientMessageResponse,
+    responses={403: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+    dependencies=[Depends(verify_internal_token)],
+)
+async def forward_session_message(
+    session_id: str,
+    request: PatientMessageRequest,
+    manager: WebSocketConnectionManager = Depends(get_connection_manager),
+):
+    """Send a forwarded message through this instance's persistent connection."""
+    if not manager.has_connection(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No active connection for session {session_id} on this instance",
+        )
+    try:
+        response_text, audio_bytes = await manager.send_message(
+            session_id, request.message, text_only=request.chat_mode
+        )
+    except Exception as e:
+        logger.error(f"Forwarded message failed for session {session_id}: {e}")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+
+    return PatientMessageResponse(
+        response_text=response_text,
+        audio_data=base64.b64encode(audio_bytes).decode("utf-8") if audio_bytes else None,
+        timestamp=datetime.now(),
+    )
+
+
+@router.post(
+    "/sessions/{session_id}/close",
+    responses={403: {"model": ErrorResponse}},
+    dependencies=[Depends(verify_internal_token)],
+)
+async def close_session_connection(
+    session_id: str,
+    manager: WebSocketConnectionManager = Depends(get_connection_manager),
+):
+    """Close this instance's persistent connection for a session."""
+    await manager.close_connection(session_id)
+    return {"success": True, "session_id": session_id}
+
+
+@router.post(
+    "/storage/gc",
+    response_model=StorageGcResponse,
+    responses={403: {"model": ErrorResponse}},
+    dependencies=[Depends(verify_internal_token)],
+)
+async def collect_storage_garbage_job(
+    request: StorageGcRequest,
+    data_service: DataServiceInterface = Depends(get_data_service),
+    storage_service: StorageService = Depends(get_storage_service),
+):
+    """Delete audio and knowledge upload objects no record references.
+
+    Dry run by default; set dry_run to false to delete. Orphans younger
+    than the grace period are always kept.
+    """
+    return await collect_storage_garbage(
+        data_service, storage_service, dry_run=request.dry_run, grace_hours=request.grace_hours
+    )
@@ -1,156 +1,51 @@
 """API routes for knowledge base management."""
 
+import asyncio
 import logging
-from typing import Annotated, Optional
+import time
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from pydantic import ValidationError
 
+from backend.config import get_settings
 from backend.models.schemas import (
+    BulkDeleteRequest,
+    BulkDeleteResponse,
     KnowledgeDocumentCreate,
     KnowledgeDocumentUpdate,
     KnowledgeDocumentResponse,
     KnowledgeDocumentListResponse,
+    KnowledgeReconcileRequest,
+    KnowledgeReconcileResponse,
+    KnowledgeSearchResponse,
+    KnowledgeSearchResult,
     SyncStatus,
     ErrorResponse,
 )
+from backend.services.bulk_delete import delete_knowledge_documents
 from backend.services.data_service import get_data_service, DataServiceInterface
 from backend.services.elevenlabs_service import (
     get_elevenlabs_service,
     ElevenLabsService,
-    ElevenLabsSyncError,
     ElevenLabsDeleteError,
+    ElevenLabsSyncError,
 )
+from backend.services.knowledge_reconciliation import reconcile_knowledge_base
+from backend.services.knowledge_search import first_match_position, highlight, section_at
+from backend.services.knowledge_sync_tasks import (
+    enqueue_knowledge_resync,
+    enqueue_knowledge_sync,
+    is_elevenlabs_document_shared,
+)
+from backend.services.knowledge_upload import KnowledgeUploadError, ingest_knowledge_upload
+from backend.services.storage_service import StorageService, get_storage_service
+from backend.services.task_queue import TaskQueue, get_task_queue
+from backend.utils.content_hash import content_hash
 
 router = APIRouter(prefix="/api/knowledge", tags=["knowledge"])
 
 
-async def sync_knowledge_to_elevenlabs(
-    knowledge_id: str,
-    content: str,
-    name: str,
-    data_service: DataServiceInterface,
-    elevenlabs_service: ElevenLabsService,
-):
-    """Background task to sync document to ElevenLabs."""
-    try:
-        # Update status to syncing
-        await data_service.update_knowledge_sync_status(knowledge_id, SyncStatus.SYNCING)
-
-        # Create in ElevenLabs
-        try:
-            elevenlabs_id = elevenlabs_service.create_document(text=content, name=name)
-        except ElevenLabsSyncError as e:
-            # Re-raise explicit sync error to be caught below with type info if needed
-            # But simpler to just let it bubble to the specific except block below
-            raise e
-        except Exception as e:
-            # Wrap generic errors
-            raise e
-
-        # Update status to completed
-        await data_service.update_knowledge_sync_status(
-            knowledge_id, SyncStatus.COMPLETED, elevenlabs_id
-        )
-
-    except ElevenLabsSyncError as e:
-        # Update status to failed with specific message
-        await data_service.update_knowledge_sync_status(
-            knowledge_id, 
-            SyncStatus.FAILED, 
-            error_message=str(e)
-        )
-    except Exception as e:
-        # Update status to failed on generic error
-        await data_service.update_knowledge_sync_status(
-            knowledge_id, 
-            SyncStatus.FAILED, 
-            error_message=f"Unexpected error: {str(e)}"
-        )
-
-
-async def resync_knowledge_to_elevenlabs(
-    knowledge_id: str,
-    old_elevenlabs_id: Optional[str],
-    content: str,
-    new_name: str,
-    data_service: DataServiceInterface,
-    elevenlabs_service: ElevenLabsService,
-):
-    """Background task to re-sync document to ElevenLabs (Delete + Create).
-    
-    Handles detaching/re-attaching if doc is linked to an agent.
-    """
-    try:
-        # Update status to syncing
-        await data_service.update_knowledge_sync_status(knowledge_id, SyncStatus.SYNCING)
-        
-        # 1. Identify linked agents
-        agents = await data_service.get_agents()
-        linked_agents = [a for a in agents if knowledge_id in a.knowledge_ids]
-        
-        # 2. Detach from agents temporarily
-        agent_kb_backups = {} # agent_id -> full_kb_list
-        if old_elevenlabs_id:
-            for agent in linked_agents:
-                try:
-                    agent_config = elevenlabs_service.get_agent(agent.elevenlabs_agent_id)
-                    current_kb = agent_config.get("conversation_config", {}).get("agent", {}).get("prompt", {}).get("knowledge_base", [])
-                    agent_kb_backups[agent.elevenlabs_agent_id] = current_kb
-                    
-                    # Remove THIS document from KB
-                    new_kb = [d for d in current_kb if d.get("id") != old_elevenlabs_id]
-                    elevenlabs_service.update_agent_knowledge_base(agent.elevenlabs_agent_id, new_kb)
-                except Exception as e:
-                    logging.warning(f"Failed to detach doc {old_elevenlabs_id} from agent {agent.elevenlabs_agent_id}: {e}")
-
-        # 3. Delete old document if it exists
-        if old_elevenlabs_id:
-            try:
-                elevenlabs_service.delete_document(old_elevenlabs_id)
-            except Exception as e:
-                logging.warning(f"Failed to delete old ElevenLabs document {old_elevenlabs_id}: {e}")
-
-        # 4. Create new in ElevenLabs
-        try:
-            new_elevenlabs_id = elevenlabs_service.create_document(text=content, name=new_name)
-        except Exception as e:
-            # If creation fails, we might leave agents detached, but status is FAILED
-            raise e
-
-        # 5. Re-attach to agents with NEW ID
-        for agent in linked_agents:
-            try:
-                # If we have a backup, use it and replace the ID
-                if agent.elevenlabs_agent_id in agent_kb_backups:
-                    old_kb = agent_kb_backups[agent.elevenlabs_agent_id]
-                    # Filter out old, add new
-                    updated_kb = [d for d in old_kb if d.get("id") != old_elevenlabs_id]
-                    updated_kb.append({"id": new_elevenlabs_id, "name": new_name, "type": "file"})
-                    elevenlabs_service.update_agent_knowledge_base(agent.elevenlabs_agent_id, updated_kb)
-                else:
-                    # Fallback: get current and add
-                    agent_config = elevenlabs_service.get_agent(agent.elevenlabs_agent_id)
-                    current_kb = agent_config.get("conversation_config", {}).get("agent", {}).get("prompt", {}).get("knowledge_base", [])
-                    current_kb.append({"id": new_elevenlabs_id, "name": new_name, "type": "file"})
-                    elevenlabs_service.update_agent_knowledge_base(agent.elevenlabs_agent_id, current_kb)
-            except Exception as e:
-                logging.error(f"Failed to re-attach new doc {new_elevenlabs_id} to agent {agent.elevenlabs_agent_id}: {e}")
-
-        # 6. Update status to completed with NEW ID
-        await data_service.update_knowledge_sync_status(
-            knowledge_id, SyncStatus.COMPLETED, new_elevenlabs_id
-        )
-
-    except ElevenLabsSyncError as e:
-        await data_service.update_knowledge_sync_status(
-            knowledge_id, SyncStatus.FAILED, error_message=str(e)
-        )
-    except Exception as e:
-        await data_service.update_knowledge_sync_status(
-            knowledge_id, SyncStatus.FAILED, error_message=f"Unexpected error during re-sync: {str(e)}"
-        )
-
-
 @router.post(
     "",
     response_model=KnowledgeDocumentResponse,
@@ -159,9 +54,8 @@ async def resync_knowledge_to_elevenlabs(
 )
 async def create_knowledge_document(
     doc: KnowledgeDocumentCreate,
-    background_tasks: BackgroundTasks,
     data_service: Annotated[DataServiceInterface, Depends(get_data_service)],
-    elevenlabs_service: Annotated[ElevenLabsService, Depends(get_elevenlabs_service)],
+    task_queue: Annotated[TaskQueue, Depends(get_task_queue)],
 ):
     """Create a new knowledge document and sync to ElevenLabs.
     
@@ -176,15 +70,74 @@ async def create_knowledge_document(
     tags_str = "_".join(doc.tags)
     elevenlabs_doc_name = f"{doc.disease_name}_{tags_str}"
 
-    # 2. Trigger background sync
-    background_tasks.add_task(
-        sync_knowledge_to_elevenlabs,
-        created_doc.knowledge_id,
-        doc.raw_content,
-        elevenlabs_doc_name,
-        data_service,
-        elevenlabs_service,
-    )
+    # 2. Queue durable background sync
+    await enqueue_knowledge_sync(created_doc.knowledge_id, elevenlabs_doc_name, queue=task_queue)
+
+    return created_doc
+
+
+@router.post(
+    "/upload",
+    response_model=KnowledgeDocumentResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        400: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
+        415: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+    },
+)
+async def upload_knowledge_document(
+    data_service: Annotated[DataServiceInterface, Depends(get_data_service)],
+    task_queue: Annotated[TaskQueue, Depends(get_task_queue)],
+    storage: Annotated[StorageService, Depends(get_storage_service)],
+    file: UploadFile = File(..., description="Markdown or plain-text file (UTF-8)"),
+    disease_name: str = Form(..., description="Name of the disease"),
+    tags: List[str] = Form(default=["faq"], description="Document tags"),
+    doctor_id: str = Form(default="default_doctor", description="ID of the uploading doctor"),
+):
+    """Create a knowledge document from a multipart file upload and sync to ElevenLabs.
+
+    The file is streamed in chunks: text is decoded and normalized (UTF-8,
+    "\\n" line endings, NFC) while sections and the content hash are computed,
+    and the normalized text is written to storage. Accepts files up to
+    KNOWLEDGE_UPLOAD_MAX_BYTES; the normalized text is capped at the same
+    character limit as the JSON endpoint (413 above it).
+    """
+    try:
+        # Validate metadata before reading the file; content is set below
+        metadata = KnowledgeDocumentCreate(
+            disease_name=disease_name, tags=tags, raw_content=" ", doctor_id=doctor_id
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_context=False),
+        )
+
+    settings = get_settings()
+    try:
+        text, extracted = await ingest_knowledge_upload(
+            file, storage, settings.knowledge_upload_max_bytes, settings.knowledge_upload_chunk_bytes
+        )
+    except KnowledgeUploadError as e:
+        status_codes = {"too_large": 413, "unsupported_type": 415}
+        raise HTTPException(
+            status_code=status_codes.get(e.error_type, status.HTTP_400_BAD_REQUEST),
+            detail=e.message,
+        )
+
+    try:
+        created_doc = await data_service.create_knowledge_document(
+            metadata.model_copy(update={"raw_content": text}), extracted
+        )
+    except Exception:
+        # Do not leave the stored file behind without a document
+        await asyncio.to_thread(storage.delete_file, extracted.source_path)
+        raise
+
+    elevenlabs_doc_name = f"{metadata.disease_name}_{'_'.join(metadata.tags)}"
+    await enqueue_knowledge_sync(created_doc.knowledge_id, elevenlabs_doc_name, queue=task_queue)
 
     return created_doc
 
@@ -198,6 +151,77 @@ async def list_knowledge_documents(
     return KnowledgeDocumentListResponse(documents=documents, total_count=len(documents))
 
 
+@router.get(
+    "/search",
+    response_model=KnowledgeSearchResponse,
+    responses={422: {"model": ErrorResponse}},
+)
+async def search_knowledge_documents(
+    data_service: Annotated[DataServiceInterface, Depends(get_data_service)],
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum results"),
+):
+    """Search knowledge documents by content with BM25 ranking.
+
+    Only the returned documents are loaded (in one batched read), to build
+    highlighted snippets.
+    """
+    start = time.perf_counter()
+    hits = data_service.get_search_index().search(q, limit)
+    docs = await data_service.get_knowledge_documents_by_ids([hit.knowledge_id for hit in hits])
+    results = []
+    for hit in hits:
+        doc = docs.get(hit.knowledge_id)
+        if not doc:
+            continue
+        position = first_match_position(doc.raw_content, q)
+        results.append(KnowledgeSearchResult(
+            knowledge_id=hit.knowledge_id,
+            disease_name=doc.disease_name,
+            score=hit.score,
+            section=section_at(doc.section_index, position) if position is not None else None,
+            highlights=highlight(doc.raw_content, q),
+        ))
+    return KnowledgeSearchResponse(
+        query=q,
+        results=results,
+        total_count=len(results),
+        took_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
+
+
+@router.post(
+    "/reconcile",
+    response_model=KnowledgeReconcileResponse,
+    responses={502: {"model": ErrorResponse}},
+)
+async def reconcile_knowledge_documents(
+    request: KnowledgeReconcileRequest,
+    data_service: Annotated[DataServiceInterface, Depends(get_data_service)],
+    elevenlabs_service: Annotated[ElevenLabsService, Depends(get_elevenlabs_service)],
+    task_queue: Annotated[TaskQueue, Depends(get_task_queue)],
+):
+    """Diff the ElevenLabs knowledge base against local documents.
+
+    Reports orphaned, missing and stale documents with phase timings. Unless
+    dry_run is set (the default), missing and stale documents are queued for
+    (re-)sync; orphans are deleted only when delete_orphans is also set.
+    """
+    try:
+        return await reconcile_knowledge_base(
+            data_service,
+            elevenlabs_service,
+            task_queue,
+            dry_run=request.dry_run,
+            delete_orphans=request.delete_orphans,
+        )
+    except ElevenLabsSyncError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(e),
+        )
+
+
 @router.get(
     "/{knowledge_id}",
     response_model=KnowledgeDocumentResponse,
@@ -225,14 +249,14 @@ async def get_knowledge_document(
 async def update_knowledge_document(
     knowledge_id: str,
     update_data: KnowledgeDocumentUpdate,
-    background_tasks: BackgroundTasks,
     data_service: Annotated[DataServiceInterface, Depends(get_data_service)],
-    elevenlabs_service: Annotated[ElevenLabsService, Depends(get_elevenlabs_service)],
+    task_queue: Annotated[TaskQueue, Depends(get_task_queue)],
 ):
     """Update a knowledge document.
     
-    If disease_name or tags are changed, it triggers a re-sync to ElevenLabs,
-    which involves deleting the old document and creating a new one with the updated name.
+    If disease_name, tags or content are changed, it triggers a re-sync to ElevenLabs,
+    which involves creating a new document with the updated name and replacing the old one.
+    Content edits that only change whitespace do not trigger a re-sync.
     """
     # 1. Get current doc
     current_doc = await data_service.get_knowledge_document(knowledge_id)
@@ -260,26 +284,22 @@ async def update_knowledge_document(
     new_tags = set(updated_doc.tags)
     new_content = updated_doc.raw_content
     
-    # Check if name/tags or content changed
-    if new_name != old_name or new_tags != old_tags or new_content != old_content:
+    # Check if name/tags or content changed (ignoring whitespace-only edits)
+    content_changed = (
+        new_content != old_content and content_hash(new_content) != content_hash(old_content)
+    )
+    if new_name != old_name or new_tags != old_tags or content_changed:
         tags_str = "_".join(updated_doc.tags)
         elevenlabs_doc_name = f"{new_name}_{tags_str}"
         
-        background_tasks.add_task(
-            resync_knowledge_to_elevenlabs,
+        await enqueue_knowledge_resync(
             knowledge_id,
-            current_doc.elevenlabs_document_id, # Pass OLD ID for deletion
-            updated_doc.raw_content,
+            current_doc.elevenlabs_document_id,  # Pass OLD ID for deletion
             elevenlabs_doc_name,
-            data_service,
-            elevenlabs_service,
+            queue=task_queue,
         )
         
-        # Set status to syncing explicitly? The background task does it immediately.
-        # But for UI responsiveness, we might want to return the doc with syncing status?
-        # The background task updates it. 
-        # Ideally we return the doc state as it is NOW (which is likely PENDING/SYNCING if we set it, or just Completed if we don't)
-        # Re-sync task updates it.
+        # The queued task sets SYNCING when it starts and COMPLETED/FAILED when done.
         
     return updated_doc
 
@@ -304,7 +324,14 @@ async def delete_knowledge_document(
 
     # If synced to ElevenLabs, try to delete there first
     elevenlabs_delete_success = False
-    if doc.elevenlabs_document_id:
+    if await is_elevenlabs_document_shared(
+        data_service, doc.elevenlabs_document_id, doc.elevenlabs_content_hash, knowledge_id
+    ):
+        logging.info(
+            f"ElevenLabs document {doc.elevenlabs_document_id} is shared with another "
+            f"knowledge document, skipping ElevenLabs deletion"
+        )
+    elif doc.elevenlabs_document_id:
         try:
             elevenlabs_service.delete_document(doc.elevenlabs_document_id)
             elevenlabs_delete_success = True
@@ -334,6 +361,25 @@ async def delete_knowledge_document(
         )
 
 
+@router.post(
+    "/bulk-delete",
+    response_model=BulkDeleteResponse,
+    responses={500: {"model": ErrorResponse}},
+)
+async def bulk_delete_knowledge_documents(
+    request: BulkDeleteRequest,
+    data_service: Annotated[DataServiceInterface, Depends(get_data_service)],
+    elevenlabs_service: Annotated[ElevenLabsService, Depends(get_elevenlabs_service)],
+):
+    """Delete many knowledge documents from the database and ElevenLabs.
+
+    ElevenLabs deletes run with bounded concurrency (an ElevenLabs document
+    shared with a document outside the request is kept); records are removed
+    in batched writes. Returns one result per ID.
+    """
+    return await delete_knowledge_documents(data_service, elevenlabs_service, request.ids)
+
+
 @router.post(
     "/{knowledge_id}/retry-sync",
     response_model=KnowledgeDocumentResponse,
@@ -341,9 +387,8 @@ async def delete_knowledge_document(
 )
 async def retry_knowledge_sync(
     knowledge_id: str,
-    background_tasks: BackgroundTasks,
     data_service: Annotated[DataServiceInterface, Depends(get_data_service)],
-    elevenlabs_service: Annotated[ElevenLabsService, Depends(get_elevenlabs_service)],
+    task_queue: Annotated[TaskQueue, Depends(get_task_queue)],
 ):
     """Retry syncing a failed knowledge document."""
     doc = await data_service.get_knowledge_document(knowledge_id)
@@ -366,15 +411,8 @@ async def retry_knowledge_sync(
         error_message=None # Explicitly clear error
     )
     
-    # Trigger background sync
-    background_tasks.add_task(
-        sync_knowledge_to_elevenlabs,
-        doc.knowledge_id,
-        doc.raw_content,
-        elevenlabs_doc_name,
-        data_service,
-        elevenlabs_service,
-    )
+    # Queue durable background sync
+    await enqueue_knowledge_sync(doc.knowledge_id, elevenlabs_doc_name, queue=task_queue)
     
     # Return updated doc state
     doc.sync_status = SyncStatus.PENDING
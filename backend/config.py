@@ -7,7 +7,7 @@ pydantic-settings for environment variable loading with sensible defaults.
 import logging
 import os
 from functools import lru_cache
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import Field, field_validator, model_validator, ValidatorFunctionWrapHandler
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -92,6 +92,12 @@ class Settings(BaseSettings):
         default="elevendops-bucket-test",
         description="GCS bucket name",
     )
+    gcp_token_refresh_margin_seconds: float = Field(
+        default=300.0,
+        ge=30.0,
+        le=1800.0,
+        description="Refresh Google access tokens in the background this long before expiry",
+    )
 
     # Backend API configuration
     backend_api_url: str = Field(
@@ -165,6 +171,182 @@ class Settings(BaseSettings):
         description="FastAPI server port",
     )
 
+    # Session affinity (multi-instance WebSocket routing)
+    session_affinity_enabled: bool = Field(
+        default=False,
+        description="Record the owning instance of each patient session in Firestore",
+    )
+    instance_id: str | None = Field(
+        default=None,
+        description="Stable identifier for this backend instance (auto-generated if unset)",
+    )
+    instance_internal_url: str | None = Field(
+        default=None,
+        description="Base URL other instances use to reach this instance's internal endpoints",
+    )
+    internal_api_token: str | None = Field(
+        default=None,
+        description="Shared secret required on internal instance-to-instance requests",
+    )
+    session_forward_timeout: float = Field(
+        default=35.0,
+        ge=1.0,
+        le=120.0,
+        description="Timeout in seconds for forwarding a message to the owning instance",
+    )
+
+    # Script generation cache
+    script_cache_enabled: bool = Field(
+        default=False,
+        description="Cache generated scripts by content, prompt, model and temperature",
+    )
+    script_cache_backend: Literal["local", "firestore"] = Field(
+        default="local",
+        description="Where cached scripts are stored (in-process or Firestore)",
+    )
+    script_cache_ttl_seconds: int = Field(
+        default=7 * 24 * 3600,
+        ge=60,
+        description="Time-to-live in seconds for cached scripts",
+    )
+
+    # Batch audio jobs and outbound provider pacing
+    batch_max_workers: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Concurrent documents processed per batch audio job",
+    )
+    gemini_requests_per_minute: int = Field(
+        default=30,
+        ge=0,
+        description="Outbound Gemini calls per minute for background work (0 disables)",
+    )
+    elevenlabs_requests_per_minute: int = Field(
+        default=20,
+        ge=0,
+        description="Outbound ElevenLabs calls per minute for background work (0 disables)",
+    )
+
+    # Durable background task queue (knowledge syncs)
+    task_queue_backend: Optional[Literal["sqlite", "firestore"]] = Field(
+        default=None,
+        description=(
+            "Task queue store: local SQLite file or shared Firestore collection "
+            "(default: firestore with Firestore data, sqlite with mock data)"
+        ),
+    )
+    task_queue_sqlite_path: str = Field(
+        default="temp_storage/task_queue.sqlite3",
+        description="SQLite database path for the task queue",
+    )
+    task_queue_workers: int = Field(
+        default=2,
+        ge=1,
+        le=16,
+        description="Concurrent background tasks per instance",
+    )
+    task_queue_lease_seconds: int = Field(
+        default=300,
+        ge=10,
+        description="Seconds a leased task is reserved before it is considered abandoned",
+    )
+    task_queue_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        le=20,
+        description="Maximum attempts for retryable task failures",
+    )
+    knowledge_resync_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=32,
+        description="Linked agents updated concurrently when a knowledge document is re-synced",
+    )
+    knowledge_search_snapshot_path: str = Field(
+        default="temp_storage/knowledge_search.json",
+        description="File where the knowledge search index is snapshotted",
+    )
+    voice_catalog_ttl_seconds: int = Field(
+        default=300,
+        ge=0,
+        description="Age after which the cached voice catalog is refreshed in the background",
+    )
+    voice_catalog_max_stale_seconds: int = Field(
+        default=86400,
+        ge=0,
+        description="Age after which the cached voice catalog is refreshed before responding",
+    )
+    knowledge_reconcile_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=32,
+        description="ElevenLabs fixes applied concurrently by knowledge reconciliation",
+    )
+    elevenlabs_list_page_size: int = Field(
+        default=100,
+        ge=1,
+        le=100,
+        description="Documents fetched per ElevenLabs knowledge base list request",
+    )
+    knowledge_upload_max_bytes: int = Field(
+        default=512 * 1024,
+        ge=1024,
+        description="Maximum size of a file sent to POST /api/knowledge/upload (text is also capped at 300000 characters)",
+    )
+    knowledge_upload_chunk_bytes: int = Field(
+        default=64 * 1024,
+        ge=1024,
+        description="Bytes read per iteration while streaming a knowledge upload",
+    )
+    audio_default_variants: str = Field(
+        default="",
+        description=(
+            "Comma-separated audio profiles (e.g. 'mobile') generated with every audio file; "
+            "each is a separate TTS synthesis, not derived from the master"
+        ),
+    )
+    audio_peaks_ms: int = Field(
+        default=50,
+        ge=0,
+        le=1000,
+        description="Milliseconds per waveform peak computed at generation time (0 disables peaks)",
+    )
+    audio_peaks_workers: int = Field(
+        default=2,
+        ge=0,
+        le=16,
+        description="Worker processes computing waveform peaks (0 computes in a thread)",
+    )
+    audio_backfill_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Audio files scanned concurrently by the metadata backfill",
+    )
+    storage_gc_grace_hours: int = Field(
+        default=24,
+        ge=0,
+        description="Unreferenced storage objects younger than this are kept by garbage collection",
+    )
+    storage_gc_deletes_per_minute: int = Field(
+        default=600,
+        ge=0,
+        description="Maximum objects deleted per minute by garbage collection (0 disables pacing)",
+    )
+    storage_gc_page_size: int = Field(
+        default=1000,
+        ge=1,
+        le=1000,
+        description="Objects listed per storage page by garbage collection",
+    )
+    bulk_delete_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=32,
+        description="ElevenLabs deletes issued concurrently by bulk delete endpoints",
+    )
+
     # Application metadata
     app_version: str = Field(
         default="0.1.0",
@@ -217,6 +399,16 @@ class Settings(BaseSettings):
         """Get CORS origins as a list."""
         return [o.strip() for o in self.cors_origins.split(",") if o.strip()]
 
+    def get_audio_default_variants(self) -> list[str]:
+        """Get default audio variant profiles as a list."""
+        return [p.strip() for p in self.audio_default_variants.split(",") if p.strip()]
+
+    def get_task_queue_backend(self) -> str:
+        """Get the task queue store, following the data service unless set explicitly."""
+        if self.task_queue_backend:
+            return self.task_queue_backend
+        return "sqlite" if self.use_mock_data else "firestore"
+
     def is_production(self) -> bool:
         """Check if running in production environment."""
         return self.app_env == "production"
@@ -348,6 +540,15 @@ GEMINI_MODELS = {
     "gemini-3-pro-preview": "gemini-3-pro-preview"
 }
 
+# Audio delivery profiles -> ElevenLabs output_format (ElevenLabs MP3 is mono).
+# "standard" is the master file; the others are optional lower-bitrate variants.
+STANDARD_AUDIO_PROFILE = "standard"
+AUDIO_PROFILES = {
+    STANDARD_AUDIO_PROFILE: "mp3_44100_128",
+    "mobile": "mp3_44100_64",
+    "low": "mp3_22050_32",
+}
+
 from pathlib import Path
 
 def get_default_script_prompt() -> str:
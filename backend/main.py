@@ -1,5 +1,6 @@
 """FastAPI application entry point for ElevenDops backend."""
 
+import asyncio
 import os
 
 from fastapi import FastAPI
@@ -14,6 +15,7 @@ from backend.api.routes.patient import router as patient_router
 from backend.api.routes.conversation import router as conversation_router
 from backend.api.routes.debug import router as debug_router
 from backend.api.routes.templates import router as templates_router
+from backend.api.routes.internal import router as internal_router
 
 from backend.config import get_settings
 from backend.utils.logging import setup_application_logging, get_logger
@@ -104,6 +106,7 @@ if not settings.is_production():
 else:
     logger.info("Debug router disabled in production environment")
 app.include_router(templates_router)
+app.include_router(internal_router)
 
 # Mount static files for mock storage mode
 if settings.use_mock_storage:
@@ -115,6 +118,78 @@ if settings.use_mock_storage:
     app.mount("/api/storage/files", StaticFiles(directory=str(mock_storage_dir)), name="mock_storage")
 
 
+@app.on_event("startup")
+async def start_task_queue():
+    """Start durable background task workers (resumes tasks left by a previous run)."""
+    from backend.services.audio_backfill import register_audio_backfill_handler
+    from backend.services.knowledge_sync_tasks import register_knowledge_sync_handlers
+    from backend.services.task_queue import get_task_queue
+
+    queue = get_task_queue()
+    register_knowledge_sync_handlers(queue)
+    register_audio_backfill_handler(queue)
+    await queue.start()
+
+
+@app.on_event("startup")
+async def warm_knowledge_search():
+    """Load the knowledge search snapshot and index documents changed since."""
+    from backend.services.data_service import get_data_service
+    from backend.services.knowledge_search import warm_search_index
+
+    data_service = get_data_service()
+    try:
+        await warm_search_index(data_service.get_search_index(), data_service)
+    except Exception as e:
+        logger.error(f"Failed to warm knowledge search index: {e}")
+
+
+@app.on_event("startup")
+async def start_credentials_refresh():
+    """Resolve Google credentials once and keep the token fresh (real GCS only)."""
+    from backend.services.gcp_credentials import get_credentials_manager, uses_gcp_credentials
+
+    if not uses_gcp_credentials():
+        return
+    try:
+        await asyncio.to_thread(get_credentials_manager().start_background_refresh)
+    except Exception as e:
+        logger.error(f"Failed to start Google credential refresh: {e}")
+
+
+@app.on_event("shutdown")
+async def stop_task_queue():
+    """Stop task workers; unfinished tasks are re-leased on the next start."""
+    from backend.services.task_queue import get_task_queue
+
+    await get_task_queue().stop()
+
+
+@app.on_event("shutdown")
+async def stop_credentials_refresh():
+    """Stop the Google credential refresh thread."""
+    from backend.services.gcp_credentials import get_credentials_manager, uses_gcp_credentials
+
+    if uses_gcp_credentials():
+        get_credentials_manager().stop_background_refresh()
+
+
+@app.on_event("shutdown")
+async def stop_peaks_workers():
+    """Stop the waveform peaks worker processes."""
+    from backend.services.audio_peaks import shutdown_peaks_executor
+
+    shutdown_peaks_executor()
+
+
+@app.on_event("shutdown")
+async def save_knowledge_search():
+    """Write a final knowledge search snapshot."""
+    from backend.services.data_service import get_data_service
+
+    get_data_service().get_search_index().save()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -2,10 +2,12 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 
 from pydantic import BaseModel, Field, field_validator
 
+from backend.config import AUDIO_PROFILES, STANDARD_AUDIO_PROFILE
+
 
 class HealthResponse(BaseModel):
     """Health check response model."""
@@ -33,6 +35,46 @@ class ErrorResponse(BaseModel):
     retryable: bool = Field(default=False, description="Whether the operation is retryable")
 
 
+class BulkDeleteRequest(BaseModel):
+    """Request model for deleting many records at once."""
+
+    ids: List[str] = Field(..., min_length=1, max_length=1000, description="IDs to delete")
+
+    @field_validator("ids")
+    @classmethod
+    def dedupe_ids(cls, v: List[str]) -> List[str]:
+        """Drop duplicate IDs while keeping request order."""
+        return list(dict.fromkeys(v))
+
+
+class BulkDeleteStatus(str, Enum):
+    """Outcome of deleting one record."""
+
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+    FAILED = "failed"
+
+
+class BulkDeleteItemResult(BaseModel):
+    """Result of deleting one record in a bulk delete."""
+
+    id: str = Field(..., description="Requested ID")
+    status: BulkDeleteStatus = Field(..., description="Outcome")
+    detail: Optional[str] = Field(
+        None, description="Error, or a cleanup warning (e.g. ElevenLabs or storage) for deleted records"
+    )
+
+
+class BulkDeleteResponse(BaseModel):
+    """Per-item outcome of a bulk delete."""
+
+    results: List[BulkDeleteItemResult] = Field(default_factory=list, description="Results in request order")
+    deleted_count: int = Field(default=0, ge=0, description="Records deleted")
+    not_found_count: int = Field(default=0, ge=0, description="IDs with no record")
+    failed_count: int = Field(default=0, ge=0, description="Records that could not be deleted")
+    elapsed_ms: float = Field(default=0.0, ge=0, description="Total duration in milliseconds")
+
+
 # Default document tags for knowledge documents
 DEFAULT_DOCUMENT_TAGS = [
     "before_visit",
@@ -44,6 +86,10 @@ DEFAULT_DOCUMENT_TAGS = [
     "faq",
 ]
 
+# Maximum knowledge document content in characters. Firestore stores the text
+# as raw content and again in the structured sections, within its 1 MiB limit.
+KNOWLEDGE_CONTENT_MAX_CHARS = 300000
+
 
 class SyncStatus(str, Enum):
     """Synchronization status with ElevenLabs."""
@@ -60,7 +106,10 @@ class KnowledgeDocumentCreate(BaseModel):
     disease_name: str = Field(..., min_length=1, max_length=100, description="Name of the disease")
     tags: List[str] = Field(default_factory=lambda: ["faq"], description="List of document tags")
     raw_content: str = Field(
-        ..., min_length=1, max_length=300000, description="Content of the document (~300KB limit)"
+        ...,
+        min_length=1,
+        max_length=KNOWLEDGE_CONTENT_MAX_CHARS,
+        description="Content of the document (~300KB limit)",
     )
     doctor_id: str = Field(default="default_doctor", description="ID of the uploading doctor")
 
@@ -87,7 +136,7 @@ class KnowledgeDocumentUpdate(BaseModel):
     disease_name: Optional[str] = Field(None, min_length=1, max_length=100, description="Name of the disease")
     tags: Optional[List[str]] = Field(None, description="List of document tags")
     
-    raw_content: Optional[str] = Field(None, min_length=1, max_length=300000, description="Updated content of the document")
+    raw_content: Optional[str] = Field(None, min_length=1, max_length=KNOWLEDGE_CONTENT_MAX_CHARS, description="Updated content of the document")
     
     @field_validator("disease_name")
     @classmethod
@@ -116,9 +165,22 @@ class KnowledgeDocumentResponse(BaseModel):
     raw_content: str = Field(..., description="Content of the document")
     sync_status: SyncStatus = Field(..., description="Sync status with ElevenLabs")
     elevenlabs_document_id: Optional[str] = Field(None, description="Document ID in ElevenLabs")
+    content_hash: Optional[str] = Field(
+        None, description="Normalized SHA-256 of raw_content"
+    )
+    elevenlabs_content_hash: Optional[str] = Field(
+        None, description="Normalized SHA-256 of the content held by the ElevenLabs document"
+    )
     structured_sections: Optional[dict] = Field(
         None, description="Structured sections of the document"
     )
+    section_index: Optional[List[dict]] = Field(
+        None,
+        description="Per-section header path, character/byte offsets and token estimate",
+    )
+    source_path: Optional[str] = Field(
+        None, description="Storage path of the uploaded file the document was created from"
+    )
     sync_error_message: Optional[str] = Field(None, description="Error message if sync failed")
     last_sync_attempt: Optional[datetime] = Field(None, description="Timestamp of last sync attempt")
     sync_retry_count: int = Field(default=0, description="Number of sync retry attempts")
@@ -133,6 +195,77 @@ class KnowledgeDocumentListResponse(BaseModel):
     total_count: int = Field(..., ge=0, description="Total number of documents")
 
 
+class KnowledgeSearchResult(BaseModel):
+    """A ranked knowledge search hit."""
+
+    knowledge_id: str = Field(..., description="Matching document ID")
+    disease_name: str = Field(..., description="Name of the disease")
+    score: float = Field(..., description="BM25 relevance score")
+    section: Optional[str] = Field(None, description="Section containing the first match")
+    highlights: List[str] = Field(
+        default_factory=list, description="Snippets with matches wrapped in <mark> tags"
+    )
+
+
+class KnowledgeSearchResponse(BaseModel):
+    """Response model for knowledge search."""
+
+    query: str = Field(..., description="Search query")
+    results: List[KnowledgeSearchResult] = Field(..., description="Results, best first")
+    total_count: int = Field(..., ge=0, description="Number of results returned")
+    took_ms: float = Field(..., ge=0, description="Search time in milliseconds")
+
+
+class ReconciliationIssue(str, Enum):
+    """Kind of mismatch between ElevenLabs and the local knowledge documents."""
+
+    ORPHAN = "orphan"  # In ElevenLabs, referenced by no local document
+    MISSING = "missing"  # Local document whose ElevenLabs document does not exist
+    STALE = "stale"  # ElevenLabs document holds outdated content
+
+
+class KnowledgeReconcileRequest(BaseModel):
+    """Request model for knowledge base reconciliation."""
+
+    dry_run: bool = Field(default=True, description="Only report the diff, apply nothing")
+    delete_orphans: bool = Field(
+        default=False,
+        description="Delete orphaned ElevenLabs documents (they may belong to another environment)",
+    )
+
+
+class ReconciliationEntry(BaseModel):
+    """One mismatch found by reconciliation and what was done about it."""
+
+    issue: ReconciliationIssue = Field(..., description="Kind of mismatch")
+    elevenlabs_document_id: Optional[str] = Field(None, description="ElevenLabs document ID")
+    knowledge_id: Optional[str] = Field(None, description="Local knowledge document ID")
+    name: Optional[str] = Field(None, description="Document name")
+    action: Optional[str] = Field(
+        None, description="Fix applied: deleted, sync_queued, resync_queued (None if not applied)"
+    )
+    error: Optional[str] = Field(None, description="Error if the fix failed")
+
+
+class KnowledgeReconcileResponse(BaseModel):
+    """Diff between ElevenLabs and local knowledge documents, with timings."""
+
+    dry_run: bool = Field(..., description="Whether fixes were skipped")
+    elevenlabs_count: int = Field(..., ge=0, description="Documents listed from ElevenLabs")
+    local_count: int = Field(..., ge=0, description="Local knowledge documents")
+    in_sync_count: int = Field(..., ge=0, description="Local documents matching ElevenLabs")
+    in_flight_count: int = Field(
+        ..., ge=0, description="Local documents with a sync pending or running (not diffed)"
+    )
+    orphans: List[ReconciliationEntry] = Field(default_factory=list, description="Orphaned ElevenLabs documents")
+    missing: List[ReconciliationEntry] = Field(default_factory=list, description="Documents missing in ElevenLabs")
+    stale: List[ReconciliationEntry] = Field(default_factory=list, description="Documents with outdated content")
+    applied_count: int = Field(default=0, ge=0, description="Fixes applied successfully")
+    failed_count: int = Field(default=0, ge=0, description="Fixes that failed")
+    pages: int = Field(default=0, ge=0, description="ElevenLabs list pages fetched")
+    timings_ms: dict = Field(default_factory=dict, description="Phase durations in milliseconds")
+
+
 class ScriptGenerateRequest(BaseModel):
     """Request model for script generation."""
 
@@ -275,6 +408,34 @@ class AudioGenerateRequest(BaseModel):
     doctor_id: str = Field(default="default_doctor", description="ID of the doctor generating audio")
     name: Optional[str] = Field(None, max_length=200, description="User-friendly name for the audio")
     description: Optional[str] = Field(None, max_length=1000, description="Optional description of the audio content")
+    variants: Optional[List[str]] = Field(
+        None,
+        description=(
+            "Lower-bitrate profiles to generate alongside the master (defaults to "
+            "AUDIO_DEFAULT_VARIANTS); each is a separate synthesis, not derived from the master"
+        ),
+    )
+
+    @field_validator("variants")
+    @classmethod
+    def validate_variants(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        """Validate that variants name known non-master profiles."""
+        if v is None:
+            return v
+        unknown = [p for p in v if p not in AUDIO_PROFILES or p == STANDARD_AUDIO_PROFILE]
+        if unknown:
+            raise ValueError(f"Unknown audio variant profiles: {unknown}")
+        return list(dict.fromkeys(v))
+
+
+class AudioVariant(BaseModel):
+    """A lower-bitrate rendition of an audio file, synthesized separately from the master."""
+
+    profile: str = Field(..., description="Profile name (see /api/audio/stream ?profile=)")
+    output_format: str = Field(..., description="ElevenLabs output format")
+    audio_url: str = Field(..., description="Storage path or URL of the variant")
+    bitrate_kbps: Optional[int] = Field(None, description="Average MP3 bitrate")
+    size_bytes: int = Field(..., ge=0, description="File size")
 
 
 class AudioGenerateResponse(BaseModel):
@@ -285,6 +446,9 @@ class AudioGenerateResponse(BaseModel):
     knowledge_id: str = Field(..., description="Source document ID")
     voice_id: str = Field(..., description="Voice used for generation")
     duration_seconds: Optional[float] = Field(None, description="Audio duration")
+    bitrate_kbps: Optional[int] = Field(None, description="Average MP3 bitrate")
+    frame_count: Optional[int] = Field(None, description="Number of MP3 audio frames")
+    variants: Dict[str, AudioVariant] = Field(default_factory=dict, description="Lower-bitrate variants by profile")
     script: str = Field(..., description="Script used for generation")
     created_at: datetime = Field(..., description="Creation timestamp")
     doctor_id: str = Field(default="default_doctor", description="ID of the doctor who generated audio")
@@ -305,6 +469,10 @@ class AudioMetadata(BaseModel):
     doctor_id: str = Field(default="default_doctor", description="ID of the doctor who generated audio")
     name: str = Field(default="", description="User-friendly name for the audio")
     description: str = Field(default="", description="Optional description of the audio content")
+    bitrate_kbps: Optional[int] = Field(default=None, description="Average MP3 bitrate (from frame headers)")
+    frame_count: Optional[int] = Field(default=None, description="Number of MP3 audio frames")
+    variants: Dict[str, AudioVariant] = Field(default_factory=dict, description="Lower-bitrate variants by profile")
+    peaks_ms: Optional[int] = Field(default=None, description="Milliseconds per waveform peak, if peaks are stored")
 
 
 class AudioListResponse(BaseModel):
@@ -314,6 +482,101 @@ class AudioListResponse(BaseModel):
     total_count: int
 
 
+class AudioManifestItem(BaseModel):
+    """Compact audio entry for history views: no script and no URL."""
+
+    audio_id: str = Field(..., description="Audio ID")
+    knowledge_id: str = Field(..., description="Source knowledge document ID")
+    name: str = Field(default="", description="User-friendly name")
+    description: str = Field(default="", description="Description of the audio content")
+    duration_seconds: Optional[float] = Field(None, description="Audio duration")
+    created_at: datetime = Field(..., description="Creation timestamp")
+    peaks_ms: Optional[int] = Field(None, description="Milliseconds per waveform peak, if peaks are stored")
+
+
+class AudioManifestResponse(BaseModel):
+    """Playback manifest of an audio collection, newest first."""
+
+    etag: str = Field(..., description="Collection version (also sent as the ETag header)")
+    items: List[AudioManifestItem] = Field(default_factory=list, description="Audio entries")
+    total_count: int = Field(..., ge=0, description="Number of entries")
+
+
+class AudioPlaybackUrlsRequest(BaseModel):
+    """Request model for signing playback URLs of manifest entries."""
+
+    audio_ids: List[str] = Field(..., min_length=1, max_length=100, description="Audio IDs to sign")
+
+
+class AudioPlaybackUrlsResponse(BaseModel):
+    """Signed playback URLs by audio ID; unknown IDs are omitted."""
+
+    urls: Dict[str, str] = Field(default_factory=dict, description="Playback URL by audio ID")
+    expires_in_seconds: int = Field(..., ge=0, description="Validity of signed URLs")
+
+
+class AudioBackfillRequest(BaseModel):
+    """Request model for backfilling measured audio metadata."""
+
+    force: bool = Field(default=False, description="Re-measure files that already have a duration")
+    concurrency: Optional[int] = Field(None, ge=1, le=32, description="Files scanned at once")
+
+
+class AudioBackfillResponse(BaseModel):
+    """Outcome of an audio metadata backfill."""
+
+    total_count: int = Field(..., ge=0, description="Audio records considered")
+    updated_count: int = Field(default=0, ge=0, description="Records updated with measured values")
+    missing_count: int = Field(default=0, ge=0, description="Records whose file is not in storage")
+    unreadable_count: int = Field(default=0, ge=0, description="Files without MP3 frames")
+    failed_count: int = Field(default=0, ge=0, description="Files that could not be read or saved")
+    elapsed_ms: float = Field(default=0.0, ge=0, description="Total duration in milliseconds")
+
+
+class AudioBackfillJobResponse(BaseModel):
+    """State of a queued audio metadata backfill."""
+
+    job_id: str = Field(..., description="Backfill job ID")
+    status: str = Field(..., description="pending, leased (running), succeeded or failed")
+    report: Optional[AudioBackfillResponse] = Field(None, description="Outcome once succeeded")
+    error: Optional[str] = Field(None, description="Last error, if any")
+
+
+class StorageGcRequest(BaseModel):
+    """Request model for a storage garbage collection run."""
+
+    dry_run: bool = Field(default=True, description="Only report orphans; delete nothing")
+    grace_hours: Optional[int] = Field(
+        None, ge=0, description="Keep orphans younger than this (defaults to STORAGE_GC_GRACE_HOURS)"
+    )
+
+
+class StorageGcEntry(BaseModel):
+    """An orphaned storage object found by garbage collection."""
+
+    path: str = Field(..., description="Storage path")
+    size_bytes: int = Field(..., ge=0, description="Object size")
+    updated_at: datetime = Field(..., description="Last modification time")
+    deleted: bool = Field(default=False, description="Whether the object was deleted")
+
+
+class StorageGcResponse(BaseModel):
+    """Outcome of a storage garbage collection run."""
+
+    dry_run: bool = Field(..., description="Whether deletes were skipped")
+    scanned_count: int = Field(default=0, ge=0, description="Objects listed")
+    orphan_count: int = Field(default=0, ge=0, description="Unreferenced objects older than the grace period")
+    orphan_bytes: int = Field(default=0, ge=0, description="Total size of those orphans")
+    recent_orphan_count: int = Field(default=0, ge=0, description="Unreferenced objects within the grace period (kept)")
+    deleted_count: int = Field(default=0, ge=0, description="Orphans deleted")
+    failed_count: int = Field(default=0, ge=0, description="Orphans that could not be deleted")
+    reclaimed_bytes: int = Field(default=0, ge=0, description="Total size of deleted orphans")
+    orphans: List[StorageGcEntry] = Field(
+        default_factory=list, description="Orphans found (capped; see orphan_count for the total)"
+    )
+    elapsed_ms: float = Field(default=0.0, ge=0, description="Total duration in milliseconds")
+
+
 class AudioUpdateRequest(BaseModel):
     """Request model for updating audio metadata."""
 
@@ -321,6 +584,111 @@ class AudioUpdateRequest(BaseModel):
     description: Optional[str] = Field(None, max_length=1000, description="Optional description of the audio content")
 
 
+class BatchJobStatus(str, Enum):
+    """Lifecycle status of a batch audio job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    COMPLETED_WITH_ERRORS = "completed_with_errors"
+    FAILED = "failed"
+
+
+class BatchItemStatus(str, Enum):
+    """Status of one knowledge document within a batch audio job."""
+
+    PENDING = "pending"
+    GENERATING_SCRIPT = "generating_script"
+    SCRIPT_READY = "script_ready"
+    GENERATING_AUDIO = "generating_audio"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AudioBatchRequest(BaseModel):
+    """Request model for generating scripts and audio for many documents."""
+
+    knowledge_ids: List[str] = Field(
+        ..., min_length=1, max_length=500, description="Knowledge documents to process"
+    )
+    voice_id: str = Field(..., description="ElevenLabs voice ID")
+    model_name: str = Field(default="gemini-2.5-flash", description="Gemini model to use")
+    custom_prompt: Optional[str] = Field(None, description="Custom prompt for generation")
+    template_config: Optional[TemplateConfig] = Field(
+        None, description="Template configuration for prompt building"
+    )
+    doctor_id: str = Field(default="default_doctor", description="ID of the doctor generating audio")
+
+    @field_validator("knowledge_ids")
+    @classmethod
+    def dedupe_knowledge_ids(cls, v: List[str]) -> List[str]:
+        """Drop duplicate IDs while keeping request order."""
+        return list(dict.fromkeys(v))
+
+
+class AudioBatchItem(BaseModel):
+    """Progress of one knowledge document within a batch audio job."""
+
+    knowledge_id: str
+    status: BatchItemStatus = BatchItemStatus.PENDING
+    script: Optional[str] = Field(None, description="Generated script (kept so resumes skip regeneration)")
+    audio_id: Optional[str] = Field(None, description="Generated audio ID once completed")
+    error: Optional[str] = None
+    attempts: int = Field(default=0, ge=0)
+    updated_at: Optional[datetime] = None
+
+
+class AudioBatchJob(BaseModel):
+    """Batch audio job with per-document progress."""
+
+    job_id: str
+    status: BatchJobStatus = BatchJobStatus.PENDING
+    voice_id: str
+    model_name: str
+    custom_prompt: Optional[str] = None
+    template_config: Optional[TemplateConfig] = None
+    doctor_id: str = "default_doctor"
+    items: List[AudioBatchItem] = Field(default_factory=list)
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    @property
+    def total_count(self) -> int:
+        """Number of documents in the job."""
+        return len(self.items)
+
+    @property
+    def completed_count(self) -> int:
+        """Number of documents with audio generated."""
+        return sum(1 for i in self.items if i.status == BatchItemStatus.COMPLETED)
+
+    @property
+    def failed_count(self) -> int:
+        """Number of documents that failed."""
+        return sum(1 for i in self.items if i.status == BatchItemStatus.FAILED)
+
+
+class AudioBatchJobResponse(AudioBatchJob):
+    """Batch audio job with progress counters."""
+
+    total: int = Field(..., ge=0, description="Number of documents in the job")
+    completed: int = Field(..., ge=0, description="Documents with audio generated")
+    failed: int = Field(..., ge=0, description="Documents that failed")
+    is_active: bool = Field(..., description="Whether the job is currently being processed")
+
+    @classmethod
+    def from_job(cls, job: AudioBatchJob, is_active: bool) -> "AudioBatchJobResponse":
+        """Build a response with counters from a job."""
+        return cls(
+            **job.model_dump(),
+            total=job.total_count,
+            completed=job.completed_count,
+            failed=job.failed_count,
+            is_active=is_active,
+        )
+
+
 class VoiceOption(BaseModel):
     """Model for a voice option."""
 
@@ -11,10 +11,12 @@ from backend.models.schemas import (
     AgentResponse,
     AgentListResponse,
     AnswerStyle,
+    BulkDeleteResponse,
     SyncStatus,
 )
 from backend.services.elevenlabs_service import get_elevenlabs_service, ElevenLabsAgentError, ElevenLabsService
 from backend.services.data_service import get_data_service, DataServiceInterface
+from backend.services import bulk_delete
 
 
 SYSTEM_PROMPTS = {
@@ -129,10 +131,14 @@ class AgentService:
             return []
             
         kb_items = []
+        seen_ids = set()  # Documents with identical content share one ElevenLabs ID
         for kid in knowledge_ids:
             # We must await the coroutine
             doc = await self.data_service.get_knowledge_document(kid)
             if doc and doc.sync_status == SyncStatus.COMPLETED and doc.elevenlabs_document_id:
+                if doc.elevenlabs_document_id in seen_ids:
+                    continue
+                seen_ids.add(doc.elevenlabs_document_id)
                 kb_items.append({
                     "id": doc.elevenlabs_document_id,
                     "name": doc.disease_name,  # Use disease_name as document name
@@ -318,6 +324,20 @@ class AgentService:
         # Delete from DB
         return await self.data_service.delete_agent(agent_id)
 
+    async def delete_agents(self, agent_ids: List[str]) -> BulkDeleteResponse:
+        """Delete several agents.
+
+        ElevenLabs deletes run with bounded concurrency and local records are
+        removed in batched writes.
+
+        Args:
+            agent_ids: IDs of the agents to delete.
+
+        Returns:
+            BulkDeleteResponse with one result per ID.
+        """
+        return await bulk_delete.delete_agents(self.data_service, self.elevenlabs, agent_ids)
+
 
     async def sync_agent_configuration(self, agent_id: str) -> AgentResponse:
         """Sync agent configuration from ElevenLabs to local Firestore.
@@ -0,0 +1,135 @@
+"""Backfill of measured audio metadata for existing files.
+
+Audio generated before durations were measured at upload time has no
+duration, bitrate or frame count. The backfill streams each such file from
+storage in large ranged reads, feeds the MP3 frame scanner (stopping early
+when a Xing/Info header gives the totals) and writes only the measured
+fields. Files are processed with bounded concurrency
+(AUDIO_BACKFILL_CONCURRENCY).
+
+Only the IDs of records lacking a duration are read (scripts are never
+loaded), and the run happens on the durable task queue: the API returns a
+job ID at once and the report is kept as the task's result.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import aclosing
+from typing import Any, Dict, Optional
+
+from backend.config import get_settings
+from backend.models.schemas import AudioBackfillResponse
+from backend.services.data_service import DataServiceInterface, get_data_service
+from backend.services.storage_service import StorageService, get_storage_service
+from backend.services.task_queue import QueuedTask, TaskQueue, get_task_queue
+from backend.utils.mp3_info import Mp3FrameScanner, Mp3Info
+
+logger = logging.getLogger(__name__)
+
+# Task kind
+AUDIO_BACKFILL = "audio_backfill"
+
+
+async def measure_stored_audio(storage_service: StorageService, audio_id: str) -> Optional[Mp3Info]:
+    """Scan a stored audio file's frame headers.
+
+    Returns:
+        Mp3Info, or None if the file holds no MP3 frames.
+
+    Raises:
+        FileNotFoundError: If the file is not in storage.
+    """
+    storage_path = f"audio/{audio_id}.mp3"
+    info = await asyncio.to_thread(storage_service.get_file_info, storage_path)
+    if info is None:
+        raise FileNotFoundError(storage_path)
+    scanner = Mp3FrameScanner()
+    async with aclosing(storage_service.aiter_file(storage_path, info=info)) as chunks:
+        async for chunk in chunks:
+            scanner.feed(chunk)
+            if scanner.complete:
+                break
+    return scanner.result()
+
+
+async def backfill_audio_metadata(
+    data_service: DataServiceInterface,
+    storage_service: StorageService,
+    force: bool = False,
+    concurrency: Optional[int] = None,
+) -> AudioBackfillResponse:
+    """Measure and store duration, bitrate and frame count for audio files.
+
+    Args:
+        data_service: Source of audio records.
+        storage_service: Storage holding the MP3 files.
+        force: Also re-measure records that already have a duration.
+        concurrency: Files scanned at once (defaults to settings).
+
+    Returns:
+        AudioBackfillResponse with per-outcome counts.
+    """
+    start = time.perf_counter()
+    concurrency = concurrency or get_settings().audio_backfill_concurrency
+    if force:
+        pending = await data_service.get_audio_file_ids()
+    else:
+        pending = await data_service.get_audio_ids_without_duration()
+    report = AudioBackfillResponse(total_count=len(pending))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def backfill(audio_id: str) -> None:
+        async with semaphore:
+            try:
+                measured = await measure_stored_audio(storage_service, audio_id)
+                if measured is None:
+                    report.unreadable_count += 1
+                    return
+                updated = await data_service.update_audio_fields(audio_id, {
+                    "duration_seconds": measured.duration_seconds,
+                    "bitrate_kbps": measured.bitrate_kbps,
+                    "frame_count": measured.frame_count,
+                })
+                if updated:
+                    report.updated_count += 1
+                else:
+                    report.missing_count += 1
+            except FileNotFoundError:
+                report.missing_count += 1
+            except Exception as e:
+                logger.error(f"Audio metadata backfill failed for {audio_id}: {e}")
+                report.failed_count += 1
+
+    await asyncio.gather(*(backfill(audio_id) for audio_id in sorted(pending)))
+    report.elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+    logger.info(
+        f"Audio metadata backfill: {report.updated_count}/{report.total_count} updated, "
+        f"{report.missing_count} missing, {report.unreadable_count} unreadable, "
+        f"{report.failed_count} failed in {report.elapsed_ms} ms"
+    )
+    return report
+
+
+async def _handle_backfill(payload: Dict[str, Any]) -> Dict[str, Any]:
+    report = await backfill_audio_metadata(
+        get_data_service(),
+        get_storage_service(),
+        force=payload.get("force", False),
+        concurrency=payload.get("concurrency"),
+    )
+    return report.model_dump()
+
+
+def register_audio_backfill_handler(queue: TaskQueue) -> None:
+    """Register the audio metadata backfill handler on a task queue."""
+    queue.register(AUDIO_BACKFILL, _handle_backfill)
+
+
+async def enqueue_audio_backfill(
+    force: bool = False, concurrency: Optional[int] = None, queue: Optional[TaskQueue] = None
+) -> QueuedTask:
+    """Queue an audio metadata backfill; the task ID identifies the job."""
+    return await (queue or get_task_queue()).enqueue(
+        AUDIO_BACKFILL, {"force": force, "concurrency": concurrency}
+    )
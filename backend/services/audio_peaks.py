@@ -0,0 +1,67 @@
+"""Waveform peaks computed off the event loop.
+
+Peaks come from a pure-Python scan of every MP3 frame (see
+backend.utils.mp3_peaks), which holds the GIL for the length of the file.
+A small process pool (AUDIO_PEAKS_WORKERS) keeps that work from stalling
+request handling; with 0 workers it runs in a thread instead. Workers are
+spawned rather than forked: forking a server process copies its event loop,
+client threads and locks into the child.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from backend.config import get_settings
+from backend.utils.mp3_peaks import compute_mp3_peaks
+
+logger = logging.getLogger(__name__)
+
+# Shared worker pool, created on first use
+_executor_instance: Optional[ProcessPoolExecutor] = None
+
+
+def get_peaks_executor() -> Optional[ProcessPoolExecutor]:
+    """Get the shared peaks process pool (None when AUDIO_PEAKS_WORKERS is 0)."""
+    global _executor_instance
+    workers = get_settings().audio_peaks_workers
+    if _executor_instance is None and workers:
+        _executor_instance = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor_instance
+
+
+def shutdown_peaks_executor() -> None:
+    """Stop the worker processes; a later call to get_peaks_executor starts new ones."""
+    global _executor_instance
+    if _executor_instance is not None:
+        _executor_instance.shutdown(wait=False, cancel_futures=True)
+        _executor_instance = None
+
+
+def _encode_peaks(audio_bytes: bytes, ms_per_peak: int) -> Optional[bytes]:
+    peaks = compute_mp3_peaks(audio_bytes, ms_per_peak)
+    if peaks is None:
+        return None
+    return json.dumps(peaks, separators=(",", ":")).encode("utf-8")
+
+
+async def compute_peaks_json(audio_bytes: bytes, ms_per_peak: int) -> Optional[bytes]:
+    """Compute the peaks sidecar of an MP3 in a worker process.
+
+    Args:
+        audio_bytes: Whole MP3 file.
+        ms_per_peak: Window covered by each min/max pair.
+
+    Returns:
+        Compact JSON document, or None if the MP3 has no Layer III frames.
+    """
+    executor = get_peaks_executor()
+    if executor is None:
+        return await asyncio.to_thread(_encode_peaks, audio_bytes, ms_per_peak)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, _encode_peaks, audio_bytes, ms_per_peak)
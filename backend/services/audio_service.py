@@ -1,22 +1,99 @@
 """Service for audio generation and management."""
 
+import asyncio
+import hashlib
+import json
 import logging
+import random
 import uuid
 from datetime import datetime
-from typing import List, Optional, AsyncGenerator
+from pathlib import Path
+from typing import Dict, List, Optional, AsyncGenerator, AsyncIterator
 
-from backend.models.schemas import AudioMetadata, VoiceOption
+from backend.models.schemas import (
+    AudioManifestResponse,
+    AudioMetadata,
+    AudioVariant,
+    VoiceOption,
+)
+from backend.services.audio_peaks import compute_peaks_json
 from backend.services.elevenlabs_service import ElevenLabsService, get_elevenlabs_service
-from backend.services.storage_service import StorageService, get_storage_service, get_signed_url
+from backend.services.storage_service import (
+    StorageService,
+    StoredFileInfo,
+    get_signed_url,
+    get_storage_service,
+)
 from backend.services.data_service import get_data_service, DataServiceInterface
 
-from backend.services.script_generation_service import ScriptGenerationService
+from backend.services.script_generation_service import (
+    ScriptGenerationService,
+    get_script_generation_service,
+)
 from backend.services.prompt_template_service import get_prompt_template_service
-from backend.config import get_default_script_prompt, GEMINI_MODELS
+from backend.services.script_cache import (
+    ScriptCache,
+    build_cache_entry,
+    build_cache_key,
+    get_script_cache,
+    iter_replay_chunks,
+)
+from backend.services.langgraph_workflow import SCRIPT_GENERATION_TEMPERATURE
+from backend.config import (
+    AUDIO_PROFILES,
+    GEMINI_MODELS,
+    STANDARD_AUDIO_PROFILE,
+    get_default_script_prompt,
+    get_settings,
+)
+from backend.utils.mp3_info import Mp3Info, scan_mp3
+from backend.utils.section_parser import CHARS_PER_TOKEN, load_sections
 from backend.models.schemas import TemplateConfig
 
 # In-memory storage is removed in favor of FirestoreDataService
 
+def _measure_mp3(audio_bytes: bytes) -> Optional[Mp3Info]:
+    """Scan MP3 frame headers; measurement problems never fail generation."""
+    try:
+        return scan_mp3(audio_bytes)
+    except Exception as e:
+        logging.warning(f"Could not measure generated audio: {e}")
+        return None
+
+
+def audio_filename(audio_id: str, profile: Optional[str] = None) -> str:
+    """Storage filename of an audio file or one of its variants.
+
+    The master is "{audio_id}.mp3"; a variant is "{audio_id}.{profile}.mp3".
+    """
+    if not profile or profile == STANDARD_AUDIO_PROFILE:
+        return f"{audio_id}.mp3"
+    return f"{audio_id}.{profile}.mp3"
+
+
+def peaks_filename(audio_id: str) -> str:
+    """Storage filename of the waveform peaks sidecar of an audio file."""
+    return f"{audio_id}.peaks.json"
+
+
+def stored_filenames(audio: AudioMetadata) -> List[str]:
+    """Storage filenames (under audio/) of an audio file, its variants and sidecars."""
+    filenames = [audio_filename(audio.audio_id)] + [
+        audio_filename(audio.audio_id, profile) for profile in audio.variants
+    ]
+    if audio.peaks_ms:
+        filenames.append(peaks_filename(audio.audio_id))
+    return filenames
+
+
+def _sign_variants(variants: Dict[str, AudioVariant]) -> Dict[str, AudioVariant]:
+    """Replace variant storage paths with signed URLs."""
+    return {
+        profile: variant.model_copy(update={"audio_url": get_signed_url(variant.audio_url)})
+        for profile, variant in variants.items()
+    }
+
+
 class AudioService:
     """Service for handling audio operations."""
 
@@ -25,7 +102,8 @@ class AudioService:
         elevenlabs_service: Optional[ElevenLabsService] = None,
         storage_service: Optional[StorageService] = None,
         data_service: Optional[DataServiceInterface] = None,
-        script_service: Optional[ScriptGenerationService] = None
+        script_service: Optional[ScriptGenerationService] = None,
+        script_cache: Optional[ScriptCache] = None
     ):
         """Initialize audio service.
         
@@ -33,12 +111,18 @@ class AudioService:
             elevenlabs_service: Optional injected service for testing.
             storage_service: Optional injected service for storage operations.
             data_service: Optional injected service for data persistence.
+            script_cache: Optional script result cache (None when caching is disabled).
         """
         self.elevenlabs_service = elevenlabs_service or get_elevenlabs_service()
         self.storage_service = storage_service or get_storage_service()
         # Use get_data_service() to respect environment variables (mock vs real DB)
         self.data_service = data_service or get_data_service()
-        self.script_service = script_service or ScriptGenerationService()
+        self.script_service = script_service or get_script_generation_service()
+        self.script_cache = script_cache or get_script_cache()
+        # Voice options built from the last catalog snapshot seen, and its ETag
+        self._voice_source = None
+        self._voice_options: List[VoiceOption] = []
+        self.voices_etag: Optional[str] = None
 
     async def generate_script(
         self, 
@@ -87,12 +171,30 @@ class AudioService:
         # Map friendly name to API model name
         api_model_name = GEMINI_MODELS.get(model_name, model_name)
         
+        cache_key = None
+        if self.script_cache is not None:
+            cache_key = build_cache_key(
+                doc.raw_content, prompt, api_model_name, SCRIPT_GENERATION_TEMPERATURE
+            )
+            cached = await self.script_cache.get(cache_key)
+            if cached:
+                logging.info(f"Script cache hit for knowledge_id: {knowledge_id}")
+                return {
+                    "script": cached.script,
+                    "model_used": cached.model_used
+                }
+        
         try:
             result = await self.script_service.generate_script(
                 knowledge_content=doc.raw_content,
                 model_name=api_model_name, 
-                prompt=prompt
+                prompt=prompt,
+                structured_sections=doc.structured_sections
             )
+            if cache_key is not None and result["script"]:
+                await self.script_cache.set(
+                    build_cache_entry(cache_key, result["script"], result["model_used"])
+                )
             return {
                 "script": result["script"],
                 "model_used": result["model_used"]
@@ -111,9 +213,16 @@ class AudioService:
                 script_content += f"{doc.structured_sections['Introduction']}\n\n"
             else:
                 limit = 5000
-                content_snippet = doc.raw_content[:limit]
-                if len(doc.raw_content) > limit:
-                    content_snippet += "..."
+                # Prefer whole leading sections over cutting the text mid-sentence
+                content_snippet = ""
+                if doc.section_index:
+                    content_snippet = load_sections(
+                        doc.raw_content, doc.section_index, max_tokens=limit // CHARS_PER_TOKEN
+                    )
+                if not content_snippet:
+                    content_snippet = doc.raw_content[:limit]
+                    if len(doc.raw_content) > limit:
+                        content_snippet += "..."
                 script_content += content_snippet
             
             return {
@@ -170,31 +279,87 @@ class AudioService:
         # Map friendly name to API model name
         api_model_name = GEMINI_MODELS.get(model_name, model_name)
         
+        cache_key = None
+        if self.script_cache is not None:
+            cache_key = build_cache_key(
+                doc.raw_content, prompt, api_model_name, SCRIPT_GENERATION_TEMPERATURE
+            )
+            cached = await self.script_cache.get(cache_key)
+            if cached:
+                # Replay as token events so SSE clients see the usual stream
+                logging.info(f"Script cache hit for knowledge_id: {knowledge_id}, replaying stream")
+                for chunk in iter_replay_chunks(cached.script):
+                    yield {"type": "token", "content": chunk}
+                yield {
+                    "type": "complete",
+                    "script": cached.script,
+                    "model_used": cached.model_used,
+                    "cached": True
+                }
+                return
+        
         # Delegate to script service streaming
         async for event in self.script_service.generate_script_stream(
             knowledge_content=doc.raw_content,
             model_name=api_model_name,
-            prompt=prompt
+            prompt=prompt,
+            structured_sections=doc.structured_sections
         ):
+            if cache_key is not None and event.get("type") == "complete" and event.get("script"):
+                await self.script_cache.set(
+                    build_cache_entry(cache_key, event["script"], event["model_used"])
+                )
             yield event
 
-    def stream_audio(self, audio_id: str):
-        """Stream audio file content.
+    def get_audio_stream_info(
+        self, audio_id: str, profile: Optional[str] = None
+    ) -> Optional[StoredFileInfo]:
+        """Get size and ETag of an audio file in storage.
+
+        Args:
+            audio_id: ID of the audio file.
+            profile: Variant profile (default: the master file).
+
+        Returns:
+            StoredFileInfo, or None if the file is not in storage.
+        """
+        return self.storage_service.get_file_info(f"audio/{audio_filename(audio_id, profile)}")
+
+    def get_audio_local_path(self, audio_id: str, profile: Optional[str] = None) -> Optional[Path]:
+        """Get the filesystem path of an audio file in mock storage.
+
+        Returns:
+            The local path (served zero-copy as a FileResponse), or None when
+            audio lives in GCS.
+        """
+        return self.storage_service.get_local_path(f"audio/{audio_filename(audio_id, profile)}")
+
+    def stream_audio(
+        self,
+        audio_id: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        info: Optional[StoredFileInfo] = None,
+        profile: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream audio file content, optionally a byte range of it.
         
-        This is a sync function because it returns a sync generator from
-        storage_service.get_file_stream(). FastAPI's StreamingResponse
-        handles sync generators efficiently via thread pool.
+        Returns an async iterator from storage_service.aiter_file(), whose
+        storage reads run in worker threads in large ranged chunks.
         
         Args:
             audio_id: ID of the audio file to stream.
+            start: First byte offset.
+            end: Last byte offset (inclusive); defaults to end of file.
+            info: Result of get_audio_stream_info, if already fetched.
+            profile: Variant profile (default: the master file).
             
         Yields:
              Bytes chunks of the audio file.
         """
-        filename = f"{audio_id}.mp3"
-        storage_path = f"audio/{filename}"
+        storage_path = f"audio/{audio_filename(audio_id, profile)}"
         
-        return self.storage_service.get_file_stream(storage_path)
+        return self.storage_service.aiter_file(storage_path, start=start, end=end, info=info)
 
     async def generate_audio(
         self, 
@@ -203,7 +368,8 @@ class AudioService:
         knowledge_id: str, 
         doctor_id: str = "default_doctor",
         name: Optional[str] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        variants: Optional[List[str]] = None,
     ) -> AudioMetadata:
         """Generate audio from a script.
         
@@ -214,6 +380,10 @@ class AudioService:
             doctor_id: ID of the doctor generating the audio.
             name: Optional user-friendly name. If None, auto-generate from document.
             description: Optional description of the audio content.
+            variants: Lower-bitrate profiles to generate alongside the master
+                (see AUDIO_PROFILES). None uses AUDIO_DEFAULT_VARIANTS. Each
+                variant is a separate synthesis, not transcoded from the master,
+                so it may differ slightly in timing and intonation.
             
         Returns:
             AudioMetadata: Metadata of the generated audio with signed URL.
@@ -223,14 +393,57 @@ class AudioService:
         """
         logging.info(f"Generating audio for knowledge_id: {knowledge_id} with voice: {voice_id}")
         
+        if variants is None:
+            variants = get_settings().get_audio_default_variants()
+        variants = list(dict.fromkeys(
+            p for p in variants if p in AUDIO_PROFILES and p != STANDARD_AUDIO_PROFILE
+        ))
+        
         try:
             # 1. Calls ElevenLabs to generate audio bytes
-            audio_bytes = self.elevenlabs_service.text_to_speech(text=script, voice_id=voice_id)
-            
-            # 2. Upload to Storage (returns storage path for production, URL for emulator)
+            # (blocking SDK calls run in a thread so concurrent requests/batch workers overlap).
+            # Variants are separate syntheses at lower output formats, not derived from
+            # the master's bytes; a shared seed keeps them as close to it as the model allows.
             audio_id = str(uuid.uuid4())
-            filename = f"{audio_id}.mp3"
-            storage_path_or_url = self.storage_service.upload_audio(audio_bytes, filename)
+            if variants:
+                seed = random.randint(0, 2**31 - 1)
+                audio_bytes, variant_audio = await asyncio.gather(
+                    asyncio.to_thread(
+                        self.elevenlabs_service.text_to_speech,
+                        text=script, voice_id=voice_id, seed=seed,
+                    ),
+                    asyncio.gather(*(
+                        self._synthesize_variant(script, voice_id, audio_id, profile, seed)
+                        for profile in variants
+                    )),
+                )
+            else:
+                audio_bytes = await asyncio.to_thread(
+                    self.elevenlabs_service.text_to_speech, text=script, voice_id=voice_id
+                )
+                variant_audio = []
+            
+            # 2. Upload to Storage (returns storage path for production, URL for emulator),
+            # measuring duration from the MP3 frame headers and computing peaks meanwhile
+            filename = audio_filename(audio_id)
+            ms_per_peak = get_settings().audio_peaks_ms
+            storage_path_or_url, mp3_info, peaks_json = await asyncio.gather(
+                asyncio.to_thread(self.storage_service.upload_audio, audio_bytes, filename),
+                asyncio.to_thread(_measure_mp3, audio_bytes),
+                self._compute_peaks(audio_id, audio_bytes, ms_per_peak),
+            )
+
+            # Variants and the peaks sidecar are stored only once the master is,
+            # so a failed generation leaves no files without a master behind
+            peaks_ms, *variant_results = await asyncio.gather(
+                self._store_peaks(audio_id, peaks_json, ms_per_peak),
+                *(
+                    self._store_variant(audio_id, profile, variant_bytes)
+                    for profile, variant_bytes in zip(variants, variant_audio)
+                    if variant_bytes is not None
+                ),
+            )
+            stored_variants = {v.profile: v for v in variant_results if v is not None}
             
             # 3. Auto-generate name if not provided
             if not name:
@@ -244,12 +457,16 @@ class AudioService:
                 audio_url=storage_path_or_url,  # Store path for production, URL for emulator
                 knowledge_id=knowledge_id,
                 voice_id=voice_id,
-                duration_seconds=None,  # ElevenLabs simple API doesn't return duration
+                duration_seconds=mp3_info.duration_seconds if mp3_info else None,
+                bitrate_kbps=mp3_info.bitrate_kbps if mp3_info else None,
+                frame_count=mp3_info.frame_count if mp3_info else None,
                 script=script,
                 created_at=datetime.utcnow(),
                 doctor_id=doctor_id,
                 name=name,
-                description=description or ""
+                description=description or "",
+                variants=stored_variants,
+                peaks_ms=peaks_ms,
             )
             
             await self.data_service.save_audio_metadata(metadata)
@@ -262,23 +479,106 @@ class AudioService:
                 # It's a storage path like "audio/uuid.mp3", generate signed URL
                 playback_url = get_signed_url(storage_path_or_url)
 
-            return AudioMetadata(
-                audio_id=metadata.audio_id,
-                audio_url=playback_url,
-                knowledge_id=metadata.knowledge_id,
-                voice_id=metadata.voice_id,
-                duration_seconds=metadata.duration_seconds,
-                script=metadata.script,
-                created_at=metadata.created_at,
-                doctor_id=metadata.doctor_id,
-                name=metadata.name,
-                description=metadata.description
-            )
+            return metadata.model_copy(update={
+                "audio_url": playback_url,
+                "variants": _sign_variants(stored_variants),
+            })
             
         except Exception as e:
             logging.error(f"Error in audio generation workflow: {e}")
             raise e
 
+    async def _compute_peaks(
+        self, audio_id: str, audio_bytes: bytes, ms_per_peak: int
+    ) -> Optional[bytes]:
+        """Compute the peaks sidecar (0 ms disables it); failures are logged, not raised."""
+        if not ms_per_peak:
+            return None
+        try:
+            peaks_json = await compute_peaks_json(audio_bytes, ms_per_peak)
+        except Exception as e:
+            logging.warning(f"Skipping waveform peaks of audio {audio_id}: {e}")
+            return None
+        if peaks_json is None:
+            logging.warning(f"No MP3 frames to compute peaks of audio {audio_id}")
+        return peaks_json
+
+    async def _store_peaks(
+        self, audio_id: str, peaks_json: Optional[bytes], ms_per_peak: int
+    ) -> Optional[int]:
+        """Upload the peaks sidecar; failures are logged, not raised.
+
+        Returns:
+            Milliseconds per peak, or None if no sidecar was stored.
+        """
+        if peaks_json is None:
+            return None
+        try:
+            await asyncio.to_thread(
+                self.storage_service.upload_file,
+                peaks_json,
+                f"audio/{peaks_filename(audio_id)}",
+                "application/json",
+            )
+        except Exception as e:
+            logging.warning(f"Skipping waveform peaks of audio {audio_id}: {e}")
+            return None
+        return ms_per_peak
+
+    def get_audio_peaks_info(self, audio_id: str) -> Optional[StoredFileInfo]:
+        """Get size and ETag of the peaks sidecar of an audio file.
+
+        Returns:
+            StoredFileInfo, or None if no peaks were stored for the audio.
+        """
+        return self.storage_service.get_file_info(f"audio/{peaks_filename(audio_id)}")
+
+    def read_audio_peaks(self, audio_id: str, info: Optional[StoredFileInfo] = None) -> bytes:
+        """Read the peaks sidecar (a few KB of JSON) of an audio file."""
+        return b"".join(
+            self.storage_service.get_file_stream(f"audio/{peaks_filename(audio_id)}", info=info)
+        )
+
+    async def _synthesize_variant(
+        self, script: str, voice_id: str, audio_id: str, profile: str, seed: int
+    ) -> Optional[bytes]:
+        """Synthesize one variant; failures are logged, not raised.
+
+        A missing variant only means clients fall back to the master.
+        """
+        try:
+            return await asyncio.to_thread(
+                self.elevenlabs_service.text_to_speech,
+                text=script, voice_id=voice_id, output_format=AUDIO_PROFILES[profile], seed=seed,
+            )
+        except Exception as e:
+            logging.warning(f"Skipping '{profile}' variant of audio {audio_id}: {e}")
+            return None
+
+    async def _store_variant(
+        self, audio_id: str, profile: str, variant_bytes: bytes
+    ) -> Optional[AudioVariant]:
+        """Upload one synthesized variant; failures are logged, not raised."""
+        try:
+            storage_path_or_url, mp3_info = await asyncio.gather(
+                asyncio.to_thread(
+                    self.storage_service.upload_audio,
+                    variant_bytes,
+                    audio_filename(audio_id, profile),
+                ),
+                asyncio.to_thread(_measure_mp3, variant_bytes),
+            )
+        except Exception as e:
+            logging.warning(f"Skipping '{profile}' variant of audio {audio_id}: {e}")
+            return None
+        return AudioVariant(
+            profile=profile,
+            output_format=AUDIO_PROFILES[profile],
+            audio_url=storage_path_or_url,
+            bitrate_kbps=mp3_info.bitrate_kbps if mp3_info else None,
+            size_bytes=len(variant_bytes),
+        )
+
     async def get_audio_files(
         self, 
         knowledge_id: Optional[str] = None, 
@@ -304,21 +604,73 @@ class AudioService:
         signed_audio_files = []
         for audio in audio_files:
             signed_url = get_signed_url(audio.audio_url)
-            signed_audio_files.append(AudioMetadata(
-                audio_id=audio.audio_id,
-                audio_url=signed_url,
-                knowledge_id=audio.knowledge_id,
-                voice_id=audio.voice_id,
-                duration_seconds=audio.duration_seconds,
-                script=audio.script,
-                created_at=audio.created_at,
-                doctor_id=audio.doctor_id,
-                name=audio.name,
-                description=audio.description
-            ))
+            signed_audio_files.append(audio.model_copy(update={
+                "audio_url": signed_url,
+                "variants": _sign_variants(audio.variants),
+            }))
         
         return signed_audio_files
 
+    async def get_audio_manifest(
+        self,
+        knowledge_id: Optional[str] = None,
+        doctor_id: Optional[str] = None
+    ) -> AudioManifestResponse:
+        """Get the compact playback manifest of an audio collection.
+
+        Entries carry no script and no URL, so nothing is signed here; the
+        ETag is a hash of the entries and changes whenever one is added,
+        removed or renamed.
+
+        Args:
+            knowledge_id: Optional filter by knowledge document ID.
+            doctor_id: Optional filter by doctor ID.
+
+        Returns:
+            AudioManifestResponse with entries newest first.
+        """
+        items = await self.data_service.get_audio_manifest_items(
+            knowledge_id=knowledge_id, doctor_id=doctor_id
+        )
+        items.sort(key=lambda item: item.created_at, reverse=True)
+        canonical = json.dumps([item.model_dump(mode="json") for item in items], sort_keys=True)
+        version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+        return AudioManifestResponse(
+            etag=f'"audio-manifest-{version}"', items=items, total_count=len(items)
+        )
+
+    async def get_playback_urls(self, audio_ids: List[str]) -> Dict[str, str]:
+        """Sign playback URLs for the given audio files.
+
+        Args:
+            audio_ids: Audio IDs, typically the manifest entries on screen.
+
+        Returns:
+            Signed URL by audio ID; unknown IDs are omitted.
+        """
+        audio_files = await self.data_service.get_audio_files_by_ids(list(dict.fromkeys(audio_ids)))
+        urls = await asyncio.gather(
+            *(asyncio.to_thread(get_signed_url, a.audio_url) for a in audio_files.values())
+        )
+        return dict(zip(audio_files, urls))
+
+    async def get_audio_file(self, audio_id: str) -> Optional[AudioMetadata]:
+        """Get one audio file, with its script and signed URLs.
+
+        Args:
+            audio_id: ID of the audio file.
+
+        Returns:
+            AudioMetadata, or None if not found.
+        """
+        audio = await self.data_service.get_audio_file(audio_id)
+        if not audio:
+            return None
+        return audio.model_copy(update={
+            "audio_url": get_signed_url(audio.audio_url),
+            "variants": _sign_variants(audio.variants),
+        })
+
     async def delete_audio(self, audio_id: str) -> bool:
         """Delete an audio file.
         
@@ -334,26 +686,20 @@ class AudioService:
         
         try:
             # 1. Get audio metadata to find storage path
-            audio_files = await self.data_service.get_audio_files()
-            audio_to_delete = None
-            for audio in audio_files:
-                if audio.audio_id == audio_id:
-                    audio_to_delete = audio
-                    break
+            audio_to_delete = await self.data_service.get_audio_file(audio_id)
             
             if not audio_to_delete:
                 logging.warning(f"Audio {audio_id} not found in database")
                 return False
             
-            # 2. Delete from storage
-            filename = f"{audio_id}.mp3"
-            
-            try:
-                self.storage_service.delete_audio(filename)
-                logging.info(f"Deleted audio file from storage: {filename}")
-            except Exception as e:
-                logging.warning(f"Failed to delete audio file from storage: {e}")
-                # Continue with database deletion even if storage deletion fails
+            # 2. Delete from storage (master, variants and peaks)
+            for filename in stored_filenames(audio_to_delete):
+                try:
+                    self.storage_service.delete_audio(filename)
+                    logging.info(f"Deleted audio file from storage: {filename}")
+                except Exception as e:
+                    logging.warning(f"Failed to delete audio file from storage: {e}")
+                    # Continue with database deletion even if storage deletion fails
             
             # 3. Delete metadata from database
             success = await self.data_service.delete_audio_file(audio_id)
@@ -389,51 +735,61 @@ class AudioService:
         """
         logging.info(f"Updating audio metadata: {audio_id}")
         
-        # Get existing audio
-        audio_files = await self.data_service.get_audio_files()
-        audio_to_update = next((a for a in audio_files if a.audio_id == audio_id), None)
+        # Point read of the existing audio
+        audio_to_update = await self.data_service.get_audio_file(audio_id)
         
         if not audio_to_update:
             raise ValueError(f"Audio {audio_id} not found")
         
-        # Create updated metadata object
-        updated_metadata = AudioMetadata(
-            audio_id=audio_to_update.audio_id,
-            audio_url=audio_to_update.audio_url,
-            knowledge_id=audio_to_update.knowledge_id,
-            voice_id=audio_to_update.voice_id,
-            duration_seconds=audio_to_update.duration_seconds,
-            script=audio_to_update.script,
-            created_at=audio_to_update.created_at,
-            doctor_id=audio_to_update.doctor_id,
-            name=name if name is not None else audio_to_update.name,
-            description=description if description is not None else audio_to_update.description
-        )
+        # Write only the changed fields
+        fields = {}
+        if name is not None:
+            fields["name"] = name
+        if description is not None:
+            fields["description"] = description
+        if fields and not await self.data_service.update_audio_fields(audio_id, fields):
+            raise ValueError(f"Audio {audio_id} not found")
         
-        # Save to database
-        saved_metadata = await self.data_service.save_audio_metadata(updated_metadata)
+        saved_metadata = audio_to_update.model_copy(update=fields)
         logging.info(f"Updated audio metadata: {audio_id}")
         return saved_metadata
 
     def get_available_voices(self) -> List[VoiceOption]:
         """Get available voices.
+
+        Options are rebuilt only when the voice catalog snapshot changes;
+        voices_etag is set to the snapshot's ETag.
         
         Returns:
             List[VoiceOption]: List of available voices.
         """
-        voices_data = self.elevenlabs_service.get_voices()
-        return [
-            VoiceOption(
-                voice_id=v["voice_id"],
-                name=v["name"],
-                description=v.get("description"),
-                preview_url=v.get("preview_url")
-            )
-            for v in voices_data
-        ]
+        snapshot = self.elevenlabs_service.get_voice_catalog()
+        if snapshot is not self._voice_source:
+            self._voice_options = [
+                VoiceOption(
+                    voice_id=v["voice_id"],
+                    name=v["name"],
+                    description=v.get("description"),
+                    preview_url=v.get("preview_url")
+                )
+                for v in snapshot.voices
+            ]
+            self.voices_etag = snapshot.etag
+            self._voice_source = snapshot
+        return list(self._voice_options)
+
+
+# Default service instance, shared across requests
+_audio_service_instance: Optional[AudioService] = None
 
 
-# Default service instance
 def get_audio_service() -> AudioService:
-    """Get the audio service instance."""
-    return AudioService()
+    """Get the shared audio service instance.
+
+    The service holds no per-request state, so a single instance avoids
+    rebuilding its clients on every request resolved through Depends.
+    """
+    global _audio_service_instance
+    if _audio_service_instance is None:
+        _audio_service_instance = AudioService()
+    return _audio_service_instance
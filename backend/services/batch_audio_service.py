@@ -0,0 +1,367 @@
+"""Batch script and audio generation across many knowledge documents.
+
+A batch job takes a list of knowledge IDs plus the same options as the
+single-document flow (template config or prompt, model, voice) and runs
+script generation followed by text-to-speech for each document through a
+bounded worker pool. Provider calls are paced by the shared limiters in
+backend.utils.provider_limits.
+
+Job and item state is persisted after every transition, so progress can be
+polled and an interrupted job resumed: completed items are skipped and items
+whose script was already generated go straight to TTS.
+"""
+
+import asyncio
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
+
+from backend.config import get_settings
+from backend.models.schemas import (
+    AudioBatchItem,
+    AudioBatchJob,
+    AudioBatchRequest,
+    BatchItemStatus,
+    BatchJobStatus,
+)
+from backend.services.audio_service import AudioService, get_audio_service
+from backend.services.firestore_data_service import FIRESTORE_BATCH_LIMIT
+from backend.utils.provider_limits import ELEVENLABS, GEMINI, get_provider_limiter
+
+logger = logging.getLogger(__name__)
+
+# Firestore collection holding batch jobs (items live in an "items" subcollection)
+AUDIO_BATCH_JOBS = "audio_batch_jobs"
+BATCH_ITEMS = "items"
+
+
+class BatchJobActiveError(Exception):
+    """Raised when starting a job that is already running in this process."""
+
+    pass
+
+
+class BatchJobStore(ABC):
+    """Abstract persistence for batch jobs and their items."""
+
+    @abstractmethod
+    async def save_job(self, job: AudioBatchJob) -> None:
+        """Persist a job and all of its items."""
+        pass
+
+    @abstractmethod
+    async def save_job_status(self, job: AudioBatchJob) -> None:
+        """Persist the job header (status and timestamps) without items."""
+        pass
+
+    @abstractmethod
+    async def save_item(self, job_id: str, position: int, item: AudioBatchItem) -> None:
+        """Persist a single item of a job."""
+        pass
+
+    @abstractmethod
+    async def get_job(self, job_id: str) -> Optional[AudioBatchJob]:
+        """Load a job with its items, or None if unknown."""
+        pass
+
+
+class LocalBatchJobStore(BatchJobStore):
+    """In-memory store used with mock data."""
+
+    def __init__(self):
+        """Initialize with empty in-memory storage."""
+        self._jobs: Dict[str, AudioBatchJob] = {}
+
+    async def save_job(self, job: AudioBatchJob) -> None:
+        """Store a copy of the job in memory."""
+        self._jobs[job.job_id] = job.model_copy(deep=True)
+
+    async def save_job_status(self, job: AudioBatchJob) -> None:
+        """Update the stored job header."""
+        stored = self._jobs.get(job.job_id)
+        if stored is None:
+            await self.save_job(job)
+            return
+        stored.status = job.status
+        stored.error = job.error
+        stored.updated_at = job.updated_at
+
+    async def save_item(self, job_id: str, position: int, item: AudioBatchItem) -> None:
+        """Update one stored item."""
+        stored = self._jobs.get(job_id)
+        if stored is not None:
+            stored.items[position] = item.model_copy()
+
+    async def get_job(self, job_id: str) -> Optional[AudioBatchJob]:
+        """Get a copy of the stored job."""
+        job = self._jobs.get(job_id)
+        return job.model_copy(deep=True) if job else None
+
+
+class FirestoreBatchJobStore(BatchJobStore):
+    """Firestore-backed store; items are documents in a subcollection.
+
+    Keeping items in a subcollection keeps each write small and the job
+    document well under Firestore's size limit even with scripts stored.
+    """
+
+    def __init__(self, db=None):
+        """Initialize with an optional Firestore client (for testing)."""
+        if db is None:
+            from backend.services.firestore_service import get_firestore_service
+            db = get_firestore_service().db
+        self._db = db
+
+    def _job_ref(self, job_id: str):
+        return self._db.collection(AUDIO_BATCH_JOBS).document(job_id)
+
+    def _job_header(self, job: AudioBatchJob) -> dict:
+        return job.model_dump(mode="json", exclude={"items"}) | {"item_count": len(job.items)}
+
+    async def save_job(self, job: AudioBatchJob) -> None:
+        """Write the job header and every item in batches of up to FIRESTORE_BATCH_LIMIT."""
+        job_ref = self._job_ref(job.job_id)
+        writes = [(job_ref, self._job_header(job))] + [
+            (
+                job_ref.collection(BATCH_ITEMS).document(f"{position:05d}"),
+                item.model_dump(mode="json") | {"position": position},
+            )
+            for position, item in enumerate(job.items)
+        ]
+        for offset in range(0, len(writes), FIRESTORE_BATCH_LIMIT):
+            batch = self._db.batch()
+            for ref, data in writes[offset:offset + FIRESTORE_BATCH_LIMIT]:
+                batch.set(ref, data)
+            batch.commit()
+
+    async def save_job_status(self, job: AudioBatchJob) -> None:
+        """Update the job header."""
+        self._job_ref(job.job_id).set(self._job_header(job), merge=True)
+
+    async def save_item(self, job_id: str, position: int, item: AudioBatchItem) -> None:
+        """Write one item document."""
+        try:
+            self._job_ref(job_id).collection(BATCH_ITEMS).document(f"{position:05d}").set(
+                item.model_dump(mode="json") | {"position": position}
+            )
+        except Exception as e:
+            # Progress writes must not abort the job; the next transition retries
+            logger.warning(f"Failed to persist batch item {job_id}/{position}: {e}")
+
+    async def get_job(self, job_id: str) -> Optional[AudioBatchJob]:
+        """Read a job header and its items ordered by position."""
+        job_ref = self._job_ref(job_id)
+        doc = job_ref.get()
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        data.pop("item_count", None)
+        item_docs = job_ref.collection(BATCH_ITEMS).order_by("position").stream()
+        items = []
+        for item_doc in item_docs:
+            item_data = item_doc.to_dict()
+            item_data.pop("position", None)
+            items.append(AudioBatchItem(**item_data))
+        return AudioBatchJob(**data, items=items)
+
+
+class BatchAudioService:
+    """Creates, runs and resumes batch audio jobs."""
+
+    def __init__(
+        self,
+        audio_service: Optional[AudioService] = None,
+        store: Optional[BatchJobStore] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize the batch service.
+
+        Args:
+            audio_service: Optional injected audio service for testing.
+            store: Optional injected job store.
+            max_workers: Concurrent documents per job (defaults to BATCH_MAX_WORKERS).
+        """
+        self.audio_service = audio_service or get_audio_service()
+        self.store = store or _default_store()
+        self.max_workers = max_workers or get_settings().batch_max_workers
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Pending FAILED-status writes, referenced until they finish
+        self._failure_writes: Set[asyncio.Task] = set()
+
+    async def create_job(self, request: AudioBatchRequest) -> AudioBatchJob:
+        """Create and persist a new pending job."""
+        now = datetime.now(timezone.utc)
+        job = AudioBatchJob(
+            job_id=str(uuid.uuid4()),
+            voice_id=request.voice_id,
+            model_name=request.model_name,
+            custom_prompt=request.custom_prompt,
+            template_config=request.template_config,
+            doctor_id=request.doctor_id,
+            items=[AudioBatchItem(knowledge_id=kid, updated_at=now) for kid in request.knowledge_ids],
+            created_at=now,
+            updated_at=now,
+        )
+        await self.store.save_job(job)
+        logger.info(f"Created batch job {job.job_id} with {len(job.items)} documents")
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[AudioBatchJob]:
+        """Get a job with its current progress."""
+        return await self.store.get_job(job_id)
+
+    def is_active(self, job_id: str) -> bool:
+        """Check whether a job is being processed by this process."""
+        task = self._tasks.get(job_id)
+        return task is not None and not task.done()
+
+    async def start_job(self, job_id: str) -> AudioBatchJob:
+        """Start (or resume) processing a job in the background.
+
+        Raises:
+            ValueError: If the job does not exist.
+            BatchJobActiveError: If the job is already running here.
+        """
+        if self.is_active(job_id):
+            raise BatchJobActiveError(f"Batch job {job_id} is already running")
+        job = await self.store.get_job(job_id)
+        if job is None:
+            raise ValueError(f"Batch job {job_id} not found")
+
+        task = asyncio.create_task(self.run_job(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda t: self._on_job_done(job_id, t))
+        return job
+
+    def _on_job_done(self, job_id: str, task: asyncio.Task) -> None:
+        """Forget a finished job task; a job that raised is logged and marked FAILED."""
+        self._tasks.pop(job_id, None)
+        if task.cancelled() or task.exception() is None:
+            return
+        error = task.exception()
+        logger.error(f"Batch job {job_id} aborted: {error}", exc_info=error)
+        write = asyncio.create_task(self._mark_job_failed(job_id, error))
+        self._failure_writes.add(write)
+        write.add_done_callback(self._failure_writes.discard)
+
+    async def _mark_job_failed(self, job_id: str, error: BaseException) -> None:
+        try:
+            job = await self.store.get_job(job_id)
+            if job is None:
+                return
+            job.status = BatchJobStatus.FAILED
+            job.error = str(error) or type(error).__name__
+            job.updated_at = datetime.now(timezone.utc)
+            await self.store.save_job_status(job)
+        except Exception as e:
+            logger.error(f"Failed to mark batch job {job_id} as failed: {e}")
+
+    async def run_job(self, job_id: str) -> AudioBatchJob:
+        """Process every unfinished item of a job and return the final job.
+
+        Items interrupted mid-flight (e.g. by a restart) are reset so they are
+        retried; failed items are retried on resume as well.
+        """
+        job = await self.store.get_job(job_id)
+        if job is None:
+            raise ValueError(f"Batch job {job_id} not found")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for position, item in enumerate(job.items):
+            if item.status == BatchItemStatus.COMPLETED:
+                continue
+            item.status = BatchItemStatus.SCRIPT_READY if item.script else BatchItemStatus.PENDING
+            queue.put_nowait(position)
+
+        job.status = BatchJobStatus.RUNNING
+        job.error = None
+        job.updated_at = datetime.now(timezone.utc)
+        await self.store.save_job_status(job)
+        logger.info(f"Running batch job {job_id}: {queue.qsize()} of {len(job.items)} documents to process")
+
+        async def worker() -> None:
+            while True:
+                try:
+                    position = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self._process_item(job, position)
+
+        workers = min(self.max_workers, queue.qsize()) or 1
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+        job.status = (
+            BatchJobStatus.COMPLETED_WITH_ERRORS if job.failed_count else BatchJobStatus.COMPLETED
+        )
+        job.updated_at = datetime.now(timezone.utc)
+        await self.store.save_job_status(job)
+        logger.info(
+            f"Batch job {job_id} finished: {job.completed_count} completed, {job.failed_count} failed"
+        )
+        return job
+
+    async def _set_item_status(
+        self, job: AudioBatchJob, position: int, status: BatchItemStatus
+    ) -> AudioBatchItem:
+        item = job.items[position]
+        item.status = status
+        item.updated_at = datetime.now(timezone.utc)
+        await self.store.save_item(job.job_id, position, item)
+        return item
+
+    async def _process_item(self, job: AudioBatchJob, position: int) -> None:
+        """Generate the script (unless already done) and audio for one document."""
+        item = job.items[position]
+        try:
+            if not item.script:
+                await self._set_item_status(job, position, BatchItemStatus.GENERATING_SCRIPT)
+                async with get_provider_limiter(GEMINI):
+                    result = await self.audio_service.generate_script(
+                        knowledge_id=item.knowledge_id,
+                        model_name=job.model_name,
+                        custom_prompt=job.custom_prompt,
+                        template_config=job.template_config,
+                    )
+                # Legacy fallback scripts are not worth voicing in bulk
+                if result.get("generation_error"):
+                    raise RuntimeError(f"Script generation failed: {result['generation_error']}")
+                item.script = result["script"]
+                await self._set_item_status(job, position, BatchItemStatus.SCRIPT_READY)
+
+            await self._set_item_status(job, position, BatchItemStatus.GENERATING_AUDIO)
+            async with get_provider_limiter(ELEVENLABS):
+                metadata = await self.audio_service.generate_audio(
+                    script=item.script,
+                    voice_id=job.voice_id,
+                    knowledge_id=item.knowledge_id,
+                    doctor_id=job.doctor_id,
+                )
+            item.audio_id = metadata.audio_id
+            item.error = None
+            await self._set_item_status(job, position, BatchItemStatus.COMPLETED)
+        except Exception as e:
+            logger.error(f"Batch job {job.job_id}: {item.knowledge_id} failed: {e}")
+            item.error = str(e) or type(e).__name__
+            item.attempts += 1
+            await self._set_item_status(job, position, BatchItemStatus.FAILED)
+
+
+def _default_store() -> BatchJobStore:
+    """Use Firestore unless running on mock data."""
+    if get_settings().use_mock_data:
+        return LocalBatchJobStore()
+    return FirestoreBatchJobStore()
+
+
+# Singleton instance
+_batch_service_instance: Optional[BatchAudioService] = None
+
+
+def get_batch_audio_service() -> BatchAudioService:
+    """Get the shared batch audio service (tracks running jobs in-process)."""
+    global _batch_service_instance
+    if _batch_service_instance is None:
+        _batch_service_instance = BatchAudioService()
+    return _batch_service_instance
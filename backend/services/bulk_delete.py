@@ -0,0 +1,227 @@
+"""Bulk deletion of audio files, knowledge documents and agents.
+
+Each bulk delete reads all requested records in one batched get (needed to
+find storage paths and ElevenLabs IDs), cleans up external resources, then
+removes the records in batched writes without per-item existence checks:
+
+- audio: master, variant and peaks files are deleted with GCS batch requests,
+- knowledge documents and agents: ElevenLabs deletes run with bounded
+  concurrency (BULK_DELETE_CONCURRENCY).
+
+As with the single-item deletes, a failed external cleanup is logged and
+reported on the item but does not keep its record from being deleted.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from backend.config import get_settings
+from backend.models.schemas import (
+    BulkDeleteItemResult,
+    BulkDeleteResponse,
+    BulkDeleteStatus,
+)
+from backend.services.audio_service import stored_filenames
+from backend.services.data_service import DataServiceInterface
+from backend.services.elevenlabs_service import ElevenLabsService
+from backend.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_bounded(
+    calls: Iterable[Callable[[], Awaitable[None]]], concurrency: int
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(call: Callable[[], Awaitable[None]]) -> None:
+        async with semaphore:
+            await call()
+
+    await asyncio.gather(*(run(call) for call in calls))
+
+
+async def _finish(
+    kind: str,
+    ids: List[str],
+    found: Iterable[str],
+    warnings: Dict[str, str],
+    delete_records: Callable[[List[str]], Awaitable[None]],
+    start: float,
+) -> BulkDeleteResponse:
+    """Delete the found records and build the per-item response."""
+    found = set(found)
+    found_ids = [i for i in ids if i in found]
+    error: Optional[str] = None
+    if found_ids:
+        try:
+            await delete_records(found_ids)
+        except Exception as e:
+            logger.error(f"Bulk delete of {len(found_ids)} {kind} records failed: {e}")
+            error = str(e)
+
+    report = BulkDeleteResponse()
+    for item_id in ids:
+        if item_id not in found:
+            result = BulkDeleteItemResult(id=item_id, status=BulkDeleteStatus.NOT_FOUND)
+            report.not_found_count += 1
+        elif error is not None:
+            result = BulkDeleteItemResult(id=item_id, status=BulkDeleteStatus.FAILED, detail=error)
+            report.failed_count += 1
+        else:
+            result = BulkDeleteItemResult(
+                id=item_id, status=BulkDeleteStatus.DELETED, detail=warnings.get(item_id)
+            )
+            report.deleted_count += 1
+        report.results.append(result)
+    report.elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+    logger.info(
+        f"Bulk {kind} delete: {report.deleted_count}/{len(ids)} deleted, "
+        f"{report.not_found_count} not found, {report.failed_count} failed in {report.elapsed_ms} ms"
+    )
+    return report
+
+
+async def delete_audio_files(
+    data_service: DataServiceInterface,
+    storage_service: StorageService,
+    audio_ids: List[str],
+) -> BulkDeleteResponse:
+    """Delete audio records and their master, variant and peaks files.
+
+    Args:
+        data_service: Source of audio records.
+        storage_service: Storage holding the MP3 files.
+        audio_ids: Audio IDs to delete.
+
+    Returns:
+        BulkDeleteResponse with one result per ID, in request order.
+    """
+    start = time.perf_counter()
+    ids = list(dict.fromkeys(audio_ids))
+    audio_files = await data_service.get_audio_files_by_ids(ids)
+
+    paths_by_id = {
+        audio_id: [f"audio/{filename}" for filename in stored_filenames(audio)]
+        for audio_id, audio in audio_files.items()
+    }
+    deleted = await asyncio.to_thread(
+        storage_service.delete_files, [p for paths in paths_by_id.values() for p in paths]
+    )
+    warnings = {}
+    for audio_id, paths in paths_by_id.items():
+        kept = [p for p in paths if not deleted.get(p)]
+        if kept:
+            warnings[audio_id] = f"Storage files not deleted: {', '.join(kept)}"
+
+    return await _finish(
+        "audio", ids, audio_files, warnings, data_service.delete_audio_files, start
+    )
+
+
+async def delete_knowledge_documents(
+    data_service: DataServiceInterface,
+    elevenlabs_service: ElevenLabsService,
+    knowledge_ids: List[str],
+    concurrency: Optional[int] = None,
+) -> BulkDeleteResponse:
+    """Delete knowledge documents and their ElevenLabs documents.
+
+    An ElevenLabs document still used by a knowledge document outside the
+    request (content-hash reuse) is kept.
+
+    Args:
+        data_service: Source of knowledge documents.
+        elevenlabs_service: ElevenLabs client.
+        knowledge_ids: Knowledge document IDs to delete.
+        concurrency: ElevenLabs deletes at once (defaults to settings).
+
+    Returns:
+        BulkDeleteResponse with one result per ID, in request order.
+    """
+    start = time.perf_counter()
+    concurrency = concurrency or get_settings().bulk_delete_concurrency
+    ids = list(dict.fromkeys(knowledge_ids))
+    docs = await data_service.get_knowledge_documents_by_ids(ids)
+
+    # Group the requested documents by the ElevenLabs document they use
+    owners: Dict[str, List[str]] = {}
+    for doc in docs.values():
+        if doc.elevenlabs_document_id:
+            owners.setdefault(doc.elevenlabs_document_id, []).append(doc.knowledge_id)
+
+    # ElevenLabs documents are only shared through content-hash reuse
+    hashes = {
+        d.elevenlabs_content_hash for d in docs.values()
+        if d.elevenlabs_document_id and d.elevenlabs_content_hash
+    }
+    sharers = await asyncio.gather(
+        *(data_service.get_knowledge_documents_by_elevenlabs_hash(h) for h in hashes)
+    )
+    kept = {
+        other.elevenlabs_document_id
+        for group in sharers for other in group
+        if other.knowledge_id not in docs and other.elevenlabs_document_id in owners
+    }
+
+    warnings: Dict[str, str] = {}
+
+    def delete_remote(elevenlabs_id: str) -> Callable[[], Awaitable[None]]:
+        async def call() -> None:
+            try:
+                await asyncio.to_thread(elevenlabs_service.delete_document, elevenlabs_id)
+            except Exception as e:
+                logger.warning(f"Failed to delete document {elevenlabs_id} from ElevenLabs: {e}")
+                for knowledge_id in owners[elevenlabs_id]:
+                    warnings[knowledge_id] = f"ElevenLabs delete failed: {e}"
+        return call
+
+    await _run_bounded(
+        (delete_remote(el_id) for el_id in owners if el_id not in kept), concurrency
+    )
+
+    return await _finish(
+        "knowledge", ids, docs, warnings, data_service.delete_knowledge_documents, start
+    )
+
+
+async def delete_agents(
+    data_service: DataServiceInterface,
+    elevenlabs_service: ElevenLabsService,
+    agent_ids: List[str],
+    concurrency: Optional[int] = None,
+) -> BulkDeleteResponse:
+    """Delete agents locally and in ElevenLabs.
+
+    Args:
+        data_service: Source of agents.
+        elevenlabs_service: ElevenLabs client.
+        agent_ids: Agent IDs to delete.
+        concurrency: ElevenLabs deletes at once (defaults to settings).
+
+    Returns:
+        BulkDeleteResponse with one result per ID, in request order.
+    """
+    start = time.perf_counter()
+    concurrency = concurrency or get_settings().bulk_delete_concurrency
+    ids = list(dict.fromkeys(agent_ids))
+    agents = await data_service.get_agents_by_ids(ids)
+    warnings: Dict[str, str] = {}
+
+    def delete_remote(agent_id: str, elevenlabs_id: str) -> Callable[[], Awaitable[None]]:
+        async def call() -> None:
+            try:
+                await asyncio.to_thread(elevenlabs_service.delete_agent, elevenlabs_id)
+            except Exception as e:
+                logger.warning(f"Failed to delete agent {elevenlabs_id} from ElevenLabs: {e}")
+                warnings[agent_id] = f"ElevenLabs delete failed: {e}"
+        return call
+
+    await _run_bounded(
+        (delete_remote(a.agent_id, a.elevenlabs_agent_id) for a in agents.values()),
+        concurrency,
+    )
+
+    return await _finish("agent", ids, agents, warnings, data_service.delete_agents, start)
@@ -6,9 +6,8 @@ with a Firestore client for production use.
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set
 import uuid
-import re
 
 from backend.config import get_settings
 from backend.models.schemas import (
@@ -21,6 +20,7 @@ from backend.models.schemas import (
     ConversationSummarySchema,
     ConversationDetailSchema,
     ConversationMessageSchema,
+    AudioManifestItem,
     AudioMetadata,
     AgentResponse,
     AnswerStyle,
@@ -28,11 +28,35 @@ from backend.models.schemas import (
     CustomTemplateUpdate,
     CustomTemplateResponse,
 )
+from backend.services.knowledge_search import KnowledgeSearchIndex, get_knowledge_search_index
+from backend.utils.content_hash import content_hash
+from backend.utils.section_parser import parse_sections
+from backend.utils.text_extraction import ExtractedText, extract_text
+
+
+def check_audio_fields(fields: Dict[str, Any]) -> None:
+    """Reject field updates that are not AudioMetadata fields.
+
+    Raises:
+        ValueError: If a field name is unknown or is the audio_id key.
+    """
+    invalid = set(fields) - (set(AudioMetadata.model_fields) - {"audio_id"})
+    if invalid:
+        raise ValueError(f"Cannot update audio fields: {sorted(invalid)}")
 
 
 class DataServiceInterface(ABC):
     """Abstract interface for data service implementations."""
 
+    # Kept in sync by implementations on knowledge create/update/delete
+    search_index: Optional[KnowledgeSearchIndex] = None
+
+    def get_search_index(self) -> KnowledgeSearchIndex:
+        """Search index updated by knowledge writes (the shared one by default)."""
+        if self.search_index is None:
+            self.search_index = get_knowledge_search_index()
+        return self.search_index
+
     # ==================== Dashboard ====================
     @abstractmethod
     async def get_dashboard_stats(self) -> DashboardStatsResponse:
@@ -42,9 +66,14 @@ class DataServiceInterface(ABC):
     # ==================== Knowledge Documents ====================
     @abstractmethod
     async def create_knowledge_document(
-        self, doc: KnowledgeDocumentCreate
+        self, doc: KnowledgeDocumentCreate, extracted: Optional[ExtractedText] = None
     ) -> KnowledgeDocumentResponse:
-        """Create a new knowledge document."""
+        """Create a new knowledge document.
+
+        extracted, when given, holds the sections, section index and content
+        hash already computed while streaming an upload, so they are not
+        recomputed from raw_content.
+        """
         pass
 
     @abstractmethod
@@ -74,9 +103,21 @@ class DataServiceInterface(ABC):
         knowledge_id: str, 
         status: SyncStatus, 
         elevenlabs_id: Optional[str] = None,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        content_hash: Optional[str] = None,
     ) -> bool:
-        """Update the sync status of a knowledge document."""
+        """Update the sync status of a knowledge document.
+
+        content_hash, when given, records the hash of the content now held by
+        the ElevenLabs document (elevenlabs_content_hash).
+        """
+        pass
+
+    @abstractmethod
+    async def get_knowledge_documents_by_elevenlabs_hash(
+        self, content_hash: str
+    ) -> List[KnowledgeDocumentResponse]:
+        """Get documents whose ElevenLabs document holds content with this hash."""
         pass
 
     @abstractmethod
@@ -84,6 +125,27 @@ class DataServiceInterface(ABC):
         """Delete a knowledge document."""
         pass
 
+    @abstractmethod
+    async def get_knowledge_source_paths(self) -> Set[str]:
+        """Get the storage paths of all uploaded knowledge source files."""
+        pass
+
+    @abstractmethod
+    async def get_knowledge_documents_by_ids(
+        self, knowledge_ids: List[str]
+    ) -> Dict[str, KnowledgeDocumentResponse]:
+        """Get several knowledge documents in one read; missing IDs are omitted."""
+        pass
+
+    @abstractmethod
+    async def delete_knowledge_documents(self, knowledge_ids: List[str]) -> None:
+        """Delete several knowledge documents in batched writes.
+
+        IDs are not checked for existence; deleting a missing document is a
+        no-op. Raises if a write fails.
+        """
+        pass
+
     # ==================== Audio Files ====================
     @abstractmethod
     async def save_audio_metadata(self, audio: AudioMetadata) -> AudioMetadata:
@@ -102,11 +164,57 @@ class DataServiceInterface(ABC):
         """Get a specific audio file by ID."""
         pass
 
+    @abstractmethod
+    async def update_audio_fields(self, audio_id: str, fields: Dict[str, Any]) -> bool:
+        """Update only the given fields of an audio file's metadata.
+
+        Args:
+            audio_id: ID of the audio file.
+            fields: Field names and new values (AudioMetadata fields only).
+
+        Returns:
+            True if updated, False if the audio file does not exist.
+
+        Raises:
+            ValueError: If a field is not an AudioMetadata field.
+        """
+        pass
+
     @abstractmethod
     async def delete_audio_file(self, audio_id: str) -> bool:
         """Delete an audio file metadata."""
         pass
 
+    @abstractmethod
+    async def get_audio_manifest_items(
+        self, knowledge_id: Optional[str] = None, doctor_id: Optional[str] = None
+    ) -> List[AudioManifestItem]:
+        """Get compact audio entries (no scripts), filtered like get_audio_files."""
+        pass
+
+    @abstractmethod
+    async def get_audio_file_ids(self) -> Set[str]:
+        """Get the IDs of all audio files (without loading their metadata)."""
+        pass
+
+    @abstractmethod
+    async def get_audio_ids_without_duration(self) -> Set[str]:
+        """Get the IDs of audio files with no measured duration (without loading scripts)."""
+        pass
+
+    @abstractmethod
+    async def get_audio_files_by_ids(self, audio_ids: List[str]) -> Dict[str, AudioMetadata]:
+        """Get several audio files in one read; missing IDs are omitted."""
+        pass
+
+    @abstractmethod
+    async def delete_audio_files(self, audio_ids: List[str]) -> None:
+        """Delete several audio file metadata records in batched writes.
+
+        IDs are not checked for existence. Raises if a write fails.
+        """
+        pass
+
     # ==================== Agents ====================
     @abstractmethod
     async def save_agent(self, agent: AgentResponse) -> AgentResponse:
@@ -125,11 +233,29 @@ class DataServiceInterface(ABC):
         """Get a specific agent by ID."""
         pass
 
+    @abstractmethod
+    async def get_agents_by_knowledge_id(self, knowledge_id: str) -> List[AgentResponse]:
+        """Get the agents linked to a knowledge document."""
+        pass
+
     @abstractmethod
     async def delete_agent(self, agent_id: str) -> bool:
         """Delete an agent."""
         pass
 
+    @abstractmethod
+    async def get_agents_by_ids(self, agent_ids: List[str]) -> Dict[str, AgentResponse]:
+        """Get several agents in one read; missing IDs are omitted."""
+        pass
+
+    @abstractmethod
+    async def delete_agents(self, agent_ids: List[str]) -> None:
+        """Delete several agents in batched writes.
+
+        IDs are not checked for existence. Raises if a write fails.
+        """
+        pass
+
     # ==================== Patient Sessions ====================
     @abstractmethod
     async def create_patient_session(
@@ -249,47 +375,10 @@ class MockDataService(DataServiceInterface):
         self._session_messages: dict[str, List[ConversationMessageSchema]] = {}
         self._audio_files: dict[str, AudioMetadata] = {}
         self._agents: dict[str, AgentResponse] = {}
+        # Reverse index: knowledge_id -> IDs of agents linking it
+        self._agent_ids_by_knowledge: dict[str, set[str]] = {}
         self._custom_templates: dict[str, CustomTemplateResponse] = {}
 
-    def _parse_structured_sections(self, content: str) -> dict:
-        """Parse markdown content into structured sections based on headers.
-        
-        Args:
-            content: Raw markdown content.
-            
-        Returns:
-            Dict mapping headers to section content.
-        """
-        sections = {}
-        matches = list(re.finditer(r'(^|\n)(?P<level>\s*#{1,6})\s(?P<title>.*)', content))
-        if not matches:
-             if content.strip():
-                 sections["content"] = content
-             return sections
-
-        for i, match in enumerate(matches):
-            current_start = match.start()
-            
-            # If this is the first match, capture intro text before it
-            if i == 0:
-                intro = content[0:current_start].strip()
-                if intro:
-                    sections["Introduction"] = intro
-
-            header_title = match.group("title").strip()
-            match_end = match.end()
-            
-            if i + 1 < len(matches):
-                next_start = matches[i+1].start()
-                section_content = content[match_end:next_start].strip()
-            else:
-                section_content = content[match_end:].strip()
-            
-            if section_content:
-                sections[header_title] = section_content
-        
-        return sections
-
     async def get_dashboard_stats(self) -> DashboardStatsResponse:
         """Get mock dashboard statistics."""
         return DashboardStatsResponse(
@@ -301,13 +390,14 @@ class MockDataService(DataServiceInterface):
         )
 
     async def create_knowledge_document(
-        self, doc: KnowledgeDocumentCreate
+        self, doc: KnowledgeDocumentCreate, extracted: Optional[ExtractedText] = None
     ) -> KnowledgeDocumentResponse:
         """Create a new knowledge document in memory."""
         knowledge_id = str(uuid.uuid4())
         now = datetime.now()
         
-        structured = self._parse_structured_sections(doc.raw_content)
+        if extracted is None:
+            extracted = extract_text(doc.raw_content)
         
         new_doc = KnowledgeDocumentResponse(
             knowledge_id=knowledge_id,
@@ -317,11 +407,15 @@ class MockDataService(DataServiceInterface):
             raw_content=doc.raw_content,
             sync_status=SyncStatus.PENDING,
             elevenlabs_document_id=None,
-            structured_sections=structured,
+            content_hash=extracted.content_hash,
+            structured_sections=extracted.structured_sections,
+            section_index=extracted.section_index,
+            source_path=extracted.source_path,
             created_at=now,
         )
         
         self._documents[knowledge_id] = new_doc
+        self.get_search_index().index_document(new_doc)
         return new_doc
 
     async def update_knowledge_document(
@@ -337,12 +431,19 @@ class MockDataService(DataServiceInterface):
         updated_fields = update_data.model_dump(exclude_unset=True)
         if not updated_fields:
             return doc
+        if "raw_content" in updated_fields:
+            updated_fields["content_hash"] = content_hash(updated_fields["raw_content"])
+            sections, section_index = parse_sections(updated_fields["raw_content"])
+            updated_fields["structured_sections"] = sections
+            updated_fields["section_index"] = section_index
             
         # Create new instance with updated values
         updated_doc = doc.model_copy(update=updated_fields)
         updated_doc.modified_at = datetime.now()
         
         self._documents[knowledge_id] = updated_doc
+        if "raw_content" in updated_fields or "disease_name" in updated_fields:
+            self.get_search_index().index_document(updated_doc)
         return updated_doc
 
     async def get_knowledge_documents(
@@ -361,7 +462,8 @@ class MockDataService(DataServiceInterface):
         return self._documents.get(knowledge_id)
 
     async def update_knowledge_sync_status(
-        self, knowledge_id: str, status: SyncStatus, elevenlabs_id: Optional[str] = None, error_message: Optional[str] = None
+        self, knowledge_id: str, status: SyncStatus, elevenlabs_id: Optional[str] = None, error_message: Optional[str] = None,
+        content_hash: Optional[str] = None,
     ) -> bool:
         """Update the sync status of a knowledge document."""
         if knowledge_id not in self._documents:
@@ -393,7 +495,10 @@ class MockDataService(DataServiceInterface):
             raw_content=doc.raw_content,
             sync_status=status,
             elevenlabs_document_id=elevenlabs_id if elevenlabs_id is not None else doc.elevenlabs_document_id,
+            content_hash=doc.content_hash,
+            elevenlabs_content_hash=content_hash if content_hash is not None else doc.elevenlabs_content_hash,
             structured_sections=doc.structured_sections,
+            section_index=doc.section_index,
             sync_error_message=new_error_message,
             last_sync_attempt=datetime.now(),
             sync_retry_count=new_retry_count,
@@ -403,13 +508,38 @@ class MockDataService(DataServiceInterface):
         self._documents[knowledge_id] = updated_doc
         return True
 
+    async def get_knowledge_documents_by_elevenlabs_hash(
+        self, content_hash: str
+    ) -> List[KnowledgeDocumentResponse]:
+        """Get documents whose ElevenLabs document holds content with this hash."""
+        return [
+            d for d in self._documents.values()
+            if d.elevenlabs_content_hash == content_hash and d.elevenlabs_document_id
+        ]
+
     async def delete_knowledge_document(self, knowledge_id: str) -> bool:
         """Delete a knowledge document from memory."""
         if knowledge_id in self._documents:
             del self._documents[knowledge_id]
+            self.get_search_index().remove_document(knowledge_id)
             return True
         return False
 
+    async def get_knowledge_source_paths(self) -> Set[str]:
+        """Get the storage paths of all uploaded knowledge source files."""
+        return {d.source_path for d in self._documents.values() if d.source_path}
+
+    async def get_knowledge_documents_by_ids(
+        self, knowledge_ids: List[str]
+    ) -> Dict[str, KnowledgeDocumentResponse]:
+        """Get several knowledge documents; missing IDs are omitted."""
+        return {k: self._documents[k] for k in knowledge_ids if k in self._documents}
+
+    async def delete_knowledge_documents(self, knowledge_ids: List[str]) -> None:
+        """Delete several knowledge documents from memory."""
+        for knowledge_id in knowledge_ids:
+            await self.delete_knowledge_document(knowledge_id)
+
     # ==================== Audio Files Implementation ====================
     async def save_audio_metadata(self, audio: AudioMetadata) -> AudioMetadata:
         """Save audio file metadata."""
@@ -431,6 +561,14 @@ class MockDataService(DataServiceInterface):
         """Get a specific audio file by ID."""
         return self._audio_files.get(audio_id)
 
+    async def update_audio_fields(self, audio_id: str, fields: Dict[str, Any]) -> bool:
+        """Update only the given fields of an audio file's metadata."""
+        check_audio_fields(fields)
+        if audio_id not in self._audio_files:
+            return False
+        self._audio_files[audio_id] = self._audio_files[audio_id].model_copy(update=fields)
+        return True
+
     async def delete_audio_file(self, audio_id: str) -> bool:
         """Delete an audio file metadata."""
         if audio_id in self._audio_files:
@@ -438,10 +576,51 @@ class MockDataService(DataServiceInterface):
             return True
         return False
 
+    async def get_audio_manifest_items(
+        self, knowledge_id: Optional[str] = None, doctor_id: Optional[str] = None
+    ) -> List[AudioManifestItem]:
+        """Get compact audio entries, filtered like get_audio_files."""
+        fields = set(AudioManifestItem.model_fields)
+        return [
+            AudioManifestItem(**a.model_dump(include=fields))
+            for a in await self.get_audio_files(knowledge_id=knowledge_id, doctor_id=doctor_id)
+        ]
+
+    async def get_audio_file_ids(self) -> Set[str]:
+        """Get the IDs of all audio files."""
+        return set(self._audio_files)
+
+    async def get_audio_ids_without_duration(self) -> Set[str]:
+        """Get the IDs of audio files with no measured duration."""
+        return {a for a, audio in self._audio_files.items() if audio.duration_seconds is None}
+
+    async def get_audio_files_by_ids(self, audio_ids: List[str]) -> Dict[str, AudioMetadata]:
+        """Get several audio files; missing IDs are omitted."""
+        return {a: self._audio_files[a] for a in audio_ids if a in self._audio_files}
+
+    async def delete_audio_files(self, audio_ids: List[str]) -> None:
+        """Delete several audio file metadata records."""
+        for audio_id in audio_ids:
+            self._audio_files.pop(audio_id, None)
+
     # ==================== Agents Implementation ====================
+    def _unindex_agent(self, agent_id: str) -> None:
+        previous = self._agents.get(agent_id)
+        if previous is None:
+            return
+        for knowledge_id in previous.knowledge_ids:
+            linked = self._agent_ids_by_knowledge.get(knowledge_id)
+            if linked is not None:
+                linked.discard(agent_id)
+                if not linked:
+                    del self._agent_ids_by_knowledge[knowledge_id]
+
     async def save_agent(self, agent: AgentResponse) -> AgentResponse:
         """Save an agent."""
+        self._unindex_agent(agent.agent_id)
         self._agents[agent.agent_id] = agent
+        for knowledge_id in agent.knowledge_ids:
+            self._agent_ids_by_knowledge.setdefault(knowledge_id, set()).add(agent.agent_id)
         return agent
 
     async def get_agents(
@@ -457,13 +636,30 @@ class MockDataService(DataServiceInterface):
         """Get a specific agent by ID."""
         return self._agents.get(agent_id)
 
+    async def get_agents_by_knowledge_id(self, knowledge_id: str) -> List[AgentResponse]:
+        """Get the agents linked to a knowledge document via the reverse index."""
+        return [
+            self._agents[agent_id]
+            for agent_id in self._agent_ids_by_knowledge.get(knowledge_id, ())
+        ]
+
     async def delete_agent(self, agent_id: str) -> bool:
         """Delete an agent."""
         if agent_id in self._agents:
+            self._unindex_agent(agent_id)
             del self._agents[agent_id]
             return True
         return False
 
+    async def get_agents_by_ids(self, agent_ids: List[str]) -> Dict[str, AgentResponse]:
+        """Get several agents; missing IDs are omitted."""
+        return {a: self._agents[a] for a in agent_ids if a in self._agents}
+
+    async def delete_agents(self, agent_ids: List[str]) -> None:
+        """Delete several agents."""
+        for agent_id in agent_ids:
+            await self.delete_agent(agent_id)
+
     # ==================== Patient Sessions Implementation ====================
     async def create_patient_session(
         self, session: PatientSessionResponse
@@ -4,7 +4,7 @@ import logging
 from io import BytesIO
 import uuid
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Mapping, Sequence
 
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception, retry_if_exception_type
 from elevenlabs.client import ElevenLabs
@@ -19,6 +19,7 @@ import json
 import base64
 import asyncio
 from backend.config import get_settings
+from backend.services.voice_catalog import VoiceCatalogSnapshot, get_voice_catalog
 
 
 class ElevenLabsServiceError(Exception):
@@ -98,6 +99,27 @@ def _should_retry_agent(exception: Exception) -> bool:
     return False
 
 
+# Curated Voices (Verified Public Voices V2.5)
+# These are specific voices the user wants to use, verified for V2.5 compatibility.
+# We hardcode them here to ensure they appear even if not in the user's library.
+# Never mutated; merged copies are built per catalog refresh.
+CURATED_VOICES = (
+    {"voice_id": "UgBBYS2sOqTuMpoF3BR0", "name": "Mark - Casual and Conversational", "preview_url": None, "languages": ["en"]},
+    {"voice_id": "NOpBlnGInO9m6vDvFkFC", "name": "Spuds Oxley - Wise and Approachable", "preview_url": None, "languages": ["en"]},
+    {"voice_id": "56AoDkrOh6qfVPDXZ7Pt", "name": "Cassidy - Crisp, Direct and Clear", "preview_url": None, "languages": ["en"]},
+    {"voice_id": "1SM7GgM6IMuvQlz2BwM3", "name": "Mark - Casual, Relaxed and Light", "preview_url": None, "languages": ["en"]},
+    {"voice_id": "zT03pEAEi0VHKciJODfn", "name": "Raju - Clear, Natural and Warm", "preview_url": None, "languages": ["en"]},
+    {"voice_id": "IvLWq57RKibBrqZGpQrC", "name": "Leo - Energetic, Inviting, and Round", "preview_url": None, "languages": ["en"]},
+    {"voice_id": "DMyrgzQFny3JI1Y1paM5", "name": "Donovan - Articulate, Strong and Deep", "preview_url": None, "languages": ["en"]},
+    {"voice_id": "Fahco4VZzobUeiPqni1S", "name": "Archer - Conversational", "preview_url": None, "languages": ["en"]},
+    {"voice_id": "vBKc2FfBKJfcZNyEt1n6", "name": "Finn - Youthful, Eager and Energetic", "preview_url": None, "languages": ["en"]},
+    {"voice_id": "g6xIsTj2HwM6VR4iXFCw", "name": "Jessica Anne Bogart - Chatty and Friendly", "preview_url": None, "languages": ["en"]},
+)
+
+# Catalog served in mock mode
+_CURATED_SNAPSHOT = VoiceCatalogSnapshot.build(CURATED_VOICES, fetched_at=0.0)
+
+
 class ElevenLabsService:
     """Service for ElevenLabs Knowledge Base operations.
 
@@ -211,32 +233,80 @@ class ElevenLabsService:
             )
 
     def list_documents(self) -> List[Dict[str, Any]]:
-        """List all Knowledge Base documents.
+        """List all Knowledge Base documents, following pagination.
 
         Returns:
-            List[Dict[str, Any]]: List of document metadata.
+            List[Dict[str, Any]]: List of document metadata (empty on error).
         """
         if self.use_mock:
             logging.info("[MOCK] list_documents called")
             return []
 
+        documents: List[Dict[str, Any]] = []
+        cursor = None
         try:
-            docs = self.client.conversational_ai.knowledge_base.list()
-            # The SDK returns an object with a 'documents' attribute or a list
-            doc_list = list(docs.documents) if hasattr(docs, 'documents') else list(docs)
-            return [
-                {
-                    "id": getattr(d, "id", None) or getattr(d, "document_id", "unknown"),
-                    "name": getattr(d, "name", "Unnamed"),
-                    "created_at": getattr(d, "created_at", None),
-                    "type": getattr(d, "type", "file")
-                }
-                for d in doc_list
-            ]
-        except Exception as e:
+            while True:
+                page, cursor = self.list_documents_page(cursor=cursor)
+                documents.extend(page)
+                if not cursor:
+                    return documents
+        except ElevenLabsSyncError as e:
             logging.error(f"Failed to list ElevenLabs documents: {e}")
             return []
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception(_should_retry),
+        reraise=True,
+        before_sleep=lambda retry_state: logging.warning(
+            f"Retrying ElevenLabs list call, attempt {retry_state.attempt_number}"
+        )
+    )
+    def list_documents_page(
+        self, cursor: Optional[str] = None, page_size: int = 100
+    ) -> tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch one page of Knowledge Base documents.
+
+        Args:
+            cursor: Cursor returned with the previous page (None for the first).
+            page_size: Documents per page (ElevenLabs allows up to 100).
+
+        Returns:
+            Tuple of (document metadata, cursor of the next page or None).
+
+        Raises:
+            ElevenLabsSyncError: If the request fails.
+        """
+        if self.use_mock:
+            logging.info("[MOCK] list_documents_page called")
+            return [], None
+
+        try:
+            docs = self.client.conversational_ai.knowledge_base.list(
+                page_size=page_size, cursor=cursor
+            )
+        except Exception as e:
+            error_type, is_retryable = self._classify_error(e)
+            raise ElevenLabsSyncError(
+                message=f"Failed to list ElevenLabs documents: {str(e)}",
+                error_type=error_type,
+                original_error=e,
+                is_retryable=is_retryable,
+            )
+        # The SDK returns an object with a 'documents' attribute or a list
+        doc_list = list(docs.documents) if hasattr(docs, 'documents') else list(docs)
+        next_cursor = getattr(docs, "next_cursor", None) if getattr(docs, "has_more", False) else None
+        return [
+            {
+                "id": getattr(d, "id", None) or getattr(d, "document_id", "unknown"),
+                "name": getattr(d, "name", "Unnamed"),
+                "created_at": getattr(d, "created_at", None),
+                "type": getattr(d, "type", "file")
+            }
+            for d in doc_list
+        ], next_cursor
+
     def delete_document(self, document_id: str) -> bool:
         """Delete document from ElevenLabs Knowledge Base.
 
@@ -266,12 +336,22 @@ class ElevenLabsService:
             # Could classify here too if needed, but keeping it simple for now as per spec focus on Sync
             raise ElevenLabsDeleteError(f"Failed to delete from ElevenLabs: {str(e)}")
 
-    def text_to_speech(self, text: str, voice_id: str) -> bytes:
+    def text_to_speech(
+        self,
+        text: str,
+        voice_id: str,
+        output_format: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> bytes:
         """Convert text to speech using ElevenLabs API.
 
         Args:
             text: The text to convert.
             voice_id: The ID of the voice to use.
+            output_format: ElevenLabs output format (default: the account
+                default, mp3_44100_128).
+            seed: Sampling seed; the same seed keeps renditions of one script
+                (e.g. bitrate variants) as alike as possible.
 
         Returns:
             bytes: The audio data.
@@ -288,10 +368,16 @@ class ElevenLabsService:
         try:
             # Using the text_to_speech.convert method from the Python SDK
             # convert returns a generator of bytes, so we need to consume it
+            options = {}
+            if output_format:
+                options["output_format"] = output_format
+            if seed is not None:
+                options["seed"] = seed
             audio_generator = self.client.text_to_speech.convert(
                 voice_id=voice_id,
                 text=text,
-                model_id="eleven_v3"
+                model_id="eleven_v3",
+                **options,
             )
             
             # Consume the generator to get the full audio bytes
@@ -302,77 +388,70 @@ class ElevenLabsService:
             logging.error(f"Failed to generate audio: {e}")
             raise ElevenLabsTTSError(f"Failed to generate audio: {str(e)}")
 
-    def get_voices(self) -> List[Dict[str, Any]]:
+    def get_voices(self) -> Sequence[Mapping[str, Any]]:
         """
         Get available voices for agent creation.
         Returns a merged list of:
         1. Specialized 'Curated Voices' (Verified V2.5 Public Voices) - Always shown
         2. User's 'My Voices' (Private library)
+
+        Served from the process-wide voice catalog (stale-while-revalidate), so
+        the ElevenLabs API is not called per request. The voices are read-only.
         """
-        # 1. Curated Voices (Verified Public Voices V2.5)
-        # These are specific voices the user wants to use, verified for V2.5 compatibility.
-        # We hardcode them here to ensure they appear even if not in the user's library.
-        CURATED_VOICES = [
-            {"voice_id": "UgBBYS2sOqTuMpoF3BR0", "name": "Mark - Casual and Conversational", "preview_url": None, "languages": ["en"]},
-            {"voice_id": "NOpBlnGInO9m6vDvFkFC", "name": "Spuds Oxley - Wise and Approachable", "preview_url": None, "languages": ["en"]},
-            {"voice_id": "56AoDkrOh6qfVPDXZ7Pt", "name": "Cassidy - Crisp, Direct and Clear", "preview_url": None, "languages": ["en"]},
-            {"voice_id": "1SM7GgM6IMuvQlz2BwM3", "name": "Mark - Casual, Relaxed and Light", "preview_url": None, "languages": ["en"]},
-            {"voice_id": "zT03pEAEi0VHKciJODfn", "name": "Raju - Clear, Natural and Warm", "preview_url": None, "languages": ["en"]},
-            {"voice_id": "IvLWq57RKibBrqZGpQrC", "name": "Leo - Energetic, Inviting, and Round", "preview_url": None, "languages": ["en"]},
-            {"voice_id": "DMyrgzQFny3JI1Y1paM5", "name": "Donovan - Articulate, Strong and Deep", "preview_url": None, "languages": ["en"]},
-            {"voice_id": "Fahco4VZzobUeiPqni1S", "name": "Archer - Conversational", "preview_url": None, "languages": ["en"]},
-            {"voice_id": "vBKc2FfBKJfcZNyEt1n6", "name": "Finn - Youthful, Eager and Energetic", "preview_url": None, "languages": ["en"]},
-            {"voice_id": "g6xIsTj2HwM6VR4iXFCw", "name": "Jessica Anne Bogart - Chatty and Friendly", "preview_url": None, "languages": ["en"]},
-        ]
-        
+        return self.get_voice_catalog().voices
+
+    def get_voice_catalog(self) -> VoiceCatalogSnapshot:
+        """Get the current voice catalog snapshot (voices, ID map and version)."""
         if self.use_mock:
             logging.info("[MOCK] get_voices called - returning curated voices")
-            return CURATED_VOICES
+            return _CURATED_SNAPSHOT
+        return get_voice_catalog(self._fetch_voices, fallback=lambda: CURATED_VOICES).get()
 
-        try:
-            # Fetch actual available voices from User's Account (My Voices)
-            response = self.client.voices.get_all()
-            user_voices_map = {v.voice_id: v for v in response.voices}
-            
-            final_voices = []
-            
-            # 1. Add ALL Curated Voices (Priority)
-            # We explicitly add them even if they are NOT in the library, 
-            # because we verified they work with V2.5 (unless Agent API strictly forbids it).
-            # If they ARE in the library, we update metadata.
-            for cv in CURATED_VOICES:
-                vid = cv["voice_id"]
-                if vid in user_voices_map:
-                    # Enriched with account data (like preview_url if available)
-                    v_obj = user_voices_map[vid]
-                    cv["name"] = v_obj.name # Use library name if desired, or keep curated
-                    cv["preview_url"] = v_obj.preview_url
-                    cv["in_library"] = True
-                else:
-                     cv["description"] = "Public Voice (Add to Library recommended)"
-                     # We assume verified voices have at least 'en' support or we use standard
-                     cv["in_library"] = False
-                final_voices.append(cv)
-            
-            # 2. Add other User Voices (if not already in curated)
-            # This ensures the user still sees their own voices
-            curated_ids = set(cv["voice_id"] for cv in CURATED_VOICES)
-            for vid, v in user_voices_map.items():
-                if vid not in curated_ids:
-                     final_voices.append({
-                        "voice_id": v.voice_id,
-                        "name": v.name,
-                        "preview_url": v.preview_url,
-                        "description": "My Library Voice",
-                        "languages": ["en"] # Fallback
-                     })
-                     
-            return final_voices
+    def _fetch_voices(self) -> List[Dict[str, Any]]:
+        """Fetch the user's voices and merge them with the curated voices.
 
-        except Exception as e:
-            logging.error(f"Failed to fetch voices from API: {e}")
-            # Fallback to just curated if API fails
-            return CURATED_VOICES
+        Raises:
+            Exception: If the ElevenLabs API call fails.
+        """
+        # Fetch actual available voices from User's Account (My Voices)
+        response = self.client.voices.get_all()
+        user_voices_map = {v.voice_id: v for v in response.voices}
+
+        final_voices = []
+
+        # 1. Add ALL Curated Voices (Priority)
+        # We explicitly add them even if they are NOT in the library,
+        # because we verified they work with V2.5 (unless Agent API strictly forbids it).
+        # If they ARE in the library, we update metadata.
+        for curated in CURATED_VOICES:
+            cv = dict(curated)
+            vid = cv["voice_id"]
+            if vid in user_voices_map:
+                # Enriched with account data (like preview_url if available)
+                v_obj = user_voices_map[vid]
+                cv["name"] = v_obj.name # Use library name if desired, or keep curated
+                cv["preview_url"] = v_obj.preview_url
+                cv["in_library"] = True
+            else:
+                cv["description"] = "Public Voice (Add to Library recommended)"
+                # We assume verified voices have at least 'en' support or we use standard
+                cv["in_library"] = False
+            final_voices.append(cv)
+
+        # 2. Add other User Voices (if not already in curated)
+        # This ensures the user still sees their own voices
+        curated_ids = set(cv["voice_id"] for cv in CURATED_VOICES)
+        for vid, v in user_voices_map.items():
+            if vid not in curated_ids:
+                final_voices.append({
+                    "voice_id": v.voice_id,
+                    "name": v.name,
+                    "preview_url": v.preview_url,
+                    "description": "My Library Voice",
+                    "languages": ["en"] # Fallback
+                })
+
+        return final_voices
 
     @retry(
         wait=wait_exponential(multiplier=1, min=2, max=10),
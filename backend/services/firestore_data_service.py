@@ -1,15 +1,17 @@
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set
 import uuid
-import re
 
 import google.cloud.firestore as firestore
 from google.cloud.firestore import SERVER_TIMESTAMP
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from google.api_core.exceptions import GoogleAPICallError, RetryError
+from google.api_core.exceptions import GoogleAPICallError, NotFound, RetryError
 
-from backend.services.data_service import DataServiceInterface
+from backend.services.data_service import DataServiceInterface, check_audio_fields
+from backend.utils.content_hash import content_hash
+from backend.utils.section_parser import parse_sections
+from backend.utils.text_extraction import ExtractedText, extract_text
 from backend.services.firestore_service import get_firestore_service
 from backend.models.schemas import (
     DashboardStatsResponse,
@@ -21,6 +23,7 @@ from backend.models.schemas import (
     ConversationSummarySchema,
     ConversationDetailSchema,
     ConversationMessageSchema,
+    AudioManifestItem,
     AudioMetadata,
     AgentResponse,
     AnswerStyle,
@@ -40,6 +43,9 @@ CONVERSATIONS = "conversations"
 PATIENT_SESSIONS = "patient_sessions"
 CUSTOM_TEMPLATES = "custom_templates"
 
+# Firestore allows at most 500 writes per batch commit
+FIRESTORE_BATCH_LIMIT = 500
+
 
 class FirestoreDataService(DataServiceInterface):
     """Firestore implementation of the data service interface."""
@@ -73,7 +79,11 @@ class FirestoreDataService(DataServiceInterface):
             raw_content=doc_dict["raw_content"],
             sync_status=SyncStatus(doc_dict["sync_status"]),
             elevenlabs_document_id=doc_dict.get("elevenlabs_document_id"),
+            content_hash=doc_dict.get("content_hash"),
+            elevenlabs_content_hash=doc_dict.get("elevenlabs_content_hash"),
             structured_sections=doc_dict.get("structured_sections"),
+            section_index=doc_dict.get("section_index"),
+            source_path=doc_dict.get("source_path"),
             created_at=doc_dict["created_at"],
             sync_error_message=doc_dict.get("sync_error_message"),
             last_sync_attempt=doc_dict.get("last_sync_attempt"),
@@ -94,6 +104,10 @@ class FirestoreDataService(DataServiceInterface):
             doctor_id=doc_dict.get("doctor_id", "default_doctor"),
             name=doc_dict.get("name", ""),
             description=doc_dict.get("description", ""),
+            bitrate_kbps=doc_dict.get("bitrate_kbps"),
+            frame_count=doc_dict.get("frame_count"),
+            variants=doc_dict.get("variants") or {},
+            peaks_ms=doc_dict.get("peaks_ms"),
         )
 
     def _doc_to_agent_response(self, doc_dict: dict) -> AgentResponse:
@@ -110,6 +124,36 @@ class FirestoreDataService(DataServiceInterface):
             languages=doc_dict.get("languages", ["zh"]),
         )
     
+    def _get_many(self, collection: str, ids: List[str]) -> Dict[str, dict]:
+        """Read several documents in one batched get; missing IDs are omitted."""
+        if not ids:
+            return {}
+        refs = [self._db.collection(collection).document(doc_id) for doc_id in dict.fromkeys(ids)]
+        return {snap.id: snap.to_dict() for snap in self._db.get_all(refs) if snap.exists}
+
+    def _delete_many(self, collection: str, ids: List[str]) -> None:
+        """Delete documents in batched writes of up to FIRESTORE_BATCH_LIMIT."""
+        unique_ids = list(dict.fromkeys(ids))
+        for offset in range(0, len(unique_ids), FIRESTORE_BATCH_LIMIT):
+            batch = self._db.batch()
+            for doc_id in unique_ids[offset:offset + FIRESTORE_BATCH_LIMIT]:
+                batch.delete(self._db.collection(collection).document(doc_id))
+            batch.commit()
+
+    def _delete_existing(self, collection: str, doc_id: str) -> bool:
+        """Delete one document with an exists precondition instead of a pre-read.
+
+        Returns:
+            True if deleted, False if the document does not exist.
+        """
+        try:
+            self._db.collection(collection).document(doc_id).delete(
+                option=self._db.write_option(exists=True)
+            )
+            return True
+        except NotFound:
+            return False
+
     def _doc_to_patient_session_response(self, doc_dict: dict) -> PatientSessionResponse:
         """Convert Firestore document to PatientSessionResponse."""
         return PatientSessionResponse(
@@ -146,35 +190,6 @@ class FirestoreDataService(DataServiceInterface):
             created_at=doc_dict["created_at"],
         )
         
-    def _parse_structured_sections(self, content: str) -> dict:
-        """Parse markdown content into structured sections based on headers."""
-        sections = {}
-        matches = list(re.finditer(r'(^|\n)(?P<level>\s*#{1,6})\s(?P<title>.*)', content))
-        if not matches:
-             if content.strip():
-                 sections["content"] = content
-             return sections
-
-        for i, match in enumerate(matches):
-            current_start = match.start()
-            if i == 0:
-                intro = content[0:current_start].strip()
-                if intro:
-                    sections["Introduction"] = intro
-
-            header_title = match.group("title").strip()
-            match_end = match.end()
-            
-            if i + 1 < len(matches):
-                next_start = matches[i+1].start()
-                section_content = content[match_end:next_start].strip()
-            else:
-                section_content = content[match_end:].strip()
-            
-            if section_content:
-                sections[header_title] = section_content
-        return sections
-
     # ==================== Dashboard ====================
     async def get_dashboard_stats(self) -> DashboardStatsResponse:
         """Get dashboard statistics using collection counts."""
@@ -268,11 +283,12 @@ class FirestoreDataService(DataServiceInterface):
         retry=retry_if_exception_type((GoogleAPICallError, RetryError))
     )
     async def create_knowledge_document(
-        self, doc: KnowledgeDocumentCreate
+        self, doc: KnowledgeDocumentCreate, extracted: Optional[ExtractedText] = None
     ) -> KnowledgeDocumentResponse:
         try:
             knowledge_id = str(uuid.uuid4())
-            structured = self._parse_structured_sections(doc.raw_content)
+            if extracted is None:
+                extracted = extract_text(doc.raw_content)
             
             doc_data = {
                 "knowledge_id": knowledge_id,
@@ -282,7 +298,10 @@ class FirestoreDataService(DataServiceInterface):
                 "raw_content": doc.raw_content,
                 "sync_status": SyncStatus.PENDING.value,
                 "elevenlabs_document_id": None,
-                "structured_sections": structured,
+                "content_hash": extracted.content_hash,
+                "structured_sections": extracted.structured_sections,
+                "section_index": extracted.section_index,
+                "source_path": extracted.source_path,
                 "created_at": SERVER_TIMESTAMP,
             }
             
@@ -291,7 +310,9 @@ class FirestoreDataService(DataServiceInterface):
             # Approximate created_at for return
             doc_data["created_at"] = datetime.now()
             
-            return self._doc_to_knowledge_response(doc_data)
+            created = self._doc_to_knowledge_response(doc_data)
+            self.get_search_index().index_document(created)
+            return created
         except Exception as e:
             logger.error(f"Failed to create knowledge document: {e}")
             raise
@@ -314,6 +335,12 @@ class FirestoreDataService(DataServiceInterface):
             if not updates:
                 return self._doc_to_knowledge_response(doc_snap.to_dict())
             
+            if "raw_content" in updates:
+                updates["content_hash"] = content_hash(updates["raw_content"])
+                sections, section_index = parse_sections(updates["raw_content"])
+                updates["structured_sections"] = sections
+                updates["section_index"] = section_index
+
             # Set modified_at
             now = datetime.now()
             updates["modified_at"] = now
@@ -322,7 +349,10 @@ class FirestoreDataService(DataServiceInterface):
             
             # Get updated
             updated_snap = doc_ref.get()
-            return self._doc_to_knowledge_response(updated_snap.to_dict())
+            updated = self._doc_to_knowledge_response(updated_snap.to_dict())
+            if "raw_content" in updates or "disease_name" in updates:
+                self.get_search_index().index_document(updated)
+            return updated
         except Exception as e:
             logger.error(f"Failed to update knowledge document {knowledge_id}: {e}")
             raise
@@ -358,7 +388,8 @@ class FirestoreDataService(DataServiceInterface):
         knowledge_id: str, 
         status: SyncStatus, 
         elevenlabs_id: Optional[str] = None,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        content_hash: Optional[str] = None,
     ) -> bool:
         try:
             ref = self._db.collection(KNOWLEDGE_DOCUMENTS).document(knowledge_id)
@@ -368,6 +399,8 @@ class FirestoreDataService(DataServiceInterface):
             }
             if elevenlabs_id:
                 updates["elevenlabs_document_id"] = elevenlabs_id
+            if content_hash:
+                updates["elevenlabs_content_hash"] = content_hash
             
             if status == SyncStatus.SYNCING:
                 updates["sync_retry_count"] = firestore.Increment(1)
@@ -388,18 +421,49 @@ class FirestoreDataService(DataServiceInterface):
             logger.error(f"Failed to update sync status {knowledge_id}: {e}")
             return False
 
+    async def get_knowledge_documents_by_elevenlabs_hash(
+        self, content_hash: str
+    ) -> List[KnowledgeDocumentResponse]:
+        try:
+            docs = (
+                self._db.collection(KNOWLEDGE_DOCUMENTS)
+                .where(filter=firestore.FieldFilter("elevenlabs_content_hash", "==", content_hash))
+                .stream()
+            )
+            return [
+                d for d in (self._doc_to_knowledge_response(s.to_dict()) for s in docs)
+                if d.elevenlabs_document_id
+            ]
+        except Exception as e:
+            logger.error(f"Failed to query knowledge documents by content hash: {e}")
+            return []
+
     async def delete_knowledge_document(self, knowledge_id: str) -> bool:
         try:
-            # Check if exists first to return correct boolean
-            doc_ref = self._db.collection(KNOWLEDGE_DOCUMENTS).document(knowledge_id)
-            if not doc_ref.get().exists:
+            if not self._delete_existing(KNOWLEDGE_DOCUMENTS, knowledge_id):
                 return False
-            doc_ref.delete()
+            self.get_search_index().remove_document(knowledge_id)
             return True
         except Exception as e:
             logger.error(f"Failed to delete knowledge document {knowledge_id}: {e}")
             return False
 
+    async def get_knowledge_source_paths(self) -> Set[str]:
+        docs = self._db.collection(KNOWLEDGE_DOCUMENTS).select(["source_path"]).stream()
+        return {path for d in docs if (path := (d.to_dict() or {}).get("source_path"))}
+
+    async def get_knowledge_documents_by_ids(
+        self, knowledge_ids: List[str]
+    ) -> Dict[str, KnowledgeDocumentResponse]:
+        docs = self._get_many(KNOWLEDGE_DOCUMENTS, knowledge_ids)
+        return {k: self._doc_to_knowledge_response(d) for k, d in docs.items()}
+
+    async def delete_knowledge_documents(self, knowledge_ids: List[str]) -> None:
+        self._delete_many(KNOWLEDGE_DOCUMENTS, knowledge_ids)
+        index = self.get_search_index()
+        for knowledge_id in knowledge_ids:
+            index.remove_document(knowledge_id)
+
     # ==================== Audio Files ====================
     async def save_audio_metadata(self, audio: AudioMetadata) -> AudioMetadata:
         try:
@@ -436,17 +500,57 @@ class FirestoreDataService(DataServiceInterface):
             logger.error(f"Failed to get audio file {audio_id}: {e}")
             return None
 
-    async def delete_audio_file(self, audio_id: str) -> bool:
+    async def update_audio_fields(self, audio_id: str, fields: Dict[str, Any]) -> bool:
+        """Update only the given fields; a missing document fails the write itself."""
+        check_audio_fields(fields)
+        if not fields:
+            return True
         try:
-            doc_ref = self._db.collection(AUDIO_FILES).document(audio_id)
-            if not doc_ref.get().exists:
-                return False
-            doc_ref.delete()
+            self._db.collection(AUDIO_FILES).document(audio_id).update(fields)
             return True
+        except NotFound:
+            return False
+        except Exception as e:
+            logger.error(f"Failed to update audio file {audio_id}: {e}")
+            raise
+
+    async def delete_audio_file(self, audio_id: str) -> bool:
+        try:
+            return self._delete_existing(AUDIO_FILES, audio_id)
         except Exception as e:
             logger.error(f"Failed to delete audio file {audio_id}: {e}")
             return False
 
+    async def get_audio_manifest_items(
+        self, knowledge_id: Optional[str] = None, doctor_id: Optional[str] = None
+    ) -> List[AudioManifestItem]:
+        # Project to the manifest fields so scripts are never transferred
+        ref = self._db.collection(AUDIO_FILES)
+        if knowledge_id:
+            ref = ref.where(filter=firestore.FieldFilter("knowledge_id", "==", knowledge_id))
+        if doctor_id:
+            ref = ref.where(filter=firestore.FieldFilter("doctor_id", "==", doctor_id))
+        docs = ref.select(list(AudioManifestItem.model_fields)).stream()
+        return [AudioManifestItem(**d.to_dict()) for d in docs]
+
+    async def get_audio_file_ids(self) -> Set[str]:
+        # Project to the document name only; no metadata is transferred
+        docs = self._db.collection(AUDIO_FILES).select([firestore.FieldPath.document_id()]).stream()
+        return {d.id for d in docs}
+
+    async def get_audio_ids_without_duration(self) -> Set[str]:
+        # Project to the duration only; an equality filter on null would miss
+        # records written before the field existed
+        docs = self._db.collection(AUDIO_FILES).select(["duration_seconds"]).stream()
+        return {d.id for d in docs if d.to_dict().get("duration_seconds") is None}
+
+    async def get_audio_files_by_ids(self, audio_ids: List[str]) -> Dict[str, AudioMetadata]:
+        docs = self._get_many(AUDIO_FILES, audio_ids)
+        return {a: self._doc_to_audio_metadata(d) for a, d in docs.items()}
+
+    async def delete_audio_files(self, audio_ids: List[str]) -> None:
+        self._delete_many(AUDIO_FILES, audio_ids)
+
     # ==================== Agents ====================
     @retry(
         stop=stop_after_attempt(3),
@@ -488,17 +592,36 @@ class FirestoreDataService(DataServiceInterface):
             logger.error(f"Failed to get agent {agent_id}: {e}")
             return None
 
+    async def get_agents_by_knowledge_id(self, knowledge_id: str) -> List[AgentResponse]:
+        """Query agents whose knowledge_ids contain the document.
+
+        Uses Firestore's automatic array index instead of scanning every agent.
+        """
+        try:
+            docs = (
+                self._db.collection(AGENTS)
+                .where(filter=firestore.FieldFilter("knowledge_ids", "array_contains", knowledge_id))
+                .stream()
+            )
+            return [self._doc_to_agent_response(d.to_dict()) for d in docs]
+        except Exception as e:
+            logger.error(f"Failed to get agents for knowledge {knowledge_id}: {e}")
+            return []
+
     async def delete_agent(self, agent_id: str) -> bool:
         try:
-            doc_ref = self._db.collection(AGENTS).document(agent_id)
-            if not doc_ref.get().exists:
-                return False
-            doc_ref.delete()
-            return True
+            return self._delete_existing(AGENTS, agent_id)
         except Exception as e:
             logger.error(f"Failed to delete agent {agent_id}: {e}")
             return False
 
+    async def get_agents_by_ids(self, agent_ids: List[str]) -> Dict[str, AgentResponse]:
+        docs = self._get_many(AGENTS, agent_ids)
+        return {a: self._doc_to_agent_response(d) for a, d in docs.items()}
+
+    async def delete_agents(self, agent_ids: List[str]) -> None:
+        self._delete_many(AGENTS, agent_ids)
+
     # ==================== Patient Sessions ====================
     @retry(
         stop=stop_after_attempt(3),
@@ -0,0 +1,240 @@
+"""Process-wide Google Cloud credentials with proactive background refresh.
+
+Production GCS access (storage client and signed URLs) used to resolve
+application default credentials, refresh tokens and look up the service
+account email on the request path. The manager does that once:
+
+- credentials come from google.auth.default() on first use;
+- one AuthorizedSession (a pooled requests session) is shared by the
+  storage client and the IAM signer, so connections are reused;
+- a daemon thread refreshes the access token GCP_TOKEN_REFRESH_MARGIN_SECONDS
+  before it expires, so requests never wait on a token refresh;
+- on Compute Engine / Cloud Run, where credentials cannot sign locally, a
+  signing credential backed by the IAM signBlob API is built once.
+"""
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional, Tuple
+
+import google.auth
+import google.auth.iam
+import google.auth.transport.requests
+import requests
+from google.auth import compute_engine
+from google.oauth2 import service_account
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+METADATA_EMAIL_URL = (
+    "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/email"
+)
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+# Wait before retrying a failed background refresh
+REFRESH_RETRY_SECONDS = 30.0
+
+
+def _utcnow() -> datetime:
+    # google-auth stores expiry as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class GoogleCredentialsManager:
+    """Lazily resolved, proactively refreshed Google credentials."""
+
+    def __init__(
+        self,
+        refresh_margin_seconds: float,
+        credentials_factory: Optional[Callable[[], Tuple[Any, Optional[str]]]] = None,
+    ):
+        """Initialize the manager; credentials are resolved on first use.
+
+        Args:
+            refresh_margin_seconds: Refresh tokens this long before expiry.
+            credentials_factory: Returns (credentials, project_id); defaults
+                to google.auth.default with the cloud-platform scope.
+        """
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._credentials_factory = credentials_factory or (
+            lambda: google.auth.default(scopes=[CLOUD_PLATFORM_SCOPE])
+        )
+        self._lock = threading.RLock()
+        self._credentials = None
+        self._project_id: Optional[str] = None
+        self._http: Optional[requests.Session] = None
+        self._session: Optional[google.auth.transport.requests.AuthorizedSession] = None
+        self._signing_credentials = None
+        self._service_account_email: Optional[str] = None
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    def _ensure_initialized(self) -> None:
+        if self._credentials is not None:
+            return
+        with self._lock:
+            if self._credentials is not None:
+                return
+            credentials, project_id = self._credentials_factory()
+            self._http = requests.Session()
+            self._session = google.auth.transport.requests.AuthorizedSession(
+                credentials, auth_request=google.auth.transport.requests.Request(session=self._http)
+            )
+            self._project_id = project_id
+            self._credentials = credentials
+            logger.info(f"Google credentials initialized ({type(credentials).__name__})")
+
+    @property
+    def credentials(self):
+        """The shared credentials object."""
+        self._ensure_initialized()
+        return self._credentials
+
+    @property
+    def project_id(self) -> Optional[str]:
+        """Project of the default credentials, if known."""
+        self._ensure_initialized()
+        return self._project_id
+
+    @property
+    def authorized_session(self) -> google.auth.transport.requests.AuthorizedSession:
+        """Pooled HTTP session that adds auth headers (shared with the storage client)."""
+        self._ensure_initialized()
+        return self._session
+
+    @property
+    def is_compute(self) -> bool:
+        """Whether the credentials come from the metadata server (cannot sign locally)."""
+        return isinstance(self.credentials, compute_engine.Credentials)
+
+    def _expires_in(self) -> Optional[float]:
+        expiry = getattr(self._credentials, "expiry", None)
+        if expiry is None:
+            return None
+        if expiry.tzinfo is not None:
+            expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+        return (expiry - _utcnow()).total_seconds()
+
+    def _needs_refresh(self) -> bool:
+        if not self._credentials.token:
+            return True
+        expires_in = self._expires_in()
+        return expires_in is not None and expires_in <= self.refresh_margin_seconds
+
+    def refresh(self, force: bool = False) -> None:
+        """Refresh the access token if it is missing or close to expiry."""
+        self._ensure_initialized()
+        with self._lock:
+            if force or self._needs_refresh():
+                self._credentials.refresh(google.auth.transport.requests.Request(session=self._http))
+                logger.debug("Google access token refreshed")
+
+    def access_token(self) -> str:
+        """A valid access token (normally already refreshed in the background)."""
+        self.refresh()
+        return self._credentials.token
+
+    @property
+    def service_account_email(self) -> Optional[str]:
+        """Service account email, resolved once (from metadata on Cloud Run)."""
+        self._ensure_initialized()
+        if self._service_account_email is not None:
+            return self._service_account_email
+        with self._lock:
+            email = getattr(self._credentials, "service_account_email", None)
+            # Cloud Run sometimes reports 'default' instead of the actual email
+            if self.is_compute and (not email or email == "default"):
+                try:
+                    response = self._http.get(
+                        METADATA_EMAIL_URL, headers={"Metadata-Flavor": "Google"}, timeout=2
+                    )
+                    if response.status_code == 200:
+                        email = response.text.strip()
+                        logger.info(f"Fetched actual SA email from metadata: {email}")
+                except Exception as e:
+                    logger.warning(f"Could not fetch SA email from metadata: {e}")
+            if email and email != "default":
+                self._service_account_email = email
+            return email
+
+    def signing_credentials(self):
+        """Credentials able to sign blobs for V4 signed URLs.
+
+        Key-file credentials sign locally and are returned as is. Compute
+        credentials get a service account credential whose signer calls the
+        IAM signBlob API through the shared authorized session.
+        """
+        if not self.is_compute:
+            return self.credentials
+        if self._signing_credentials is None:
+            with self._lock:
+                if self._signing_credentials is None:
+                    email = self.service_account_email
+                    signer = google.auth.iam.Signer(
+                        google.auth.transport.requests.Request(session=self._session),
+                        self._credentials,
+                        email,
+                    )
+                    self._signing_credentials = service_account.Credentials(signer, email, TOKEN_URI)
+        return self._signing_credentials
+
+    def start_background_refresh(self) -> None:
+        """Start the refresh thread (idempotent)."""
+        self._ensure_initialized()
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, name="gcp-credentials-refresh", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_background_refresh(self) -> None:
+        """Stop the refresh thread."""
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def _next_refresh_delay(self) -> float:
+        expires_in = self._expires_in()
+        if expires_in is None:
+            return REFRESH_RETRY_SECONDS * 10
+        return max(1.0, expires_in - self.refresh_margin_seconds)
+
+    def _refresh_loop(self) -> None:
+        delay = 0.0
+        while not self._stop.wait(delay):
+            try:
+                self.refresh()
+                delay = self._next_refresh_delay()
+            except Exception as e:
+                logger.warning(f"Background credential refresh failed: {e}")
+                delay = REFRESH_RETRY_SECONDS
+
+
+# Singleton instance
+_manager_instance: Optional[GoogleCredentialsManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_credentials_manager() -> GoogleCredentialsManager:
+    """Get the process-wide Google credentials manager."""
+    global _manager_instance
+    if _manager_instance is None:
+        with _manager_lock:
+            if _manager_instance is None:
+                _manager_instance = GoogleCredentialsManager(
+                    refresh_margin_seconds=get_settings().gcp_token_refresh_margin_seconds
+                )
+    return _manager_instance
+
+
+def uses_gcp_credentials() -> bool:
+    """Whether storage talks to real GCS (not mock storage or the emulator)."""
+    settings = get_settings()
+    return not settings.use_mock_storage and not settings.use_gcs_emulator
@@ -0,0 +1,277 @@
+"""Reconciliation of the ElevenLabs knowledge base with local documents.
+
+ElevenLabs documents are paged with a prefetch (the next page is requested
+while the current one is joined) and concurrently with loading the local
+documents. The join is a single pass over hash maps keyed by ElevenLabs
+document ID, producing:
+
+- orphans: ElevenLabs documents no local document references,
+- missing: local documents whose ElevenLabs document no longer exists (or
+  that never synced successfully),
+- stale: local documents whose content changed since the ElevenLabs copy
+  was made.
+
+Fixes go through the existing paths: missing and stale documents are marked
+PENDING and queued on the durable task queue (re-syncs also swap the new
+document into linked agents); orphans are deleted only when requested. Fixes
+run with bounded concurrency (KNOWLEDGE_RECONCILE_CONCURRENCY).
+
+Orphans come from a local snapshot taken while ElevenLabs is paged, so a
+sync finishing in between creates a document that looks orphaned. Before
+deleting orphans the referenced IDs are read again, and documents referenced
+by then are dropped from the orphan list.
+"""
+
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from backend.config import get_settings
+from backend.models.schemas import (
+    KnowledgeDocumentResponse,
+    KnowledgeReconcileResponse,
+    ReconciliationEntry,
+    ReconciliationIssue,
+    SyncStatus,
+)
+from backend.services.data_service import DataServiceInterface
+from backend.services.elevenlabs_service import ElevenLabsService
+from backend.services.knowledge_sync_tasks import enqueue_knowledge_resync, enqueue_knowledge_sync
+from backend.services.task_queue import TaskQueue
+
+logger = logging.getLogger(__name__)
+
+# Statuses whose sync is queued or running; these documents are not diffed
+IN_FLIGHT_STATUSES = (SyncStatus.PENDING, SyncStatus.SYNCING)
+
+
+def _elevenlabs_name(doc: KnowledgeDocumentResponse) -> str:
+    return f"{doc.disease_name}_{'_'.join(doc.tags)}"
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+async def iter_elevenlabs_pages(
+    elevenlabs_service: ElevenLabsService, page_size: int
+) -> AsyncIterator[List[dict]]:
+    """Yield pages of ElevenLabs documents, prefetching the next page.
+
+    Pages are cursor-linked, so they cannot be requested in parallel; instead
+    the request for page n+1 is in flight while the caller processes page n.
+    """
+    pending = asyncio.create_task(
+        asyncio.to_thread(elevenlabs_service.list_documents_page, None, page_size)
+    )
+    while pending is not None:
+        documents, cursor = await pending
+        pending = (
+            asyncio.create_task(
+                asyncio.to_thread(elevenlabs_service.list_documents_page, cursor, page_size)
+            )
+            if cursor
+            else None
+        )
+        yield documents
+
+
+async def _list_elevenlabs(
+    elevenlabs_service: ElevenLabsService, page_size: int, local_refs: asyncio.Future
+) -> Tuple[List[dict], Set[str], int, float]:
+    """Page through ElevenLabs, joining each page once local IDs are loaded.
+
+    Returns:
+        Tuple of (orphaned ElevenLabs documents, seen referenced IDs, page
+        count, listing time in ms).
+    """
+    start = time.perf_counter()
+    orphans: List[dict] = []
+    seen: Set[str] = set()
+    pages = 0
+    async for page in iter_elevenlabs_pages(elevenlabs_service, page_size):
+        pages += 1
+        refs = await local_refs
+        for el_doc in page:
+            if el_doc["id"] in refs:
+                seen.add(el_doc["id"])
+            else:
+                orphans.append(el_doc)
+    return orphans, seen, pages, _elapsed_ms(start)
+
+
+async def _referenced_elevenlabs_ids(data_service: DataServiceInterface) -> Set[str]:
+    """Re-read the ElevenLabs IDs local documents reference right now."""
+    return {
+        doc.elevenlabs_document_id
+        for doc in await data_service.get_knowledge_documents()
+        if doc.elevenlabs_document_id
+    }
+
+
+async def reconcile_knowledge_base(
+    data_service: DataServiceInterface,
+    elevenlabs_service: ElevenLabsService,
+    task_queue: TaskQueue,
+    dry_run: bool = True,
+    delete_orphans: bool = False,
+    concurrency: Optional[int] = None,
+    page_size: Optional[int] = None,
+) -> KnowledgeReconcileResponse:
+    """Diff ElevenLabs against local knowledge documents and optionally fix it.
+
+    Args:
+        data_service: Source of local knowledge documents.
+        elevenlabs_service: ElevenLabs client.
+        task_queue: Queue used for sync/re-sync fixes.
+        dry_run: Report only; apply no fixes.
+        delete_orphans: Also delete orphaned ElevenLabs documents.
+        concurrency: Fixes applied at once (defaults to settings).
+        page_size: ElevenLabs list page size (defaults to settings).
+
+    Returns:
+        KnowledgeReconcileResponse with the diff, fix results and timings.
+
+    Raises:
+        ElevenLabsSyncError: If listing ElevenLabs documents fails. Nothing is
+            applied in that case, since every document would look missing.
+    """
+    settings = get_settings()
+    concurrency = concurrency or settings.knowledge_reconcile_concurrency
+    page_size = page_size or settings.elevenlabs_list_page_size
+    total_start = time.perf_counter()
+
+    # 1. Load local documents and page ElevenLabs concurrently
+    local_refs: asyncio.Future = asyncio.get_running_loop().create_future()
+    listing = asyncio.create_task(_list_elevenlabs(elevenlabs_service, page_size, local_refs))
+    local_start = time.perf_counter()
+    try:
+        local_docs = await data_service.get_knowledge_documents()
+    except Exception:
+        listing.cancel()
+        raise
+    local_ms = _elapsed_ms(local_start)
+
+    diff_start = time.perf_counter()
+    refs: Dict[str, List[KnowledgeDocumentResponse]] = {}
+    unsynced: List[KnowledgeDocumentResponse] = []
+    # In-flight documents are not diffed but still keep their document from being an orphan
+    referenced: Set[str] = set()
+    in_flight = 0
+    for doc in local_docs:
+        if doc.elevenlabs_document_id:
+            referenced.add(doc.elevenlabs_document_id)
+        if doc.sync_status in IN_FLIGHT_STATUSES:
+            in_flight += 1
+        elif doc.elevenlabs_document_id:
+            refs.setdefault(doc.elevenlabs_document_id, []).append(doc)
+        else:
+            unsynced.append(doc)
+    local_refs.set_result(referenced)
+    orphan_docs, seen, pages, elevenlabs_ms = await listing
+
+    # 2. Classify local documents against what ElevenLabs holds
+    missing: List[KnowledgeDocumentResponse] = list(unsynced)
+    stale: List[KnowledgeDocumentResponse] = []
+    in_sync = 0
+    for elevenlabs_id, docs in refs.items():
+        for doc in docs:
+            if elevenlabs_id not in seen:
+                missing.append(doc)
+            elif doc.elevenlabs_content_hash and doc.elevenlabs_content_hash != doc.content_hash:
+                stale.append(doc)
+            else:
+                in_sync += 1
+
+    report = KnowledgeReconcileResponse(
+        dry_run=dry_run,
+        elevenlabs_count=len(orphan_docs) + len(seen),
+        local_count=len(local_docs),
+        in_sync_count=in_sync,
+        in_flight_count=in_flight,
+        orphans=[
+            ReconciliationEntry(
+                issue=ReconciliationIssue.ORPHAN, elevenlabs_document_id=d["id"], name=d.get("name")
+            )
+            for d in orphan_docs
+        ],
+        missing=[
+            ReconciliationEntry(
+                issue=ReconciliationIssue.MISSING,
+                elevenlabs_document_id=d.elevenlabs_document_id,
+                knowledge_id=d.knowledge_id,
+                name=d.disease_name,
+            )
+            for d in missing
+        ],
+        stale=[
+            ReconciliationEntry(
+                issue=ReconciliationIssue.STALE,
+                elevenlabs_document_id=d.elevenlabs_document_id,
+                knowledge_id=d.knowledge_id,
+                name=d.disease_name,
+            )
+            for d in stale
+        ],
+        pages=pages,
+    )
+    diff_ms = _elapsed_ms(diff_start)
+
+    # 3. Apply fixes with bounded concurrency
+    apply_start = time.perf_counter()
+    if not dry_run and delete_orphans and report.orphans:
+        referenced_now = await _referenced_elevenlabs_ids(data_service)
+        report.orphans = [
+            e for e in report.orphans if e.elevenlabs_document_id not in referenced_now
+        ]
+    if not dry_run:
+        semaphore = asyncio.Semaphore(concurrency)
+        docs_by_id = {d.knowledge_id: d for d in missing + stale}
+
+        async def fix(entry: ReconciliationEntry) -> None:
+            async with semaphore:
+                try:
+                    if entry.issue == ReconciliationIssue.ORPHAN:
+                        await asyncio.to_thread(
+                            elevenlabs_service.delete_document, entry.elevenlabs_document_id
+                        )
+                        entry.action = "deleted"
+                        return
+                    doc = docs_by_id[entry.knowledge_id]
+                    # PENDING keeps the dead ID out of content-hash reuse
+                    await data_service.update_knowledge_sync_status(doc.knowledge_id, SyncStatus.PENDING)
+                    if doc.elevenlabs_document_id:
+                        await enqueue_knowledge_resync(
+                            doc.knowledge_id, doc.elevenlabs_document_id, _elevenlabs_name(doc),
+                            queue=task_queue,
+                        )
+                        entry.action = "resync_queued"
+                    else:
+                        await enqueue_knowledge_sync(
+                            doc.knowledge_id, _elevenlabs_name(doc), queue=task_queue
+                        )
+                        entry.action = "sync_queued"
+                except Exception as e:
+                    target = entry.knowledge_id or entry.elevenlabs_document_id
+                    logger.error(f"Reconciliation fix failed for {entry.issue.value} {target}: {e}")
+                    entry.error = str(e)
+
+        entries = report.missing + report.stale + (report.orphans if delete_orphans else [])
+        await asyncio.gather(*(fix(entry) for entry in entries))
+        report.applied_count = sum(1 for entry in entries if entry.action)
+        report.failed_count = sum(1 for entry in entries if entry.error)
+
+    report.timings_ms = {
+        "list_elevenlabs": elevenlabs_ms,
+        "list_local": local_ms,
+        "diff": diff_ms,
+        "apply": _elapsed_ms(apply_start),
+        "total": _elapsed_ms(total_start),
+    }
+    logger.info(
+        f"Knowledge reconciliation{' (dry run)' if dry_run else ''}: "
+        f"{len(report.orphans)} orphans, {len(report.missing)} missing, {len(report.stale)} stale, "
+        f"{report.applied_count} fixed, {report.failed_count} failed in {report.timings_ms['total']} ms"
+    )
+    return report
@@ -0,0 +1,400 @@
+"""In-process BM25 search over knowledge documents.
+
+The data services update the index on every knowledge create, update and
+delete, so searches never scan documents. Only term frequencies are kept in
+memory; snippets are built from the few documents actually returned.
+
+The index is snapshotted to disk (debounced after changes and on shutdown)
+and reloaded at startup, where it is reconciled against the data service by
+content hash so only documents changed while the process was down (or by
+another instance) are re-tokenized.
+
+Tokenization lowercases word characters; runs of CJK characters are indexed
+as overlapping bigrams since Chinese text has no spaces between words.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.config import get_settings
+from backend.models.schemas import KnowledgeDocumentResponse
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Document fields are weighted by repeating their tokens
+TITLE_WEIGHT = 3
+SECTION_TITLE_WEIGHT = 2
+
+# Seconds to wait after a change before writing the snapshot
+SNAPSHOT_DELAY_SECONDS = 5.0
+SNAPSHOT_VERSION = 1
+
+# Highlighting
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+SNIPPET_CONTEXT_CHARS = 60
+MAX_SNIPPETS = 3
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms (CJK runs become bigrams)."""
+    tokens: List[str] = []
+    for word in _WORD_RE.findall(text.lower()):
+        if not _CJK_RE.search(word):
+            tokens.append(word)
+            continue
+        # Split mixed words into CJK and non-CJK parts
+        pos = 0
+        for match in _CJK_RE.finditer(word):
+            if match.start() > pos:
+                tokens.append(word[pos:match.start()])
+            run = match.group()
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            pos = match.end()
+        if pos < len(word):
+            tokens.append(word[pos:])
+    return tokens
+
+
+def _document_terms(doc: KnowledgeDocumentResponse) -> Counter:
+    terms = Counter(tokenize(doc.raw_content))
+    for token in tokenize(doc.disease_name):
+        terms[token] += TITLE_WEIGHT
+    for title in (doc.structured_sections or {}):
+        for token in tokenize(title):
+            terms[token] += SECTION_TITLE_WEIGHT
+    return terms
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result before highlighting."""
+
+    knowledge_id: str
+    score: float
+    disease_name: str
+
+
+@dataclass
+class _IndexedDocument:
+    terms: Dict[str, int]
+    length: int
+    disease_name: str
+    content_hash: Optional[str] = None
+
+
+class KnowledgeSearchIndex:
+    """Incrementally maintained BM25 inverted index."""
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        """Initialize an empty index.
+
+        Args:
+            snapshot_path: File used by save()/load() (no snapshots if omitted).
+        """
+        self.snapshot_path = snapshot_path
+        self._docs: Dict[str, _IndexedDocument] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+        self._autosave = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, knowledge_id: str) -> bool:
+        return knowledge_id in self._docs
+
+    def indexed_ids(self) -> List[str]:
+        """IDs of all indexed documents."""
+        with self._lock:
+            return list(self._docs)
+
+    def is_current(self, doc: KnowledgeDocumentResponse) -> bool:
+        """Check whether the indexed version of a document matches it."""
+        entry = self._docs.get(doc.knowledge_id)
+        return (
+            entry is not None
+            and doc.content_hash is not None
+            and entry.content_hash == doc.content_hash
+            and entry.disease_name == doc.disease_name
+        )
+
+    # ---------- Mutation ----------
+
+    def index_document(self, doc: KnowledgeDocumentResponse) -> None:
+        """Add or replace a document."""
+        terms = _document_terms(doc)
+        entry = _IndexedDocument(
+            terms=dict(terms),
+            length=sum(terms.values()),
+            disease_name=doc.disease_name,
+            content_hash=doc.content_hash,
+        )
+        with self._lock:
+            self._remove_locked(doc.knowledge_id)
+            self._add_locked(doc.knowledge_id, entry)
+        self._schedule_save()
+
+    def remove_document(self, knowledge_id: str) -> None:
+        """Remove a document if indexed."""
+        with self._lock:
+            removed = self._remove_locked(knowledge_id)
+        if removed:
+            self._schedule_save()
+
+    def _add_locked(self, knowledge_id: str, entry: _IndexedDocument) -> None:
+        self._docs[knowledge_id] = entry
+        self._total_length += entry.length
+        for term, tf in entry.terms.items():
+            self._postings.setdefault(term, {})[knowledge_id] = tf
+
+    def _remove_locked(self, knowledge_id: str) -> bool:
+        entry = self._docs.pop(knowledge_id, None)
+        if entry is None:
+            return False
+        self._total_length -= entry.length
+        for term in entry.terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(knowledge_id, None)
+                if not posting:
+                    del self._postings[term]
+        return True
+
+    # ---------- Query ----------
+
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """Rank documents for a query with BM25."""
+        terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self._docs)
+            if not terms or not doc_count:
+                return []
+            avg_length = self._total_length / doc_count or 1.0
+            scores: Dict[str, float] = {}
+            for term in terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                df = len(posting)
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                for knowledge_id, tf in posting.items():
+                    length = self._docs[knowledge_id].length
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                    scores[knowledge_id] = scores.get(knowledge_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [
+                SearchHit(knowledge_id=kid, score=round(score, 4), disease_name=self._docs[kid].disease_name)
+                for kid, score in top
+            ]
+
+    # ---------- Snapshots ----------
+
+    def save(self) -> None:
+        """Write the index to snapshot_path atomically."""
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            data = {
+                "version": SNAPSHOT_VERSION,
+                "documents": {
+                    kid: {
+                        "terms": entry.terms,
+                        "disease_name": entry.disease_name,
+                        "content_hash": entry.content_hash,
+                    }
+                    for kid, entry in self._docs.items()
+                },
+            }
+        path = Path(self.snapshot_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+        logger.debug(f"Saved knowledge search snapshot with {len(data['documents'])} documents")
+
+    def load(self) -> bool:
+        """Replace the index with the snapshot on disk. Returns False if none is usable."""
+        if not self.snapshot_path or not Path(self.snapshot_path).exists():
+            return False
+        try:
+            data = json.loads(Path(self.snapshot_path).read_text(encoding="utf-8"))
+            if data.get("version") != SNAPSHOT_VERSION:
+                return False
+            entries = {
+                kid: _IndexedDocument(
+                    terms=doc["terms"],
+                    length=sum(doc["terms"].values()),
+                    disease_name=doc["disease_name"],
+                    content_hash=doc.get("content_hash"),
+                )
+                for kid, doc in data["documents"].items()
+            }
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable knowledge search snapshot: {e}")
+            return False
+        with self._lock:
+            self._docs, self._postings, self._total_length = {}, {}, 0
+            for kid, entry in entries.items():
+                self._add_locked(kid, entry)
+        return True
+
+    def enable_autosave(self) -> None:
+        """Save a snapshot shortly after changes (requires a running event loop)."""
+        self._autosave = True
+
+    def _schedule_save(self) -> None:
+        if not self._autosave or not self.snapshot_path or self._save_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        def run_save() -> None:
+            self._save_handle = None
+            loop.run_in_executor(None, self._save_logged)
+
+        self._save_handle = loop.call_later(SNAPSHOT_DELAY_SECONDS, run_save)
+
+    def _save_logged(self) -> None:
+        try:
+            self.save()
+        except Exception as e:
+            logger.error(f"Failed to save knowledge search snapshot: {e}")
+
+
+def _query_pattern(query: str) -> Optional[re.Pattern]:
+    """Matcher for query terms: CJK runs as substrings, other terms as whole words."""
+    words = {t for t in _WORD_RE.findall(query.lower()) if t}
+    if not words:
+        return None
+    alternatives = sorted(words, key=len, reverse=True)
+    return re.compile(
+        "|".join(
+            re.escape(w) if _CJK_RE.search(w) else rf"\b{re.escape(w)}\b" for w in alternatives
+        ),
+        re.IGNORECASE,
+    )
+
+
+def highlight(content: str, query: str, max_snippets: int = MAX_SNIPPETS) -> List[str]:
+    """Build snippets around query term matches, wrapped in <mark> tags.
+
+    CJK query runs are matched as whole substrings; other terms as
+    case-insensitive words.
+    """
+    pattern = _query_pattern(query)
+    if pattern is None:
+        return []
+    snippets: List[str] = []
+    last_end = -1
+    for match in pattern.finditer(content):
+        if match.start() < last_end:
+            continue
+        start = max(0, match.start() - SNIPPET_CONTEXT_CHARS)
+        end = min(len(content), match.end() + SNIPPET_CONTEXT_CHARS)
+        window = content[start:end]
+        marked = pattern.sub(lambda m: f"{HIGHLIGHT_OPEN}{m.group()}{HIGHLIGHT_CLOSE}", window)
+        prefix = "..." if start > 0 else ""
+        suffix = "..." if end < len(content) else ""
+        snippets.append(f"{prefix}{' '.join(marked.split())}{suffix}")
+        last_end = end
+        if len(snippets) >= max_snippets:
+            break
+    return snippets
+
+
+def section_at(section_index: Optional[List[dict]], position: int) -> Optional[str]:
+    """Title of the indexed section containing a character position."""
+    for entry in section_index or []:
+        if entry["start"] <= position < entry["end"]:
+            return entry["title"]
+    return None
+
+
+def first_match_position(content: str, query: str) -> Optional[int]:
+    """Character position of the first query term in content, matched as in highlight."""
+    pattern = _query_pattern(query)
+    match = pattern.search(content) if pattern else None
+    return match.start() if match else None
+
+
+async def sync_search_index(
+    index: "KnowledgeSearchIndex", documents: Iterable[KnowledgeDocumentResponse]
+) -> Tuple[int, int]:
+    """Reconcile the index with the current documents.
+
+    Documents whose content hash and name match the indexed version are skipped.
+
+    Returns:
+        Tuple of (documents re-indexed, documents removed).
+    """
+    seen = set()
+    reindexed = 0
+    for doc in documents:
+        seen.add(doc.knowledge_id)
+        if index.is_current(doc):
+            continue
+        index.index_document(doc)
+        reindexed += 1
+        await asyncio.sleep(0)  # Keep the event loop responsive on large rebuilds
+    stale = [kid for kid in index.indexed_ids() if kid not in seen]
+    for kid in stale:
+        index.remove_document(kid)
+    return reindexed, len(stale)
+
+
+async def warm_search_index(index: KnowledgeSearchIndex, data_service) -> None:
+    """Load the snapshot, catch up with the data service, then enable autosave.
+
+    Args:
+        index: Index to warm (normally the data service's search index).
+        data_service: DataServiceInterface providing the current documents.
+    """
+    start = time.perf_counter()
+    loaded = await asyncio.to_thread(index.load)
+    documents = await data_service.get_knowledge_documents()
+    reindexed, removed = await sync_search_index(index, documents)
+    if reindexed or removed:
+        await asyncio.to_thread(index.save)
+    index.enable_autosave()
+    logger.info(
+        f"Knowledge search index ready: {len(index)} documents "
+        f"(snapshot {'loaded' if loaded else 'missing'}, {reindexed} re-indexed, {removed} removed) "
+        f"in {(time.perf_counter() - start) * 1000:.0f} ms"
+    )
+
+
+# Singleton instance
+_index_instance: Optional[KnowledgeSearchIndex] = None
+
+
+def get_knowledge_search_index() -> KnowledgeSearchIndex:
+    """Get the process-wide knowledge search index."""
+    global _index_instance
+    if _index_instance is None:
+        _index_instance = KnowledgeSearchIndex(get_settings().knowledge_search_snapshot_path)
+    return _index_instance
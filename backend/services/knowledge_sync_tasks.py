@@ -0,0 +1,278 @@
+"""Knowledge document sync work run through the durable task queue.
+
+Sync (create) and re-sync (replace) of a knowledge document in ElevenLabs are
+queued as tasks instead of FastAPI BackgroundTasks, so a restart mid-sync no
+longer leaves a document in SYNCING: the task's lease expires and another
+worker picks it up. Task payloads carry only identifiers; document content is
+read when the task runs so retries always use the latest version.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from backend.config import get_settings
+from backend.models.schemas import SyncStatus
+from backend.services.data_service import DataServiceInterface, get_data_service
+from backend.services.elevenlabs_service import (
+    ElevenLabsService,
+    ElevenLabsSyncError,
+    get_elevenlabs_service,
+)
+from backend.services.task_queue import TaskQueue, get_task_queue
+from backend.utils.content_hash import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Task kinds
+KNOWLEDGE_SYNC = "knowledge_sync"
+KNOWLEDGE_RESYNC = "knowledge_resync"
+
+
+async def find_reusable_elevenlabs_document(
+    data_service: DataServiceInterface, digest: str, knowledge_id: str
+) -> Optional[str]:
+    """Get the ElevenLabs ID of another synced document with identical content."""
+    for doc in await data_service.get_knowledge_documents_by_elevenlabs_hash(digest):
+        if doc.knowledge_id != knowledge_id and doc.sync_status == SyncStatus.COMPLETED:
+            return doc.elevenlabs_document_id
+    return None
+
+
+async def is_elevenlabs_document_shared(
+    data_service: DataServiceInterface,
+    elevenlabs_id: Optional[str],
+    digest: Optional[str],
+    knowledge_id: str,
+) -> bool:
+    """Check whether another knowledge document still uses this ElevenLabs document.
+
+    Documents only share an ElevenLabs document through content-hash reuse, so
+    candidates are found by the hash of the content it holds.
+    """
+    if not elevenlabs_id or not digest:
+        return False
+    return any(
+        doc.knowledge_id != knowledge_id and doc.elevenlabs_document_id == elevenlabs_id
+        for doc in await data_service.get_knowledge_documents_by_elevenlabs_hash(digest)
+    )
+
+
+async def perform_knowledge_sync(
+    knowledge_id: str,
+    content: str,
+    name: str,
+    data_service: DataServiceInterface,
+    elevenlabs_service: ElevenLabsService,
+) -> str:
+    """Create the document in ElevenLabs and mark it COMPLETED.
+
+    If another document with identical (normalized) content is already synced,
+    its ElevenLabs document is reused instead of uploading a duplicate.
+
+    Returns:
+        str: The ElevenLabs document ID.
+
+    Raises:
+        ElevenLabsSyncError: If ElevenLabs rejects the document.
+    """
+    await data_service.update_knowledge_sync_status(knowledge_id, SyncStatus.SYNCING)
+    digest = content_hash(content)
+    elevenlabs_id = await find_reusable_elevenlabs_document(data_service, digest, knowledge_id)
+    if elevenlabs_id:
+        logger.info(f"Reusing ElevenLabs document {elevenlabs_id} for identical content of {knowledge_id}")
+    else:
+        elevenlabs_id = await asyncio.to_thread(
+            elevenlabs_service.create_document, text=content, name=name
+        )
+    await data_service.update_knowledge_sync_status(
+        knowledge_id, SyncStatus.COMPLETED, elevenlabs_id, content_hash=digest
+    )
+    return elevenlabs_id
+
+
+def _agent_knowledge_base(agent_config: dict) -> List[dict]:
+    """Extract the knowledge base list from an ElevenLabs agent config."""
+    return (
+        agent_config.get("conversation_config", {})
+        .get("agent", {})
+        .get("prompt", {})
+        .get("knowledge_base", [])
+    )
+
+
+async def perform_knowledge_resync(
+    knowledge_id: str,
+    old_elevenlabs_id: Optional[str],
+    content: str,
+    new_name: str,
+    data_service: DataServiceInterface,
+    elevenlabs_service: ElevenLabsService,
+    old_content_hash: Optional[str] = None,
+) -> str:
+    """Replace the ElevenLabs document and mark it COMPLETED.
+
+    The replacement is created first and then swapped into every linked agent
+    in a single knowledge base update per agent, so agents are never left
+    without the document. Agents are updated concurrently (bounded by
+    KNOWLEDGE_RESYNC_CONCURRENCY). The old document is deleted only once no
+    agent references it; if any swap failed it is kept so that agent still
+    has a working knowledge base. As in perform_knowledge_sync, an existing
+    ElevenLabs document with identical content is reused, and the old one is
+    never deleted while another knowledge document shares it.
+
+    Args:
+        old_content_hash: Hash of the content held by the old ElevenLabs
+            document, used to detect other documents sharing it.
+
+    Returns:
+        str: The new ElevenLabs document ID.
+
+    Raises:
+        ElevenLabsSyncError: If creating the replacement document fails.
+    """
+    await data_service.update_knowledge_sync_status(knowledge_id, SyncStatus.SYNCING)
+
+    # 1. Create the replacement (on failure agents still have the old document)
+    digest = content_hash(content)
+    new_elevenlabs_id = await find_reusable_elevenlabs_document(data_service, digest, knowledge_id)
+    if new_elevenlabs_id:
+        logger.info(f"Reusing ElevenLabs document {new_elevenlabs_id} for identical content of {knowledge_id}")
+    else:
+        new_elevenlabs_id = await asyncio.to_thread(
+            elevenlabs_service.create_document, text=content, name=new_name
+        )
+
+    # 2. Swap old -> new in every linked agent
+    linked_agents = await data_service.get_agents_by_knowledge_id(knowledge_id)
+    semaphore = asyncio.Semaphore(get_settings().knowledge_resync_concurrency)
+    new_entry = {"id": new_elevenlabs_id, "name": new_name, "type": "file"}
+
+    async def swap(agent) -> bool:
+        async with semaphore:
+            try:
+                agent_config = await asyncio.to_thread(
+                    elevenlabs_service.get_agent, agent.elevenlabs_agent_id
+                )
+                updated_kb = [
+                    d for d in _agent_knowledge_base(agent_config)
+                    if d.get("id") not in (old_elevenlabs_id, new_elevenlabs_id)
+                ]
+                updated_kb.append(new_entry)
+                await asyncio.to_thread(
+                    elevenlabs_service.update_agent_knowledge_base,
+                    agent.elevenlabs_agent_id,
+                    updated_kb,
+                )
+                return True
+            except Exception as e:
+                logger.error(
+                    f"Failed to swap doc {old_elevenlabs_id} -> {new_elevenlabs_id} "
+                    f"on agent {agent.elevenlabs_agent_id}: {e}"
+                )
+                return False
+
+    swapped = await asyncio.gather(*(swap(agent) for agent in linked_agents))
+
+    # 3. Delete the old document once nothing references it
+    if old_elevenlabs_id and old_elevenlabs_id != new_elevenlabs_id:
+        if await is_elevenlabs_document_shared(
+            data_service, old_elevenlabs_id, old_content_hash, knowledge_id
+        ):
+            logger.info(f"Keeping old ElevenLabs document {old_elevenlabs_id}: shared with another document")
+        elif all(swapped):
+            try:
+                await asyncio.to_thread(elevenlabs_service.delete_document, old_elevenlabs_id)
+            except Exception as e:
+                logger.warning(f"Failed to delete old ElevenLabs document {old_elevenlabs_id}: {e}")
+        else:
+            logger.warning(
+                f"Keeping old ElevenLabs document {old_elevenlabs_id}: "
+                f"{swapped.count(False)} agent(s) still reference it"
+            )
+
+    # 4. Update status to completed with NEW ID
+    await data_service.update_knowledge_sync_status(
+        knowledge_id, SyncStatus.COMPLETED, new_elevenlabs_id, content_hash=digest
+    )
+    return new_elevenlabs_id
+
+
+def sync_failure_message(error: Exception, resync: bool = False) -> str:
+    """Error message stored on a document whose sync failed."""
+    if isinstance(error, ElevenLabsSyncError):
+        return str(error)
+    if resync:
+        return f"Unexpected error during re-sync: {str(error)}"
+    return f"Unexpected error: {str(error)}"
+
+
+async def _handle_sync(payload: Dict[str, Any]) -> None:
+    data_service = get_data_service()
+    doc = await data_service.get_knowledge_document(payload["knowledge_id"])
+    if doc is None:
+        logger.info(f"Skipping sync of deleted knowledge document {payload['knowledge_id']}")
+        return
+    await perform_knowledge_sync(
+        doc.knowledge_id, doc.raw_content, payload["name"], data_service, get_elevenlabs_service()
+    )
+
+
+async def _handle_resync(payload: Dict[str, Any]) -> None:
+    data_service = get_data_service()
+    doc = await data_service.get_knowledge_document(payload["knowledge_id"])
+    if doc is None:
+        logger.info(f"Skipping re-sync of deleted knowledge document {payload['knowledge_id']}")
+        return
+    # Prefer the ID stored now: an earlier queued re-sync may already have replaced it
+    await perform_knowledge_resync(
+        doc.knowledge_id,
+        doc.elevenlabs_document_id or payload.get("old_elevenlabs_id"),
+        doc.raw_content,
+        payload["name"],
+        data_service,
+        get_elevenlabs_service(),
+        old_content_hash=doc.elevenlabs_content_hash,
+    )
+
+
+async def _mark_sync_failed(payload: Dict[str, Any], error: Exception) -> None:
+    await get_data_service().update_knowledge_sync_status(
+        payload["knowledge_id"], SyncStatus.FAILED, error_message=sync_failure_message(error)
+    )
+
+
+async def _mark_resync_failed(payload: Dict[str, Any], error: Exception) -> None:
+    await get_data_service().update_knowledge_sync_status(
+        payload["knowledge_id"],
+        SyncStatus.FAILED,
+        error_message=sync_failure_message(error, resync=True),
+    )
+
+
+def register_knowledge_sync_handlers(queue: TaskQueue) -> None:
+    """Register knowledge sync handlers on a task queue."""
+    queue.register(KNOWLEDGE_SYNC, _handle_sync, on_give_up=_mark_sync_failed)
+    queue.register(KNOWLEDGE_RESYNC, _handle_resync, on_give_up=_mark_resync_failed)
+
+
+async def enqueue_knowledge_sync(
+    knowledge_id: str, name: str, queue: Optional[TaskQueue] = None
+) -> None:
+    """Queue creation of a knowledge document in ElevenLabs."""
+    await (queue or get_task_queue()).enqueue(
+        KNOWLEDGE_SYNC, {"knowledge_id": knowledge_id, "name": name}
+    )
+
+
+async def enqueue_knowledge_resync(
+    knowledge_id: str,
+    old_elevenlabs_id: Optional[str],
+    name: str,
+    queue: Optional[TaskQueue] = None,
+) -> None:
+    """Queue replacement of a knowledge document in ElevenLabs."""
+    await (queue or get_task_queue()).enqueue(
+        KNOWLEDGE_RESYNC,
+        {"knowledge_id": knowledge_id, "old_elevenlabs_id": old_elevenlabs_id, "name": name},
+    )
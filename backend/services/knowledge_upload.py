@@ -0,0 +1,123 @@
+"""Streaming ingestion of uploaded knowledge files.
+
+Multipart uploads are read in fixed-size chunks and rejected as soon as
+they pass the byte or character limit. Each chunk is decoded and normalized
+by StreamingTextExtractor, which also builds the sections and content hash
+as it goes. The normalized text becomes the document's raw_content, so it is
+held in memory (at most KNOWLEDGE_CONTENT_MAX_CHARS) and uploaded to storage
+once the whole file has been read.
+"""
+
+import asyncio
+import logging
+import uuid
+from pathlib import PurePath
+from typing import List, Tuple
+
+from fastapi import UploadFile
+
+from backend.models.schemas import KNOWLEDGE_CONTENT_MAX_CHARS
+from backend.services.storage_service import StorageService
+from backend.utils.text_extraction import ExtractedText, StreamingTextExtractor, upload_content_type
+
+logger = logging.getLogger(__name__)
+
+# Storage prefix for uploaded knowledge files
+KNOWLEDGE_UPLOAD_PREFIX = "knowledge"
+
+
+class KnowledgeUploadError(Exception):
+    """Raised when an uploaded knowledge file cannot be ingested."""
+
+    def __init__(self, message: str, error_type: str):
+        """Initialize the error.
+
+        Args:
+            message: Human-readable reason.
+            error_type: One of "too_large", "unsupported_type", "invalid_content".
+        """
+        super().__init__(message)
+        self.message = message
+        self.error_type = error_type
+
+
+async def ingest_knowledge_upload(
+    upload: UploadFile,
+    storage: StorageService,
+    max_bytes: int,
+    chunk_size: int,
+    max_chars: int = KNOWLEDGE_CONTENT_MAX_CHARS,
+) -> Tuple[str, ExtractedText]:
+    """Decode, normalize and store an uploaded markdown or plain-text file.
+
+    Args:
+        upload: The multipart file.
+        storage: Storage service the normalized text is written to.
+        max_bytes: Maximum accepted upload size in bytes.
+        chunk_size: Bytes read from the upload per iteration.
+        max_chars: Maximum normalized text length, as for JSON-created documents.
+
+    Returns:
+        Tuple of (normalized text, extraction results with source_path set).
+
+    Raises:
+        KnowledgeUploadError: If the file or its text is too large, of an
+            unsupported type, not UTF-8 text, or empty. Nothing is stored then.
+    """
+    content_type = upload_content_type(upload.filename, upload.content_type)
+    if content_type is None:
+        raise KnowledgeUploadError(
+            f"Unsupported file type for '{upload.filename}'. Upload a .md or .txt file.",
+            "unsupported_type",
+        )
+    if upload.size is not None and upload.size > max_bytes:
+        raise KnowledgeUploadError(_too_large_message(max_bytes), "too_large")
+
+    extractor = StreamingTextExtractor()
+    pieces: List[str] = []
+    char_count = 0
+    try:
+        while chunk := await upload.read(chunk_size):
+            if extractor.byte_size + len(chunk) > max_bytes:
+                raise KnowledgeUploadError(_too_large_message(max_bytes), "too_large")
+            text = extractor.feed(chunk)
+            char_count += len(text)
+            if char_count > max_chars:
+                raise KnowledgeUploadError(_too_long_message(max_chars), "too_large")
+            if text:
+                pieces.append(text)
+        tail, extracted = extractor.close()
+    except UnicodeDecodeError as e:
+        raise KnowledgeUploadError("File is not valid UTF-8 text", "invalid_content") from e
+    if char_count + len(tail) > max_chars:
+        raise KnowledgeUploadError(_too_long_message(max_chars), "too_large")
+    pieces.append(tail)
+    if not extractor.has_text:
+        raise KnowledgeUploadError("File contains no text", "invalid_content")
+
+    normalized = "".join(pieces)
+    suffix = PurePath(upload.filename or "").suffix.lower() or (
+        ".md" if content_type == "text/markdown" else ".txt"
+    )
+    storage_path = f"{KNOWLEDGE_UPLOAD_PREFIX}/{uuid.uuid4()}{suffix}"
+    await asyncio.to_thread(
+        storage.upload_file,
+        normalized.encode("utf-8"),
+        storage_path,
+        f"{content_type}; charset=utf-8",
+    )
+
+    extracted.source_path = storage_path
+    logger.info(
+        f"Ingested knowledge upload '{upload.filename}' ({extracted.byte_size} bytes, "
+        f"{len(extracted.section_index)} sections) to {storage_path}"
+    )
+    return normalized, extracted
+
+
+def _too_large_message(max_bytes: int) -> str:
+    return f"File exceeds the {max_bytes // 1024} KB upload limit"
+
+
+def _too_long_message(max_chars: int) -> str:
+    return f"Text exceeds the {max_chars}-character document limit"
@@ -1,13 +1,17 @@
 from typing import TypedDict, Optional, Any, Callable, AsyncGenerator
+from typing_extensions import NotRequired
 from langgraph.graph import StateGraph, END
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage, HumanMessage
+import asyncio
 import logging
 import os
+import threading
 import time
 import traceback
 import functools
 import uuid
+from contextvars import ContextVar, Token
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
@@ -57,19 +61,36 @@ class WorkflowTrace:
             self.status = "completed"
 
 
-# Global trace storage for the current execution
-_current_trace: Optional[WorkflowTrace] = None
+# Trace for the current execution. A ContextVar (rather than a module global)
+# gives each request/task its own trace, so concurrent workflows never record
+# steps into each other's WorkflowTrace.
+_current_trace: ContextVar[Optional[WorkflowTrace]] = ContextVar(
+    "current_workflow_trace", default=None
+)
+
+# Per-node overhead budget for trace_node (excluding the wrapped node's own
+# work). Checked by tests and scripts/benchmark--trace-overhead.py.
+TRACE_NODE_OVERHEAD_BUDGET_MS = 0.2
 
 
 def get_current_trace() -> Optional[WorkflowTrace]:
-    """Get the current workflow trace."""
-    return _current_trace
+    """Get the workflow trace for the current execution context."""
+    return _current_trace.get()
+
+
+def set_current_trace(trace: Optional[WorkflowTrace]) -> Token:
+    """Set the workflow trace for the current execution context.
+
+    Returns:
+        Token that can be passed to reset_current_trace() to restore the
+        previous value.
+    """
+    return _current_trace.set(trace)
 
 
-def set_current_trace(trace: Optional[WorkflowTrace]) -> None:
-    """Set the current workflow trace."""
-    global _current_trace
-    _current_trace = trace
+def reset_current_trace(token: Token) -> None:
+    """Restore the trace that was current before set_current_trace()."""
+    _current_trace.reset(token)
 
 
 def trace_node(func: Callable) -> Callable:
@@ -209,12 +230,110 @@ def trace_node(func: Callable) -> Callable:
             raise
     
     # Return appropriate wrapper based on function type
-    import asyncio
     if asyncio.iscoroutinefunction(func):
         return async_wrapper
     return sync_wrapper
 
 
+# ============================================================================
+# Shared LLM client pool
+# ============================================================================
+# Building a ChatGoogleGenerativeAI client (and its HTTP/TLS session) costs tens
+# of milliseconds, so clients are created once per configuration and reused.
+
+LLMPoolKey = tuple[str, float, int, bool, str]
+
+# Sampling temperature used for script generation (also part of the script cache key)
+SCRIPT_GENERATION_TEMPERATURE = 0.7
+
+_llm_pool: dict[LLMPoolKey, Any] = {}
+_llm_pool_lock = threading.Lock()
+
+
+def _default_llm_factory(
+    model_name: str,
+    api_key: str,
+    temperature: float,
+    max_output_tokens: int,
+    streaming: bool,
+) -> Any:
+    """Build a new Gemini chat client for the given configuration."""
+    if streaming:
+        return ChatGoogleGenerativeAI(
+            model=model_name,
+            google_api_key=api_key,
+            temperature=temperature,
+            streaming=True,  # Enable streaming mode
+            max_output_tokens=max_output_tokens,
+        )
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        google_api_key=api_key,
+        temperature=temperature,
+        timeout=30,  # 30 second timeout for API calls
+        max_retries=2,  # Retry on transient failures
+        max_output_tokens=max_output_tokens,
+    )
+
+
+_llm_factory: Callable[..., Any] = _default_llm_factory
+
+
+def set_llm_factory(factory: Optional[Callable[..., Any]]) -> None:
+    """Replace the LLM client factory (None restores the Gemini default).
+
+    Intended for tests and benchmarks that substitute a fake chat model.
+    Clears the pool so no client built by the previous factory is reused.
+    """
+    global _llm_factory
+    _llm_factory = factory or _default_llm_factory
+    clear_llm_pool()
+
+
+def clear_llm_pool() -> None:
+    """Drop all pooled LLM clients."""
+    with _llm_pool_lock:
+        _llm_pool.clear()
+
+
+def get_llm_client(
+    model_name: str,
+    api_key: str,
+    temperature: float = 0.7,
+    max_output_tokens: int = 4096,
+    streaming: bool = False,
+) -> Any:
+    """Get a pooled chat client for (model, temperature, max tokens, streaming).
+
+    Clients are keyed by configuration plus API key, so a rotated key never
+    reuses a client bound to the old one.
+    """
+    key: LLMPoolKey = (model_name, temperature, max_output_tokens, streaming, api_key)
+    client = _llm_pool.get(key)
+    if client is not None:
+        return client
+
+    with _llm_pool_lock:
+        client = _llm_pool.get(key)
+        if client is None:
+            # The library reads GOOGLE_API_KEY as a fallback; set it only when it changes
+            if os.environ.get("GOOGLE_API_KEY") != api_key:
+                os.environ["GOOGLE_API_KEY"] = api_key
+            client = _llm_factory(
+                model_name=model_name,
+                api_key=api_key,
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                streaming=streaming,
+            )
+            _llm_pool[key] = client
+            logger.info(
+                f"Created pooled LLM client: model={model_name}, streaming={streaming} "
+                f"(pool size {len(_llm_pool)})"
+            )
+    return client
+
+
 class ScriptGenerationState(TypedDict):
     """State for LangGraph script generation workflow."""
     knowledge_content: str
@@ -222,16 +341,221 @@ class ScriptGenerationState(TypedDict):
     model_name: str
     generated_script: str
     error: Optional[str]
+    # Optional header -> content map from the knowledge document, used for chunking
+    structured_sections: NotRequired[Optional[dict]]
+    # Map-reduce intermediates (empty for documents small enough for one pass)
+    context_chunks: NotRequired[list[str]]
+    section_summaries: NotRequired[list[str]]
+
+
+# ============================================================================
+# Map-reduce for large knowledge documents
+# ============================================================================
+# Documents above MAP_REDUCE_THRESHOLD_CHARS are split into chunks (by section
+# where possible), each chunk is condensed by the model in parallel, and the
+# final script is generated from the condensed notes.
+
+MAP_REDUCE_THRESHOLD_CHARS = 40_000
+MAP_CHUNK_MAX_CHARS = 20_000
+MAP_MAX_CONCURRENCY = 4
+MAP_SUMMARY_TEMPERATURE = 0.2
+MAP_SUMMARY_MAX_OUTPUT_TOKENS = 1024
+LLM_CALL_TIMEOUT_SECONDS = 35.0  # Slightly longer than LLM timeout to let it handle retries
+
+SECTION_SUMMARY_PROMPT = (
+    "You are preparing notes for a patient education script writer. "
+    "Condense the following section of a medical knowledge document into concise "
+    "notes. Keep every clinically relevant fact, instruction, number, warning and "
+    "term; drop repetition and formatting. Answer in the language of the section."
+)
+
+
+def _split_text(text: str, max_chars: int) -> list[str]:
+    """Split text into pieces of at most max_chars, preferring paragraph breaks."""
+    text = text.strip()
+    if not text:
+        return []
+    pieces = []
+    while len(text) > max_chars:
+        cut = text.rfind("\n\n", 0, max_chars)
+        if cut <= 0:
+            cut = text.rfind("\n", 0, max_chars)
+        if cut <= 0:
+            cut = text.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(text[:cut].strip())
+        text = text[cut:].strip()
+    if text:
+        pieces.append(text)
+    return pieces
+
+
+def chunk_knowledge_content(
+    content: str,
+    structured_sections: Optional[dict] = None,
+    max_chars: int = MAP_CHUNK_MAX_CHARS,
+) -> list[str]:
+    """Split knowledge content into chunks for the map stage.
+
+    Sections are packed together in document order until a chunk would exceed
+    max_chars; oversized sections are split on paragraph boundaries. Without
+    structured sections the raw content is split the same way.
+
+    Args:
+        content: Raw knowledge document content.
+        structured_sections: Optional header -> section content map.
+        max_chars: Maximum characters per chunk.
+
+    Returns:
+        List of chunk strings in document order.
+    """
+    if not structured_sections:
+        return _split_text(content, max_chars)
+
+    chunks: list[str] = []
+    current = ""
+    for title, body in structured_sections.items():
+        body = str(body or "").strip()
+        if not body:
+            continue
+        for piece in _split_text(f"## {title}\n{body}", max_chars):
+            if current and len(current) + len(piece) + 2 > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _normalize_content(content: Any) -> str:
+    """Normalize response content: some models return a list of content blocks."""
+    if isinstance(content, list):
+        # Extract text from content blocks (e.g., [{"type": "text", "text": "..."}])
+        text_parts = []
+        for item in content:
+            if isinstance(item, dict) and "text" in item:
+                text_parts.append(item["text"])
+            elif isinstance(item, str):
+                text_parts.append(item)
+        return "".join(text_parts) if text_parts else str(content)
+    return content
+
+
+async def summarize_chunks(
+    chunks: list[str],
+    model_name: str,
+    api_key: str,
+    max_concurrency: int = MAP_MAX_CONCURRENCY,
+) -> list[str]:
+    """Condense chunks in parallel with bounded concurrency (the map stage).
+
+    Args:
+        chunks: Chunks produced by chunk_knowledge_content().
+        model_name: Gemini model to use.
+        api_key: Google API key.
+        max_concurrency: Maximum simultaneous model calls.
+
+    Returns:
+        One summary per chunk, in the same order.
+
+    Raises:
+        asyncio.TimeoutError: If a chunk is not summarized in time.
+        Exception: Any model error for a chunk.
+    """
+    llm = get_llm_client(
+        model_name,
+        api_key,
+        temperature=MAP_SUMMARY_TEMPERATURE,
+        max_output_tokens=MAP_SUMMARY_MAX_OUTPUT_TOKENS,
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def summarize(index: int, chunk: str) -> str:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await asyncio.wait_for(
+                llm.ainvoke([
+                    SystemMessage(content=SECTION_SUMMARY_PROMPT),
+                    HumanMessage(content=chunk),
+                ]),
+                timeout=LLM_CALL_TIMEOUT_SECONDS,
+            )
+            logger.debug(
+                f"Summarized chunk {index + 1}/{len(chunks)} ({len(chunk)} chars) "
+                f"in {int((time.perf_counter() - start) * 1000)}ms"
+            )
+            return _normalize_content(response.content)
+
+    return list(await asyncio.gather(*(summarize(i, c) for i, c in enumerate(chunks))))
+
+
+def build_generation_message(content: str, section_summaries: Optional[list[str]] = None) -> str:
+    """Build the human message for the final (reduce) generation call."""
+    if section_summaries:
+        notes = "\n\n".join(
+            f"[Part {i + 1}]\n{summary}" for i, summary in enumerate(section_summaries)
+        )
+        return (
+            "The knowledge document is long, so it has been condensed part by part. "
+            f"Here are the condensed notes for the whole document:\n\n{notes}"
+        )
+    return f"Here is the knowledge document content:\n\n{content}"
 
 
 async def prepare_context_node(state: ScriptGenerationState) -> dict:
-    """Prepare context for generation."""
-    # Placeholder for any preprocessing (e.g. text cleaning, truncation)
-    return {}
+    """Split large documents into chunks for the map stage.
+
+    Documents at or below MAP_REDUCE_THRESHOLD_CHARS are generated in a single
+    pass and produce no chunks.
+    """
+    content = state["knowledge_content"]
+    if len(content) <= MAP_REDUCE_THRESHOLD_CHARS:
+        return {"context_chunks": []}
+
+    chunks = chunk_knowledge_content(content, state.get("structured_sections"))
+    logger.info(f"Split {len(content)} chars of knowledge content into {len(chunks)} chunks")
+    return {"context_chunks": chunks}
+
+
+def route_after_prepare(state: ScriptGenerationState) -> str:
+    """Route to the map stage only when the content was chunked."""
+    return "summarize_sections" if state.get("context_chunks") else "generate_script"
+
+
+async def summarize_sections_node(state: ScriptGenerationState) -> dict:
+    """Summarize each chunk in parallel (map stage)."""
+    chunks = state.get("context_chunks") or []
+    model_name = state["model_name"]
+    settings = get_settings()
+    api_key = settings.google_api_key
+
+    if not api_key:
+        if settings.use_mock_data:
+            return {"section_summaries": [chunk[:200] for chunk in chunks]}
+        return {"error": "Google API key not configured"}
+
+    try:
+        summaries = await summarize_chunks(chunks, model_name, api_key)
+        logger.info(f"Summarized {len(chunks)} chunks with model {model_name}")
+        return {"section_summaries": summaries}
+    except asyncio.TimeoutError:
+        logger.error(f"Gemini API timeout while summarizing sections with model {model_name}")
+        return {
+            "error": f"API timeout: Model '{model_name}' did not summarize a section within "
+                     f"{int(LLM_CALL_TIMEOUT_SECONDS)} seconds."
+        }
+    except Exception as e:
+        error_type = type(e).__name__
+        logger.error(f"Section summarization failed with {error_type}: {e}", exc_info=True)
+        return {"error": f"{error_type}: {str(e) or repr(e)}"}
 
 
 async def generate_script_node(state: ScriptGenerationState) -> dict:
-    """Generate script using Google Gemini."""
+    """Generate script using Google Gemini (the reduce stage for large documents)."""
+    if state.get("error"):
+        return {}
     try:
         model_name = state["model_name"]
         prompt = state["prompt"]
@@ -249,33 +573,24 @@ async def generate_script_node(state: ScriptGenerationState) -> dict:
 
         # Debug: Log key status (masked)
         masked_key = f"{api_key[:4]}...{api_key[-4:]}" if api_key else "None"
-        logger.info(f"Initiating ChatGoogleGenerativeAI with model: {model_name}, Key: {masked_key}")
-        
-        # Explicitly set env var as fallback for the library
-        if api_key:
-            os.environ["GOOGLE_API_KEY"] = api_key
+        logger.info(f"Generating script with model: {model_name}, Key: {masked_key}")
 
-        llm = ChatGoogleGenerativeAI(
-            model=model_name,
-            google_api_key=api_key,
-            temperature=0.7,
-            timeout=30,  # 30 second timeout for API calls
-            max_retries=2,  # Retry on transient failures
-            max_output_tokens=4096,  # Allow for much longer script generation
+        # Allow for much longer script generation
+        llm = get_llm_client(
+            model_name, api_key, temperature=SCRIPT_GENERATION_TEMPERATURE, max_output_tokens=4096
         )
         
         # Determine strictness? For now simple prompt
         messages = [
             SystemMessage(content=prompt),
-            HumanMessage(content=f"Here is the knowledge document content:\n\n{content}")
+            HumanMessage(content=build_generation_message(content, state.get("section_summaries")))
         ]
         
         # Use asyncio timeout as additional protection
-        import asyncio
         try:
             response = await asyncio.wait_for(
                 llm.ainvoke(messages),
-                timeout=35.0  # Slightly longer than LLM timeout to let it handle retries
+                timeout=LLM_CALL_TIMEOUT_SECONDS
             )
         except asyncio.TimeoutError:
             logger.error(f"Gemini API timeout after 35s for model {model_name}")
@@ -284,19 +599,7 @@ async def generate_script_node(state: ScriptGenerationState) -> dict:
                          "Please verify your API key or try a different model."
             }
         
-        # Normalize response content: some models return a list of content blocks
-        content = response.content
-        if isinstance(content, list):
-            # Extract text from content blocks (e.g., [{"type": "text", "text": "..."}])
-            text_parts = []
-            for item in content:
-                if isinstance(item, dict) and "text" in item:
-                    text_parts.append(item["text"])
-                elif isinstance(item, str):
-                    text_parts.append(item)
-            content = "".join(text_parts) if text_parts else str(content)
-        
-        return {"generated_script": content}
+        return {"generated_script": _normalize_content(response.content)}
     except Exception as e:
         # Improved error handling with detailed logging and meaningful error messages
         error_type = type(e).__name__
@@ -335,11 +638,18 @@ def create_script_generation_graph():
     workflow = StateGraph(ScriptGenerationState)
     
     workflow.add_node("prepare_context", prepare_context_node)
+    workflow.add_node("summarize_sections", summarize_sections_node)
     workflow.add_node("generate_script", generate_script_node)
     workflow.add_node("post_process", post_process_node)
     
     workflow.set_entry_point("prepare_context")
-    workflow.add_edge("prepare_context", "generate_script")
+    # Large documents go through the map stage; small ones skip straight to generation
+    workflow.add_conditional_edges(
+        "prepare_context",
+        route_after_prepare,
+        ["summarize_sections", "generate_script"],
+    )
+    workflow.add_edge("summarize_sections", "generate_script")
     workflow.add_edge("generate_script", "post_process")
     workflow.add_edge("post_process", END)
     
@@ -361,22 +671,46 @@ def create_traced_script_generation_graph():
     
     # Wrap nodes with tracing
     workflow.add_node("prepare_context", trace_node(prepare_context_node))
+    workflow.add_node("summarize_sections", trace_node(summarize_sections_node))
     workflow.add_node("generate_script", trace_node(generate_script_node))
     workflow.add_node("post_process", trace_node(post_process_node))
     
     workflow.set_entry_point("prepare_context")
-    workflow.add_edge("prepare_context", "generate_script")
+    # Large documents go through the map stage; small ones skip straight to generation
+    workflow.add_conditional_edges(
+        "prepare_context",
+        route_after_prepare,
+        ["summarize_sections", "generate_script"],
+    )
+    workflow.add_edge("summarize_sections", "generate_script")
     workflow.add_edge("generate_script", "post_process")
     workflow.add_edge("post_process", END)
     
     return workflow.compile()
 
 
+# Compiled graphs are immutable and hold no per-request state, so both variants
+# are built once at import and shared by every request.
+_script_generation_graph = create_script_generation_graph()
+_traced_script_generation_graph = create_traced_script_generation_graph()
+
+
+def get_script_generation_graph():
+    """Get the shared compiled (untraced) script generation graph."""
+    return _script_generation_graph
+
+
+def get_traced_script_generation_graph():
+    """Get the shared compiled script generation graph with tracing enabled."""
+    return _traced_script_generation_graph
+
+
 async def run_traced_workflow(
     knowledge_content: str,
     prompt: str,
     model_name: str,
     session_id: Optional[str] = None,
+    structured_sections: Optional[dict] = None,
 ) -> tuple[dict, WorkflowTrace]:
     """Run the script generation workflow with full tracing.
     
@@ -385,6 +719,7 @@ async def run_traced_workflow(
         prompt: The generation prompt.
         model_name: The Gemini model to use.
         session_id: Optional session ID to associate the trace with.
+        structured_sections: Optional section map used to chunk large documents.
         
     Returns:
         Tuple of (final_state, workflow_trace)
@@ -405,11 +740,11 @@ async def run_traced_workflow(
         }
     )
     
-    # Set current trace for nodes to use
-    set_current_trace(trace)
+    # Set current trace for nodes to use (scoped to this task's context)
+    token = set_current_trace(trace)
     
     try:
-        graph = create_traced_script_generation_graph()
+        graph = get_traced_script_generation_graph()
         
         initial_state: ScriptGenerationState = {
             "knowledge_content": knowledge_content,
@@ -417,6 +752,7 @@ async def run_traced_workflow(
             "model_name": model_name,
             "generated_script": "",
             "error": None,
+            "structured_sections": structured_sections,
         }
         
         result = await graph.ainvoke(initial_state)
@@ -433,7 +769,7 @@ async def run_traced_workflow(
         raise
         
     finally:
-        set_current_trace(None)
+        reset_current_trace(token)
 
 
 def post_process_script(script: str) -> str:
@@ -456,6 +792,7 @@ async def generate_script_stream(
     knowledge_content: str,
     prompt: str,
     model_name: str,
+    structured_sections: Optional[dict] = None,
 ) -> AsyncGenerator[dict, None]:
     """Stream script generation tokens from the LLM.
     
@@ -467,6 +804,8 @@ async def generate_script_stream(
         knowledge_content: The knowledge document content to process.
         prompt: The system prompt for script generation.
         model_name: The Gemini model to use.
+        structured_sections: Optional header -> content map used to chunk
+            large documents before the streamed (reduce) generation.
         
     Yields:
         dict events with one of these types:
@@ -493,21 +832,30 @@ async def generate_script_stream(
     masked_key = f"{api_key[:4]}...{api_key[-4:]}" if api_key else "None"
     logger.info(f"Starting streaming generation with model: {model_name}, Key: {masked_key}")
     
-    # Set env var as fallback for the library
-    os.environ["GOOGLE_API_KEY"] = api_key
-    
     try:
-        llm = ChatGoogleGenerativeAI(
-            model=model_name,
-            google_api_key=api_key,
-            temperature=0.7,
-            streaming=True,  # Enable streaming mode
-            max_output_tokens=4096,  # Allow for much longer script generation
+        llm = get_llm_client(
+            model_name,
+            api_key,
+            temperature=SCRIPT_GENERATION_TEMPERATURE,
+            max_output_tokens=4096,
+            streaming=True,
         )
         
+        # Large documents are condensed first (map stage); only the final
+        # generation is streamed
+        section_summaries = None
+        if len(knowledge_content) > MAP_REDUCE_THRESHOLD_CHARS:
+            chunks = chunk_knowledge_content(knowledge_content, structured_sections)
+            map_start = time.perf_counter()
+            section_summaries = await summarize_chunks(chunks, model_name, api_key)
+            logger.info(
+                f"Summarized {len(chunks)} chunks in "
+                f"{int((time.perf_counter() - map_start) * 1000)}ms before streaming"
+            )
+        
         messages = [
             SystemMessage(content=prompt),
-            HumanMessage(content=f"Here is the knowledge document content:\n\n{knowledge_content}")
+            HumanMessage(content=build_generation_message(knowledge_content, section_summaries))
         ]
         
         full_content = ""
@@ -1,9 +1,10 @@
 """Service for managing patient conversation sessions."""
 
+import base64
 import logging
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 from backend.models.schemas import (
     PatientSessionCreate,
@@ -17,6 +18,15 @@ from backend.services.data_service import get_data_service, DataServiceInterface
 from backend.services.elevenlabs_service import get_elevenlabs_service, ElevenLabsServiceError
 from backend.services.conversation_service import ConversationService
 from backend.services.websocket_manager import get_connection_manager, WebSocketConnectionManager
+from backend.services.session_affinity import (
+    SessionRegistry,
+    SessionForwardError,
+    get_session_registry,
+    get_instance_id,
+    build_local_owner,
+    forward_message,
+    forward_close,
+)
 
 class PatientService:
     """Service for managing patient conversation sessions."""
@@ -27,6 +37,7 @@ class PatientService:
         elevenlabs_service=None,
         conversation_service: Optional[ConversationService] = None,
         connection_manager: Optional[WebSocketConnectionManager] = None,
+        session_registry: Optional[SessionRegistry] = None,
     ):
         """Initialize the service.
         
@@ -35,11 +46,13 @@ class PatientService:
             elevenlabs_service: Optional ElevenLabs service injection.
             conversation_service: Optional conversation service injection.
             connection_manager: Optional WebSocket connection manager injection.
+            session_registry: Optional session-ownership registry injection.
         """
         self.data_service = data_service or get_data_service()
         self.elevenlabs_service = elevenlabs_service or get_elevenlabs_service()
         self.conversation_service = conversation_service or ConversationService()
         self.connection_manager = connection_manager or get_connection_manager()
+        self.session_registry = session_registry or get_session_registry()
 
     async def create_session(self, request: PatientSessionCreate) -> PatientSessionResponse:
         """Create a new patient conversation session.
@@ -81,6 +94,12 @@ class PatientService:
                 language=primary_lang
             )
             logging.info(f"WebSocket connection established for session {session_id} (lang: {primary_lang})")
+
+            # Record this instance as the owner so other instances can forward to it
+            try:
+                await self.session_registry.register(build_local_owner(session_id))
+            except Exception as e:
+                logging.warning(f"Failed to register owner for session {session_id}: {e}")
         except Exception as e:
             logging.error(f"Failed to create WebSocket connection for session {session_id}: {e}")
             # Continue without persistent connection - will fall back to one-shot mode
@@ -145,11 +164,15 @@ class PatientService:
                     session_id, message, text_only=chat_mode
                 )
             else:
-                # Fallback to one-shot connection (legacy behavior)
-                logging.warning(f"No persistent connection for session {session_id}, using one-shot")
-                response_text, audio_bytes = await self.elevenlabs_service.send_text_message(
-                    agent.elevenlabs_agent_id, message, text_only=chat_mode
-                )
+                forwarded = await self._forward_to_owner(session_id, message, chat_mode)
+                if forwarded is not None:
+                    response_text, audio_bytes = forwarded
+                else:
+                    # Fallback to one-shot connection (legacy behavior)
+                    logging.warning(f"No persistent connection for session {session_id}, using one-shot")
+                    response_text, audio_bytes = await self.elevenlabs_service.send_text_message(
+                        agent.elevenlabs_agent_id, message, text_only=chat_mode
+                    )
         except Exception as e:
             logging.error(f"Failed to get response from ElevenLabs for session {session_id}: {e}")
             # Graceful degradation: return text-only fallback
@@ -160,7 +183,6 @@ class PatientService:
             audio_bytes = None
         
         # Convert audio bytes to base64 if needed by Schema
-        import base64
         audio_b64 = base64.b64encode(audio_bytes).decode('utf-8') if audio_bytes else None
 
         # Log agent message
@@ -181,6 +203,38 @@ class PatientService:
             timestamp=datetime.now()
         )
 
+    async def _get_remote_owner(self, session_id: str):
+        """Return the session's owner if it is another instance, else None."""
+        try:
+            owner = await self.session_registry.get_owner(session_id)
+        except Exception as e:
+            logging.warning(f"Failed to look up owner for session {session_id}: {e}")
+            return None
+        if owner and owner.instance_id != get_instance_id():
+            return owner
+        return None
+
+    async def _forward_to_owner(
+        self, session_id: str, message: str, chat_mode: bool
+    ) -> Optional[Tuple[str, Optional[bytes]]]:
+        """Forward a message to the instance holding the session's connection.
+
+        Returns:
+            (response_text, audio_bytes) from the owner, or None if the session
+            has no remote owner or forwarding failed.
+        """
+        owner = await self._get_remote_owner(session_id)
+        if not owner:
+            return None
+        try:
+            logging.info(f"Forwarding session {session_id} message to owner {owner.instance_id}")
+            response_text, audio_b64 = await forward_message(owner, message, text_only=chat_mode)
+        except SessionForwardError as e:
+            logging.warning(f"{e}; falling back to one-shot")
+            return None
+        audio_bytes = base64.b64decode(audio_b64) if audio_b64 else None
+        return response_text, audio_bytes
+
     async def end_session(self, session_id: str) -> SessionEndResponse:
         """End a patient session.
 
@@ -190,9 +244,21 @@ class PatientService:
         Returns:
             SessionEndResponse: The end session result.
         """
-        # Close WebSocket connection first
-        await self.connection_manager.close_connection(session_id)
-        logging.info(f"WebSocket connection closed for session {session_id}")
+        # Close WebSocket connection first (on the owning instance if it is not us)
+        if self.connection_manager.has_connection(session_id):
+            await self.connection_manager.close_connection(session_id)
+            logging.info(f"WebSocket connection closed for session {session_id}")
+        else:
+            owner = await self._get_remote_owner(session_id)
+            if owner:
+                try:
+                    await forward_close(owner)
+                    logging.info(f"Closed session {session_id} on owner {owner.instance_id}")
+                except SessionForwardError as e:
+                    logging.warning(str(e))
+            else:
+                await self.connection_manager.close_connection(session_id)
+        await self.session_registry.release(session_id)
         
         session = await self.data_service.get_patient_session(session_id)
         if not session:
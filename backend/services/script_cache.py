@@ -0,0 +1,227 @@
+"""Result cache for AI script generation.
+
+Generating a script costs a 30-60 s Gemini call, yet the same knowledge
+document rendered with the same template combination always produces the same
+prompt. Results are cached under a hash of (raw content, built prompt, model,
+temperature) so repeat requests are served immediately.
+
+Two backends are provided:
+- LocalScriptCache: in-process cache for single-instance and test setups.
+- FirestoreScriptCache: shared cache for multi-instance deployments.
+
+Caching is opt-in via SCRIPT_CACHE_ENABLED.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, Optional
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Firestore collection holding cached scripts
+SCRIPT_CACHE = "script_cache"
+
+# Approximate size of each replayed token event on a streaming cache hit
+REPLAY_CHUNK_CHARS = 64
+
+
+@dataclass
+class CachedScript:
+    """A generated script stored in the cache."""
+
+    cache_key: str
+    script: str
+    model_used: str
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    expires_at: Optional[datetime] = None
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        """Check whether this entry has passed its expiry time."""
+        if self.expires_at is None:
+            return False
+        return (now or datetime.now(timezone.utc)) >= self.expires_at
+
+
+def build_cache_key(raw_content: str, prompt: str, model_name: str, temperature: float) -> str:
+    """Build a stable cache key for a script generation request.
+
+    Args:
+        raw_content: Knowledge document content sent to the model.
+        prompt: Fully built system prompt.
+        model_name: API model name.
+        temperature: Sampling temperature.
+
+    Returns:
+        str: SHA-256 hex digest identifying the request.
+    """
+    # JSON encoding keeps field boundaries unambiguous
+    payload = json.dumps(
+        [raw_content, prompt, model_name, float(temperature)], ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def iter_replay_chunks(script: str, chunk_chars: int = REPLAY_CHUNK_CHARS) -> Iterator[str]:
+    """Split a cached script into token-sized chunks for streaming replay.
+
+    Chunks break on word boundaries and concatenate back to the exact script.
+    """
+    buffer = ""
+    for piece in re.findall(r"\s*\S+\s*", script):
+        buffer += piece
+        if len(buffer) >= chunk_chars:
+            yield buffer
+            buffer = ""
+    if buffer:
+        yield buffer
+
+
+class ScriptCache(ABC):
+    """Abstract store for generated scripts."""
+
+    @abstractmethod
+    async def get(self, cache_key: str) -> Optional[CachedScript]:
+        """Get an unexpired cached script, or None on a miss."""
+        pass
+
+    @abstractmethod
+    async def set(self, entry: CachedScript) -> None:
+        """Store (or overwrite) a cached script."""
+        pass
+
+    @abstractmethod
+    async def delete(self, cache_key: str) -> None:
+        """Remove a cached script."""
+        pass
+
+
+class LocalScriptCache(ScriptCache):
+    """In-process cache used when the Firestore backend is not selected."""
+
+    def __init__(self, max_entries: int = 256):
+        """Initialize with empty in-memory storage.
+
+        Args:
+            max_entries: Oldest entries are evicted beyond this size.
+        """
+        self._entries: Dict[str, CachedScript] = {}
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    async def get(self, cache_key: str) -> Optional[CachedScript]:
+        """Get a cached script from memory, dropping it if expired."""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry.is_expired():
+                del self._entries[cache_key]
+                return None
+            return entry
+
+    async def set(self, entry: CachedScript) -> None:
+        """Store a cached script in memory."""
+        with self._lock:
+            self._entries.pop(entry.cache_key, None)
+            self._entries[entry.cache_key] = entry
+            while len(self._entries) > self._max_entries:
+                # Dicts preserve insertion order, so the first key is the oldest
+                del self._entries[next(iter(self._entries))]
+
+    async def delete(self, cache_key: str) -> None:
+        """Remove a cached script from memory."""
+        with self._lock:
+            self._entries.pop(cache_key, None)
+
+
+class FirestoreScriptCache(ScriptCache):
+    """Firestore-backed cache shared by every backend instance.
+
+    Expiry is checked on read; a Firestore TTL policy on ``expires_at`` can be
+    configured to purge expired documents.
+    """
+
+    def __init__(self, db=None):
+        """Initialize with an optional Firestore client (for testing)."""
+        if db is None:
+            from backend.services.firestore_service import get_firestore_service
+            db = get_firestore_service().db
+        self._db = db
+
+    async def get(self, cache_key: str) -> Optional[CachedScript]:
+        """Read a cached script from Firestore."""
+        try:
+            doc = self._db.collection(SCRIPT_CACHE).document(cache_key).get()
+            if not doc.exists:
+                return None
+            data = doc.to_dict()
+            entry = CachedScript(
+                cache_key=cache_key,
+                script=data["script"],
+                model_used=data["model_used"],
+                created_at=data.get("created_at") or datetime.now(timezone.utc),
+                expires_at=data.get("expires_at"),
+            )
+            return None if entry.is_expired() else entry
+        except Exception as e:
+            logger.error(f"Failed to read script cache entry {cache_key}: {e}")
+            return None
+
+    async def set(self, entry: CachedScript) -> None:
+        """Write a cached script to Firestore."""
+        try:
+            self._db.collection(SCRIPT_CACHE).document(entry.cache_key).set({
+                "script": entry.script,
+                "model_used": entry.model_used,
+                "created_at": entry.created_at,
+                "expires_at": entry.expires_at,
+            })
+        except Exception as e:
+            logger.warning(f"Failed to write script cache entry {entry.cache_key}: {e}")
+
+    async def delete(self, cache_key: str) -> None:
+        """Delete a cached script from Firestore."""
+        try:
+            self._db.collection(SCRIPT_CACHE).document(cache_key).delete()
+        except Exception as e:
+            logger.warning(f"Failed to delete script cache entry {cache_key}: {e}")
+
+
+def build_cache_entry(cache_key: str, script: str, model_used: str) -> CachedScript:
+    """Build a cache entry that expires after SCRIPT_CACHE_TTL_SECONDS."""
+    now = datetime.now(timezone.utc)
+    return CachedScript(
+        cache_key=cache_key,
+        script=script,
+        model_used=model_used,
+        created_at=now,
+        expires_at=now + timedelta(seconds=get_settings().script_cache_ttl_seconds),
+    )
+
+
+# Singleton instance
+_cache_instance: Optional[ScriptCache] = None
+
+
+def get_script_cache() -> Optional[ScriptCache]:
+    """Get the script cache for the current configuration.
+
+    Returns None when SCRIPT_CACHE_ENABLED is false, otherwise a
+    FirestoreScriptCache or LocalScriptCache per SCRIPT_CACHE_BACKEND.
+    """
+    global _cache_instance
+    settings = get_settings()
+    if not settings.script_cache_enabled:
+        return None
+    if _cache_instance is None:
+        if settings.script_cache_backend == "firestore":
+            _cache_instance = FirestoreScriptCache()
+        else:
+            _cache_instance = LocalScriptCache()
+    return _cache_instance
@@ -1,7 +1,7 @@
 import logging
 import datetime
 from typing import TypedDict, Optional, AsyncGenerator
-from backend.services.langgraph_workflow import create_script_generation_graph, generate_script_stream as workflow_generate_script_stream
+from backend.services.langgraph_workflow import get_script_generation_graph, generate_script_stream as workflow_generate_script_stream
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +15,14 @@ class ScriptGenerationService:
     """Service for AI-powered script generation using LangGraph."""
     
     def __init__(self):
-        self.workflow = create_script_generation_graph()
+        self.workflow = get_script_generation_graph()
 
     async def generate_script(
         self,
         knowledge_content: str,
         model_name: str,
-        prompt: str
+        prompt: str,
+        structured_sections: Optional[dict] = None
     ) -> ScriptGenerationResult:
         """Generate voice-optimized script using LangGraph workflow.
         
@@ -29,6 +30,7 @@ class ScriptGenerationService:
             knowledge_content: Raw content from knowledge document
             model_name: Gemini model to use
             prompt: System prompt for generation
+            structured_sections: Optional section map used to chunk large documents
             
         Returns:
             ScriptGenerationResult with script and metadata
@@ -41,7 +43,8 @@ class ScriptGenerationService:
             "prompt": prompt,
             "model_name": model_name,
             "generated_script": "",
-            "error": None
+            "error": None,
+            "structured_sections": structured_sections
         }
         
         try:
@@ -65,7 +68,8 @@ class ScriptGenerationService:
         self,
         knowledge_content: str,
         model_name: str,
-        prompt: str
+        prompt: str,
+        structured_sections: Optional[dict] = None
     ) -> AsyncGenerator[dict, None]:
         """Stream script generation tokens.
         
@@ -76,6 +80,7 @@ class ScriptGenerationService:
             knowledge_content: Raw content from knowledge document
             model_name: Gemini model to use
             prompt: System prompt for generation
+            structured_sections: Optional section map used to chunk large documents
             
         Yields:
             dict events: token, complete, or error
@@ -84,5 +89,18 @@ class ScriptGenerationService:
             knowledge_content=knowledge_content,
             prompt=prompt,
             model_name=model_name,
+            structured_sections=structured_sections,
         ):
             yield event
+
+
+# Singleton instance
+_script_service_instance: Optional[ScriptGenerationService] = None
+
+
+def get_script_generation_service() -> ScriptGenerationService:
+    """Get the shared script generation service instance."""
+    global _script_service_instance
+    if _script_service_instance is None:
+        _script_service_instance = ScriptGenerationService()
+    return _script_service_instance
@@ -0,0 +1,259 @@
+"""Session affinity for persistent patient WebSocket connections.
+
+Persistent ElevenLabs sockets live in the in-process WebSocketConnectionManager,
+so only the instance that created a session can reuse its connection. This module
+records which instance owns each session and forwards messages from non-owning
+instances to the owner over an internal endpoint.
+
+Two registry implementations are provided:
+- LocalSessionRegistry: in-memory stand-in for single-instance and test setups.
+- FirestoreSessionRegistry: shared registry for multi-instance deployments.
+"""
+
+import asyncio
+import logging
+import socket
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Firestore collection holding session -> instance ownership records
+SESSION_OWNERS = "session_owners"
+
+# Header carrying the shared secret on instance-to-instance requests
+INTERNAL_TOKEN_HEADER = "X-Internal-Token"
+
+
+@dataclass
+class SessionOwner:
+    """Identifies the instance that holds a session's persistent connection."""
+
+    session_id: str
+    instance_id: str
+    internal_url: Optional[str] = None
+    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class SessionForwardError(Exception):
+    """Raised when a message cannot be forwarded to the owning instance."""
+
+    pass
+
+
+class SessionRegistry(ABC):
+    """Abstract registry mapping session IDs to their owning instance."""
+
+    @abstractmethod
+    async def register(self, owner: SessionOwner) -> None:
+        """Record (or overwrite) the owner of a session."""
+        pass
+
+    @abstractmethod
+    async def get_owner(self, session_id: str) -> Optional[SessionOwner]:
+        """Get the owner of a session, or None if unknown."""
+        pass
+
+    @abstractmethod
+    async def release(self, session_id: str) -> None:
+        """Remove the ownership record for a session."""
+        pass
+
+
+class LocalSessionRegistry(SessionRegistry):
+    """In-memory registry used when Firestore-backed affinity is disabled."""
+
+    def __init__(self):
+        """Initialize with empty in-memory storage."""
+        self._owners: Dict[str, SessionOwner] = {}
+
+    async def register(self, owner: SessionOwner) -> None:
+        """Record the owner of a session in memory."""
+        self._owners[owner.session_id] = owner
+
+    async def get_owner(self, session_id: str) -> Optional[SessionOwner]:
+        """Get the owner of a session from memory."""
+        return self._owners.get(session_id)
+
+    async def release(self, session_id: str) -> None:
+        """Remove the ownership record from memory."""
+        self._owners.pop(session_id, None)
+
+
+class FirestoreSessionRegistry(SessionRegistry):
+    """Firestore-backed registry shared by every backend instance."""
+
+    def __init__(self, db=None):
+        """Initialize with an optional Firestore client (for testing)."""
+        if db is None:
+            from backend.services.firestore_service import get_firestore_service
+            db = get_firestore_service().db
+        self._db = db
+
+    async def register(self, owner: SessionOwner) -> None:
+        """Write the ownership record for a session."""
+        self._db.collection(SESSION_OWNERS).document(owner.session_id).set({
+            "session_id": owner.session_id,
+            "instance_id": owner.instance_id,
+            "internal_url": owner.internal_url,
+            "updated_at": owner.updated_at,
+        })
+
+    async def get_owner(self, session_id: str) -> Optional[SessionOwner]:
+        """Read the ownership record for a session."""
+        try:
+            doc = self._db.collection(SESSION_OWNERS).document(session_id).get()
+            if not doc.exists:
+                return None
+            data = doc.to_dict()
+            return SessionOwner(
+                session_id=data["session_id"],
+                instance_id=data["instance_id"],
+                internal_url=data.get("internal_url"),
+                updated_at=data.get("updated_at") or datetime.now(timezone.utc),
+            )
+        except Exception as e:
+            logger.error(f"Failed to get owner for session {session_id}: {e}")
+            return None
+
+    async def release(self, session_id: str) -> None:
+        """Delete the ownership record for a session."""
+        try:
+            self._db.collection(SESSION_OWNERS).document(session_id).delete()
+        except Exception as e:
+            logger.warning(f"Failed to release session {session_id}: {e}")
+
+
+# Stable identity for this process, generated once when not configured
+_instance_id: Optional[str] = None
+
+
+def get_instance_id() -> str:
+    """Get this instance's identifier.
+
+    Uses INSTANCE_ID when configured, otherwise hostname plus a random suffix
+    so restarted containers never inherit a stale owner record.
+    """
+    global _instance_id
+    if _instance_id is None:
+        configured = get_settings().instance_id
+        _instance_id = configured or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+    return _instance_id
+
+
+def build_local_owner(session_id: str) -> SessionOwner:
+    """Build an ownership record pointing at this instance."""
+    return SessionOwner(
+        session_id=session_id,
+        instance_id=get_instance_id(),
+        internal_url=get_settings().instance_internal_url,
+    )
+
+
+async def _post_to_owner(
+    owner: SessionOwner,
+    action: str,
+    payload: dict,
+    client: Optional[httpx.AsyncClient] = None,
+) -> dict:
+    """POST to an internal session endpoint on the owning instance.
+
+    Raises:
+        SessionForwardError: If the owner is unreachable or rejects the request.
+    """
+    if not owner.internal_url:
+        raise SessionForwardError(
+            f"Owner {owner.instance_id} of session {owner.session_id} has no internal URL"
+        )
+
+    settings = get_settings()
+    url = f"{owner.internal_url.rstrip('/')}/api/internal/sessions/{owner.session_id}/{action}"
+    headers = {}
+    if settings.internal_api_token:
+        headers[INTERNAL_TOKEN_HEADER] = settings.internal_api_token
+
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(timeout=settings.session_forward_timeout)
+    try:
+        response = await client.post(url, json=payload, headers=headers)
+        if response.status_code != 200:
+            raise SessionForwardError(
+                f"Owner {owner.instance_id} returned {response.status_code} "
+                f"for session {owner.session_id}"
+            )
+        return response.json()
+    except (httpx.HTTPError, asyncio.TimeoutError, ValueError) as e:
+        raise SessionForwardError(
+            f"Failed to reach owner {owner.instance_id} for session {owner.session_id}: {e}"
+        ) from e
+    finally:
+        if owns_client:
+            await client.aclose()
+
+
+async def forward_message(
+    owner: SessionOwner,
+    text: str,
+    text_only: bool = True,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Tuple[str, Optional[str]]:
+    """Forward a patient message to the instance owning the session.
+
+    Args:
+        owner: Ownership record of the target session.
+        text: The patient's message.
+        text_only: Whether to request a text-only response.
+        client: Optional HTTP client injection for testing.
+
+    Returns:
+        Tuple[str, Optional[str]]: (response_text, base64 audio data).
+
+    Raises:
+        SessionForwardError: If the owner is unreachable or rejects the request.
+    """
+    data = await _post_to_owner(
+        owner, "message", {"message": text, "chat_mode": text_only}, client=client
+    )
+    if "response_text" not in data:
+        raise SessionForwardError(
+            f"Owner {owner.instance_id} returned a malformed response for session {owner.session_id}"
+        )
+    return data["response_text"], data.get("audio_data")
+
+
+async def forward_close(
+    owner: SessionOwner, client: Optional[httpx.AsyncClient] = None
+) -> None:
+    """Ask the owning instance to close a session's persistent connection.
+
+    Raises:
+        SessionForwardError: If the owner is unreachable or rejects the request.
+    """
+    await _post_to_owner(owner, "close", {}, client=client)
+
+
+# Singleton instance
+_registry_instance: Optional[SessionRegistry] = None
+
+
+def get_session_registry() -> SessionRegistry:
+    """Get the session registry for the current configuration.
+
+    Returns FirestoreSessionRegistry when SESSION_AFFINITY_ENABLED is true,
+    otherwise an in-memory LocalSessionRegistry.
+    """
+    global _registry_instance
+    if _registry_instance is None:
+        if get_settings().session_affinity_enabled:
+            _registry_instance = FirestoreSessionRegistry()
+        else:
+            _registry_instance = LocalSessionRegistry()
+    return _registry_instance
@@ -0,0 +1,141 @@
+"""Garbage collection of orphaned storage objects.
+
+Audio files can outlive their metadata: a delete that fails halfway, or a
+generation that uploads and then fails to save its record, leaves MP3s in the
+bucket (or under temp_storage/ with mock storage) that nothing references.
+Knowledge uploads can be orphaned the same way.
+
+A run snapshots the referenced keys (audio IDs from a name-only projection of
+audio_files, and knowledge source paths), then lists storage page by page and
+takes the set difference per page. Audio objects are keyed by the audio ID
+before the first dot, so variants ("{id}.{profile}.mp3") and other sidecars
+belong to their audio file. Orphans younger than the grace period are kept,
+which covers uploads whose record is still being written. Deletes go through
+GCS batch requests paced to STORAGE_GC_DELETES_PER_MINUTE.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from backend.config import get_settings
+from backend.models.schemas import StorageGcEntry, StorageGcResponse
+from backend.services.data_service import DataServiceInterface
+from backend.services.knowledge_upload import KNOWLEDGE_UPLOAD_PREFIX
+from backend.services.storage_service import GCS_BATCH_SIZE, StorageService, StoredObject
+from backend.utils.provider_limits import ProviderRateLimiter
+
+logger = logging.getLogger(__name__)
+
+AUDIO_PREFIX = "audio"
+
+# Orphans listed individually in a report
+STORAGE_GC_REPORT_LIMIT = 500
+
+
+def audio_id_from_path(path: str) -> str:
+    """Audio ID an object under audio/ belongs to ("audio/{id}[.suffix...]")."""
+    return path.rsplit("/", 1)[-1].split(".", 1)[0]
+
+
+def _orphans_in_page(
+    page: List[StoredObject], referenced: Set[str], key: Callable[[str], str]
+) -> List[StoredObject]:
+    """Objects of the page whose key is not referenced (a set difference)."""
+    by_key: Dict[str, List[StoredObject]] = {}
+    for obj in page:
+        by_key.setdefault(key(obj.name), []).append(obj)
+    return [obj for k in by_key.keys() - referenced for obj in by_key[k]]
+
+
+async def _pages(storage_service: StorageService, prefix: str, page_size: int):
+    """Fetch listing pages in a worker thread, one request per page."""
+    pages: Iterator[List[StoredObject]] = storage_service.iter_object_pages(prefix, page_size)
+    while (page := await asyncio.to_thread(next, pages, None)) is not None:
+        yield page
+
+
+async def collect_storage_garbage(
+    data_service: DataServiceInterface,
+    storage_service: StorageService,
+    dry_run: bool = True,
+    grace_hours: Optional[int] = None,
+    deletes_per_minute: Optional[int] = None,
+) -> StorageGcResponse:
+    """Find and (unless dry_run) delete unreferenced audio and upload objects.
+
+    Args:
+        data_service: Source of audio records and knowledge documents.
+        storage_service: Storage to scan.
+        dry_run: Only report orphans.
+        grace_hours: Minimum orphan age (defaults to settings).
+        deletes_per_minute: Delete pacing, 0 for none (defaults to settings).
+
+    Returns:
+        StorageGcResponse with counts, reclaimed bytes and the orphans found.
+    """
+    start = time.perf_counter()
+    settings = get_settings()
+    if grace_hours is None:
+        grace_hours = settings.storage_gc_grace_hours
+    if deletes_per_minute is None:
+        deletes_per_minute = settings.storage_gc_deletes_per_minute
+    limiter = ProviderRateLimiter(deletes_per_minute)
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=grace_hours)
+    report = StorageGcResponse(dry_run=dry_run)
+
+    # Snapshot references before listing: anything uploaded afterwards is
+    # younger than the grace period and therefore never collected
+    audio_ids, source_paths = await asyncio.gather(
+        data_service.get_audio_file_ids(), data_service.get_knowledge_source_paths()
+    )
+    scans = (
+        (AUDIO_PREFIX, audio_ids, audio_id_from_path),
+        (KNOWLEDGE_UPLOAD_PREFIX, source_paths, lambda path: path),
+    )
+
+    for prefix, referenced, key in scans:
+        async for page in _pages(storage_service, prefix, settings.storage_gc_page_size):
+            report.scanned_count += len(page)
+            orphans = []
+            for obj in _orphans_in_page(page, referenced, key):
+                if obj.updated >= cutoff:
+                    report.recent_orphan_count += 1
+                else:
+                    orphans.append(obj)
+            report.orphan_count += len(orphans)
+            report.orphan_bytes += sum(obj.size for obj in orphans)
+            entries = {
+                obj.name: StorageGcEntry(path=obj.name, size_bytes=obj.size, updated_at=obj.updated)
+                for obj in orphans
+            }
+            room = STORAGE_GC_REPORT_LIMIT - len(report.orphans)
+            report.orphans.extend(list(entries.values())[:max(room, 0)])
+            if dry_run:
+                continue
+
+            for offset in range(0, len(orphans), GCS_BATCH_SIZE):
+                chunk = orphans[offset:offset + GCS_BATCH_SIZE]
+                await limiter.acquire(len(chunk))
+                results = await asyncio.to_thread(
+                    storage_service.delete_files, [obj.name for obj in chunk]
+                )
+                for obj in chunk:
+                    if results.get(obj.name):
+                        entries[obj.name].deleted = True
+                        report.deleted_count += 1
+                        report.reclaimed_bytes += obj.size
+                    else:
+                        report.failed_count += 1
+
+    report.elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+    logger.info(
+        f"Storage GC{' (dry run)' if dry_run else ''}: scanned {report.scanned_count}, "
+        f"{report.orphan_count} orphans ({report.orphan_bytes} bytes), "
+        f"{report.recent_orphan_count} within grace, {report.deleted_count} deleted, "
+        f"{report.failed_count} failed, {report.reclaimed_bytes} bytes reclaimed "
+        f"in {report.elapsed_ms} ms"
+    )
+    return report
@@ -1,14 +1,89 @@
+import asyncio
 import logging
 import os
 import shutil
-from datetime import timedelta
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from google.cloud import storage
 from google.auth.credentials import AnonymousCredentials
 from backend.config import get_settings
+from backend.services.gcp_credentials import get_credentials_manager
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for streamed downloads (mock storage reads)
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Bytes fetched per ranged GCS read while streaming: the first read is small
+# so playback (or a seek) starts quickly, later reads double up to the max
+GCS_STREAM_MIN_CHUNK_SIZE = 256 * 1024
+GCS_STREAM_MAX_CHUNK_SIZE = 1024 * 1024
+
+# Calls per GCS JSON API batch request (the service limit is 100)
+GCS_BATCH_SIZE = 100
+
+
+@lru_cache(maxsize=1)
+def _recording_batch_class():
+    """Batch that keeps the sub-responses returned by finish().
+
+    Deletes return no per-call result inside a batch, and the context
+    manager discards what finish() returns, so it is kept here.
+    """
+    from google.cloud.storage.batch import Batch
+
+    class RecordingBatch(Batch):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.responses: List = []
+
+        def finish(self, raise_exception=True):
+            self.responses = super().finish(raise_exception=raise_exception)
+            return self.responses
+
+    return RecordingBatch
+
+
+@dataclass(frozen=True)
+class StoredFileInfo:
+    """Size and version of a stored file, used for Range and ETag handling."""
+
+    size: int
+    etag: str
+    generation: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """A listed storage object."""
+
+    name: str
+    size: int
+    updated: datetime
+
+
+def _gcs_read_spans(start: int, last: int) -> Iterator[Tuple[int, int]]:
+    """Yield inclusive (start, end) spans covering start..last, growing in size."""
+    chunk_size = GCS_STREAM_MIN_CHUNK_SIZE
+    position = start
+    while position <= last:
+        chunk_end = min(position + chunk_size, last + 1) - 1
+        yield position, chunk_end
+        position = chunk_end + 1
+        chunk_size = min(chunk_size * 2, GCS_STREAM_MAX_CHUNK_SIZE)
+
+
+def _strip_public_url(storage_path: str) -> str:
+    """Turn a public GCS URL into a storage path; other paths are unchanged."""
+    if storage_path.startswith("https://storage.googleapis.com/"):
+        parts = storage_path.split("/")
+        if len(parts) > 4:
+            return "/".join(parts[4:])
+    return storage_path
+
 
 class StorageService:
     """GCS client that works with both fake-gcs-server and production."""
@@ -54,10 +129,13 @@ class StorageService:
                 self._client._http._base_url = settings.gcs_emulator_host
             else:
                 logger.info("Connecting to production GCS")
-                if settings.google_cloud_project:
-                    self._client = storage.Client(project=settings.google_cloud_project)
-                else:
-                    self._client = storage.Client()
+                # Shared credentials and pooled session (also used for URL signing)
+                manager = get_credentials_manager()
+                self._client = storage.Client(
+                    project=settings.google_cloud_project or manager.project_id,
+                    credentials=manager.credentials,
+                    _http=manager.authorized_session,
+                )
             
             if not settings.use_mock_storage:
                 self._ensure_bucket_exists()
@@ -171,6 +249,83 @@ class StorageService:
             logger.error(f"Failed to delete file {filename}: {e}")
             return False
     
+    def iter_object_pages(self, prefix: str, page_size: int = 1000) -> Iterator[List[StoredObject]]:
+        """List objects under a prefix, one page at a time.
+
+        Each page is fetched lazily (one GCS list request per page), so the
+        caller can process a page before the next is requested.
+
+        Args:
+            prefix: Top-level folder, e.g. 'audio'.
+            page_size: Objects per page.
+
+        Yields:
+            Lists of StoredObject with name, size and last update time (UTC).
+        """
+        settings = get_settings()
+        prefix = prefix.strip("/") + "/"
+
+        if settings.use_mock_storage:
+            root = self._mock_storage_dir / prefix
+            page: List[StoredObject] = []
+            for directory, _, files in sorted(os.walk(root)):
+                for name in sorted(files):
+                    path = Path(directory) / name
+                    stat = path.stat()
+                    page.append(StoredObject(
+                        name=path.relative_to(self._mock_storage_dir).as_posix(),
+                        size=stat.st_size,
+                        updated=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+                    ))
+                    if len(page) >= page_size:
+                        yield page
+                        page = []
+            if page:
+                yield page
+            return
+
+        blobs = self._client.list_blobs(
+            self._bucket,
+            prefix=prefix,
+            page_size=page_size,
+            fields="items(name,size,updated),nextPageToken",
+        )
+        for blob_page in blobs.pages:
+            yield [StoredObject(b.name, b.size or 0, b.updated) for b in blob_page]
+
+    def delete_files(self, filenames: List[str]) -> Dict[str, bool]:
+        """Delete several files, using GCS batch requests.
+
+        Args:
+            filenames: Storage paths to delete.
+
+        Returns:
+            Mapping of path to True if deleted, False if not found or failed.
+        """
+        settings = get_settings()
+        filenames = list(dict.fromkeys(filenames))
+
+        if settings.use_mock_storage:
+            return {filename: self.delete_file(filename) for filename in filenames}
+
+        results = {}
+        for offset in range(0, len(filenames), GCS_BATCH_SIZE):
+            chunk = filenames[offset:offset + GCS_BATCH_SIZE]
+            try:
+                batch = _recording_batch_class()(self._client, raise_exception=False)
+                with batch:
+                    for filename in chunk:
+                        self._bucket.delete_blob(filename)
+                # finish() returns one sub-response per deferred call, in order
+                for filename, response in zip(chunk, batch.responses):
+                    results[filename] = 200 <= response.status_code < 300
+                    if not results[filename] and response.status_code != 404:
+                        logger.error(f"Failed to delete file {filename}: HTTP {response.status_code}")
+            except Exception as e:
+                logger.error(f"Batch delete of {len(chunk)} files failed: {e}")
+                results.update((filename, False) for filename in chunk)
+        return results
+
     def delete_audio(self, filename: str) -> bool:
         """Delete audio file from storage.
         
@@ -212,46 +367,147 @@ class StorageService:
             logger.error(f"Storage health check failed: {e}")
             return False
 
-    def get_file_stream(self, storage_path: str):
-        """Get a stream of the file content.
+    def get_file_info(self, storage_path: str) -> Optional[StoredFileInfo]:
+        """Get the size and version of a stored file.
+
+        Args:
+            storage_path: Path to the file in storage (or its public GCS URL).
+
+        Returns:
+            StoredFileInfo, or None if the file does not exist.
+        """
+        settings = get_settings()
+        storage_path = _strip_public_url(storage_path)
+
+        if settings.use_mock_storage:
+            try:
+                stat = os.stat(self._mock_storage_dir / storage_path)
+            except FileNotFoundError:
+                return None
+            return StoredFileInfo(size=stat.st_size, etag=f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"')
+
+        blob = self._bucket.get_blob(storage_path)
+        if blob is None:
+            return None
+        return StoredFileInfo(size=blob.size, etag=f'"{blob.generation}"', generation=blob.generation)
+
+    def get_file_stream(
+        self,
+        storage_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        info: Optional[StoredFileInfo] = None,
+    ):
+        """Get a stream of the file content, optionally a byte range of it.
         
         Args:
             storage_path: Path to the file in storage.
+            start: First byte offset to return.
+            end: Last byte offset to return (inclusive); defaults to end of file.
+            info: Result of get_file_info, if already fetched. For GCS it pins
+                the reads to that object generation and skips a metadata call.
             
         Yields:
             Bytes chunks of the file content.
         """
         settings = get_settings()
-        
-        # Handle full URL input by extracting path
-        if storage_path.startswith("https://storage.googleapis.com/"):
-            parts = storage_path.split("/")
-            if len(parts) > 4:
-                storage_path = "/".join(parts[4:])
+        storage_path = _strip_public_url(storage_path)
         
         if settings.use_mock_storage:
             file_path = self._mock_storage_dir / storage_path
+            # pread reads at an offset without seeking; it is POSIX-only, so
+            # elsewhere the handle (owned by this generator) is seeked once
+            pread = getattr(os, "pread", None)
             with open(file_path, "rb") as f:
-                while chunk := f.read(8192):
+                size = os.fstat(f.fileno()).st_size
+                last = size - 1 if end is None else min(end, size - 1)
+                position = start
+                if pread is None:
+                    f.seek(start)
+                while position <= last:
+                    length = min(STREAM_CHUNK_SIZE, last - position + 1)
+                    chunk = pread(f.fileno(), length, position) if pread else f.read(length)
+                    if not chunk:
+                        break
+                    position += len(chunk)
                     yield chunk
-                    
-        elif settings.use_gcs_emulator:
-            # For emulator, we can just download as bytes (it's local anyway)
-            # or try to stream if client supports it. 
-            # Simple approach: download to memory (emulator is for dev/test)
-            blob = self._bucket.blob(storage_path)
-            yield blob.download_as_bytes()
-            
-        else:
-            # Production GCS: Stream download
-            blob = self._bucket.blob(storage_path)
-            try:
-                with blob.open("rb") as f:
-                    while chunk := f.read(8192):
-                        yield chunk
-            except Exception as e:
-                logger.error(f"Error streaming file {storage_path}: {e}")
-                raise
+            return
+
+        # GCS (emulator and production): ranged reads of one object generation
+        blob, last = self._ranged_blob(storage_path, end, info)
+        try:
+            for span_start, span_end in _gcs_read_spans(start, last):
+                chunk = blob.download_as_bytes(start=span_start, end=span_end)
+                if not chunk:
+                    break
+                yield chunk
+        except Exception as e:
+            logger.error(f"Error streaming file {storage_path}: {e}")
+            raise
+
+    async def aiter_file(
+        self,
+        storage_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        info: Optional[StoredFileInfo] = None,
+    ) -> AsyncIterator[bytes]:
+        """Async variant of get_file_stream.
+
+        Each ranged GCS read (256 KiB growing to 1 MiB) runs in a worker
+        thread, so a file costs a few dozen thread hops instead of one per
+        8 KiB chunk. Mock storage files are better served with get_local_path
+        and a FileResponse; this path reads them in STREAM_CHUNK_SIZE chunks.
+
+        Args:
+            storage_path: Path to the file in storage.
+            start: First byte offset to return.
+            end: Last byte offset to return (inclusive); defaults to end of file.
+            info: Result of get_file_info, if already fetched.
+
+        Yields:
+            Bytes chunks of the file content.
+        """
+        settings = get_settings()
+        storage_path = _strip_public_url(storage_path)
+
+        if settings.use_mock_storage:
+            reader = self.get_file_stream(storage_path, start=start, end=end)
+            while (chunk := await asyncio.to_thread(next, reader, None)) is not None:
+                yield chunk
+            return
+
+        blob, last = await asyncio.to_thread(self._ranged_blob, storage_path, end, info)
+        try:
+            for span_start, span_end in _gcs_read_spans(start, last):
+                chunk = await asyncio.to_thread(blob.download_as_bytes, start=span_start, end=span_end)
+                if not chunk:
+                    break
+                yield chunk
+        except Exception as e:
+            logger.error(f"Error streaming file {storage_path}: {e}")
+            raise
+
+    def get_local_path(self, storage_path: str) -> Optional[Path]:
+        """Get the filesystem path of a file held in mock storage.
+
+        Returns:
+            The local path, or None for GCS-backed storage.
+        """
+        if not get_settings().use_mock_storage:
+            return None
+        return self._mock_storage_dir / _strip_public_url(storage_path)
+
+    def _ranged_blob(
+        self, storage_path: str, end: Optional[int], info: Optional[StoredFileInfo]
+    ) -> Tuple["storage.Blob", int]:
+        """Resolve the generation-pinned blob and last byte offset for a ranged read."""
+        if info is None:
+            info = self.get_file_info(storage_path)
+            if info is None:
+                raise FileNotFoundError(storage_path)
+        last = info.size - 1 if end is None else min(end, info.size - 1)
+        return self._bucket.blob(storage_path, generation=info.generation), last
 
 
 def get_storage_service() -> StorageService:
@@ -312,57 +568,15 @@ def get_signed_url(
     try:
         blob = service._bucket.blob(storage_path)
         
-        # Get credentials to determine signing strategy
-        import google.auth
-        import google.auth.transport.requests
-        from google.auth import compute_engine
-        credentials, project_id = google.auth.default()
-        
-        # Check if we're running on Compute Engine (Cloud Run/GCE)
-        # These credentials can't sign locally and need IAM API
-        is_compute_credentials = isinstance(credentials, compute_engine.Credentials)
-        
-        if is_compute_credentials:
-            # Cloud Run: Use IAM signBlob API
-            service_account_email = credentials.service_account_email
-            
-            # Cloud Run sometimes returns 'default' instead of actual email
-            # Fetch the real email from metadata server
-            if service_account_email == "default" or not service_account_email:
-                try:
-                    import requests
-                    metadata_url = "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/email"
-                    response = requests.get(metadata_url, headers={"Metadata-Flavor": "Google"}, timeout=2)
-                    if response.status_code == 200:
-                        service_account_email = response.text.strip()
-                        logger.info(f"Fetched actual SA email from metadata: {service_account_email}")
-                except Exception as meta_err:
-                    logger.warning(f"Could not fetch SA email from metadata: {meta_err}")
-            
-            logger.info(f"Using IAM signing with Compute Engine SA: {service_account_email}")
-            
-            # Refresh to get access token for IAM API call
-            if not credentials.token:
-                logger.info("Refreshing Compute Engine credentials...")
-                request = google.auth.transport.requests.Request()
-                credentials.refresh(request)
-                logger.info("Credentials refreshed successfully.")
-            
-            signed_url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(seconds=expiration_seconds),
-                method="GET",
-                service_account_email=service_account_email,
-                access_token=credentials.token
-            )
-        else:
-            # Local development with SA key file: Sign locally (no IAM API needed)
-            logger.info("Using local credentials signing (service account key file)")
-            signed_url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(seconds=expiration_seconds),
-                method="GET",
-            )
+        # Credentials, service account email and token refresh are handled
+        # once by the shared manager; Compute Engine credentials (Cloud Run)
+        # sign through the IAM signBlob API, key-file credentials locally
+        signed_url = blob.generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=expiration_seconds),
+            method="GET",
+            credentials=get_credentials_manager().signing_credentials(),
+        )
         
         logger.info(f"Generated signed URL for {storage_path} (expires in {expiration_seconds}s)")
         return signed_url
@@ -0,0 +1,628 @@
+"""Durable background task queue with leases.
+
+Replaces in-process FastAPI BackgroundTasks for work that must survive an
+instance restart (ElevenLabs knowledge syncs). Tasks are persisted before the
+request returns; workers lease them for a bounded time and renew the lease while
+the handler runs, so a task whose worker died becomes available again once its
+lease goes stale, while a long-running one is never picked up twice.
+
+Two stores are provided:
+- SQLiteTaskStore: mock-data mode, local development and tests.
+- FirestoreTaskStore: shared queue, the default whenever Firestore holds the data.
+
+Failures are retried with exponential backoff only when the raised exception
+reports ``is_retryable`` (as ElevenLabsSyncError does); anything else fails the
+task immediately.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Firestore collection holding queued tasks
+TASK_QUEUE = "task_queue"
+
+# Task statuses
+PENDING = "pending"
+LEASED = "leased"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Retry backoff: base * 2^(attempt-1), capped, with up to 20% jitter
+RETRY_BACKOFF_BASE_SECONDS = 5.0
+RETRY_BACKOFF_MAX_SECONDS = 300.0
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class QueuedTask:
+    """A unit of durable background work."""
+
+    task_id: str
+    kind: str
+    payload: Dict[str, Any]
+    status: str = PENDING
+    attempts: int = 0
+    max_attempts: int = 5
+    available_at: datetime = field(default_factory=_utcnow)
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: datetime = field(default_factory=_utcnow)
+    result: Optional[Dict[str, Any]] = None
+
+
+def compute_backoff(attempts: int) -> float:
+    """Delay in seconds before retry number ``attempts`` (1-based)."""
+    delay = min(RETRY_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), RETRY_BACKOFF_MAX_SECONDS)
+    return delay * (1 + random.uniform(0, 0.2))
+
+
+class TaskStore(ABC):
+    """Abstract persistence and leasing for queued tasks."""
+
+    @abstractmethod
+    async def enqueue(self, task: QueuedTask) -> None:
+        """Persist a new pending task."""
+        pass
+
+    @abstractmethod
+    async def lease_next(self, owner: str, lease_seconds: float) -> Optional[QueuedTask]:
+        """Atomically lease the oldest available pending task, or return None."""
+        pass
+
+    @abstractmethod
+    async def renew_lease(self, task_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend a lease still held by ``owner``. Returns False if it was lost."""
+        pass
+
+    @abstractmethod
+    async def complete(self, task_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        """Mark a leased task as succeeded, keeping the handler's result if any."""
+        pass
+
+    @abstractmethod
+    async def fail(self, task_id: str, error: str, retry_at: Optional[datetime]) -> None:
+        """Record a failure; reschedule at ``retry_at`` or fail permanently if None."""
+        pass
+
+    @abstractmethod
+    async def recover_stale_leases(self) -> int:
+        """Return tasks whose lease expired to pending. Returns the count recovered."""
+        pass
+
+    @abstractmethod
+    async def get(self, task_id: str) -> Optional[QueuedTask]:
+        """Get a task by ID."""
+        pass
+
+
+class SQLiteTaskStore(TaskStore):
+    """SQLite-backed store; leasing uses a single UPDATE under an immediate transaction."""
+
+    _COLUMNS = (
+        "task_id, kind, payload, status, attempts, max_attempts, available_at, "
+        "lease_owner, lease_expires_at, last_error, created_at, updated_at, result"
+    )
+
+    def __init__(self, path: str = ":memory:"):
+        """Open (and create if needed) the queue database.
+
+        Args:
+            path: SQLite file path, or ":memory:" for a private in-memory queue.
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS tasks (
+                    task_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    max_attempts INTEGER NOT NULL,
+                    available_at TEXT NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires_at TEXT,
+                    last_error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    result TEXT
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_available ON tasks (status, available_at)"
+            )
+
+    @staticmethod
+    def _ts(value: Optional[datetime]) -> Optional[str]:
+        return value.astimezone(timezone.utc).isoformat(timespec="microseconds") if value else None
+
+    def _row_to_task(self, row) -> QueuedTask:
+        def dt(v):
+            return datetime.fromisoformat(v) if v else None
+
+        return QueuedTask(
+            task_id=row[0],
+            kind=row[1],
+            payload=json.loads(row[2]),
+            status=row[3],
+            attempts=row[4],
+            max_attempts=row[5],
+            available_at=dt(row[6]),
+            lease_owner=row[7],
+            lease_expires_at=dt(row[8]),
+            last_error=row[9],
+            created_at=dt(row[10]),
+            updated_at=dt(row[11]),
+            result=json.loads(row[12]) if row[12] else None,
+        )
+
+    async def enqueue(self, task: QueuedTask) -> None:
+        """Insert a pending task."""
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO tasks ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    task.task_id, task.kind, json.dumps(task.payload), task.status,
+                    task.attempts, task.max_attempts, self._ts(task.available_at),
+                    task.lease_owner, self._ts(task.lease_expires_at), task.last_error,
+                    self._ts(task.created_at), self._ts(task.updated_at),
+                    json.dumps(task.result) if task.result is not None else None,
+                ),
+            )
+
+    async def lease_next(self, owner: str, lease_seconds: float) -> Optional[QueuedTask]:
+        """Lease the oldest available pending task."""
+        now = _utcnow()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT task_id FROM tasks WHERE status = ? AND available_at <= ? "
+                    "ORDER BY available_at LIMIT 1",
+                    (PENDING, self._ts(now)),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE tasks SET status = ?, lease_owner = ?, lease_expires_at = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE task_id = ?",
+                    (LEASED, owner, self._ts(now + timedelta(seconds=lease_seconds)),
+                     self._ts(now), row[0]),
+                )
+                leased = self._conn.execute(
+                    f"SELECT {self._COLUMNS} FROM tasks WHERE task_id = ?", (row[0],)
+                ).fetchone()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self._row_to_task(leased)
+
+    async def renew_lease(self, task_id: str, owner: str, lease_seconds: float) -> bool:
+        """Push the lease expiry forward if ``owner`` still holds it."""
+        now = _utcnow()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET lease_expires_at = ?, updated_at = ? "
+                "WHERE task_id = ? AND status = ? AND lease_owner = ?",
+                (self._ts(now + timedelta(seconds=lease_seconds)), self._ts(now),
+                 task_id, LEASED, owner),
+            )
+            return cursor.rowcount == 1
+
+    async def complete(self, task_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        """Mark a task as succeeded and release its lease."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires_at = NULL, "
+                "last_error = NULL, result = ?, updated_at = ? WHERE task_id = ?",
+                (SUCCEEDED, json.dumps(result) if result is not None else None,
+                 self._ts(_utcnow()), task_id),
+            )
+
+    async def fail(self, task_id: str, error: str, retry_at: Optional[datetime]) -> None:
+        """Reschedule or permanently fail a task."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET status = ?, available_at = COALESCE(?, available_at), "
+                "lease_owner = NULL, lease_expires_at = NULL, last_error = ?, updated_at = ? "
+                "WHERE task_id = ?",
+                (PENDING if retry_at else FAILED, self._ts(retry_at), error,
+                 self._ts(_utcnow()), task_id),
+            )
+
+    async def recover_stale_leases(self) -> int:
+        """Return expired leases to the pending state."""
+        now = self._ts(_utcnow())
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires_at = NULL, "
+                "available_at = ?, updated_at = ? WHERE status = ? AND lease_expires_at < ?",
+                (PENDING, now, now, LEASED, now),
+            )
+            return cursor.rowcount
+
+    async def get(self, task_id: str) -> Optional[QueuedTask]:
+        """Get a task by ID."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return self._row_to_task(row) if row else None
+
+
+class FirestoreTaskStore(TaskStore):
+    """Firestore-backed store; leases are claimed inside transactions."""
+
+    # Candidates examined per lease attempt (others may be claimed concurrently)
+    LEASE_CANDIDATES = 5
+
+    def __init__(self, db=None):
+        """Initialize with an optional Firestore client (for testing)."""
+        if db is None:
+            from backend.services.firestore_service import get_firestore_service
+            db = get_firestore_service().db
+        self._db = db
+
+    @staticmethod
+    def _to_doc(task: QueuedTask) -> dict:
+        return {
+            "kind": task.kind,
+            "payload": task.payload,
+            "status": task.status,
+            "attempts": task.attempts,
+            "max_attempts": task.max_attempts,
+            "available_at": task.available_at,
+            "lease_owner": task.lease_owner,
+            "lease_expires_at": task.lease_expires_at,
+            "last_error": task.last_error,
+            "created_at": task.created_at,
+            "updated_at": task.updated_at,
+            "result": task.result,
+        }
+
+    @staticmethod
+    def _from_doc(task_id: str, data: dict) -> QueuedTask:
+        return QueuedTask(task_id=task_id, **data)
+
+    async def enqueue(self, task: QueuedTask) -> None:
+        """Write a pending task document."""
+        self._db.collection(TASK_QUEUE).document(task.task_id).set(self._to_doc(task))
+
+    async def lease_next(self, owner: str, lease_seconds: float) -> Optional[QueuedTask]:
+        """Claim the oldest available task, re-checking its status in a transaction."""
+        from google.cloud import firestore
+
+        now = _utcnow()
+        candidates = (
+            self._db.collection(TASK_QUEUE)
+            .where("status", "==", PENDING)
+            .where("available_at", "<=", now)
+            .order_by("available_at")
+            .limit(self.LEASE_CANDIDATES)
+            .stream()
+        )
+
+        @firestore.transactional
+        def claim(transaction, ref):
+            snapshot = ref.get(transaction=transaction)
+            data = snapshot.to_dict() if snapshot.exists else None
+            if not data or data.get("status") != PENDING:
+                return None
+            data.update(
+                status=LEASED,
+                lease_owner=owner,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                attempts=data.get("attempts", 0) + 1,
+                updated_at=now,
+            )
+            transaction.update(ref, {
+                k: data[k] for k in ("status", "lease_owner", "lease_expires_at", "attempts", "updated_at")
+            })
+            return data
+
+        for doc in candidates:
+            data = claim(self._db.transaction(), doc.reference)
+            if data is not None:
+                return self._from_doc(doc.id, data)
+        return None
+
+    async def renew_lease(self, task_id: str, owner: str, lease_seconds: float) -> bool:
+        """Push the lease expiry forward, checking ownership in a transaction."""
+        from google.cloud import firestore
+
+        ref = self._db.collection(TASK_QUEUE).document(task_id)
+
+        @firestore.transactional
+        def renew(transaction):
+            snapshot = ref.get(transaction=transaction)
+            data = snapshot.to_dict() if snapshot.exists else None
+            if not data or data.get("status") != LEASED or data.get("lease_owner") != owner:
+                return False
+            now = _utcnow()
+            transaction.update(ref, {
+                "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                "updated_at": now,
+            })
+            return True
+
+        return renew(self._db.transaction())
+
+    async def complete(self, task_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        """Mark a task as succeeded."""
+        self._db.collection(TASK_QUEUE).document(task_id).update({
+            "status": SUCCEEDED,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "last_error": None,
+            "result": result,
+            "updated_at": _utcnow(),
+        })
+
+    async def fail(self, task_id: str, error: str, retry_at: Optional[datetime]) -> None:
+        """Reschedule or permanently fail a task."""
+        update = {
+            "status": PENDING if retry_at else FAILED,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "last_error": error,
+            "updated_at": _utcnow(),
+        }
+        if retry_at:
+            update["available_at"] = retry_at
+        self._db.collection(TASK_QUEUE).document(task_id).update(update)
+
+    async def recover_stale_leases(self) -> int:
+        """Return expired leases to pending."""
+        now = _utcnow()
+        stale = (
+            self._db.collection(TASK_QUEUE)
+            .where("status", "==", LEASED)
+            .where("lease_expires_at", "<", now)
+            .stream()
+        )
+        count = 0
+        for doc in stale:
+            doc.reference.update({
+                "status": PENDING,
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "available_at": now,
+                "updated_at": now,
+            })
+            count += 1
+        return count
+
+    async def get(self, task_id: str) -> Optional[QueuedTask]:
+        """Get a task by ID."""
+        doc = self._db.collection(TASK_QUEUE).document(task_id).get()
+        return self._from_doc(task_id, doc.to_dict()) if doc.exists else None
+
+
+# Handler signature: receives the task payload and may return a JSON-serializable
+# result kept on the task; raise to signal failure
+TaskHandler = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+# Called once when a task fails permanently (e.g. to mark a document FAILED)
+GiveUpHandler = Callable[[Dict[str, Any], Exception], Awaitable[None]]
+
+
+class TaskQueue:
+    """Runs queued tasks with a fixed number of concurrent workers."""
+
+    def __init__(
+        self,
+        store: TaskStore,
+        workers: int = 2,
+        lease_seconds: float = 300.0,
+        poll_interval: float = 2.0,
+        max_attempts: int = 5,
+        owner: Optional[str] = None,
+    ):
+        """Initialize the queue.
+
+        Args:
+            store: Task persistence.
+            workers: Maximum tasks executed concurrently by this process.
+            lease_seconds: How long a leased task is reserved before it is
+                considered abandoned; renewed every third of that while the
+                handler runs.
+            poll_interval: Idle wait between polls when no task is available.
+            max_attempts: Default attempt budget for new tasks.
+            owner: Lease owner name for this process (random if omitted).
+        """
+        self.store = store
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.owner = owner or f"worker-{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, TaskHandler] = {}
+        self._give_up_handlers: Dict[str, GiveUpHandler] = {}
+        self._worker_tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._last_recovery = float("-inf")
+
+    def register(
+        self, kind: str, handler: TaskHandler, on_give_up: Optional[GiveUpHandler] = None
+    ) -> None:
+        """Register the handler (and optional give-up callback) for a task kind."""
+        self._handlers[kind] = handler
+        if on_give_up:
+            self._give_up_handlers[kind] = on_give_up
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any]) -> QueuedTask:
+        """Persist a task and wake an idle worker."""
+        task = QueuedTask(
+            task_id=str(uuid.uuid4()),
+            kind=kind,
+            payload=payload,
+            max_attempts=self.max_attempts,
+        )
+        await self.store.enqueue(task)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return task
+
+    async def start(self) -> None:
+        """Recover stale leases, then start the worker loops."""
+        if self._worker_tasks:
+            return
+        self._last_recovery = float("-inf")
+        await self._recover_if_due()
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker_loop(i)) for i in range(self.workers)
+        ]
+        logger.info(f"Task queue started with {self.workers} worker(s) as {self.owner}")
+
+    async def stop(self) -> None:
+        """Stop the worker loops; in-flight tasks are cancelled and later re-leased."""
+        self._stopping = True
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def run_once(self) -> bool:
+        """Lease and run a single task. Returns False if none was available."""
+        task = await self.store.lease_next(self.owner, self.lease_seconds)
+        if task is None:
+            return False
+        await self._execute(task)
+        return True
+
+    async def _recover_if_due(self) -> None:
+        """Periodically return leases abandoned by dead workers (any instance) to pending."""
+        now = time.monotonic()
+        if now - self._last_recovery < self.lease_seconds / 2:
+            return
+        self._last_recovery = now
+        recovered = await self.store.recover_stale_leases()
+        if recovered:
+            logger.warning(f"Recovered {recovered} task(s) with stale leases")
+
+    async def _worker_loop(self, index: int) -> None:
+        while not self._stopping:
+            try:
+                if index == 0:
+                    await self._recover_if_due()
+                if await self.run_once():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Task worker {index} error: {e}", exc_info=True)
+            # Idle: wait for an enqueue or the next poll
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, task: QueuedTask) -> None:
+        handler = self._handlers.get(task.kind)
+        if handler is None:
+            await self.store.fail(task.task_id, f"No handler for task kind {task.kind}", None)
+            return
+        try:
+            result = await self._run_with_lease(handler, task)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            retryable = bool(getattr(e, "is_retryable", False))
+            if retryable and task.attempts < task.max_attempts:
+                delay = compute_backoff(task.attempts)
+                logger.warning(
+                    f"Task {task.task_id} ({task.kind}) attempt {task.attempts} failed, "
+                    f"retrying in {delay:.1f}s: {error}"
+                )
+                await self.store.fail(task.task_id, error, _utcnow() + timedelta(seconds=delay))
+                return
+            logger.error(f"Task {task.task_id} ({task.kind}) failed permanently: {error}")
+            await self.store.fail(task.task_id, error, None)
+            give_up = self._give_up_handlers.get(task.kind)
+            if give_up:
+                try:
+                    await give_up(task.payload, e)
+                except Exception as callback_error:
+                    logger.error(f"Give-up handler for task {task.task_id} failed: {callback_error}")
+            return
+        await self.store.complete(task.task_id, result)
+
+    async def _run_with_lease(
+        self, handler: TaskHandler, task: QueuedTask
+    ) -> Optional[Dict[str, Any]]:
+        """Run a handler while a heartbeat keeps the task's lease from going stale."""
+        heartbeat = asyncio.create_task(self._renew_lease_loop(task))
+        try:
+            return await handler(task.payload)
+        finally:
+            heartbeat.cancel()
+
+    async def _renew_lease_loop(self, task: QueuedTask) -> None:
+        """Keep the lease of a running task alive until the handler returns."""
+        interval = self.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await self.store.renew_lease(task.task_id, self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Lease renewal for task {task.task_id} failed: {e}")
+                continue
+            if not renewed:
+                logger.warning(
+                    f"Task {task.task_id} ({task.kind}) lost its lease; "
+                    "another worker may run it again"
+                )
+                return
+
+
+def _default_store() -> TaskStore:
+    settings = get_settings()
+    if settings.get_task_queue_backend() == "firestore":
+        return FirestoreTaskStore()
+    return SQLiteTaskStore(settings.task_queue_sqlite_path)
+
+
+# Singleton instance
+_queue_instance: Optional[TaskQueue] = None
+
+
+def get_task_queue() -> TaskQueue:
+    """Get the process-wide task queue configured from settings."""
+    global _queue_instance
+    if _queue_instance is None:
+        settings = get_settings()
+        _queue_instance = TaskQueue(
+            store=_default_store(),
+            workers=settings.task_queue_workers,
+            lease_seconds=settings.task_queue_lease_seconds,
+            max_attempts=settings.task_queue_max_attempts,
+        )
+    return _queue_instance
@@ -0,0 +1,188 @@
+"""Process-wide voice catalog cache with stale-while-revalidate refresh.
+
+Fetching voices means a call to the ElevenLabs API plus merging with the
+curated list, which used to happen on every voice list request. The catalog
+keeps the merged result as an immutable snapshot:
+
+- fresh (younger than VOICE_CATALOG_TTL_SECONDS): served as is;
+- stale (up to VOICE_CATALOG_MAX_STALE_SECONDS): served immediately while a
+  single background refresh runs;
+- older, or never fetched: refreshed synchronously (one caller fetches,
+  concurrent callers wait for its result).
+
+A failed refresh keeps serving the previous snapshot. If nothing was ever
+fetched, the fallback voices are served as an already-stale snapshot so the
+next request retries in the background.
+
+Each snapshot carries a content version, used as the ETag of the voice list
+endpoint, and an ID map for O(1) voice lookups.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence, Tuple
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class VoiceCatalogSnapshot:
+    """Immutable merged voice list."""
+
+    voices: Tuple[Mapping[str, Any], ...]
+    by_id: Mapping[str, Mapping[str, Any]]
+    version: str
+    fetched_at: float
+
+    @classmethod
+    def build(cls, voices: Iterable[Mapping[str, Any]], fetched_at: float) -> "VoiceCatalogSnapshot":
+        """Freeze a voice list and compute its content version."""
+        frozen = tuple(_freeze(v) for v in voices)
+        canonical = json.dumps([_thaw(v) for v in frozen], sort_keys=True, default=str)
+        return cls(
+            voices=frozen,
+            by_id=MappingProxyType({v["voice_id"]: v for v in frozen}),
+            version=hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16],
+            fetched_at=fetched_at,
+        )
+
+    @property
+    def etag(self) -> str:
+        """Quoted entity tag for HTTP responses."""
+        return f'"voices-{self.version}"'
+
+    def get(self, voice_id: str) -> Optional[Mapping[str, Any]]:
+        """Look up a voice by ID."""
+        return self.by_id.get(voice_id)
+
+
+class VoiceCatalog:
+    """Stale-while-revalidate cache around a voice fetch function."""
+
+    def __init__(
+        self,
+        fetch: Callable[[], Sequence[Mapping[str, Any]]],
+        ttl_seconds: float,
+        max_stale_seconds: float,
+        fallback: Optional[Callable[[], Sequence[Mapping[str, Any]]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an empty catalog.
+
+        Args:
+            fetch: Returns the merged voice list; raises on failure.
+            ttl_seconds: Age until a snapshot is refreshed in the background.
+            max_stale_seconds: Age until a snapshot is no longer served while refreshing.
+            fallback: Voices served when nothing could be fetched yet.
+            clock: Monotonic time source (injectable for tests).
+        """
+        self._fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self._fallback = fallback
+        self._clock = clock
+        self._snapshot: Optional[VoiceCatalogSnapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._background: Optional[threading.Thread] = None
+
+    def get(self) -> VoiceCatalogSnapshot:
+        """Return the current snapshot, refreshing as described in the module docs."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            age = self._clock() - snapshot.fetched_at
+            if age < self.ttl_seconds:
+                return snapshot
+            if age < self.max_stale_seconds:
+                self._refresh_in_background()
+                return snapshot
+        return self.refresh(if_older_than=self.max_stale_seconds)
+
+    def refresh(self, if_older_than: float = 0.0) -> VoiceCatalogSnapshot:
+        """Fetch now unless another caller refreshed while this one waited.
+
+        Args:
+            if_older_than: Skip the fetch if the snapshot is younger than this.
+        """
+        with self._refresh_lock:
+            current = self._snapshot
+            if current is not None and self._clock() - current.fetched_at < if_older_than:
+                return current
+            try:
+                voices = self._fetch()
+                self._snapshot = VoiceCatalogSnapshot.build(voices, self._clock())
+                logger.info(f"Voice catalog refreshed: {len(voices)} voices (version {self._snapshot.version})")
+            except Exception as e:
+                if current is not None:
+                    logger.warning(f"Voice catalog refresh failed, serving previous snapshot: {e}")
+                    return current
+                if self._fallback is None:
+                    raise
+                logger.error(f"Voice catalog fetch failed, serving fallback voices: {e}")
+                # Stale on arrival, so the next request retries in the background
+                self._snapshot = VoiceCatalogSnapshot.build(
+                    self._fallback(), self._clock() - self.ttl_seconds
+                )
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next get() fetches synchronously."""
+        with self._refresh_lock:
+            self._snapshot = None
+
+    def _refresh_in_background(self) -> None:
+        if self._background is not None and self._background.is_alive():
+            return
+        self._background = threading.Thread(
+            target=self.refresh,
+            kwargs={"if_older_than": self.ttl_seconds},
+            name="voice-catalog-refresh",
+            daemon=True,
+        )
+        self._background.start()
+
+
+# Singleton instance
+_catalog_instance: Optional[VoiceCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_voice_catalog(
+    fetch: Callable[[], Sequence[Mapping[str, Any]]],
+    fallback: Optional[Callable[[], Sequence[Mapping[str, Any]]]] = None,
+) -> VoiceCatalog:
+    """Get the process-wide voice catalog, created with the first caller's fetch function."""
+    global _catalog_instance
+    if _catalog_instance is None:
+        with _catalog_lock:
+            if _catalog_instance is None:
+                settings = get_settings()
+                _catalog_instance = VoiceCatalog(
+                    fetch,
+                    ttl_seconds=settings.voice_catalog_ttl_seconds,
+                    max_stale_seconds=settings.voice_catalog_max_stale_seconds,
+                    fallback=fallback,
+                )
+    return _catalog_instance
@@ -0,0 +1,70 @@
+"""Normalized content hashing for knowledge documents.
+
+Two documents whose text differs only in whitespace (line endings, trailing
+spaces, indentation, blank-line runs) or Unicode composition hash the same,
+so such edits do not trigger an ElevenLabs re-sync and identical uploads can
+share one ElevenLabs document.
+"""
+
+import hashlib
+import unicodedata
+
+
+def normalize_content(text: str) -> str:
+    """Normalize text for comparison.
+
+    Applies NFC normalization, collapses runs of spaces/tabs within each line,
+    drops leading/trailing whitespace per line, and collapses consecutive
+    blank lines into one.
+    """
+    text = unicodedata.normalize("NFC", text)
+    lines = []
+    previous_blank = True  # Also drops leading blank lines
+    for line in text.splitlines():
+        collapsed = " ".join(line.split())
+        if not collapsed:
+            if not previous_blank:
+                lines.append("")
+            previous_blank = True
+            continue
+        lines.append(collapsed)
+        previous_blank = False
+    while lines and not lines[-1]:
+        lines.pop()
+    return "\n".join(lines)
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalized text."""
+    return hashlib.sha256(normalize_content(text).encode("utf-8")).hexdigest()
+
+
+class ContentHasher:
+    """Incremental content_hash over text supplied one line at a time.
+
+    Feeding the lines of a text (as produced by str.splitlines) gives the
+    same digest as content_hash(text), without holding the text.
+    """
+
+    def __init__(self):
+        """Initialize an empty hasher."""
+        self._sha = hashlib.sha256()
+        self._started = False
+        self._blank_pending = False
+
+    def update_line(self, line: str) -> None:
+        """Add one line (a trailing line break is ignored)."""
+        collapsed = " ".join(unicodedata.normalize("NFC", line).split())
+        if not collapsed:
+            # Blank runs only count once something follows them
+            self._blank_pending = self._started
+            return
+        if self._started:
+            self._sha.update(b"\n\n" if self._blank_pending else b"\n")
+        self._sha.update(collapsed.encode("utf-8"))
+        self._started = True
+        self._blank_pending = False
+
+    def hexdigest(self) -> str:
+        """Digest of the lines added so far."""
+        return self._sha.hexdigest()
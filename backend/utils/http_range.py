@@ -0,0 +1,61 @@
+"""HTTP Range and conditional request helpers for streamed files.
+
+Only single byte ranges are served as 206; multi-range requests are answered
+with the full content, which RFC 9110 allows a server to do.
+"""
+
+from typing import Optional, Tuple
+
+
+class RangeNotSatisfiable(Exception):
+    """Requested range lies outside the file (answered with 416)."""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a Range header against a file size.
+
+    Args:
+        header: Range header value (e.g. "bytes=0-1023", "bytes=500-", "bytes=-500").
+        size: Total file size in bytes.
+
+    Returns:
+        Inclusive (start, end) byte offsets, or None if the whole file should
+        be served (no header, unsupported unit, malformed or multi-range).
+
+    Raises:
+        RangeNotSatisfiable: If the range is well formed but starts past the end.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiable(header)
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if start < 0 or (end is not None and end < start):
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
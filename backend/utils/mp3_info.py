@@ -0,0 +1,205 @@
+"""Pure-Python MP3 frame-header scanner.
+
+Walks MPEG audio frame headers (skipping frame bodies and ID3v2 tags) to
+compute duration, average bitrate and frame count without decoding audio.
+The scanner is incremental: feed it chunks as they are uploaded or streamed.
+A Xing/Info header in the first frame gives the frame count up front; the
+scanner then reports `complete` so callers reading from storage can stop.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+# Bitrates in kbps by (version is MPEG1, layer) and bitrate index
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Sample rates by version bits (3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+
+@dataclass(frozen=True)
+class Mp3Info:
+    """Stream properties derived from frame headers."""
+
+    duration_seconds: float
+    bitrate_kbps: int
+    frame_count: int
+    sample_rate: int
+    is_vbr: bool
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    """Properties of one MPEG audio frame, read from its 4-byte header."""
+
+    length: int
+    samples: int
+    sample_rate: int
+    bitrate: int
+    side_info: int  # Offset of a Xing/Info tag from the frame start
+    layer: int
+
+
+def parse_frame_header(b0: int, b1: int, b2: int, b3: int) -> Optional[FrameHeader]:
+    """Parse the 4 header bytes of an MPEG audio frame.
+
+    Returns:
+        FrameHeader, or None if the bytes are not a valid frame header.
+    """
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    layer = 4 - layer_bits
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    mono = (b3 >> 6) == 3
+    if layer == 1:
+        return FrameHeader((12 * bitrate // sample_rate + padding) * 4, 384, sample_rate, bitrate, 0, 1)
+    if layer == 2 or mpeg1:
+        samples, factor = 1152, 144
+    else:
+        samples, factor = 576, 72
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    return FrameHeader(
+        factor * bitrate // sample_rate + padding, samples, sample_rate, bitrate, 4 + side_info, layer
+    )
+
+
+class Mp3FrameScanner:
+    """Incremental frame-header scanner; see the module docstring."""
+
+    def __init__(self):
+        self._buffer = b""
+        self._skip = 0
+        self._started = False
+        self._first_frame: Optional[FrameHeader] = None
+        self._xing_tag: Optional[bytes] = None
+        self._xing_frames: Optional[int] = None
+        self._xing_bytes: Optional[int] = None
+        self.frame_count = 0
+        self.audio_bytes = 0
+        self._samples = 0
+        self._sample_rate = 0
+        self._bitrates = set()
+
+    @property
+    def complete(self) -> bool:
+        """True once a Xing/Info header has given the totals."""
+        return self._xing_frames is not None
+
+    def feed(self, chunk: bytes) -> None:
+        """Scan the next chunk of the stream."""
+        if self.complete:
+            return
+        if self._skip >= len(chunk):
+            self._skip -= len(chunk)
+            return
+        data = self._buffer + chunk[self._skip:] if self._buffer else chunk[self._skip:]
+        self._skip = 0
+        pos = self._scan(data)
+        if pos > len(data):
+            self._skip = pos - len(data)
+            pos = len(data)
+        self._buffer = data[pos:]
+
+    def _scan(self, data: bytes) -> int:
+        """Consume frames from data; returns the position reached (may pass the end)."""
+        pos = 0
+        end = len(data)
+        if not self._started:
+            if end < 10:
+                return 0
+            self._started = True
+            if data[:3] == b"ID3":
+                size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+                footer = 10 if data[5] & 0x10 else 0
+                pos = 10 + size + footer
+        while pos + 4 <= end:
+            frame = parse_frame_header(data[pos], data[pos + 1], data[pos + 2], data[pos + 3])
+            if frame is None:
+                # Resync on the next possible frame start
+                next_sync = data.find(b"\xff", pos + 1)
+                pos = end - 3 if next_sync < 0 else next_sync
+                continue
+            if self._first_frame is None:
+                if pos + min(frame.length, frame.side_info + 16) > end:
+                    break  # Wait for enough bytes to look for a Xing/Info header
+                self._first_frame = frame
+                if self._read_xing(data, pos + frame.side_info):
+                    # The tag frame holds no audio; with totals the scan is done
+                    pos += frame.length
+                    if self.complete:
+                        return pos
+                    continue
+            self.frame_count += 1
+            self.audio_bytes += frame.length
+            self._samples += frame.samples
+            self._sample_rate = frame.sample_rate
+            self._bitrates.add(frame.bitrate)
+            pos += frame.length
+        return pos
+
+    def _read_xing(self, data: bytes, tag_pos: int) -> bool:
+        """Parse a Xing/Info tag at tag_pos; returns whether one was found."""
+        tag = data[tag_pos:tag_pos + 4]
+        if tag not in (b"Xing", b"Info"):
+            return False
+        self._xing_tag = tag
+        flags = int.from_bytes(data[tag_pos + 4:tag_pos + 8], "big")
+        if flags & 0x1:
+            self._xing_frames = int.from_bytes(data[tag_pos + 8:tag_pos + 12], "big")
+            if flags & 0x2:
+                self._xing_bytes = int.from_bytes(data[tag_pos + 12:tag_pos + 16], "big")
+        return True
+
+    def result(self) -> Optional[Mp3Info]:
+        """Summarize the frames scanned so far; None if no audio frame was found."""
+        if self._xing_frames is not None:
+            frame = self._first_frame
+            duration = self._xing_frames * frame.samples / frame.sample_rate
+            if not duration:
+                return None
+            audio_bytes = self._xing_bytes or self._xing_frames * frame.length
+            return Mp3Info(
+                duration_seconds=round(duration, 3),
+                bitrate_kbps=round(audio_bytes * 8 / duration / 1000),
+                frame_count=self._xing_frames,
+                sample_rate=frame.sample_rate,
+                # LAME writes "Xing" for VBR and "Info" for CBR streams
+                is_vbr=self._xing_tag == b"Xing",
+            )
+        if not self.frame_count:
+            return None
+        duration = self._samples / self._sample_rate
+        return Mp3Info(
+            duration_seconds=round(duration, 3),
+            bitrate_kbps=round(self.audio_bytes * 8 / duration / 1000),
+            frame_count=self.frame_count,
+            sample_rate=self._sample_rate,
+            is_vbr=len(self._bitrates) > 1,
+        )
+
+
+def scan_mp3(data: bytes) -> Optional[Mp3Info]:
+    """Scan a whole MP3 held in memory."""
+    scanner = Mp3FrameScanner()
+    scanner.feed(data)
+    return scanner.result()
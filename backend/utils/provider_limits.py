@@ -0,0 +1,79 @@
+"""Outbound rate limiting for third-party AI providers.
+
+Unlike backend.middleware.rate_limit, which limits incoming requests per
+client, these limiters pace this process's own calls to Gemini and ElevenLabs
+so background work (batch jobs, sync queues) stays within provider quotas.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+from backend.config import get_settings
+
+# Provider names used as limiter keys
+GEMINI = "gemini"
+ELEVENLABS = "elevenlabs"
+
+
+class ProviderRateLimiter:
+    """Spaces calls to at most ``requests_per_minute`` per process.
+
+    Use as an async context manager around each provider call::
+
+        async with get_provider_limiter(GEMINI):
+            await llm.ainvoke(...)
+    """
+
+    def __init__(self, requests_per_minute: int):
+        """Initialize the limiter.
+
+        Args:
+            requests_per_minute: Maximum call starts per minute (<= 0 disables pacing).
+        """
+        self.requests_per_minute = requests_per_minute
+        self._interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, slots: int = 1) -> None:
+        """Wait until the next call slot is available.
+
+        Args:
+            slots: Calls being started together (e.g. objects in one batch
+                request); later callers wait for all of them.
+        """
+        if self._interval <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval * slots
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def __aenter__(self) -> "ProviderRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+# Limiters shared by every caller in this process
+_limiters: Dict[str, ProviderRateLimiter] = {}
+
+
+def get_provider_limiter(provider: str) -> ProviderRateLimiter:
+    """Get the shared rate limiter for a provider (GEMINI or ELEVENLABS)."""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        settings = get_settings()
+        rpm = {
+            GEMINI: settings.gemini_requests_per_minute,
+            ELEVENLABS: settings.elevenlabs_requests_per_minute,
+        }.get(provider, 0)
+        limiter = _limiters.setdefault(provider, ProviderRateLimiter(rpm))
+    return limiter
@@ -0,0 +1,189 @@
+"""Single-pass markdown section parser for knowledge documents.
+
+Replaces the per-service regex parsing of structured sections. Content is
+consumed line by line (optionally in arbitrary chunks via SectionParser.feed),
+so parsing is linear in document size and never rescans earlier text.
+
+Besides the header -> content map stored as ``structured_sections``, the
+parser builds a section index: one entry per section with its header path,
+character and UTF-8 byte offsets of the body, and an estimated token count.
+The index is persisted with the document so callers can slice out just the
+sections they need instead of truncating the raw content.
+"""
+
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Rough characters-per-token ratio used for token estimates
+CHARS_PER_TOKEN = 4
+
+# Splits after each "\n", keeping it on the line
+_LINE_END_RE = re.compile(r"(?<=\n)")
+
+# Title used for text that precedes the first header
+INTRODUCTION = "Introduction"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the LLM token count of a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _parse_header(line: str) -> Optional[Tuple[int, str]]:
+    """Return (level, title) if the line is an ATX header, else None."""
+    stripped = line.lstrip()
+    level = 0
+    while level < len(stripped) and stripped[level] == "#":
+        level += 1
+    if not 1 <= level <= 6 or level == len(stripped) or stripped[level] not in " \t":
+        return None
+    return level, stripped[level:].strip()
+
+
+class SectionParser:
+    """Incremental parser; feed text chunks, then call close()."""
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        self._pending: List[str] = []  # Pieces of an incomplete trailing line
+        self._char_pos = 0
+        self._byte_pos = 0
+        self._header_stack: List[Tuple[int, str]] = []
+        self._title = INTRODUCTION
+        self._path: List[str] = [INTRODUCTION]
+        self._level = 0
+        self._body: List[str] = []
+        self._body_start = (0, 0)
+        self._saw_header = False
+        self._raw_parts: List[str] = []  # Only kept until the first header
+        self.sections: Dict[str, str] = {}
+        self.index: List[dict] = []
+
+    def feed(self, chunk: str) -> None:
+        """Consume a chunk of text (may split lines anywhere)."""
+        if not chunk:
+            return
+        self._pending.append(chunk)
+        if "\n" not in chunk:
+            return
+        # Only "\n" ends a line, as in the old regex parser (str.splitlines
+        # would also split on \r, \x0b, \u2028 and friends)
+        lines = _LINE_END_RE.split("".join(self._pending))
+        # The last line may continue in the next chunk
+        tail = lines.pop()
+        self._pending = [tail] if tail else []
+        for line in lines:
+            self._consume_line(line)
+
+    def close(self) -> Tuple[Dict[str, str], List[dict]]:
+        """Flush remaining text and return (structured_sections, section_index)."""
+        if self._pending:
+            self._consume_line("".join(self._pending))
+            self._pending = []
+        self._finish_section()
+        if not self._saw_header:
+            content = "".join(self._raw_parts)
+            self.sections = {"content": content} if content.strip() else {}
+            self.index = []
+            if content.strip():
+                self.index.append(self._index_entry(
+                    "content", ["content"], 0, 0, self._char_pos, 0, self._byte_pos, content
+                ))
+        return self.sections, self.index
+
+    def _consume_line(self, line: str) -> None:
+        header = _parse_header(line)
+        line_start = (self._char_pos, self._byte_pos)
+        self._char_pos += len(line)
+        self._byte_pos += len(line.encode("utf-8"))
+
+        if header is None:
+            self._body.append(line)
+            if not self._saw_header:
+                self._raw_parts.append(line)
+            return
+
+        self._finish_section(end=line_start)
+        self._saw_header = True
+        self._raw_parts = []
+        level, title = header
+        while self._header_stack and self._header_stack[-1][0] >= level:
+            self._header_stack.pop()
+        self._header_stack.append((level, title))
+        self._title = title
+        self._level = level
+        self._path = [t for _, t in self._header_stack]
+        self._body = []
+        self._body_start = (self._char_pos, self._byte_pos)
+
+    def _finish_section(self, end: Optional[Tuple[int, int]] = None) -> None:
+        end_char, end_byte = end or (self._char_pos, self._byte_pos)
+        body = "".join(self._body).strip()
+        if body and (self._saw_header or end is not None):
+            self.sections[self._title] = body
+            self.index.append(self._index_entry(
+                self._title, self._path, self._level,
+                self._body_start[0], end_char, self._body_start[1], end_byte, body,
+            ))
+        self._body = []
+
+    @staticmethod
+    def _index_entry(
+        title: str, path: List[str], level: int,
+        start: int, end: int, byte_start: int, byte_end: int, body: str,
+    ) -> dict:
+        return {
+            "title": title,
+            "path": list(path),
+            "level": level,
+            "start": start,
+            "end": end,
+            "byte_start": byte_start,
+            "byte_end": byte_end,
+            "tokens": estimate_tokens(body),
+        }
+
+
+def parse_sections(content: str) -> Tuple[Dict[str, str], List[dict]]:
+    """Parse markdown content into structured sections and a section index.
+
+    Args:
+        content: Raw markdown content.
+
+    Returns:
+        Tuple of (header -> section content map, section index entries).
+        Text before the first header is stored as "Introduction"; content
+        without any header is stored whole under "content".
+    """
+    parser = SectionParser()
+    parser.feed(content)
+    return parser.close()
+
+
+def load_sections(
+    content: str, section_index: List[dict], max_tokens: int, titles: Optional[List[str]] = None
+) -> str:
+    """Assemble whole sections, in document order, within a token budget.
+
+    Args:
+        content: Raw document content the index was built from.
+        section_index: Index produced by parse_sections.
+        max_tokens: Token budget for the returned text.
+        titles: Optional section titles to restrict to.
+
+    Returns:
+        The selected sections as markdown, or "" if none fit.
+    """
+    parts: List[str] = []
+    used = 0
+    for entry in section_index:
+        if titles is not None and entry["title"] not in titles:
+            continue
+        if used + entry["tokens"] > max_tokens:
+            break
+        body = content[entry["start"]:entry["end"]].strip()
+        heading = "#" * entry["level"] + " " + entry["title"] if entry["level"] else ""
+        parts.append(f"{heading}\n{body}" if heading else body)
+        used += entry["tokens"]
+    return "\n\n".join(parts)
@@ -0,0 +1,141 @@
+"""Streaming text extraction for uploaded knowledge files.
+
+Uploaded markdown/plain-text files are consumed as byte chunks: each chunk is
+UTF-8 decoded incrementally (a multi-byte character may span chunks), line
+endings are normalized to "\\n" and each line is NFC normalized. Complete
+lines are fed to the section parser and the content hasher as they arrive,
+so sections, section index and content hash are ready when the last chunk
+has been read, without a second pass over the text.
+"""
+
+import codecs
+import unicodedata
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import Dict, List, Optional, Tuple
+
+from backend.utils.content_hash import ContentHasher, content_hash
+from backend.utils.section_parser import SectionParser, parse_sections
+
+# Upload file extensions and the content types they are stored with
+SUPPORTED_UPLOAD_TYPES = {
+    ".md": "text/markdown",
+    ".markdown": "text/markdown",
+    ".txt": "text/plain",
+}
+
+# Content types accepted when the filename has no known extension
+SUPPORTED_CONTENT_TYPES = {"text/markdown", "text/x-markdown", "text/plain"}
+
+
+def upload_content_type(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Resolve the stored content type of an upload, or None if unsupported."""
+    suffix = PurePath(filename or "").suffix.lower()
+    if suffix in SUPPORTED_UPLOAD_TYPES:
+        return SUPPORTED_UPLOAD_TYPES[suffix]
+    base_type = (content_type or "").split(";")[0].strip().lower()
+    if not suffix and base_type in SUPPORTED_CONTENT_TYPES:
+        return "text/markdown" if "markdown" in base_type else "text/plain"
+    return None
+
+
+@dataclass
+class ExtractedText:
+    """Results computed while streaming a document's text."""
+
+    structured_sections: Dict[str, str]
+    section_index: List[dict]
+    content_hash: str
+    byte_size: int = 0
+    char_count: int = 0
+    source_path: Optional[str] = None
+
+
+def extract_text(content: str) -> ExtractedText:
+    """Compute sections, section index and content hash of in-memory content."""
+    sections, index = parse_sections(content)
+    return ExtractedText(
+        structured_sections=sections,
+        section_index=index,
+        content_hash=content_hash(content),
+        byte_size=len(content.encode("utf-8")),
+        char_count=len(content),
+    )
+
+
+class StreamingTextExtractor:
+    """Incremental decoder/normalizer; feed byte chunks, then call close()."""
+
+    def __init__(self):
+        """Initialize an empty extractor."""
+        # utf-8-sig drops a leading byte order mark
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="strict")
+        self._pending = ""
+        self._parser = SectionParser()
+        self._hasher = ContentHasher()
+        self._byte_size = 0
+        self._char_count = 0
+        self._has_text = False
+
+    @property
+    def byte_size(self) -> int:
+        """Raw bytes consumed so far."""
+        return self._byte_size
+
+    def feed(self, chunk: bytes) -> str:
+        """Consume a chunk of the upload.
+
+        Returns:
+            Normalized text for the lines completed by this chunk.
+
+        Raises:
+            UnicodeDecodeError: If the bytes are not valid UTF-8.
+        """
+        self._byte_size += len(chunk)
+        return self._process(self._decoder.decode(chunk))
+
+    def close(self) -> Tuple[str, ExtractedText]:
+        """Flush the final line.
+
+        Returns:
+            Tuple of (remaining normalized text, extraction results).
+
+        Raises:
+            UnicodeDecodeError: If the upload ends inside a UTF-8 sequence.
+        """
+        tail = self._process(self._decoder.decode(b"", final=True), final=True)
+        sections, index = self._parser.close()
+        return tail, ExtractedText(
+            structured_sections=sections,
+            section_index=index,
+            content_hash=self._hasher.hexdigest(),
+            byte_size=self._byte_size,
+            char_count=self._char_count,
+        )
+
+    @property
+    def has_text(self) -> bool:
+        """Whether any non-whitespace text has been seen."""
+        return self._has_text
+
+    def _process(self, text: str, final: bool = False) -> str:
+        text = self._pending + text
+        self._pending = ""
+        if not text:
+            return ""
+        lines = text.splitlines(keepends=True)
+        last = lines[-1]
+        # Keep an unterminated line, or a bare "\r" that may be half of "\r\n"
+        if not final and not last.endswith("\n"):
+            self._pending = lines.pop()
+        out = []
+        for line in lines:
+            body = line.rstrip("\r\n")
+            terminated = len(body) != len(line)
+            normalized = unicodedata.normalize("NFC", body) + ("\n" if terminated else "")
+            self._hasher.update_line(normalized)
+            self._parser.feed(normalized)
+            self._has_text = self._has_text or bool(normalized.strip())
+            self._char_count += len(normalized)
+            out.append(normalized)
+        return "".join(out)
@@ -0,0 +1,55 @@
+"""Backfill duration, bitrate and frame count for stored audio files.
+
+Thin CLI over backend.services.audio_backfill (also exposed as
+POST /api/audio/backfill-metadata, which queues it). Only MP3 frame headers are parsed, so
+files are streamed but not decoded.
+
+Usage:
+    python scripts/backfill--audio-metadata.py
+    python scripts/backfill--audio-metadata.py --force --concurrency 8
+"""
+
+import sys
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv(project_root / ".env")
+
+from backend.services.audio_backfill import backfill_audio_metadata
+from backend.services.data_service import get_data_service
+from backend.services.storage_service import get_storage_service
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio metadata backfill")
+    parser.add_argument("--force", action="store_true", help="Re-measure files that already have a duration")
+    parser.add_argument("--concurrency", type=int, default=None, help="Files scanned at once")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        backfill_audio_metadata(
+            get_data_service(), get_storage_service(), force=args.force, concurrency=args.concurrency
+        )
+    )
+    logger.info(
+        f"Updated {report.updated_count} of {report.total_count} "
+        f"(missing: {report.missing_count}, unreadable: {report.unreadable_count}, "
+        f"failed: {report.failed_count}) in {report.elapsed_ms} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark for audio stream serving throughput.
+
+Sends a generated MP3-sized file through the ASGI response objects the
+stream endpoint uses and reports MB/s and CPU seconds per GB streamed:
+
+- legacy:   StreamingResponse over a sync generator of 8 KiB reads (one
+            thread-pool hop per chunk), as before;
+- file:     FileResponse for mock storage (zero-copy file send where the
+            server supports it; chunked async reads otherwise);
+- gcs-sync: StreamingResponse over the sync ranged-read generator;
+- gcs-async: StreamingResponse over the async ranged-read iterator.
+
+The GCS variants use an in-memory fake blob with an optional per-request
+latency (--latency-ms) to model network round trips.
+
+Usage:
+    python scripts/benchmark--audio-streaming.py
+    python scripts/benchmark--audio-streaming.py --size-mb 64 --repeat 5 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from starlette.responses import FileResponse, StreamingResponse
+
+from backend.config import get_settings
+from backend.services.storage_service import StorageService, StoredFileInfo
+
+# Setup logging
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+LEGACY_CHUNK_SIZE = 8192
+
+
+def legacy_stream(path: Path):
+    """The previous mock storage generator."""
+    with open(path, "rb") as f:
+        while chunk := f.read(LEGACY_CHUNK_SIZE):
+            yield chunk
+
+
+def fake_gcs_storage(data: bytes, latency_s: float) -> StorageService:
+    storage = object.__new__(StorageService)
+    storage._bucket = MagicMock()
+
+    def download_as_bytes(start, end):
+        if latency_s:
+            time.sleep(latency_s)
+        return data[start:end + 1]
+
+    storage._bucket.blob.return_value.download_as_bytes.side_effect = download_as_bytes
+    return storage
+
+
+async def send_response(response) -> int:
+    """Run an ASGI response, discarding the body; returns bytes sent."""
+    sent = 0
+    scope = {"type": "http", "method": "GET", "headers": [], "extensions": {}}
+
+    async def receive():
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+
+    await response(scope, receive, send)
+    return sent
+
+
+def measure(make_response, size: int, repeat: int):
+    wall = cpu = 0.0
+    for _ in range(repeat):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        sent = asyncio.run(send_response(make_response()))
+        wall += time.perf_counter() - wall_start
+        cpu += time.process_time() - cpu_start
+        assert sent == size, f"sent {sent} of {size} bytes"
+    mb = size * repeat / 1e6
+    return mb / wall, cpu / (size * repeat / 1e9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark audio stream serving")
+    parser.add_argument("--size-mb", type=int, default=32, help="Generated file size")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fake GCS per-request latency")
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    data = os.urandom(size)
+    info = StoredFileInfo(size=size, etag='"1"', generation=1)
+    gcs = fake_gcs_storage(data, args.latency_ms / 1000)
+    get_settings().use_mock_storage = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "audio.mp3"
+        path.write_bytes(data)
+        variants = {
+            "legacy": lambda: StreamingResponse(legacy_stream(path), media_type="audio/mpeg"),
+            "file": lambda: FileResponse(path, media_type="audio/mpeg"),
+            "gcs-sync": lambda: StreamingResponse(
+                gcs.get_file_stream("audio/a.mp3", info=info), media_type="audio/mpeg"
+            ),
+            "gcs-async": lambda: StreamingResponse(
+                gcs.aiter_file("audio/a.mp3", info=info), media_type="audio/mpeg"
+            ),
+        }
+
+        print(f"\n{args.size_mb} MiB x {args.repeat}, fake GCS latency {args.latency_ms} ms")
+        print(f"{'variant':>10} {'MB/s':>10} {'CPU s/GB':>10}")
+        for name, make_response in variants.items():
+            throughput, cpu_per_gb = measure(make_response, size, args.repeat)
+            print(f"{name:>10} {throughput:>10.1f} {cpu_per_gb:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
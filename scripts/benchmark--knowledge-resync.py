@@ -0,0 +1,136 @@
+"""Benchmark for re-syncing a knowledge document shared by many agents.
+
+Simulates ElevenLabs calls with a fixed latency and compares the previous
+sequential detach/delete/create/re-attach flow against the current
+create-then-swap flow with bounded concurrency. Reports total wall time and
+how long agents were left without the document.
+
+Usage:
+    python scripts/benchmark--knowledge-resync.py
+    python scripts/benchmark--knowledge-resync.py --agents 40 --latency-ms 150
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ["USE_MOCK_DATA"] = "true"
+os.environ["USE_FIRESTORE_EMULATOR"] = "false"
+
+from backend.models.schemas import AgentResponse, AnswerStyle, KnowledgeDocumentCreate
+from backend.services.data_service import MockDataService
+from backend.services.knowledge_sync_tasks import _agent_knowledge_base, perform_knowledge_resync
+
+# Setup logging
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class SimulatedElevenLabs:
+    """ElevenLabs stand-in with per-call latency that tracks document gaps."""
+
+    def __init__(self, agent_ids, latency: float):
+        self.latency = latency
+        self.kb = {a: [{"id": "el_old", "name": "doc", "type": "file"}] for a in agent_ids}
+        self.missing_since = {}
+        self.gap_seconds = 0.0
+
+    def create_document(self, text, name):
+        time.sleep(self.latency)
+        return "el_new"
+
+    def delete_document(self, document_id):
+        time.sleep(self.latency)
+        return True
+
+    def get_agent(self, agent_id):
+        time.sleep(self.latency)
+        return {"conversation_config": {"agent": {"prompt": {"knowledge_base": list(self.kb[agent_id])}}}}
+
+    def update_agent_knowledge_base(self, agent_id, knowledge_base):
+        time.sleep(self.latency)
+        now = time.perf_counter()
+        self.kb[agent_id] = knowledge_base
+        if not knowledge_base:
+            self.missing_since[agent_id] = now
+        elif agent_id in self.missing_since:
+            self.gap_seconds = max(self.gap_seconds, now - self.missing_since.pop(agent_id))
+        return True
+
+
+async def sequential_resync(knowledge_id, old_id, content, name, data_service, elevenlabs):
+    """The previous flow: detach all, delete, create, re-attach all, one call at a time."""
+    agents = [a for a in await data_service.get_agents() if knowledge_id in a.knowledge_ids]
+    backups = {}
+    for agent in agents:
+        current = _agent_knowledge_base(elevenlabs.get_agent(agent.elevenlabs_agent_id))
+        backups[agent.elevenlabs_agent_id] = current
+        elevenlabs.update_agent_knowledge_base(
+            agent.elevenlabs_agent_id, [d for d in current if d.get("id") != old_id]
+        )
+    elevenlabs.delete_document(old_id)
+    new_id = elevenlabs.create_document(text=content, name=name)
+    for agent in agents:
+        kb = [d for d in backups[agent.elevenlabs_agent_id] if d.get("id") != old_id]
+        kb.append({"id": new_id, "name": name, "type": "file"})
+        elevenlabs.update_agent_knowledge_base(agent.elevenlabs_agent_id, kb)
+    return new_id
+
+
+async def run(flow, agent_count: int, latency: float):
+    data_service = MockDataService()
+    doc = await data_service.create_knowledge_document(
+        KnowledgeDocumentCreate(disease_name="Benchmark", raw_content="content")
+    )
+    agent_ids = []
+    for i in range(agent_count):
+        await data_service.save_agent(AgentResponse(
+            agent_id=f"agent-{i}",
+            name=f"Agent {i}",
+            knowledge_ids=[doc.knowledge_id],
+            voice_id="voice",
+            answer_style=AnswerStyle.PROFESSIONAL,
+            elevenlabs_agent_id=f"el-agent-{i}",
+            doctor_id="doctor",
+            created_at=datetime.now(),
+        ))
+        agent_ids.append(f"el-agent-{i}")
+
+    elevenlabs = SimulatedElevenLabs(agent_ids, latency)
+    start = time.perf_counter()
+    await flow(doc.knowledge_id, "el_old", "content", "doc", data_service, elevenlabs)
+    return time.perf_counter() - start, elevenlabs.gap_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark knowledge re-sync across agents")
+    parser.add_argument("--agents", type=int, default=40, help="Agents linked to the document")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Simulated call latency")
+    parser.add_argument("--concurrency", type=int, default=8, help="KNOWLEDGE_RESYNC_CONCURRENCY")
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    with patch("backend.services.knowledge_sync_tasks.get_settings") as mock_settings:
+        mock_settings.return_value.knowledge_resync_concurrency = args.concurrency
+        seq_total, seq_gap = asyncio.run(run(sequential_resync, args.agents, latency))
+        new_total, new_gap = asyncio.run(run(perform_knowledge_resync, args.agents, latency))
+
+    print(f"\nKnowledge re-sync, {args.agents} agents, {args.latency_ms:.0f} ms/call")
+    swap_label = f"swap x{args.concurrency}"
+    print(f"  {'sequential':<16} total {seq_total:7.2f} s   max agent gap {seq_gap:7.2f} s")
+    print(f"  {swap_label:<16} total {new_total:7.2f} s   max agent gap {new_gap:7.2f} s")
+    print(f"  speedup          {seq_total / new_total:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
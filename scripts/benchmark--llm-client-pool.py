@@ -0,0 +1,123 @@
+"""Benchmark for the shared LLM client pool in langgraph_workflow.
+
+Compares per-request client overhead when a ChatGoogleGenerativeAI client is
+built on every request (the previous behaviour) against a pooled lookup via
+get_llm_client(). No network calls are made: clients are constructed with a
+dummy key, and the end-to-end comparison swaps in a fake chat model through
+set_llm_factory() so only client setup cost differs between the two runs.
+
+Usage:
+    python scripts/benchmark--llm-client-pool.py
+    python scripts/benchmark--llm-client-pool.py --requests 200
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from backend.services.langgraph_workflow import (
+    clear_llm_pool,
+    get_llm_client,
+    set_llm_factory,
+)
+
+# Setup logging
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+MODEL = "gemini-2.5-flash-lite"
+DUMMY_KEY = "benchmark-dummy-key"
+MESSAGES = [SystemMessage(content="You are a script writer."), HumanMessage(content="Knowledge")]
+
+
+def _summarize(label: str, samples: list[float]) -> None:
+    """Print mean/p50/p95 in milliseconds for a list of durations (seconds)."""
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    print(
+        f"{label:<38} mean={statistics.mean(ms):8.3f} ms  "
+        f"p50={statistics.median(ms):8.3f} ms  p95={p95:8.3f} ms"
+    )
+
+
+def bench_client_setup(requests: int) -> None:
+    """Measure client acquisition cost: new Gemini client vs pooled lookup."""
+    fresh = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        ChatGoogleGenerativeAI(
+            model=MODEL,
+            google_api_key=DUMMY_KEY,
+            temperature=0.7,
+            timeout=30,
+            max_retries=2,
+            max_output_tokens=4096,
+        )
+        fresh.append(time.perf_counter() - start)
+
+    clear_llm_pool()
+    pooled = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        get_llm_client(MODEL, DUMMY_KEY)
+        pooled.append(time.perf_counter() - start)
+    clear_llm_pool()
+
+    print(f"\nClient acquisition ({requests} requests)")
+    _summarize("new ChatGoogleGenerativeAI per request", fresh)
+    _summarize("pooled get_llm_client()", pooled)
+
+
+async def bench_fake_requests(requests: int) -> None:
+    """Measure setup + invoke with a fake chat model standing in for Gemini."""
+
+    def fake_factory(**kwargs):
+        return FakeListChatModel(responses=["Generated script"])
+
+    # Unpooled: build a new client for every request, as before
+    unpooled = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        llm = fake_factory()
+        await llm.ainvoke(MESSAGES)
+        unpooled.append(time.perf_counter() - start)
+
+    set_llm_factory(fake_factory)
+    try:
+        pooled = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            llm = get_llm_client(MODEL, DUMMY_KEY)
+            await llm.ainvoke(MESSAGES)
+            pooled.append(time.perf_counter() - start)
+    finally:
+        set_llm_factory(None)
+
+    print(f"\nFake chat model request ({requests} requests)")
+    _summarize("new fake client per request", unpooled)
+    _summarize("pooled fake client", pooled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared LLM client pool")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    args = parser.parse_args()
+
+    bench_client_setup(args.requests)
+    asyncio.run(bench_fake_requests(args.requests))
+
+
+if __name__ == "__main__":
+    main()
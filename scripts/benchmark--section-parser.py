@@ -0,0 +1,98 @@
+"""Benchmark for markdown section parsing of knowledge documents.
+
+Compares the previous regex-based parser (duplicated in the data services)
+with the shared single-pass parser on generated documents up to the 300 KB
+upload limit, and checks both produce the same sections.
+
+Usage:
+    python scripts/benchmark--section-parser.py
+    python scripts/benchmark--section-parser.py --sizes 10000 100000 300000 --repeat 20
+"""
+
+import argparse
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.utils.section_parser import parse_sections
+
+# Setup logging
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def legacy_parse(content: str) -> dict:
+    """The regex parser previously copied into both data services."""
+    sections = {}
+    matches = list(re.finditer(r'(^|\n)(?P<level>\s*#{1,6})\s(?P<title>.*)', content))
+    if not matches:
+        if content.strip():
+            sections["content"] = content
+        return sections
+    for i, match in enumerate(matches):
+        if i == 0:
+            intro = content[0:match.start()].strip()
+            if intro:
+                sections["Introduction"] = intro
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        body = content[match.end():end].strip()
+        if body:
+            sections[match.group("title").strip()] = body
+    return sections
+
+
+def make_document(size: int) -> str:
+    """Generate markdown of roughly `size` characters with nested headers."""
+    parts = ["Introductory paragraph about the condition.\n"]
+    total = len(parts[0])
+    i = 0
+    while total < size:
+        level = 1 + i % 3
+        block = (
+            f"{'#' * level} Section {i}\n"
+            + "Patients should follow the care plan and report symptoms. " * 8
+            + "\n\n"
+        )
+        parts.append(block)
+        total += len(block)
+        i += 1
+    return "".join(parts)
+
+
+def bench(func, content: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(content)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark knowledge section parsing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement")
+    args = parser.parse_args()
+
+    print(f"\n{'size':>10} {'legacy ms':>10} {'shared ms':>10} {'same':>6}")
+    ok = True
+    for size in args.sizes:
+        content = make_document(size)
+        same = legacy_parse(content) == parse_sections(content)[0]
+        ok = ok and same
+        print(
+            f"{len(content):>10} {bench(legacy_parse, content, args.repeat):>10.2f} "
+            f"{bench(parse_sections, content, args.repeat):>10.2f} {str(same):>6}"
+        )
+    print("\nNote: the shared parser also builds the section index in the same pass.")
+    if not ok:
+        print("FAIL: outputs differ")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark for script generation workflow lifecycle costs.
+
+Measures:
+1. Startup: importing langgraph_workflow (which compiles both graphs once).
+2. Per-request setup: compiling a graph per request (previous behaviour)
+   versus fetching the shared compiled graph, and building a new
+   AudioService per request versus the shared get_audio_service() instance.
+
+Storage, data and ElevenLabs dependencies are replaced with mocks so only the
+service and graph construction cost is measured; no network calls are made.
+
+Usage:
+    python scripts/benchmark--workflow-lifecycle.py
+    python scripts/benchmark--workflow-lifecycle.py --requests 200
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Setup logging
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def _summarize(label: str, samples: list[float]) -> None:
+    """Print mean/p50/p95 in milliseconds for a list of durations (seconds)."""
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    print(
+        f"{label:<40} mean={statistics.mean(ms):8.3f} ms  "
+        f"p50={statistics.median(ms):8.3f} ms  p95={p95:8.3f} ms"
+    )
+
+
+def bench_startup() -> None:
+    """Time the module import that compiles the shared graphs."""
+    start = time.perf_counter()
+    import backend.services.langgraph_workflow  # noqa: F401
+    elapsed = time.perf_counter() - start
+    print(f"\nStartup\n{'import langgraph_workflow (+ compile x2)':<40} {elapsed * 1000:8.3f} ms")
+
+
+def bench_graph(requests: int) -> None:
+    """Compare compiling a graph per request against the shared graph."""
+    from backend.services import langgraph_workflow as wf
+
+    compiled, traced, shared = [], [], []
+    for _ in range(requests):
+        start = time.perf_counter()
+        wf.create_script_generation_graph()
+        compiled.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        wf.create_traced_script_generation_graph()
+        traced.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        wf.get_script_generation_graph()
+        wf.get_traced_script_generation_graph()
+        shared.append(time.perf_counter() - start)
+
+    print(f"\nGraph setup per request ({requests} requests)")
+    _summarize("compile untraced graph", compiled)
+    _summarize("compile traced graph", traced)
+    _summarize("shared compiled graphs", shared)
+
+
+def bench_audio_service(requests: int) -> None:
+    """Compare a new AudioService per request against the shared instance."""
+    from backend.services import audio_service as audio_module
+    from backend.services import script_generation_service as script_module
+    from backend.services.langgraph_workflow import create_script_generation_graph
+
+    with patch.object(audio_module, "get_elevenlabs_service", return_value=MagicMock()), \
+         patch.object(audio_module, "get_storage_service", return_value=MagicMock()), \
+         patch.object(audio_module, "get_data_service", return_value=MagicMock()), \
+         patch.object(audio_module, "_audio_service_instance", None):
+        per_request = []
+        # Previous lifecycle: new AudioService and ScriptGenerationService per
+        # request, each compiling its own graph
+        with patch.object(script_module, "get_script_generation_graph", create_script_generation_graph):
+            for _ in range(requests):
+                start = time.perf_counter()
+                audio_module.AudioService(script_service=script_module.ScriptGenerationService())
+                per_request.append(time.perf_counter() - start)
+
+        shared = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            audio_module.get_audio_service()
+            shared.append(time.perf_counter() - start)
+
+    print(f"\nAudioService dependency per request ({requests} requests)")
+    _summarize("new AudioService per request", per_request)
+    _summarize("shared get_audio_service()", shared)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark workflow and service lifecycle")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    args = parser.parse_args()
+
+    bench_startup()
+    bench_graph(args.requests)
+    bench_audio_service(args.requests)
+
+
+if __name__ == "__main__":
+    main()
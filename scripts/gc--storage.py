@@ -0,0 +1,62 @@
+"""Find and delete storage objects no database record references.
+
+Thin CLI over backend.services.storage_gc (also exposed as
+POST /api/internal/storage/gc). Scans audio/ and knowledge/ and reports
+orphans older than the grace period; nothing is deleted without --apply.
+
+Usage:
+    python scripts/gc--storage.py
+    python scripts/gc--storage.py --apply --grace-hours 48
+"""
+
+import sys
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv(project_root / ".env")
+
+from backend.services.data_service import get_data_service
+from backend.services.storage_gc import collect_storage_garbage
+from backend.services.storage_service import get_storage_service
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage garbage collection")
+    parser.add_argument("--apply", action="store_true", help="Delete orphans (default: dry run)")
+    parser.add_argument("--grace-hours", type=int, default=None, help="Keep orphans younger than this")
+    parser.add_argument("--deletes-per-minute", type=int, default=None, help="Delete pacing (0: none)")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        collect_storage_garbage(
+            get_data_service(),
+            get_storage_service(),
+            dry_run=not args.apply,
+            grace_hours=args.grace_hours,
+            deletes_per_minute=args.deletes_per_minute,
+        )
+    )
+    for entry in report.orphans:
+        logger.info(f"{'deleted' if entry.deleted else 'orphan'}: {entry.path} ({entry.size_bytes} bytes)")
+    logger.info(
+        f"Scanned {report.scanned_count}: {report.orphan_count} orphans ({report.orphan_bytes} bytes), "
+        f"{report.deleted_count} deleted, {report.failed_count} failed, "
+        f"{report.reclaimed_bytes} bytes reclaimed in {report.elapsed_ms} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -207,17 +207,18 @@ if submitted:
     elif not uploaded_file:
         add_error_to_log("Please upload a file.")
     else:
-        # File size check (300KB = 300 * 1024 bytes)
-        if uploaded_file.size > 300 * 1024:
-            add_error_to_log("File size exceeds 300KB limit.")
+        # File size check (the backend enforces the same limit while streaming)
+        max_upload_bytes = get_settings().knowledge_upload_max_bytes
+        if uploaded_file.size > max_upload_bytes:
+            add_error_to_log(f"File size exceeds {max_upload_bytes // 1024}KB limit.")
         else:
-            content = uploaded_file.read().decode("utf-8")
-            
             with st.spinner("Uploading and syncing..."):
                 try:
-                    # Run async function in sync context
-                    doc = asyncio.run(client.upload_knowledge(
-                        content=content,
+                    # Run async function in sync context; the file is sent as multipart
+                    # and decoded/parsed by the backend
+                    doc = asyncio.run(client.upload_knowledge_file(
+                        file=uploaded_file,
+                        filename=uploaded_file.name,
                         disease_name=disease_name.strip(),
                         tags=all_tags
                     ))
@@ -6,6 +6,7 @@ from knowledge documents using ElevenLabs TTS.
 
 import asyncio
 import logging
+import time
 from typing import List, Optional, Any
 import sys
 
@@ -26,6 +27,7 @@ from streamlit_app.services.models import (
     CustomTemplateCreate,
 )
 from streamlit_app.services.cached_data import (
+    get_audio_peaks_cached,
     get_documents_cached,
     get_voices_cached,
     run_async,
@@ -87,6 +89,14 @@ if "doctor_id" not in st.session_state:
 # Audio history view mode: "document" = document-specific, "doctor" = all doctor's audio
 if "audio_view_mode" not in st.session_state:
     st.session_state.audio_view_mode = "doctor"
+# Audio history paging, signed playback URLs {audio_id: (url, expires_at)}
+# and scripts loaded on demand {audio_id: script}
+if "audio_history_page" not in st.session_state:
+    st.session_state.audio_history_page = 0
+if "_audio_playback_urls" not in st.session_state:
+    st.session_state._audio_playback_urls = {}
+if "_audio_scripts" not in st.session_state:
+    st.session_state._audio_scripts = {}
 # Pending template operations (for async handling outside dialogs)
 if "_pending_template_op" not in st.session_state:
     st.session_state._pending_template_op = None
@@ -1126,6 +1136,58 @@ def edit_audio_details():
             st.rerun()
 
 
+AUDIO_HISTORY_PAGE_SIZE = 10
+# Re-sign playback URLs this long before they expire
+PLAYBACK_URL_REFRESH_MARGIN_SECONDS = 300
+
+
+WAVEFORM_BARS = 120
+
+
+def render_waveform(audio_id: str) -> None:
+    """Render a waveform preview from the stored peaks (no audio download)."""
+    try:
+        peaks = get_audio_peaks_cached(audio_id)
+    except Exception as e:
+        logging.warning(f"[Audio History] No waveform for {audio_id}: {e}")
+        return
+    if not peaks:
+        return
+    # Downsample to a fixed number of bars, keeping the loudest peak of each
+    count = min(WAVEFORM_BARS, len(peaks))
+    bars = [
+        max(peaks[i * len(peaks) // count:(i + 1) * len(peaks) // count]) for i in range(count)
+    ]
+    rects = "".join(
+        f'<rect x="{i * 3}" y="{20 - h}" width="2" height="{2 * h or 1}"/>'
+        for i, h in enumerate(round(b * 20 / 127) for b in bars)
+    )
+    st.markdown(
+        f'<svg viewBox="0 0 {len(bars) * 3} 40" width="100%" height="40" '
+        f'preserveAspectRatio="none" fill="#7c8db5">{rects}</svg>',
+        unsafe_allow_html=True,
+    )
+
+
+def get_playback_urls(audio_ids: List[str]) -> dict:
+    """Signed playback URLs for the given audio, signing only missing or expiring ones."""
+    cached = st.session_state._audio_playback_urls
+    now = time.time()
+    missing = [
+        audio_id for audio_id in audio_ids
+        if audio_id not in cached or cached[audio_id][1] - PLAYBACK_URL_REFRESH_MARGIN_SECONDS <= now
+    ]
+    if missing:
+        try:
+            urls, expires_in = run_async(client.get_playback_urls(missing))
+        except Exception as e:
+            add_error_to_log(f"Unable to load audio playback. (Error: {e})")
+            urls, expires_in = {}, 0
+        expires_at = now + expires_in
+        cached.update({audio_id: (url, expires_at) for audio_id, url in urls.items()})
+    return {audio_id: cached[audio_id][0] for audio_id in audio_ids if audio_id in cached}
+
+
 @st.fragment
 def render_audio_history():
     """Render audio history with toggle for document-specific vs all-doctor audio."""
@@ -1166,18 +1228,21 @@ def render_audio_history():
         current_cache_id = f"doc_{st.session_state.selected_document.knowledge_id}"
     else:
         current_cache_id = f"doctor_{st.session_state.doctor_id}"
+    if st.session_state.get("_audio_history_page_id") != current_cache_id:
+        st.session_state.audio_history_page = 0
+        st.session_state._audio_history_page_id = current_cache_id
     
     # Check cache validity
     if st.session_state.get(cache_id_key) != current_cache_id:
         logging.info(f"[Audio History] Cache miss/invalid. Fetching for {current_cache_id}")
-        # Cache miss or stale, fetch fresh data
+        # Cache miss or stale, fetch the manifest (revalidated by ETag)
         try:
             if st.session_state.audio_view_mode == "document":
-                audio_files = run_async(client.get_audio_files(
+                audio_files = run_async(client.get_audio_manifest(
                     knowledge_id=st.session_state.selected_document.knowledge_id
                 ))
             else:
-                audio_files = run_async(client.get_audio_files(
+                audio_files = run_async(client.get_audio_manifest(
                     doctor_id=st.session_state.doctor_id
                 ))
             
@@ -1201,9 +1266,30 @@ def render_audio_history():
             st.caption(f"No audio files found for doctor: {st.session_state.doctor_id}")
         return
     
-    st.caption(f"Showing {len(audio_files)} audio file(s)")
-
-    for audio in audio_files:
+    page_count = -(-len(audio_files) // AUDIO_HISTORY_PAGE_SIZE)
+    page = min(st.session_state.audio_history_page, page_count - 1)
+    start = page * AUDIO_HISTORY_PAGE_SIZE
+    page_files = audio_files[start:start + AUDIO_HISTORY_PAGE_SIZE]
+    st.caption(
+        f"Showing {start + 1}-{start + len(page_files)} of {len(audio_files)} audio file(s)"
+    )
+    if page_count > 1:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("◀ Newer", key="audio_history_prev", disabled=page == 0):
+                st.session_state.audio_history_page = page - 1
+                st.rerun(scope="fragment")
+        with col_page:
+            st.caption(f"Page {page + 1} of {page_count}")
+        with col_next:
+            if st.button("Older ▶", key="audio_history_next", disabled=page >= page_count - 1):
+                st.session_state.audio_history_page = page + 1
+                st.rerun(scope="fragment")
+
+    # Sign URLs only for the entries on this page
+    playback_urls = get_playback_urls([audio.audio_id for audio in page_files])
+
+    for audio in page_files:
         with st.container(border=True):
             # Header row with metadata, audio player, and action buttons
             col_meta, col_audio, col_actions = st.columns([2, 2, 0.8])
@@ -1220,7 +1306,12 @@ def render_audio_history():
                 st.caption(f"Generated: {audio.created_at.strftime('%Y-%m-%d %H:%M')}")
                 
             with col_audio:
-                st.audio(audio.audio_url, format="audio/mpeg")
+                if audio.peaks_ms:
+                    render_waveform(audio.audio_id)
+                if audio.audio_id in playback_urls:
+                    st.audio(playback_urls[audio.audio_id], format="audio/mpeg")
+                else:
+                    st.caption("Audio unavailable")
                 
             with col_actions:
                 btn_edit, btn_del = st.columns(2)
@@ -1240,9 +1331,17 @@ def render_audio_history():
                         st.session_state._pending_audio_deletion = audio.audio_id
                         st.rerun(scope="fragment")
             
-            # Full-width View Script expander (outside columns)
-            with st.expander("View Script"):
-                st.text(audio.script)
+            # Script is loaded on demand (the manifest does not carry it)
+            scripts = st.session_state._audio_scripts
+            if audio.audio_id in scripts:
+                with st.expander("View Script", expanded=True):
+                    st.text(scripts[audio.audio_id])
+            elif st.button("📜 View Script", key=f"script_audio_{audio.audio_id}"):
+                try:
+                    scripts[audio.audio_id] = run_async(client.get_audio_file(audio.audio_id)).script
+                except Exception as e:
+                    add_error_to_log(f"Unable to load script. (Error: {e})")
+                st.rerun(scope="fragment")
 
     # Handle pending dialogs within the fragment scope
     if st.session_state.get("_pending_audio_deletion"):
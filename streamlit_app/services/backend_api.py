@@ -6,7 +6,7 @@ with the FastAPI backend without exposing API logic in the UI layer.
 
 import os
 from datetime import datetime
-from typing import List, Optional, AsyncGenerator
+from typing import AsyncGenerator, BinaryIO, Dict, List, Optional, Tuple
 import json
 
 import httpx
@@ -22,6 +22,7 @@ from streamlit_app.services.models import (
     KnowledgeDocument,
     ScriptResponse,
     AudioResponse,
+    AudioManifestItem,
     VoiceOption,
     TemplateInfo,
     TemplateConfig,
@@ -41,6 +42,13 @@ DEFAULT_TIMEOUT = 10.0  # seconds
 LLM_TIMEOUT = 90.0  # Extended timeout for LLM generation (large documents can take 60+ seconds)
 
 
+# Last voice list per backend URL: (ETag, voices)
+_voices_cache: dict = {}
+
+# Last audio manifest per (backend URL, knowledge_id, doctor_id): (ETag, items)
+_audio_manifest_cache: dict = {}
+
+
 def _resolve_audio_url(base_url: str, audio_url: str) -> str:
     """Transform audio URLs for browser playback.
     
@@ -254,6 +262,56 @@ class BackendAPIClient:
                 status_code=e.response.status_code,
             ) from e
     
+    async def upload_knowledge_file(
+        self, file: BinaryIO, filename: str, disease_name: str, tags: List[str]
+    ) -> KnowledgeDocument:
+        """Upload a knowledge file as multipart form data.
+
+        The backend decodes, normalizes and parses the file while streaming it.
+
+        Args:
+            file: Binary file object positioned at the start of the content.
+            filename: Original filename (.md or .txt).
+            disease_name: Name of the disease.
+            tags: List of document tags.
+
+        Returns:
+            KnowledgeDocument object.
+        """
+        try:
+            async with self._get_client() as client:
+                response = await client.post(
+                    "/api/knowledge/upload",
+                    data={"disease_name": disease_name, "tags": tags},
+                    files={"file": (filename, file)},
+                )
+                response.raise_for_status()
+                data = response.json()
+                return KnowledgeDocument(
+                    knowledge_id=data["knowledge_id"],
+                    doctor_id=data["doctor_id"],
+                    disease_name=data["disease_name"],
+                    tags=data["tags"],
+                    raw_content=data["raw_content"],
+                    sync_status=data["sync_status"],
+                    elevenlabs_document_id=data["elevenlabs_document_id"],
+                    structured_sections=data.get("structured_sections"),
+                    created_at=datetime.fromisoformat(data["created_at"]),
+                    sync_error_message=data.get("sync_error_message"),
+                    last_sync_attempt=datetime.fromisoformat(data["last_sync_attempt"]) if data.get("last_sync_attempt") else None,
+                    sync_retry_count=data.get("sync_retry_count", 0),
+                    modified_at=datetime.fromisoformat(data["modified_at"]) if data.get("modified_at") else None,
+                )
+        except httpx.ConnectError as e:
+            raise APIConnectionError(f"Failed to connect to backend: {e}") from e
+        except httpx.TimeoutException as e:
+            raise APITimeoutError(f"Upload timed out: {e}") from e
+        except httpx.HTTPStatusError as e:
+            raise APIError(
+                message=f"Upload failed: {self._parse_error_message(e.response)}",
+                status_code=e.response.status_code,
+            ) from e
+
     async def get_knowledge_documents(self) -> List[KnowledgeDocument]:
         """Get all knowledge documents.
 
@@ -630,18 +688,167 @@ class BackendAPIClient:
                 status_code=e.response.status_code,
             ) from e
 
+    async def get_audio_manifest(
+        self, knowledge_id: Optional[str] = None, doctor_id: Optional[str] = None
+    ) -> List[AudioManifestItem]:
+        """Get the compact audio history (no scripts or URLs), newest first.
+
+        The last manifest is kept per backend URL and filter and revalidated
+        with its ETag, so an unchanged collection is not downloaded again.
+
+        Args:
+            knowledge_id: Optional filter by knowledge document ID.
+            doctor_id: Optional filter by doctor ID.
+
+        Returns:
+            List of AudioManifestItem objects.
+        """
+        cache_key = (self.base_url, knowledge_id, doctor_id)
+        try:
+            cached = _audio_manifest_cache.get(cache_key)
+            headers = {"If-None-Match": cached[0]} if cached else {}
+            params = {}
+            if knowledge_id:
+                params["knowledge_id"] = knowledge_id
+            if doctor_id:
+                params["doctor_id"] = doctor_id
+            async with self._get_client() as client:
+                response = await client.get("/api/audio/manifest", params=params, headers=headers)
+                if response.status_code == 304 and cached:
+                    return list(cached[1])
+                response.raise_for_status()
+                data = response.json()
+                items = [
+                    AudioManifestItem(
+                        audio_id=d["audio_id"],
+                        knowledge_id=d["knowledge_id"],
+                        created_at=datetime.fromisoformat(d["created_at"]),
+                        name=d.get("name", ""),
+                        description=d.get("description", ""),
+                        duration_seconds=d.get("duration_seconds"),
+                        peaks_ms=d.get("peaks_ms"),
+                    )
+                    for d in data["items"]
+                ]
+                _audio_manifest_cache[cache_key] = (data["etag"], items)
+                return list(items)
+        except httpx.ConnectError as e:
+            raise APIConnectionError(f"Failed to connect to backend: {e}") from e
+        except httpx.HTTPStatusError as e:
+            raise APIError(
+                message=f"Failed to fetch audio history: {self._parse_error_message(e.response)}",
+                status_code=e.response.status_code,
+            ) from e
+
+    async def get_playback_urls(self, audio_ids: List[str]) -> Tuple[Dict[str, str], int]:
+        """Get signed playback URLs for audio files.
+
+        Args:
+            audio_ids: Audio IDs to sign (at most 100).
+
+        Returns:
+            Playback URL by audio ID (unknown IDs are omitted) and the
+            number of seconds the URLs stay valid.
+        """
+        try:
+            async with self._get_client() as client:
+                response = await client.post(
+                    "/api/audio/playback-urls", json={"audio_ids": audio_ids}
+                )
+                response.raise_for_status()
+                data = response.json()
+                urls = {
+                    audio_id: _resolve_audio_url(self.base_url, url)
+                    for audio_id, url in data["urls"].items()
+                }
+                return urls, data["expires_in_seconds"]
+        except httpx.ConnectError as e:
+            raise APIConnectionError(f"Failed to connect to backend: {e}") from e
+        except httpx.HTTPStatusError as e:
+            raise APIError(
+                message=f"Failed to sign audio URLs: {self._parse_error_message(e.response)}",
+                status_code=e.response.status_code,
+            ) from e
+
+    async def get_audio_peaks(self, audio_id: str) -> Optional[List[int]]:
+        """Get the waveform envelope of an audio file.
+
+        Args:
+            audio_id: ID of the audio file.
+
+        Returns:
+            Peak level (0-127) per peaks window, or None if the audio has
+            no stored peaks.
+        """
+        try:
+            async with self._get_client() as client:
+                response = await client.get(f"/api/audio/{audio_id}/peaks")
+                if response.status_code == 404:
+                    return None
+                response.raise_for_status()
+                # "data" holds min/max pairs; the envelope is the max of each
+                return response.json()["data"][1::2]
+        except httpx.ConnectError as e:
+            raise APIConnectionError(f"Failed to connect to backend: {e}") from e
+        except httpx.HTTPStatusError as e:
+            raise APIError(
+                message=f"Failed to fetch waveform: {self._parse_error_message(e.response)}",
+                status_code=e.response.status_code,
+            ) from e
+
+    async def get_audio_file(self, audio_id: str) -> AudioResponse:
+        """Get one audio file with its script.
+
+        Args:
+            audio_id: ID of the audio file.
+
+        Returns:
+            AudioResponse object.
+        """
+        try:
+            async with self._get_client() as client:
+                response = await client.get(f"/api/audio/{audio_id}/metadata")
+                response.raise_for_status()
+                d = response.json()
+                return AudioResponse(
+                    audio_id=d["audio_id"],
+                    audio_url=_resolve_audio_url(self.base_url, d["audio_url"]),
+                    knowledge_id=d["knowledge_id"],
+                    voice_id=d["voice_id"],
+                    duration_seconds=d.get("duration_seconds"),
+                    script=d["script"],
+                    created_at=datetime.fromisoformat(d["created_at"]),
+                    doctor_id=d.get("doctor_id", "default_doctor"),
+                    name=d.get("name", ""),
+                    description=d.get("description", ""),
+                )
+        except httpx.ConnectError as e:
+            raise APIConnectionError(f"Failed to connect to backend: {e}") from e
+        except httpx.HTTPStatusError as e:
+            raise APIError(
+                message=f"Failed to fetch audio: {self._parse_error_message(e.response)}",
+                status_code=e.response.status_code,
+            ) from e
+
     async def get_available_voices(self) -> List[VoiceOption]:
         """Get available voices.
 
+        The last list is kept per backend URL and revalidated with its ETag,
+        so an unchanged catalog costs a 304 instead of a full response.
+
         Returns:
             List of VoiceOption objects.
         """
         try:
+            cached = _voices_cache.get(self.base_url)
+            headers = {"If-None-Match": cached[0]} if cached else {}
             async with self._get_client() as client:
-                response = await client.get("/api/audio/voices/list")
+                response = await client.get("/api/audio/voices/list", headers=headers)
+                if response.status_code == 304 and cached:
+                    return list(cached[1])
                 response.raise_for_status()
                 data = response.json()
-                return [
+                voices = [
                     VoiceOption(
                         voice_id=v["voice_id"],
                         name=v["name"],
@@ -650,6 +857,10 @@ class BackendAPIClient:
                     )
                     for v in data
                 ]
+                etag = response.headers.get("etag")
+                if etag:
+                    _voices_cache[self.base_url] = (etag, voices)
+                return list(voices)
         except httpx.ConnectError as e:
             raise APIConnectionError(f"Failed to connect to backend: {e}") from e
         except httpx.HTTPStatusError as e:
@@ -1,5 +1,5 @@
 import asyncio
-from typing import List
+from typing import List, Optional
 
 import streamlit as st
 
@@ -44,12 +44,23 @@ def get_documents_cached() -> List[KnowledgeDocument]:
         return []
 
 
-@st.cache_data(ttl=300)
+@st.cache_data(max_entries=256)
+def get_audio_peaks_cached(audio_id: str) -> Optional[List[int]]:
+    """Fetch the waveform envelope of an audio file.
+
+    Peaks never change for an audio file, so entries only leave the cache
+    when it is full. Errors are raised (and not cached) for the caller.
+    """
+    return run_async(client.get_audio_peaks(audio_id))
+
+
+@st.cache_data(ttl=60)
 def get_voices_cached() -> List[VoiceOption]:
-    """Fetch voices with caching (5 min TTL).
+    """Fetch voices with caching (1 min TTL).
     
     Uses @st.cache_data for clean, declarative caching instead of
-    manual session state management.
+    manual session state management. The backend caches the voice catalog
+    itself and the client revalidates by ETag, so a short TTL is cheap.
     """
     try:
         return run_async(client.get_available_voices())
@@ -84,6 +84,19 @@ class AudioResponse:
     description: str = ""
 
 
+@dataclass
+class AudioManifestItem:
+    """Compact audio history entry (no script, no URL)."""
+
+    audio_id: str
+    knowledge_id: str
+    created_at: datetime
+    name: str = ""
+    description: str = ""
+    duration_seconds: Optional[float] = None
+    peaks_ms: Optional[int] = None
+
+
 @dataclass
 class VoiceOption:
     """Voice option data class."""
@@ -52,6 +52,33 @@ else:
     if "STORAGE_EMULATOR_HOST" not in os.environ:
         os.environ["STORAGE_EMULATOR_HOST"] = "http://localhost:4443"
 
+
+
+# Fixtures for services over local mock storage
+@pytest.fixture
+def mock_storage(tmp_path, monkeypatch):
+    """StorageService in mock mode, rooted at tmp_path with an empty audio/ directory."""
+    from backend.config import get_settings
+    from backend.services.storage_service import StorageService
+
+    monkeypatch.setattr(get_settings(), "use_mock_storage", True)
+    storage = object.__new__(StorageService)
+    storage._mock_storage_dir = tmp_path
+    storage._blob_public_base_url = "http://localhost:8000/api/audio/files"
+    (tmp_path / "audio").mkdir(exist_ok=True)
+    return storage
+
+
+@pytest.fixture
+def audio_service(mock_storage):
+    """AudioService over mock_storage and MockDataService; ElevenLabs is a MagicMock."""
+    from backend.services.audio_service import AudioService
+    from backend.services.data_service import MockDataService
+
+    return AudioService(
+        elevenlabs_service=MagicMock(), storage_service=mock_storage, data_service=MockDataService()
+    )
+
 # We use real langgraph and langchain modules for testing logic
 # ensuring we test against the actual library behaviors
 
@@ -6,6 +6,7 @@ import hypothesis.strategies as st
 from unittest.mock import MagicMock, AsyncMock
 
 from backend.services.audio_service import AudioService
+from backend.services.voice_catalog import VoiceCatalogSnapshot
 from backend.models.schemas import AudioMetadata
 
 # Strategies
@@ -179,7 +180,7 @@ async def test_audio_query_by_knowledge_id_returns_all_matching_records(
 def test_voice_list_contains_required_fields(voices_data):
     # Setup
     elevenlabs = MagicMock()
-    elevenlabs.get_voices.return_value = voices_data
+    elevenlabs.get_voice_catalog.return_value = VoiceCatalogSnapshot.build(voices_data, 0.0)
     
     service = AudioService(
         elevenlabs_service=elevenlabs,
@@ -24,7 +24,8 @@ def test_storage_upload_returns_valid_url(filename, use_emulator):
         mock_settings.return_value.use_mock_storage = False
 
         # Mock storage client injection or initialization
-        with patch("google.cloud.storage.Client"):
+        with patch("google.cloud.storage.Client"), \
+             patch("backend.services.storage_service.get_credentials_manager"):
             service = StorageService()
             # Force re-init or handle singleton? 
             # StorageService is a singleton. We might need to reset it or mock __init__ logic if it's already initialized.
@@ -0,0 +1,205 @@
+"""Tests for batch script and audio generation jobs."""
+
+import asyncio
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.schemas import (
+    AudioBatchRequest,
+    AudioMetadata,
+    BatchItemStatus,
+    BatchJobStatus,
+)
+from backend.services.batch_audio_service import (
+    BatchAudioService,
+    FirestoreBatchJobStore,
+    LocalBatchJobStore,
+    get_batch_audio_service,
+)
+from backend.services.firestore_data_service import FIRESTORE_BATCH_LIMIT
+from backend.utils.provider_limits import ProviderRateLimiter
+
+
+@pytest.fixture(autouse=True)
+def unpaced_providers():
+    """Disable provider pacing so tests run instantly."""
+    with patch(
+        "backend.services.batch_audio_service.get_provider_limiter",
+        return_value=ProviderRateLimiter(0),
+    ):
+        yield
+
+
+class FakeAudioService:
+    """Records calls and peak concurrency; fails for configured knowledge IDs."""
+
+    def __init__(self, fail_script=(), fail_audio=()):
+        self.fail_script = set(fail_script)
+        self.fail_audio = set(fail_audio)
+        self.script_calls = []
+        self.audio_calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_script(self, knowledge_id, **kwargs):
+        self.script_calls.append(knowledge_id)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        if knowledge_id in self.fail_script:
+            return {"script": "fallback", "model_used": "legacy_fallback", "generation_error": "Timeout"}
+        return {"script": f"script for {knowledge_id}", "model_used": "gemini"}
+
+    async def generate_audio(self, script, voice_id, knowledge_id, doctor_id):
+        self.audio_calls.append(knowledge_id)
+        if knowledge_id in self.fail_audio:
+            raise RuntimeError("TTS quota exceeded")
+        return AudioMetadata(
+            audio_id=f"audio-{knowledge_id}",
+            audio_url="http://audio",
+            knowledge_id=knowledge_id,
+            voice_id=voice_id,
+            duration_seconds=None,
+            script=script,
+            created_at=datetime.now(),
+            doctor_id=doctor_id,
+        )
+
+
+def _request(ids):
+    return AudioBatchRequest(knowledge_ids=ids, voice_id="voice-1")
+
+
+@pytest.mark.asyncio
+async def test_run_job_processes_all_documents_with_bounded_workers():
+    audio = FakeAudioService()
+    service = BatchAudioService(audio_service=audio, store=LocalBatchJobStore(), max_workers=3)
+    job = await service.create_job(_request([f"kb-{i}" for i in range(10)]))
+
+    final = await service.run_job(job.job_id)
+
+    assert final.status == BatchJobStatus.COMPLETED
+    assert final.completed_count == 10
+    assert 1 < audio.peak <= 3
+    stored = await service.get_job(job.job_id)
+    assert all(i.status == BatchItemStatus.COMPLETED for i in stored.items)
+    assert stored.items[4].audio_id == "audio-kb-4"
+
+
+@pytest.mark.asyncio
+async def test_failures_are_recorded_and_resume_retries_only_unfinished():
+    audio = FakeAudioService(fail_script={"kb-1"}, fail_audio={"kb-2"})
+    store = LocalBatchJobStore()
+    service = BatchAudioService(audio_service=audio, store=store, max_workers=2)
+    job = await service.create_job(_request(["kb-0", "kb-1", "kb-2"]))
+
+    first = await service.run_job(job.job_id)
+    assert first.status == BatchJobStatus.COMPLETED_WITH_ERRORS
+    items = {i.knowledge_id: i for i in (await service.get_job(job.job_id)).items}
+    assert items["kb-1"].status == BatchItemStatus.FAILED
+    assert "Timeout" in items["kb-1"].error
+    assert items["kb-2"].status == BatchItemStatus.FAILED
+    assert items["kb-2"].script == "script for kb-2"
+
+    # Resume with the providers healthy again
+    audio.fail_script.clear()
+    audio.fail_audio.clear()
+    audio.script_calls.clear()
+    audio.audio_calls.clear()
+    resumed = await service.run_job(job.job_id)
+
+    assert resumed.status == BatchJobStatus.COMPLETED
+    assert audio.script_calls == ["kb-1"]  # kb-2 kept its script
+    assert sorted(audio.audio_calls) == ["kb-1", "kb-2"]  # kb-0 skipped
+    assert {i.knowledge_id: i.attempts for i in resumed.items} == {"kb-0": 0, "kb-1": 1, "kb-2": 1}
+
+
+def test_request_dedupes_knowledge_ids():
+    assert _request(["a", "b", "a"]).knowledge_ids == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_provider_rate_limiter_spaces_calls():
+    limiter = ProviderRateLimiter(requests_per_minute=3000)  # one slot per 20ms
+    start = time.monotonic()
+    for _ in range(4):
+        async with limiter:
+            pass
+    assert time.monotonic() - start >= 0.055
+
+
+def test_batch_endpoints_create_poll_and_resume():
+    service = BatchAudioService(
+        audio_service=FakeAudioService(), store=LocalBatchJobStore(), max_workers=2
+    )
+
+    async def start_without_running(job_id):
+        return await service.store.get_job(job_id)
+
+    service.start_job = AsyncMock(side_effect=start_without_running)
+    app.dependency_overrides[get_batch_audio_service] = lambda: service
+    try:
+        client = TestClient(app)
+        created = client.post("/api/audio/batch", json={"knowledge_ids": ["kb-1", "kb-2"], "voice_id": "v"})
+        assert created.status_code == 202
+        job_id = created.json()["job_id"]
+        assert created.json()["total"] == 2
+
+        polled = client.get(f"/api/audio/batch/{job_id}")
+        assert polled.status_code == 200
+        assert polled.json()["completed"] == 0
+        assert [i["status"] for i in polled.json()["items"]] == ["pending", "pending"]
+
+        assert client.get("/api/audio/batch/missing").status_code == 404
+        assert client.post(f"/api/audio/batch/{job_id}/resume").status_code == 202
+    finally:
+        app.dependency_overrides.pop(get_batch_audio_service, None)
+
+
+@pytest.mark.asyncio
+async def test_firestore_store_commits_full_size_job_in_chunks():
+    db = MagicMock()
+    store = FirestoreBatchJobStore(db=db)
+    service = BatchAudioService(audio_service=FakeAudioService(), store=store)
+
+    await service.create_job(_request([f"kb-{i}" for i in range(500)]))
+
+    batch = db.batch.return_value
+    assert batch.commit.call_count == 2
+    assert batch.set.call_count == FIRESTORE_BATCH_LIMIT + 1
+
+
+@pytest.mark.asyncio
+async def test_job_that_raises_is_marked_failed():
+    store = LocalBatchJobStore()
+    service = BatchAudioService(audio_service=FakeAudioService(), store=store)
+    job = await service.create_job(_request(["kb-0"]))
+    save_job_status = store.save_job_status
+    calls = 0
+
+    async def flaky_save_job_status(job):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("store unavailable")
+        await save_job_status(job)
+
+    store.save_job_status = flaky_save_job_status
+    await service.start_job(job.job_id)
+    for _ in range(100):
+        stored = await service.get_job(job.job_id)
+        if stored.status == BatchJobStatus.FAILED:
+            break
+        await asyncio.sleep(0.01)
+
+    assert stored.status == BatchJobStatus.FAILED
+    assert stored.error == "store unavailable"
+    assert not service.is_active(job.job_id)
@@ -0,0 +1,123 @@
+"""Tests for the compact audio manifest and on-demand URL signing."""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.schemas import AudioMetadata
+from backend.services.audio_service import AudioService, get_audio_service
+from backend.services.data_service import MockDataService
+from backend.services.firestore_data_service import FirestoreDataService
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def make_audio(audio_id, minutes_ago, knowledge_id="k1", name=""):
+    return AudioMetadata(
+        audio_id=audio_id,
+        audio_url=f"audio/{audio_id}.mp3",
+        knowledge_id=knowledge_id,
+        voice_id="v1",
+        duration_seconds=12.5,
+        script="A very long script " * 100,
+        created_at=NOW - timedelta(minutes=minutes_ago),
+        doctor_id="dr1",
+        name=name,
+    )
+
+
+@pytest.fixture
+def service():
+    data_service = MockDataService()
+    for audio in (make_audio("old", 10), make_audio("new", 1), make_audio("other", 5, "k2")):
+        asyncio.run(data_service.save_audio_metadata(audio))
+    service = AudioService(
+        elevenlabs_service=MagicMock(),
+        storage_service=MagicMock(),
+        data_service=data_service,
+        script_service=MagicMock(),
+    )
+    app.dependency_overrides[get_audio_service] = lambda: service
+    yield service
+    app.dependency_overrides.clear()
+
+
+class TestManifest:
+    """GET /api/audio/manifest."""
+
+    def test_compact_newest_first(self, service):
+        response = TestClient(app).get("/api/audio/manifest", params={"doctor_id": "dr1"})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [i["audio_id"] for i in body["items"]] == ["new", "other", "old"]
+        assert set(body["items"][0]) == {
+            "audio_id", "knowledge_id", "name", "description", "duration_seconds", "created_at",
+            "peaks_ms",
+        }
+        assert response.headers["etag"] == body["etag"]
+
+    def test_filter_by_knowledge_id(self, service):
+        body = TestClient(app).get("/api/audio/manifest", params={"knowledge_id": "k2"}).json()
+
+        assert [i["audio_id"] for i in body["items"]] == ["other"]
+
+    def test_revalidation_and_etag_changes(self, service):
+        client = TestClient(app)
+        etag = client.get("/api/audio/manifest").headers["etag"]
+
+        response = client.get("/api/audio/manifest", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        asyncio.run(service.data_service.update_audio_fields("old", {"name": "Renamed"}))
+        response = client.get("/api/audio/manifest", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+
+class TestOnDemandAudio:
+    """Signing visible entries and loading one script."""
+
+    def test_playback_urls_skip_unknown_ids(self, service):
+        response = TestClient(app).post(
+            "/api/audio/playback-urls", json={"audio_ids": ["new", "missing", "new"]}
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert list(body["urls"]) == ["new"]
+        assert "new.mp3" in body["urls"]["new"]
+        assert body["expires_in_seconds"] > 0
+
+    def test_playback_urls_limit(self, service):
+        response = TestClient(app).post(
+            "/api/audio/playback-urls", json={"audio_ids": [str(i) for i in range(101)]}
+        )
+
+        assert response.status_code == 422
+
+    def test_metadata_has_script(self, service):
+        client = TestClient(app)
+
+        assert client.get("/api/audio/new/metadata").json()["script"].startswith("A very long")
+        assert client.get("/api/audio/missing/metadata").status_code == 404
+
+
+def test_firestore_manifest_uses_projection():
+    service = object.__new__(FirestoreDataService)
+    service._db = MagicMock()
+    query = service._db.collection.return_value.where.return_value.select.return_value
+    snapshot = MagicMock()
+    snapshot.to_dict.return_value = {"audio_id": "a1", "knowledge_id": "k1", "created_at": NOW}
+    query.stream.return_value = [snapshot]
+
+    items = asyncio.run(service.get_audio_manifest_items(knowledge_id="k1"))
+
+    assert [i.audio_id for i in items] == ["a1"]
+    fields = service._db.collection.return_value.where.return_value.select.call_args.args[0]
+    assert "script" not in fields and "audio_url" not in fields
@@ -0,0 +1,193 @@
+"""Tests for MP3 frame scanning and the audio metadata backfill."""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from hypothesis import given, strategies as st
+
+from backend.main import app
+from backend.models.schemas import AudioMetadata
+from backend.services import audio_backfill
+from backend.services.audio_backfill import backfill_audio_metadata, register_audio_backfill_handler
+from backend.services.audio_service import AudioService
+from backend.services.data_service import MockDataService
+from backend.services.firestore_data_service import FirestoreDataService
+from backend.services.task_queue import SQLiteTaskStore, SUCCEEDED, TaskQueue, get_task_queue
+from backend.utils.mp3_info import Mp3FrameScanner, parse_frame_header, scan_mp3
+
+# MPEG1 Layer III, 128 kbps, 44.1 kHz, no padding: 417-byte frames, 1152 samples
+HEADER_128 = b"\xff\xfb\x90\x00"
+# Same at 64 kbps: 208-byte frames
+HEADER_64 = b"\xff\xfb\x50\x00"
+
+
+def frame(header=HEADER_128):
+    length = 417 if header == HEADER_128 else 208
+    return header + b"\x00" * (length - 4)
+
+
+def id3_tag(size=300):
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x04\x00\x00" + syncsafe + b"\x00" * size
+
+
+def xing_frame(frames, tag=b"Info"):
+    # MPEG1 stereo: side info is 32 bytes after the 4-byte header
+    body = b"\x00" * 32 + tag + (3).to_bytes(4, "big") + frames.to_bytes(4, "big") + (frames * 417).to_bytes(4, "big")
+    return HEADER_128 + body + b"\x00" * (417 - 4 - len(body))
+
+
+class TestMp3FrameScanner:
+    """Frame walking, tags and chunking."""
+
+    def test_cbr_stream(self):
+        info = scan_mp3(frame() * 1000)
+
+        assert info.frame_count == 1000
+        assert info.duration_seconds == pytest.approx(1000 * 1152 / 44100, abs=1e-3)
+        assert info.bitrate_kbps == 128
+        assert info.sample_rate == 44100
+        assert not info.is_vbr
+
+    def test_skips_id3_and_resyncs_over_garbage(self):
+        data = id3_tag() + frame() * 10 + b"junk\x00\xff\x00" + frame() * 10 + b"TAG" + b"\x00" * 125
+
+        assert scan_mp3(data).frame_count == 20
+
+    def test_vbr_stream(self):
+        info = scan_mp3((frame() + frame(HEADER_64)) * 50)
+
+        assert info.frame_count == 100
+        assert info.is_vbr
+        assert 64 < info.bitrate_kbps < 128
+
+    def test_xing_header_completes_early(self):
+        scanner = Mp3FrameScanner()
+        scanner.feed(id3_tag() + xing_frame(5000))
+
+        assert scanner.complete
+        info = scanner.result()
+        assert info.frame_count == 5000
+        assert info.duration_seconds == pytest.approx(5000 * 1152 / 44100, abs=1e-3)
+
+    def test_parse_frame_header(self):
+        header = parse_frame_header(*HEADER_64)
+
+        assert (header.length, header.samples, header.bitrate, header.layer) == (208, 1152, 64000, 3)
+        assert parse_frame_header(0xFF, 0xFF, 0xFF, 0xFF) is None
+
+    def test_not_mp3(self):
+        assert scan_mp3(b"fake audio") is None
+        assert scan_mp3(b"") is None
+
+    @given(st.lists(st.integers(1, 2000), min_size=1, max_size=20))
+    def test_chunking_does_not_change_result(self, cuts):
+        data = id3_tag(1000) + frame() * 30 + frame(HEADER_64) * 7
+        scanner = Mp3FrameScanner()
+        position = 0
+        for cut in cuts:
+            scanner.feed(data[position:position + cut])
+            position += cut
+        scanner.feed(data[position:])
+
+        assert scanner.result() == scan_mp3(data)
+
+
+@pytest.mark.asyncio
+async def test_generate_audio_stores_measurements():
+    elevenlabs = MagicMock()
+    elevenlabs.text_to_speech.return_value = frame() * 100
+    storage = MagicMock()
+    storage.upload_audio.return_value = "http://fake/audio.mp3"
+    data_service = MockDataService()
+    service = AudioService(elevenlabs_service=elevenlabs, storage_service=storage, data_service=data_service)
+
+    metadata = await service.generate_audio(script="s", voice_id="v", knowledge_id="k", name="n")
+
+    stored = await data_service.get_audio_file(metadata.audio_id)
+    assert stored.frame_count == 100
+    assert stored.bitrate_kbps == 128
+    assert stored.duration_seconds == pytest.approx(100 * 1152 / 44100, abs=1e-3)
+
+
+class TestBackfill:
+    """Backfill over mock storage."""
+
+    @pytest.fixture
+    def storage(self, mock_storage):
+        return mock_storage
+
+    @pytest.fixture
+    def data_service(self, storage):
+        service = MockDataService()
+        files = {"a1": frame() * 200, "a2": id3_tag() + xing_frame(9000), "bad": b"not audio" * 10}
+        for audio_id in ["a1", "a2", "bad", "gone", "done"]:
+            if audio_id in files:
+                (storage._mock_storage_dir / "audio" / f"{audio_id}.mp3").write_bytes(files[audio_id])
+            service._audio_files[audio_id] = AudioMetadata(
+                audio_id=audio_id, audio_url=f"audio/{audio_id}.mp3", knowledge_id="k", voice_id="v",
+                duration_seconds=12.0 if audio_id == "done" else None, script="s", created_at=datetime.now(),
+            )
+        return service
+
+    @pytest.mark.asyncio
+    async def test_fills_missing_metadata(self, data_service, storage):
+        report = await backfill_audio_metadata(data_service, storage, concurrency=2)
+
+        assert (report.total_count, report.updated_count) == (4, 2)
+        assert (report.missing_count, report.unreadable_count, report.failed_count) == (1, 1, 0)
+        a1 = await data_service.get_audio_file("a1")
+        assert a1.frame_count == 200
+        assert a1.bitrate_kbps == 128
+        assert (await data_service.get_audio_file("a2")).frame_count == 9000
+        assert (await data_service.get_audio_file("done")).frame_count is None
+
+    @pytest.mark.asyncio
+    async def test_reads_only_ids_without_duration(self, data_service, storage):
+        data_service.get_audio_files = MagicMock(side_effect=AssertionError("loads scripts"))
+
+        report = await backfill_audio_metadata(data_service, storage)
+
+        assert report.total_count == 4
+
+    def test_route_queues_job(self, data_service, storage, monkeypatch):
+        monkeypatch.setattr(audio_backfill, "get_data_service", lambda: data_service)
+        monkeypatch.setattr(audio_backfill, "get_storage_service", lambda: storage)
+        queue = TaskQueue(SQLiteTaskStore(":memory:"))
+        register_audio_backfill_handler(queue)
+        app.dependency_overrides[get_task_queue] = lambda: queue
+        client = TestClient(app)
+        try:
+            response = client.post("/api/audio/backfill-metadata", json={"force": True})
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+            assert response.json()["status"] == "pending"
+            assert data_service._audio_files["a1"].frame_count is None
+
+            assert asyncio.run(queue.run_once()) is True
+            body = client.get(f"/api/audio/backfill-metadata/{job_id}").json()
+            assert client.get("/api/audio/backfill-metadata/missing").status_code == 404
+        finally:
+            app.dependency_overrides.clear()
+
+        assert body["status"] == SUCCEEDED
+        assert body["report"]["total_count"] == 5
+        assert body["report"]["updated_count"] == 2
+
+
+def test_firestore_ids_without_duration_use_projection():
+    service = object.__new__(FirestoreDataService)
+    service._db = MagicMock()
+    query = service._db.collection.return_value.select.return_value
+    docs = []
+    for audio_id, data in [("new", {"duration_seconds": 3.5}), ("null", {"duration_seconds": None}), ("old", {})]:
+        doc = MagicMock(id=audio_id)
+        doc.to_dict.return_value = data
+        docs.append(doc)
+    query.stream.return_value = docs
+
+    assert asyncio.run(service.get_audio_ids_without_duration()) == {"null", "old"}
+    service._db.collection.return_value.select.assert_called_once_with(["duration_seconds"])
@@ -0,0 +1,147 @@
+"""Tests for waveform peaks computed at generation time."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import app
+from backend.services import bulk_delete
+from backend.services.audio_peaks import compute_peaks_json, shutdown_peaks_executor
+from backend.services.audio_service import (
+    get_audio_service,
+    peaks_filename,
+    stored_filenames,
+)
+from backend.services.firestore_data_service import FirestoreDataService
+from backend.utils.mp3_peaks import compute_mp3_peaks
+
+# MPEG1 Layer III, 128 kbps, 44.1 kHz, mono, no CRC: 417-byte frames
+HEADER = b"\xff\xfb\x90\xc4"
+FRAME_LENGTH = 417
+
+
+def frame(global_gain=None, tag=b""):
+    """One frame whose two granules share a global_gain (None: silent)."""
+    bits = 0
+    for _ in range(2):
+        part2_3_length, big_values = (100, 50) if global_gain is not None else (0, 0)
+        granule = (part2_3_length << 47) | (big_values << 38) | ((global_gain or 0) << 30)
+        bits = (bits << 59) | granule
+    side_info = bits.to_bytes(17, "big")
+    body = HEADER + side_info + tag
+    return body + b"\x00" * (FRAME_LENGTH - len(body))
+
+
+# Info frame, then 10 silent, 10 loud and 10 quieter (30 dB down) frames
+MP3 = frame(tag=b"Info") + frame() * 10 + frame(180) * 10 + frame(160) * 10
+
+
+class TestComputePeaks:
+    """Envelope estimation from Layer III side info."""
+
+    def test_envelope_follows_global_gain(self):
+        peaks = compute_mp3_peaks(MP3, 26)
+
+        assert peaks["sample_rate"] == 44100
+        assert peaks["samples_per_pixel"] == 1147
+        assert peaks["length"] == 31  # 60 granules of 576 samples; the Info frame holds no audio
+        maxima = peaks["data"][1::2]
+        assert peaks["data"][0::2] == [-m for m in maxima]
+        assert maxima[:9] == [0] * 9
+        assert maxima[11:19] == [127] * 8
+        assert maxima[-5:] == [48] * 5
+
+    def test_id3_tag_and_junk_are_skipped(self):
+        id3 = b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"\xff" * 5
+        peaks = compute_mp3_peaks(id3 + b"junk" + frame(180) * 4, 50)
+
+        assert peaks["length"] == 3  # 8 granules over 2205-sample windows
+        assert peaks["data"] == [-127, 127] * 3
+
+    def test_no_layer3_frames(self):
+        assert compute_mp3_peaks(b"\x00" * 1000, 50) is None
+
+
+class TestWorkers:
+    """Process pool and thread fallback."""
+
+    @pytest.mark.parametrize("workers", [0, 1])
+    def test_compute_peaks_json(self, workers, monkeypatch):
+        monkeypatch.setattr(get_settings(), "audio_peaks_workers", workers)
+        try:
+            data = asyncio.run(compute_peaks_json(MP3, 50))
+        finally:
+            shutdown_peaks_executor()
+
+        assert json.loads(data) == compute_mp3_peaks(MP3, 50)
+
+
+@pytest.fixture
+def service(audio_service, monkeypatch):
+    monkeypatch.setattr(get_settings(), "audio_peaks_workers", 0)
+    audio_service.elevenlabs_service.text_to_speech.return_value = MP3
+    app.dependency_overrides[get_audio_service] = lambda: audio_service
+    yield audio_service
+    app.dependency_overrides.clear()
+
+
+def generate(service):
+    return asyncio.run(service.generate_audio(
+        script="Hello", voice_id="v1", knowledge_id="k1", name="n", variants=[]
+    ))
+
+
+class TestPeaksSidecar:
+    """Stored at generation, served by GET /api/audio/{audio_id}/peaks."""
+
+    def test_generation_stores_and_route_serves_peaks(self, service, tmp_path):
+        metadata = generate(service)
+
+        assert metadata.peaks_ms == 50
+        assert (tmp_path / "audio" / peaks_filename(metadata.audio_id)).exists()
+        client = TestClient(app)
+        response = client.get(f"/api/audio/{metadata.audio_id}/peaks")
+        assert response.status_code == 200
+        assert response.json() == compute_mp3_peaks(MP3, 50)
+        revalidated = client.get(
+            f"/api/audio/{metadata.audio_id}/peaks",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert revalidated.status_code == 304
+        assert client.get("/api/audio/missing/peaks").status_code == 404
+
+    def test_disabled_or_failing_peaks_do_not_fail_generation(self, service, monkeypatch):
+        monkeypatch.setattr(get_settings(), "audio_peaks_ms", 0)
+        assert generate(service).peaks_ms is None
+
+        monkeypatch.setattr(get_settings(), "audio_peaks_ms", 50)
+        service.elevenlabs_service.text_to_speech.return_value = b"not an mp3"
+        assert generate(service).peaks_ms is None
+
+    def test_deletes_remove_sidecar(self, service, tmp_path):
+        first, second = generate(service), generate(service)
+
+        assert asyncio.run(service.delete_audio(first.audio_id))
+        report = asyncio.run(bulk_delete.delete_audio_files(
+            service.data_service, service.storage_service, [second.audio_id]
+        ))
+
+        assert report.results[0].detail is None
+        assert not list((tmp_path / "audio").iterdir())
+
+    def test_firestore_round_trip_keeps_peaks(self, service):
+        metadata = generate(service)
+        firestore = object.__new__(FirestoreDataService)
+        firestore._db = MagicMock()
+        doc_ref = firestore._db.collection.return_value.document.return_value
+
+        asyncio.run(firestore.save_audio_metadata(metadata))
+        doc_ref.get.return_value.to_dict.return_value = doc_ref.set.call_args.args[0]
+        loaded = asyncio.run(firestore.get_audio_file(metadata.audio_id))
+
+        assert loaded.peaks_ms == 50
+        assert peaks_filename(metadata.audio_id) in stored_filenames(loaded)
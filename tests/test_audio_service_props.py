@@ -2,7 +2,9 @@
 
 from unittest.mock import MagicMock, AsyncMock
 import asyncio
+from datetime import datetime
 
+import pytest
 from hypothesis import given, strategies as st, settings
 
 from backend.models.schemas import AudioMetadata, KnowledgeDocumentResponse
@@ -110,3 +112,86 @@ def test_audio_metadata_storage(knowledge_id: str, script: str, voice_id: str):
         assert len(other_history) == 0
     finally:
         loop.close()
+
+
+def test_get_audio_service_is_shared():
+    """get_audio_service returns one instance, so per-request setup is a lookup."""
+    from unittest.mock import patch
+    import backend.services.audio_service as audio_module
+
+    with patch.object(audio_module, "_audio_service_instance", None), \
+         patch.object(audio_module, "get_elevenlabs_service", return_value=MagicMock()), \
+         patch.object(audio_module, "get_storage_service", return_value=MagicMock()), \
+         patch.object(audio_module, "get_data_service", return_value=MockDataService()):
+        first = audio_module.get_audio_service()
+        second = audio_module.get_audio_service()
+
+    assert first is second
+    assert first.script_service is audio_module.get_script_generation_service()
+
+
+def _audio_service_with_library(count: int = 3):
+    data_store = MockDataService()
+    for i in range(count):
+        data_store._audio_files[f"a{i}"] = AudioMetadata(
+            audio_id=f"a{i}", audio_url=f"http://fake/a{i}.mp3", knowledge_id="k", voice_id="v",
+            duration_seconds=1.0, script="script", created_at=datetime.now(), name=f"Audio {i}",
+        )
+    data_store.get_audio_files = AsyncMock(side_effect=AssertionError("full scan"))
+    service = AudioService(
+        elevenlabs_service=MagicMock(), storage_service=MagicMock(), data_service=data_store
+    )
+    return service, data_store
+
+
+@pytest.mark.asyncio
+async def test_update_audio_metadata_writes_only_changed_fields():
+    """Renames use a point read and a field-mask update, not a list scan."""
+    service, data_store = _audio_service_with_library()
+    data_store.save_audio_metadata = AsyncMock(side_effect=AssertionError("full rewrite"))
+
+    updated = await service.update_audio_metadata("a1", name="Renamed")
+
+    assert updated.name == "Renamed"
+    assert updated.script == "script"
+    assert (await data_store.get_audio_file("a1")).name == "Renamed"
+    with pytest.raises(ValueError):
+        await service.update_audio_metadata("missing", name="x")
+
+
+@pytest.mark.asyncio
+async def test_delete_audio_uses_point_read():
+    service, data_store = _audio_service_with_library()
+
+    assert await service.delete_audio("a2") is True
+    assert await data_store.get_audio_file("a2") is None
+    service.storage_service.delete_audio.assert_called_once_with("a2.mp3")
+    assert await service.delete_audio("a2") is False
+
+
+@pytest.mark.asyncio
+async def test_update_audio_fields_rejects_unknown_fields():
+    _, data_store = _audio_service_with_library()
+
+    with pytest.raises(ValueError):
+        await data_store.update_audio_fields("a0", {"audio_id": "other"})
+    with pytest.raises(ValueError):
+        await data_store.update_audio_fields("a0", {"bogus": 1})
+    assert await data_store.update_audio_fields("missing", {"name": "x"}) is False
+
+
+@pytest.mark.asyncio
+async def test_firestore_update_audio_fields_is_a_field_mask_write():
+    from google.api_core.exceptions import NotFound
+    from backend.services.firestore_data_service import FirestoreDataService
+
+    service = FirestoreDataService.__new__(FirestoreDataService)
+    service._db = MagicMock()
+    doc_ref = service._db.collection.return_value.document.return_value
+
+    assert await service.update_audio_fields("a1", {"name": "Renamed"}) is True
+    doc_ref.update.assert_called_once_with({"name": "Renamed"})
+    doc_ref.get.assert_not_called()
+
+    doc_ref.update.side_effect = NotFound("gone")
+    assert await service.update_audio_fields("a1", {"name": "Renamed"}) is False
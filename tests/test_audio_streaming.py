@@ -0,0 +1,225 @@
+"""Tests for ranged and conditional audio streaming."""
+
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from hypothesis import given, strategies as st
+
+from backend.api.routes import audio as audio_routes
+from backend.config import get_settings
+from backend.main import app
+from backend.services.audio_service import AudioService, get_audio_service
+from backend.services.storage_service import (
+    GCS_STREAM_MAX_CHUNK_SIZE,
+    GCS_STREAM_MIN_CHUNK_SIZE,
+    StorageService,
+    StoredFileInfo,
+    _gcs_read_spans,
+)
+from backend.utils.http_range import RangeNotSatisfiable, etag_matches, parse_range
+
+AUDIO = bytes(range(256)) * 200  # 51,200 bytes
+LARGE_AUDIO = bytes(range(256)) * 12_000  # ~3 MB, spans several GCS reads
+
+
+@pytest.fixture
+def mock_storage(mock_storage):
+    """The shared mock storage holding AUDIO at audio/a1.mp3."""
+    (mock_storage._mock_storage_dir / "audio" / "a1.mp3").write_bytes(AUDIO)
+    return mock_storage
+
+
+@pytest.fixture
+def gcs_storage(monkeypatch):
+    """StorageService over a fake bucket holding LARGE_AUDIO at audio/a1.mp3."""
+    monkeypatch.setattr(get_settings(), "use_mock_storage", False)
+    storage = object.__new__(StorageService)
+    storage._bucket = MagicMock()
+    storage._bucket.get_blob.side_effect = lambda path: (
+        MagicMock(size=len(LARGE_AUDIO), generation=7) if path == "audio/a1.mp3" else None
+    )
+    blob = storage._bucket.blob.return_value
+    blob.download_as_bytes.side_effect = lambda start, end: LARGE_AUDIO[start:end + 1]
+    return storage
+
+
+class TestParseRange:
+    """Range header parsing."""
+
+    @pytest.mark.parametrize("header,expected", [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=0-9,20-29", None),
+        ("items=0-9", None),
+        ("bytes=abc", None),
+        ("bytes=9-0", None),
+    ])
+    def test_parse(self, header, expected):
+        assert parse_range(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range(header, 1000)
+
+    @given(st.integers(0, 2000), st.integers(0, 2000), st.integers(1, 1500))
+    def test_result_within_file(self, first, last, size):
+        try:
+            result = parse_range(f"bytes={first}-{last}", size)
+        except RangeNotSatisfiable:
+            assert first >= size
+            return
+        if result is not None:
+            start, end = result
+            assert 0 <= start <= end < size
+
+    def test_etag_matches(self):
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"ab"', '"b"')
+        assert not etag_matches(None, '"b"')
+
+
+class TestStorageStreaming:
+    """Ranged reads in StorageService.get_file_stream."""
+
+    def test_mock_storage_range(self, mock_storage):
+        info = mock_storage.get_file_info("audio/a1.mp3")
+
+        assert info.size == len(AUDIO)
+        assert b"".join(mock_storage.get_file_stream("audio/a1.mp3")) == AUDIO
+        assert b"".join(mock_storage.get_file_stream("audio/a1.mp3", 10000, 30000)) == AUDIO[10000:30001]
+        assert mock_storage.get_file_info("audio/missing.mp3") is None
+
+    def test_mock_storage_range_without_pread(self, mock_storage, monkeypatch):
+        monkeypatch.delattr(os, "pread", raising=False)
+
+        assert b"".join(mock_storage.get_file_stream("audio/a1.mp3")) == AUDIO
+        assert b"".join(mock_storage.get_file_stream("audio/a1.mp3", 10000, 30000)) == AUDIO[10000:30001]
+
+    def test_gcs_uses_ranged_reads_of_one_generation(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "use_mock_storage", False)
+        storage = object.__new__(StorageService)
+        storage._bucket = MagicMock()
+        blob = storage._bucket.blob.return_value
+        blob.download_as_bytes.side_effect = lambda start, end: AUDIO[start:end + 1]
+        info = StoredFileInfo(size=len(AUDIO), etag='"7"', generation=7)
+
+        data = b"".join(storage.get_file_stream("audio/a1.mp3", 100, 40000, info=info))
+
+        assert data == AUDIO[100:40001]
+        storage._bucket.blob.assert_called_once_with("audio/a1.mp3", generation=7)
+        blob.download_as_bytes.assert_called_once_with(start=100, end=40000)
+
+
+class TestAsyncStreaming:
+    """Adaptive ranged reads on the async path."""
+
+    def test_spans_grow_to_max_and_cover_range(self):
+        spans = list(_gcs_read_spans(10, 3_000_000))
+
+        assert spans[0] == (10, 10 + GCS_STREAM_MIN_CHUNK_SIZE - 1)
+        assert max(e - s + 1 for s, e in spans) == GCS_STREAM_MAX_CHUNK_SIZE
+        assert all(b[0] == a[1] + 1 for a, b in zip(spans, spans[1:]))
+        assert spans[-1][1] == 3_000_000
+
+    @pytest.mark.asyncio
+    async def test_gcs_async_stream(self, gcs_storage):
+        chunks = [c async for c in gcs_storage.aiter_file("audio/a1.mp3", start=5)]
+
+        assert b"".join(chunks) == LARGE_AUDIO[5:]
+        assert len(chunks) == len(list(_gcs_read_spans(5, len(LARGE_AUDIO) - 1)))
+        gcs_storage._bucket.blob.assert_called_once_with("audio/a1.mp3", generation=7)
+
+    @pytest.mark.asyncio
+    async def test_mock_storage_async_stream(self, mock_storage):
+        chunks = [c async for c in mock_storage.aiter_file("audio/a1.mp3", 100, 199)]
+
+        assert b"".join(chunks) == AUDIO[100:200]
+
+
+class TestGcsStreamRoute:
+    """Streaming route over GCS-backed storage."""
+
+    @pytest.fixture
+    def client(self, gcs_storage):
+        service = AudioService(
+            elevenlabs_service=MagicMock(), storage_service=gcs_storage, data_service=AsyncMock()
+        )
+        app.dependency_overrides[get_audio_service] = lambda: service
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_full_and_partial(self, client):
+        full = client.get("/api/audio/stream/a1")
+        assert full.status_code == 200
+        assert full.content == LARGE_AUDIO
+        assert full.headers["etag"] == '"7"'
+
+        partial = client.get("/api/audio/stream/a1", headers={"Range": "bytes=-1000"})
+        assert partial.status_code == 206
+        assert partial.content == LARGE_AUDIO[-1000:]
+
+        assert client.get("/api/audio/stream/missing").status_code == 404
+
+
+class TestStreamRoute:
+    """GET /api/audio/stream/{audio_id}."""
+
+    @pytest.fixture
+    def client(self, mock_storage, audio_service):
+        app.dependency_overrides[get_audio_service] = lambda: audio_service
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_full_response_advertises_ranges(self, client):
+        response = client.get("/api/audio/stream/a1")
+
+        assert response.status_code == 200
+        assert response.content == AUDIO
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-length"] == str(len(AUDIO))
+        assert response.headers["etag"]
+
+    def test_partial_content(self, client):
+        response = client.get("/api/audio/stream/a1", headers={"Range": "bytes=1000-1999"})
+
+        assert response.status_code == 206
+        assert response.content == AUDIO[1000:2000]
+        assert response.headers["content-range"] == f"bytes 1000-1999/{len(AUDIO)}"
+        assert response.headers["content-length"] == "1000"
+
+    def test_partial_content_does_not_rely_on_file_response(self, client, monkeypatch):
+        def file_response(*args, **kwargs):
+            raise AssertionError("ranges must not depend on FileResponse Range support")
+
+        monkeypatch.setattr(audio_routes, "FileResponse", file_response)
+        response = client.get("/api/audio/stream/a1", headers={"Range": "bytes=10-19"})
+
+        assert response.status_code == 206
+        assert response.content == AUDIO[10:20]
+
+    def test_not_modified_and_unsatisfiable(self, client):
+        etag = client.get("/api/audio/stream/a1").headers["etag"]
+
+        assert client.get("/api/audio/stream/a1", headers={"If-None-Match": etag}).status_code == 304
+        unsatisfiable = client.get("/api/audio/stream/a1", headers={"Range": f"bytes={len(AUDIO)}-"})
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers["content-range"] == f"bytes */{len(AUDIO)}"
+
+    def test_stale_if_range_gets_full_content(self, client):
+        response = client.get(
+            "/api/audio/stream/a1", headers={"Range": "bytes=0-9", "If-Range": '"old"'}
+        )
+
+        assert response.status_code == 200
+        assert response.content == AUDIO
+
+    def test_missing_audio_is_404(self, client):
+        assert client.get("/api/audio/stream/missing").status_code == 404
@@ -0,0 +1,119 @@
+"""Tests for lower-bitrate audio variants."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from backend.config import AUDIO_PROFILES, get_settings
+from backend.main import app
+from backend.models.schemas import AudioGenerateRequest
+from backend.services.audio_service import audio_filename, get_audio_service
+
+# MPEG1 Layer III 44.1 kHz frames: 128 kbps (417 bytes) and 64 kbps (208 bytes)
+MASTER = (b"\xff\xfb\x90\x00" + b"\x00" * 413) * 100
+MOBILE = (b"\xff\xfb\x50\x00" + b"\x00" * 204) * 100
+
+
+def fake_tts(text, voice_id, output_format=None, seed=None):
+    if output_format == AUDIO_PROFILES["mobile"]:
+        return MOBILE
+    if output_format == AUDIO_PROFILES["low"]:
+        raise RuntimeError("quota exceeded")
+    return MASTER
+
+
+@pytest.fixture
+def service(audio_service):
+    audio_service.elevenlabs_service.text_to_speech.side_effect = fake_tts
+    return audio_service
+
+
+def generate(service, variants):
+    return asyncio.run(service.generate_audio(
+        script="Hello", voice_id="v1", knowledge_id="k1", name="n", variants=variants
+    ))
+
+
+class TestGenerateVariants:
+    """Variant synthesis alongside the master."""
+
+    def test_no_variants_keeps_single_call(self, service):
+        metadata = generate(service, [])
+
+        service.elevenlabs_service.text_to_speech.assert_called_once_with(text="Hello", voice_id="v1")
+        assert metadata.variants == {}
+
+    def test_variants_share_seed_and_failures_are_skipped(self, service, tmp_path):
+        metadata = generate(service, ["mobile", "low"])
+
+        calls = service.elevenlabs_service.text_to_speech.call_args_list
+        assert len(calls) == 3
+        assert len({c.kwargs["seed"] for c in calls}) == 1
+        assert set(metadata.variants) == {"mobile"}
+        mobile = metadata.variants["mobile"]
+        assert mobile.output_format == "mp3_44100_64"
+        assert mobile.bitrate_kbps == 64
+        assert mobile.size_bytes == len(MOBILE)
+        assert (tmp_path / "audio" / audio_filename(metadata.audio_id, "mobile")).read_bytes() == MOBILE
+
+    def test_duplicate_variants_are_synthesized_once(self, service):
+        metadata = generate(service, ["mobile", "mobile", "standard"])
+
+        assert service.elevenlabs_service.text_to_speech.call_count == 2
+        assert set(metadata.variants) == {"mobile"}
+
+    def test_failed_master_upload_stores_no_variants(self, service, tmp_path, monkeypatch):
+        upload_audio = service.storage_service.upload_audio
+
+        def upload(data, filename):
+            if data == MASTER:
+                raise RuntimeError("bucket unavailable")
+            return upload_audio(data, filename)
+
+        monkeypatch.setattr(service.storage_service, "upload_audio", upload)
+
+        with pytest.raises(RuntimeError):
+            generate(service, ["mobile"])
+        assert not (tmp_path / "audio").exists() or not list((tmp_path / "audio").iterdir())
+
+    def test_default_variants_from_settings(self, service, monkeypatch):
+        monkeypatch.setattr(get_settings(), "audio_default_variants", "mobile")
+
+        assert set(generate(service, None).variants) == {"mobile"}
+
+    def test_delete_removes_variant_files(self, service, tmp_path):
+        metadata = generate(service, ["mobile"])
+
+        assert asyncio.run(service.delete_audio(metadata.audio_id))
+        assert not list((tmp_path / "audio").iterdir())
+
+    @pytest.mark.parametrize("variants", [["standard"], ["hifi"]])
+    def test_request_rejects_unknown_profiles(self, variants):
+        with pytest.raises(ValidationError):
+            AudioGenerateRequest(script="s", voice_id="v", knowledge_id="k", variants=variants)
+
+
+class TestStreamProfile:
+    """GET /api/audio/stream/{audio_id}?profile=."""
+
+    @pytest.fixture
+    def client(self, service):
+        app.dependency_overrides[get_audio_service] = lambda: service
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_serves_variant_and_falls_back_to_master(self, client, service):
+        audio_id = generate(service, ["mobile"]).audio_id
+
+        mobile = client.get(f"/api/audio/stream/{audio_id}", params={"profile": "mobile"})
+        assert mobile.content == MOBILE
+        assert mobile.headers["x-audio-profile"] == "mobile"
+
+        low = client.get(f"/api/audio/stream/{audio_id}", params={"profile": "low"})
+        assert low.content == MASTER
+        assert low.headers["x-audio-profile"] == "standard"
+
+    def test_unknown_profile_is_422(self, client):
+        assert client.get("/api/audio/stream/a1", params={"profile": "hifi"}).status_code == 422
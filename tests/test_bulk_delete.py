@@ -0,0 +1,303 @@
+"""Tests for bulk deletion of audio, knowledge documents and agents."""
+
+import asyncio
+import sys
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+from google.api_core.exceptions import NotFound
+from google.auth.credentials import AnonymousCredentials
+
+from backend.config import get_settings
+from backend.main import app
+from backend.models.schemas import (
+    AgentResponse,
+    AnswerStyle,
+    AudioMetadata,
+    AudioVariant,
+    KnowledgeDocumentCreate,
+    SyncStatus,
+)
+from backend.services import bulk_delete
+from backend.services.agent_service import AgentService, get_agent_service
+from backend.services.data_service import MockDataService, get_data_service
+from backend.services.firestore_data_service import FIRESTORE_BATCH_LIMIT, FirestoreDataService
+from backend.services.knowledge_search import KnowledgeSearchIndex
+from backend.services.storage_service import GCS_BATCH_SIZE, StorageService, get_storage_service
+from backend.utils.content_hash import content_hash
+
+
+def make_audio(audio_id, variants=()):
+    return AudioMetadata(
+        audio_id=audio_id,
+        audio_url=f"audio/{audio_id}.mp3",
+        knowledge_id="k1",
+        voice_id="v1",
+        duration_seconds=1.0,
+        script="s",
+        created_at=datetime.now(),
+        variants={
+            p: AudioVariant(
+                profile=p, output_format="mp3_44100_64", audio_url=f"audio/{audio_id}.{p}.mp3", size_bytes=1
+            )
+            for p in variants
+        },
+    )
+
+
+def make_agent(index):
+    return AgentResponse(
+        agent_id=f"agent-{index}",
+        name=f"Agent {index}",
+        knowledge_ids=[],
+        voice_id="voice",
+        answer_style=AnswerStyle.PROFESSIONAL,
+        elevenlabs_agent_id=f"el-agent-{index}",
+        doctor_id="doctor",
+        created_at=datetime.now(),
+    )
+
+
+@pytest.fixture
+def data_service():
+    service = MockDataService()
+    service.search_index = KnowledgeSearchIndex()
+    return service
+
+
+async def add_doc(service, name, elevenlabs_id):
+    doc = await service.create_knowledge_document(
+        KnowledgeDocumentCreate(disease_name=name, raw_content="shared content")
+    )
+    await service.update_knowledge_sync_status(
+        doc.knowledge_id, SyncStatus.COMPLETED, elevenlabs_id, content_hash=content_hash(doc.raw_content)
+    )
+    return doc
+
+
+class TestBulkDeleteAudio:
+    """POST /api/audio/bulk-delete."""
+
+    def test_deletes_records_and_variant_files(self, data_service, mock_storage, tmp_path):
+        for audio in (make_audio("a1", ["mobile"]), make_audio("a2")):
+            asyncio.run(data_service.save_audio_metadata(audio))
+        for name in ("a1.mp3", "a1.mobile.mp3", "a2.mp3", "other.mp3"):
+            (tmp_path / "audio" / name).write_bytes(b"x")
+        app.dependency_overrides[get_data_service] = lambda: data_service
+        app.dependency_overrides[get_storage_service] = lambda: mock_storage
+        try:
+            response = TestClient(app).post(
+                "/api/audio/bulk-delete", json={"ids": ["a2", "missing", "a1", "a2"]}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [(r["id"], r["status"]) for r in body["results"]] == [
+            ("a2", "deleted"), ("missing", "not_found"), ("a1", "deleted"),
+        ]
+        assert body["deleted_count"] == 2
+        assert data_service._audio_files == {}
+        assert [p.name for p in (tmp_path / "audio").iterdir()] == ["other.mp3"]
+
+    def test_missing_file_is_a_warning(self, data_service, mock_storage):
+        asyncio.run(data_service.save_audio_metadata(make_audio("a1")))
+
+        report = asyncio.run(bulk_delete.delete_audio_files(data_service, mock_storage, ["a1"]))
+
+        assert report.results[0].status == "deleted"
+        assert "audio/a1.mp3" in report.results[0].detail
+
+    def test_record_write_failure_fails_items(self, data_service, mock_storage):
+        asyncio.run(data_service.save_audio_metadata(make_audio("a1")))
+        data_service.delete_audio_files = MagicMock(side_effect=RuntimeError("unavailable"))
+
+        report = asyncio.run(bulk_delete.delete_audio_files(data_service, mock_storage, ["a1", "x"]))
+
+        assert [r.status for r in report.results] == ["failed", "not_found"]
+        assert report.failed_count == 1
+
+
+class TestBulkDeleteKnowledge:
+    """Knowledge documents and shared ElevenLabs documents."""
+
+    def test_shared_elevenlabs_document_is_kept(self, data_service):
+        kept = asyncio.run(add_doc(data_service, "A", "el-shared"))
+        deleted = asyncio.run(add_doc(data_service, "B", "el-shared"))
+        elevenlabs = MagicMock()
+
+        report = asyncio.run(bulk_delete.delete_knowledge_documents(
+            data_service, elevenlabs, [deleted.knowledge_id]
+        ))
+
+        assert report.deleted_count == 1
+        elevenlabs.delete_document.assert_not_called()
+        assert list(data_service._documents) == [kept.knowledge_id]
+
+    def test_document_deleted_once_when_all_users_go(self, data_service):
+        docs = [asyncio.run(add_doc(data_service, name, "el-shared")) for name in "AB"]
+        solo = asyncio.run(add_doc(data_service, "C", "el-solo"))
+
+        def delete_document(elevenlabs_id):
+            if elevenlabs_id == "el-solo":
+                raise RuntimeError("rate limited")
+            return True
+
+        elevenlabs = MagicMock()
+        elevenlabs.delete_document.side_effect = delete_document
+
+        report = asyncio.run(bulk_delete.delete_knowledge_documents(
+            data_service, elevenlabs, [d.knowledge_id for d in docs + [solo]]
+        ))
+
+        elevenlabs.delete_document.assert_any_call("el-shared")
+        assert elevenlabs.delete_document.call_count == 2
+        assert report.deleted_count == 3
+        assert "rate limited" in report.results[2].detail
+        assert data_service._documents == {}
+
+    def test_route(self, data_service):
+        doc = asyncio.run(add_doc(data_service, "A", None))
+        app.dependency_overrides[get_data_service] = lambda: data_service
+        try:
+            response = TestClient(app).post("/api/knowledge/bulk-delete", json={"ids": [doc.knowledge_id]})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.json()["deleted_count"] == 1
+
+    def test_empty_request_is_rejected(self):
+        assert TestClient(app).post("/api/knowledge/bulk-delete", json={"ids": []}).status_code == 422
+
+
+class TestBulkDeleteAgents:
+    """POST /api/agent/bulk-delete."""
+
+    def test_bounded_concurrency_and_remote_failures(self, data_service, monkeypatch):
+        monkeypatch.setattr(get_settings(), "bulk_delete_concurrency", 2)
+        for i in range(6):
+            asyncio.run(data_service.save_agent(make_agent(i)))
+        active = peak = 0
+        lock = threading.Lock()
+
+        def delete_agent(elevenlabs_id):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            if elevenlabs_id == "el-agent-3":
+                raise RuntimeError("gone")
+            return True
+
+        elevenlabs = MagicMock()
+        elevenlabs.delete_agent.side_effect = delete_agent
+        service = AgentService(elevenlabs_service=elevenlabs, data_service=data_service)
+        app.dependency_overrides[get_agent_service] = lambda: service
+        try:
+            response = TestClient(app).post(
+                "/api/agent/bulk-delete", json={"ids": [f"agent-{i}" for i in range(7)]}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        body = response.json()
+        assert body["deleted_count"] == 6
+        assert body["not_found_count"] == 1
+        assert "gone" in body["results"][3]["detail"]
+        assert peak <= 2
+        assert data_service._agents == {}
+
+
+class TestFirestoreBatching:
+    """Batched reads and writes in FirestoreDataService."""
+
+    @pytest.fixture
+    def firestore(self):
+        service = object.__new__(FirestoreDataService)
+        service._db = MagicMock()
+        return service
+
+    def test_delete_many_chunks_without_reads(self, firestore):
+        ids = [f"id-{i}" for i in range(FIRESTORE_BATCH_LIMIT + 10)]
+
+        asyncio.run(firestore.delete_audio_files(ids + ids[:5]))
+
+        batch = firestore._db.batch.return_value
+        assert batch.commit.call_count == 2
+        assert batch.delete.call_count == len(ids)
+        firestore._db.collection.return_value.document.return_value.get.assert_not_called()
+
+    def test_get_many_uses_one_batched_read(self, firestore):
+        snapshot = MagicMock(id="agent-1", exists=True)
+        snapshot.to_dict.return_value = make_agent(1).model_dump() | {"answer_style": "professional"}
+        firestore._db.get_all.return_value = [snapshot, MagicMock(exists=False)]
+
+        agents = asyncio.run(firestore.get_agents_by_ids(["agent-1", "agent-2"]))
+
+        assert list(agents) == ["agent-1"]
+        firestore._db.get_all.assert_called_once()
+
+    def test_single_delete_uses_precondition(self, firestore):
+        doc_ref = firestore._db.collection.return_value.document.return_value
+        doc_ref.delete.side_effect = [None, NotFound("missing")]
+
+        assert asyncio.run(firestore.delete_agent("a1")) is True
+        assert asyncio.run(firestore.delete_agent("a2")) is False
+        doc_ref.get.assert_not_called()
+
+
+class TestGcsBatchDelete:
+    """StorageService.delete_files over GCS batch requests."""
+
+    @pytest.fixture
+    def gcs(self):
+        """The real google-cloud-storage package instead of the conftest mock."""
+        with patch.dict(sys.modules):
+            for name in [n for n in sys.modules if n.startswith("google.cloud")]:
+                del sys.modules[name]
+            from google.cloud import storage as gcs
+            yield gcs
+
+    def test_per_file_results_from_real_batch(self, gcs, monkeypatch):
+        monkeypatch.setattr(get_settings(), "use_mock_storage", False)
+        client = gcs.Client(project="test", credentials=AnonymousCredentials())
+        storage = object.__new__(StorageService)
+        storage._client = client
+        storage._bucket = client.bucket("bucket")
+        sent = []
+
+        def make_request(method, url, data=None, headers=None, timeout=None):
+            # Answer each deferred DELETE in order; the second file overall is missing
+            calls = data.count("DELETE ")
+            parts = []
+            for i in range(len(sent) * GCS_BATCH_SIZE, len(sent) * GCS_BATCH_SIZE + calls):
+                status = "404 Not Found" if i == 1 else "204 No Content"
+                parts.append(
+                    f"--batch\nContent-Type: application/http\nContent-ID: <response-{i}>\n\n"
+                    f"HTTP/1.1 {status}\nContent-Length: 0\n\n"
+                )
+            sent.append(calls)
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["content-type"] = "multipart/mixed; boundary=batch"
+            response._content = ("".join(parts) + "--batch--\n").encode()
+            return response
+
+        monkeypatch.setattr(client._base_connection, "_make_request", make_request)
+        paths = [f"audio/{i}.mp3" for i in range(GCS_BATCH_SIZE + 3)]
+
+        results = storage.delete_files(paths)
+
+        assert sent == [GCS_BATCH_SIZE, 3]
+        assert results["audio/1.mp3"] is False
+        assert sum(results.values()) == len(paths) - 1
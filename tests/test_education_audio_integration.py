@@ -6,6 +6,7 @@ import pytest
 from streamlit.testing.v1 import AppTest
 
 from streamlit_app.services.models import (
+    AudioManifestItem,
     AudioResponse,
     KnowledgeDocument,
     ScriptResponse,
@@ -50,6 +51,13 @@ MOCK_AUDIO = AudioResponse(
     created_at=datetime.utcnow()
 )
 
+MOCK_MANIFEST_ITEM = AudioManifestItem(
+    audio_id="aud_1",
+    knowledge_id="doc_1",
+    created_at=datetime.utcnow(),
+    duration_seconds=10.0,
+)
+
 MOCK_SCRIPT_CONTENT = "Generated script"
 
 async def mock_script_stream(*args, **kwargs):
@@ -65,6 +73,8 @@ def mock_client():
     client.generate_script_stream = MagicMock(side_effect=mock_script_stream)
     client.generate_audio = AsyncMock(return_value=MOCK_AUDIO)
     client.get_audio_files = AsyncMock(return_value=[MOCK_AUDIO])
+    client.get_audio_manifest = AsyncMock(return_value=[MOCK_MANIFEST_ITEM])
+    client.get_playback_urls = AsyncMock(return_value=({"aud_1": "http://audio.url"}, 3600))
     client.get_templates = AsyncMock(return_value=[])
     client.health_check = AsyncMock(return_value={"status": "ok"})
     return client
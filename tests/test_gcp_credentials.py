@@ -0,0 +1,116 @@
+"""Tests for the shared Google credentials manager."""
+
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.services.gcp_credentials import GoogleCredentialsManager
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class FakeCredentials:
+    """Credentials whose tokens last `lifetime` seconds."""
+
+    def __init__(self, lifetime=3600):
+        self.lifetime = lifetime
+        self.token = None
+        self.expiry = None
+        self.refreshes = 0
+        self.service_account_email = "svc@example.iam.gserviceaccount.com"
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.token = f"token-{self.refreshes}"
+        self.expiry = utcnow() + timedelta(seconds=self.lifetime)
+
+
+@pytest.fixture
+def credentials():
+    return FakeCredentials()
+
+
+@pytest.fixture
+def manager(credentials):
+    factory = MagicMock(return_value=(credentials, "proj"))
+    manager = GoogleCredentialsManager(refresh_margin_seconds=300, credentials_factory=factory)
+    manager.factory = factory
+    return manager
+
+
+class TestCredentialsManager:
+    """Initialization, caching and refresh."""
+
+    def test_initialized_once_with_shared_session(self, manager, credentials):
+        assert manager.credentials is credentials
+        assert manager.project_id == "proj"
+        assert manager.authorized_session is manager.authorized_session
+        manager.access_token()
+        manager.access_token()
+        manager.factory.assert_called_once()
+
+    def test_token_reused_until_within_margin(self, manager, credentials):
+        assert manager.access_token() == "token-1"
+        assert manager.access_token() == "token-1"
+
+        credentials.expiry = utcnow() + timedelta(seconds=120)
+        assert manager.access_token() == "token-2"
+
+    def test_next_refresh_scheduled_before_expiry(self, manager, credentials):
+        manager.refresh()
+
+        delay = manager._next_refresh_delay()
+        assert 3600 - 300 - 5 < delay <= 3600 - 300
+
+    def test_background_refresh_keeps_token_fresh(self, credentials):
+        credentials.lifetime = 301  # Next refresh due one second after each refresh
+        manager = GoogleCredentialsManager(
+            refresh_margin_seconds=300, credentials_factory=lambda: (credentials, None)
+        )
+        manager.start_background_refresh()
+        try:
+            deadline = utcnow() + timedelta(seconds=5)
+            while credentials.refreshes < 2 and utcnow() < deadline:
+                time.sleep(0.05)
+        finally:
+            manager.stop_background_refresh()
+        assert credentials.refreshes >= 2
+
+    def test_key_file_credentials_sign_locally(self, manager, credentials):
+        assert manager.signing_credentials() is credentials
+
+    def test_compute_credentials_sign_through_iam_once(self, manager):
+        with patch("backend.services.gcp_credentials.compute_engine.Credentials", FakeCredentials):
+            manager.credentials.service_account_email = "default"
+            manager._http = MagicMock()
+            manager._http.get.return_value = MagicMock(status_code=200, text="run@proj.iam.gserviceaccount.com\n")
+
+            first = manager.signing_credentials()
+            second = manager.signing_credentials()
+
+        assert first is second
+        assert first.service_account_email == "run@proj.iam.gserviceaccount.com"
+        manager._http.get.assert_called_once()
+
+
+def test_signed_url_uses_manager_signing_credentials(monkeypatch):
+    from backend.config import get_settings
+    from backend.services import storage_service
+
+    monkeypatch.setattr(get_settings(), "use_mock_storage", False)
+    monkeypatch.setattr(get_settings(), "use_gcs_emulator", False)
+    service = MagicMock()
+    service._bucket.blob.return_value.generate_signed_url.return_value = "https://signed"
+    signing = object()
+    manager = MagicMock()
+    manager.signing_credentials.return_value = signing
+    monkeypatch.setattr(storage_service, "get_storage_service", lambda: service)
+    monkeypatch.setattr(storage_service, "get_credentials_manager", lambda: manager)
+
+    assert storage_service.get_signed_url("audio/a.mp3") == "https://signed"
+    kwargs = service._bucket.blob.return_value.generate_signed_url.call_args.kwargs
+    assert kwargs["credentials"] is signing
@@ -0,0 +1,153 @@
+"""Tests for content-hash based dedupe of knowledge syncs."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.schemas import KnowledgeDocumentCreate, SyncStatus
+from backend.services.data_service import MockDataService, get_data_service
+from backend.services.elevenlabs_service import get_elevenlabs_service
+from backend.services.knowledge_sync_tasks import (
+    KNOWLEDGE_RESYNC,
+    perform_knowledge_resync,
+    perform_knowledge_sync,
+)
+from backend.services.task_queue import SQLiteTaskStore, TaskQueue, get_task_queue
+from backend.utils.content_hash import content_hash, normalize_content
+
+
+class TestNormalizeContent:
+    """Whitespace and Unicode normalization."""
+
+    def test_whitespace_only_differences_hash_equal(self):
+        original = "# Diabetes\n\nCheck glucose daily.\nTake insulin."
+        edited = "\n# Diabetes  \r\n\r\n\r\n  Check   glucose\tdaily.\r\nTake insulin.\n\n"
+        assert content_hash(original) == content_hash(edited)
+
+    def test_unicode_composition_hashes_equal(self):
+        assert content_hash("caf\u00e9") == content_hash("cafe\u0301")
+
+    def test_word_and_paragraph_changes_differ(self):
+        assert content_hash("Take insulin.") != content_hash("Take insulin daily.")
+        assert content_hash("a\nb") != content_hash("a\n\nb")
+
+    def test_normalized_form(self):
+        assert normalize_content("  a  b \n\n\n c\n") == "a b\n\nc"
+
+
+async def create_synced(data_service, content, elevenlabs_id):
+    doc = await data_service.create_knowledge_document(
+        KnowledgeDocumentCreate(disease_name="Asthma", raw_content=content)
+    )
+    await data_service.update_knowledge_sync_status(
+        doc.knowledge_id, SyncStatus.COMPLETED, elevenlabs_id, content_hash=content_hash(content)
+    )
+    return await data_service.get_knowledge_document(doc.knowledge_id)
+
+
+class TestElevenLabsDocumentReuse:
+    """Identical content shares one ElevenLabs document."""
+
+    @pytest.mark.asyncio
+    async def test_sync_reuses_document_with_identical_content(self):
+        data_service = MockDataService()
+        await create_synced(data_service, "Use your inhaler.", "el_existing")
+        duplicate = await data_service.create_knowledge_document(
+            KnowledgeDocumentCreate(disease_name="Asthma copy", raw_content="Use  your inhaler.\n")
+        )
+        elevenlabs = MagicMock()
+
+        elevenlabs_id = await perform_knowledge_sync(
+            duplicate.knowledge_id, duplicate.raw_content, "Asthma copy_faq", data_service, elevenlabs
+        )
+
+        assert elevenlabs_id == "el_existing"
+        elevenlabs.create_document.assert_not_called()
+        stored = await data_service.get_knowledge_document(duplicate.knowledge_id)
+        assert stored.sync_status == SyncStatus.COMPLETED
+        assert stored.elevenlabs_content_hash == content_hash("Use your inhaler.")
+
+    @pytest.mark.asyncio
+    async def test_resync_keeps_old_document_while_shared(self):
+        data_service = MockDataService()
+        await create_synced(data_service, "Use your inhaler.", "el_shared")
+        doc = await create_synced(data_service, "Use your inhaler.", "el_shared")
+        elevenlabs = MagicMock()
+        elevenlabs.create_document.return_value = "el_new"
+
+        await perform_knowledge_resync(
+            doc.knowledge_id, "el_shared", "Use your inhaler twice daily.", "Asthma_faq",
+            data_service, elevenlabs, old_content_hash=doc.elevenlabs_content_hash,
+        )
+
+        elevenlabs.create_document.assert_called_once()
+        elevenlabs.delete_document.assert_not_called()
+
+
+class TestKnowledgeRoutes:
+    """Update and delete routes honour content hashes."""
+
+    @pytest.fixture
+    def data_service(self):
+        return MockDataService()
+
+    @pytest.fixture
+    def elevenlabs(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def queue(self):
+        return TaskQueue(SQLiteTaskStore(":memory:"))
+
+    @pytest.fixture
+    def client(self, data_service, elevenlabs, queue):
+        app.dependency_overrides[get_data_service] = lambda: data_service
+        app.dependency_overrides[get_elevenlabs_service] = lambda: elevenlabs
+        app.dependency_overrides[get_task_queue] = lambda: queue
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    async def _queued_kinds(self, queue):
+        kinds = []
+        while True:
+            task = await queue.store.lease_next("test", 60)
+            if task is None:
+                return kinds
+            kinds.append(task.kind)
+
+    @pytest.mark.asyncio
+    async def test_whitespace_only_edit_skips_resync(self, client, data_service, queue):
+        doc = await create_synced(data_service, "Use your inhaler.\nSee a doctor.", "el_1")
+
+        response = client.put(
+            f"/api/knowledge/{doc.knowledge_id}",
+            json={"raw_content": "Use your inhaler.  \r\n  See  a doctor.\n"},
+        )
+
+        assert response.status_code == 200
+        assert await self._queued_kinds(queue) == []
+
+    @pytest.mark.asyncio
+    async def test_content_edit_queues_resync(self, client, data_service, queue):
+        doc = await create_synced(data_service, "Use your inhaler.", "el_1")
+
+        response = client.put(
+            f"/api/knowledge/{doc.knowledge_id}", json={"raw_content": "Use your spacer."}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["content_hash"] == content_hash("Use your spacer.")
+        assert await self._queued_kinds(queue) == [KNOWLEDGE_RESYNC]
+
+    @pytest.mark.asyncio
+    async def test_delete_keeps_shared_elevenlabs_document(self, client, data_service, elevenlabs):
+        first = await create_synced(data_service, "Use your inhaler.", "el_shared")
+        second = await create_synced(data_service, "Use your inhaler.", "el_shared")
+
+        assert client.delete(f"/api/knowledge/{first.knowledge_id}").status_code == 204
+        elevenlabs.delete_document.assert_not_called()
+
+        assert client.delete(f"/api/knowledge/{second.knowledge_id}").status_code == 204
+        elevenlabs.delete_document.assert_called_once_with("el_shared")
@@ -0,0 +1,226 @@
+"""Tests for ElevenLabs knowledge base reconciliation."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.schemas import KnowledgeDocumentCreate, SyncStatus
+from backend.services.data_service import MockDataService, get_data_service
+from backend.services.elevenlabs_service import (
+    ElevenLabsErrorType,
+    ElevenLabsSyncError,
+    get_elevenlabs_service,
+)
+from backend.services.knowledge_reconciliation import reconcile_knowledge_base
+from backend.services.knowledge_search import KnowledgeSearchIndex
+from backend.services.knowledge_sync_tasks import KNOWLEDGE_RESYNC, KNOWLEDGE_SYNC
+from backend.services.task_queue import SQLiteTaskStore, TaskQueue, get_task_queue
+from backend.utils.content_hash import content_hash
+
+
+def paged_elevenlabs(ids, page_size=2):
+    """ElevenLabs mock whose list_documents_page serves ids in cursor-linked pages."""
+    service = MagicMock()
+
+    def list_documents_page(cursor=None, page_size_arg=100):
+        start = int(cursor or 0)
+        page = [{"id": i, "name": f"doc {i}"} for i in ids[start:start + page_size]]
+        next_start = start + page_size
+        return page, str(next_start) if next_start < len(ids) else None
+
+    service.list_documents_page.side_effect = list_documents_page
+    return service
+
+
+async def add_doc(service, name, elevenlabs_id=None, status=SyncStatus.COMPLETED, synced_content=None):
+    doc = await service.create_knowledge_document(
+        KnowledgeDocumentCreate(disease_name=name, raw_content=f"{name} content")
+    )
+    digest = content_hash(synced_content or doc.raw_content)
+    await service.update_knowledge_sync_status(doc.knowledge_id, status, elevenlabs_id, content_hash=digest)
+    return doc
+
+
+@pytest.fixture
+def data_service():
+    service = MockDataService()
+    service.search_index = KnowledgeSearchIndex()
+    return service
+
+
+@pytest.fixture
+def queue():
+    return TaskQueue(SQLiteTaskStore(":memory:"))
+
+
+async def queued(queue):
+    tasks = []
+    while (task := await queue.store.lease_next("test", 60)) is not None:
+        tasks.append((task.kind, task.payload["knowledge_id"]))
+    return sorted(tasks)
+
+
+@pytest.fixture
+async def drifted(data_service):
+    """Local state: one in sync, one missing, one stale, one never synced, one in flight."""
+    return {
+        "ok": await add_doc(data_service, "Ok", "el_ok"),
+        "missing": await add_doc(data_service, "Missing", "el_gone"),
+        "stale": await add_doc(data_service, "Stale", "el_stale", synced_content="old text"),
+        "failed": await add_doc(data_service, "Failed", None, SyncStatus.FAILED),
+        "pending": await add_doc(data_service, "Pending", "el_pending", SyncStatus.PENDING),
+    }
+
+
+class TestReconcile:
+    """Diff and fixes."""
+
+    @pytest.mark.asyncio
+    async def test_dry_run_reports_diff_across_pages(self, data_service, queue, drifted):
+        elevenlabs = paged_elevenlabs(["el_ok", "el_orphan", "el_stale", "el_pending", "el_orphan2"])
+
+        report = await reconcile_knowledge_base(data_service, elevenlabs, queue, page_size=2)
+
+        assert report.dry_run
+        assert report.pages == 3
+        assert report.elevenlabs_count == 5
+        assert report.in_sync_count == 1
+        assert report.in_flight_count == 1
+        assert sorted(e.elevenlabs_document_id for e in report.orphans) == ["el_orphan", "el_orphan2"]
+        assert sorted(e.knowledge_id for e in report.missing) == sorted(
+            [drifted["missing"].knowledge_id, drifted["failed"].knowledge_id]
+        )
+        assert [e.knowledge_id for e in report.stale] == [drifted["stale"].knowledge_id]
+        assert set(report.timings_ms) == {"list_elevenlabs", "list_local", "diff", "apply", "total"}
+        assert await queued(queue) == []
+        elevenlabs.delete_document.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fix_queues_syncs_and_keeps_orphans_by_default(self, data_service, queue, drifted):
+        elevenlabs = paged_elevenlabs(["el_ok", "el_orphan", "el_stale", "el_pending"])
+
+        report = await reconcile_knowledge_base(data_service, elevenlabs, queue, dry_run=False)
+
+        assert report.applied_count == 3
+        assert report.failed_count == 0
+        assert await queued(queue) == sorted([
+            (KNOWLEDGE_RESYNC, drifted["missing"].knowledge_id),
+            (KNOWLEDGE_RESYNC, drifted["stale"].knowledge_id),
+            (KNOWLEDGE_SYNC, drifted["failed"].knowledge_id),
+        ])
+        missing = await data_service.get_knowledge_document(drifted["missing"].knowledge_id)
+        assert missing.sync_status == SyncStatus.PENDING
+        elevenlabs.delete_document.assert_not_called()
+        assert report.orphans[0].action is None
+
+    @pytest.mark.asyncio
+    async def test_delete_orphans_with_failures_reported(self, data_service, queue):
+        elevenlabs = paged_elevenlabs(["el_a", "el_b", "el_c"])
+
+        def delete_document(doc_id):
+            if doc_id == "el_b":
+                raise RuntimeError("boom")
+            return True
+
+        elevenlabs.delete_document.side_effect = delete_document
+
+        report = await reconcile_knowledge_base(
+            data_service, elevenlabs, queue, dry_run=False, delete_orphans=True, concurrency=2
+        )
+
+        assert {e.elevenlabs_document_id: e.action for e in report.orphans} == {
+            "el_a": "deleted", "el_b": None, "el_c": "deleted",
+        }
+        assert report.applied_count == 2
+        assert report.failed_count == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_finishing_during_listing_is_not_deleted(self, data_service, queue):
+        doc = await add_doc(data_service, "Pending", None, SyncStatus.PENDING)
+        elevenlabs = paged_elevenlabs(["el_new", "el_orphan"])
+        elevenlabs.delete_document.return_value = True
+        load = data_service.get_knowledge_documents
+
+        async def load_then_finish_sync(*args, **kwargs):
+            docs = [d.model_copy() for d in await load(*args, **kwargs)]
+            await data_service.update_knowledge_sync_status(
+                doc.knowledge_id, SyncStatus.COMPLETED, "el_new", content_hash=doc.content_hash
+            )
+            return docs
+
+        data_service.get_knowledge_documents = load_then_finish_sync
+
+        report = await reconcile_knowledge_base(
+            data_service, elevenlabs, queue, dry_run=False, delete_orphans=True
+        )
+
+        assert [e.elevenlabs_document_id for e in report.orphans] == ["el_orphan"]
+        elevenlabs.delete_document.assert_called_once_with("el_orphan")
+
+    @pytest.mark.asyncio
+    async def test_in_flight_documents_are_not_orphans(self, data_service, queue):
+        await add_doc(data_service, "Pending", "el_pending", SyncStatus.SYNCING)
+
+        report = await reconcile_knowledge_base(data_service, paged_elevenlabs(["el_pending"]), queue)
+
+        assert report.orphans == []
+        assert report.in_flight_count == 1
+
+    @pytest.mark.asyncio
+    async def test_listing_failure_applies_nothing(self, data_service, queue):
+        await add_doc(data_service, "Ok", "el_ok")
+        elevenlabs = MagicMock()
+        elevenlabs.list_documents_page.side_effect = ElevenLabsSyncError(
+            "down", ElevenLabsErrorType.SERVER_ERROR
+        )
+
+        with pytest.raises(ElevenLabsSyncError):
+            await reconcile_knowledge_base(data_service, elevenlabs, queue, dry_run=False)
+        assert await queued(queue) == []
+
+
+class TestReconcileRoute:
+    """POST /api/knowledge/reconcile."""
+
+    @pytest.fixture
+    def client(self, data_service, queue):
+        elevenlabs = paged_elevenlabs(["el_ok", "el_orphan"])
+        app.dependency_overrides[get_data_service] = lambda: data_service
+        app.dependency_overrides[get_elevenlabs_service] = lambda: elevenlabs
+        app.dependency_overrides[get_task_queue] = lambda: queue
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_defaults_to_dry_run(self, client, data_service):
+        await add_doc(data_service, "Ok", "el_ok")
+
+        response = client.post("/api/knowledge/reconcile", json={})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["dry_run"] is True
+        assert [e["elevenlabs_document_id"] for e in body["orphans"]] == ["el_orphan"]
+        assert body["in_sync_count"] == 1
+
+
+class TestListDocumentsPagination:
+    """ElevenLabsService.list_documents follows cursors."""
+
+    def test_follows_next_cursor(self):
+        from backend.services.elevenlabs_service import ElevenLabsService
+
+        service = ElevenLabsService.__new__(ElevenLabsService)
+        service.use_mock = False
+        service.client = MagicMock()
+        pages = {
+            None: MagicMock(documents=[MagicMock(id="a", name="A")], has_more=True, next_cursor="c1"),
+            "c1": MagicMock(documents=[MagicMock(id="b", name="B")], has_more=False, next_cursor=None),
+        }
+        service.client.conversational_ai.knowledge_base.list.side_effect = (
+            lambda page_size, cursor: pages[cursor]
+        )
+
+        assert [d["id"] for d in service.list_documents()] == ["a", "b"]
@@ -0,0 +1,172 @@
+"""Tests for knowledge re-sync across linked agents."""
+
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from backend.models.schemas import AgentResponse, AnswerStyle, KnowledgeDocumentCreate, SyncStatus
+from backend.services.data_service import MockDataService
+from backend.services.elevenlabs_service import ElevenLabsAgentError, ElevenLabsSyncError
+from backend.services.knowledge_sync_tasks import perform_knowledge_resync
+
+
+def make_agent(index: int, knowledge_ids) -> AgentResponse:
+    return AgentResponse(
+        agent_id=f"agent-{index}",
+        name=f"Agent {index}",
+        knowledge_ids=list(knowledge_ids),
+        voice_id="voice",
+        answer_style=AnswerStyle.PROFESSIONAL,
+        elevenlabs_agent_id=f"el-agent-{index}",
+        doctor_id="doctor",
+        created_at=datetime.now(),
+    )
+
+
+class FakeElevenLabs:
+    """Records call order and peak concurrency of agent calls."""
+
+    def __init__(self, agents_kb, delay=0.0, fail_agents=(), fail_create=False):
+        self.agents_kb = agents_kb  # el agent id -> knowledge base list
+        self.delay = delay
+        self.fail_agents = set(fail_agents)
+        self.fail_create = fail_create
+        self.events = []
+        self.deleted = []
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def create_document(self, text, name):
+        if self.fail_create:
+            raise ElevenLabsSyncError("create failed", "server", is_retryable=True)
+        self.events.append("create")
+        return "el_new"
+
+    def get_agent(self, agent_id):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return {"conversation_config": {"agent": {"prompt": {"knowledge_base": list(self.agents_kb[agent_id])}}}}
+
+    def update_agent_knowledge_base(self, agent_id, knowledge_base):
+        if agent_id in self.fail_agents:
+            raise ElevenLabsAgentError("update failed")
+        self.events.append(f"update:{agent_id}")
+        self.agents_kb[agent_id] = knowledge_base
+        return True
+
+    def delete_document(self, document_id):
+        self.events.append("delete")
+        self.deleted.append(document_id)
+        return True
+
+
+@pytest.fixture
+def concurrency():
+    with patch("backend.services.knowledge_sync_tasks.get_settings") as mock_settings:
+        mock_settings.return_value.knowledge_resync_concurrency = 4
+        yield 4
+
+
+async def setup_linked(data_service, agent_count):
+    doc = await data_service.create_knowledge_document(
+        KnowledgeDocumentCreate(disease_name="Asthma", raw_content="Inhaler use.")
+    )
+    agents_kb = {}
+    for i in range(agent_count):
+        await data_service.save_agent(make_agent(i, [doc.knowledge_id, "other-doc"]))
+        agents_kb[f"el-agent-{i}"] = [
+            {"id": "el_old", "name": "Asthma_faq", "type": "file"},
+            {"id": "el_other", "name": "Other", "type": "file"},
+        ]
+    # An unrelated agent must not be touched
+    await data_service.save_agent(make_agent(99, ["other-doc"]))
+    agents_kb["el-agent-99"] = [{"id": "el_other", "name": "Other", "type": "file"}]
+    return doc, agents_kb
+
+
+class TestAgentReverseIndex:
+    """MockDataService knowledge_id -> agents index."""
+
+    @pytest.mark.asyncio
+    async def test_index_follows_save_and_delete(self):
+        data_service = MockDataService()
+        await data_service.save_agent(make_agent(1, ["k1", "k2"]))
+        await data_service.save_agent(make_agent(2, ["k2"]))
+
+        assert {a.agent_id for a in await data_service.get_agents_by_knowledge_id("k2")} == {"agent-1", "agent-2"}
+
+        # Relinking agent-1 drops it from k2
+        await data_service.save_agent(make_agent(1, ["k1"]))
+        assert [a.agent_id for a in await data_service.get_agents_by_knowledge_id("k2")] == ["agent-2"]
+
+        await data_service.delete_agent("agent-2")
+        assert await data_service.get_agents_by_knowledge_id("k2") == []
+        assert [a.agent_id for a in await data_service.get_agents_by_knowledge_id("k1")] == ["agent-1"]
+
+
+class TestPerformKnowledgeResync:
+    """Create-then-swap re-sync."""
+
+    @pytest.mark.asyncio
+    async def test_swaps_document_on_every_linked_agent(self, concurrency):
+        data_service = MockDataService()
+        doc, agents_kb = await setup_linked(data_service, 10)
+        elevenlabs = FakeElevenLabs(agents_kb, delay=0.02)
+
+        new_id = await perform_knowledge_resync(
+            doc.knowledge_id, "el_old", doc.raw_content, "Asthma_faq", data_service, elevenlabs
+        )
+
+        assert new_id == "el_new"
+        for i in range(10):
+            ids = [d["id"] for d in agents_kb[f"el-agent-{i}"]]
+            assert ids == ["el_other", "el_new"]
+        assert agents_kb["el-agent-99"] == [{"id": "el_other", "name": "Other", "type": "file"}]
+
+        # New document exists before any agent is touched; old one is deleted last
+        assert elevenlabs.events[0] == "create"
+        assert elevenlabs.events[-1] == "delete"
+        assert elevenlabs.deleted == ["el_old"]
+        assert 1 < elevenlabs.peak <= concurrency
+
+        stored = await data_service.get_knowledge_document(doc.knowledge_id)
+        assert stored.sync_status == SyncStatus.COMPLETED
+        assert stored.elevenlabs_document_id == "el_new"
+
+    @pytest.mark.asyncio
+    async def test_failed_swap_keeps_old_document(self, concurrency):
+        data_service = MockDataService()
+        doc, agents_kb = await setup_linked(data_service, 3)
+        elevenlabs = FakeElevenLabs(agents_kb, fail_agents={"el-agent-1"})
+
+        await perform_knowledge_resync(
+            doc.knowledge_id, "el_old", doc.raw_content, "Asthma_faq", data_service, elevenlabs
+        )
+
+        assert elevenlabs.deleted == []
+        assert [d["id"] for d in agents_kb["el-agent-1"]] == ["el_old", "el_other"]
+        assert [d["id"] for d in agents_kb["el-agent-0"]] == ["el_other", "el_new"]
+
+    @pytest.mark.asyncio
+    async def test_create_failure_leaves_agents_untouched(self, concurrency):
+        data_service = MockDataService()
+        doc, agents_kb = await setup_linked(data_service, 2)
+        elevenlabs = FakeElevenLabs(agents_kb, fail_create=True)
+
+        with pytest.raises(ElevenLabsSyncError):
+            await perform_knowledge_resync(
+                doc.knowledge_id, "el_old", doc.raw_content, "Asthma_faq", data_service, elevenlabs
+            )
+
+        assert elevenlabs.events == []
+        assert [d["id"] for d in agents_kb["el-agent-0"]] == ["el_old", "el_other"]
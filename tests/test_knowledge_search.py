@@ -0,0 +1,186 @@
+"""Tests for the BM25 knowledge search index."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.schemas import KnowledgeDocumentCreate, KnowledgeDocumentUpdate
+from backend.services.data_service import MockDataService, get_data_service
+from backend.services.knowledge_search import (
+    KnowledgeSearchIndex,
+    first_match_position,
+    highlight,
+    sync_search_index,
+    tokenize,
+)
+
+DIABETES = """Diabetes affects blood sugar.
+
+# Treatment
+Insulin injections and diet control. Check glucose before insulin.
+
+# Follow-up
+Visit every three months.
+"""
+
+ASTHMA = """# Inhalers
+Use your inhaler twice daily. Rinse your mouth after steroid use.
+"""
+
+
+@pytest.fixture
+def service():
+    data_service = MockDataService()
+    data_service.search_index = KnowledgeSearchIndex()
+    return data_service
+
+
+async def create(service, name, content):
+    return await service.create_knowledge_document(
+        KnowledgeDocumentCreate(disease_name=name, raw_content=content)
+    )
+
+
+class TestTokenize:
+    """Term extraction."""
+
+    def test_lowercases_words(self):
+        assert tokenize("Insulin, DIET-control") == ["insulin", "diet", "control"]
+
+    def test_cjk_runs_become_bigrams(self):
+        assert tokenize("糖尿病 insulin") == ["糖尿", "尿病", "insulin"]
+        assert tokenize("A型") == ["a", "型"]
+
+
+class TestIndex:
+    """Ranking and incremental maintenance."""
+
+    @pytest.mark.asyncio
+    async def test_ranks_more_relevant_document_first(self, service):
+        diabetes = await create(service, "Diabetes", DIABETES)
+        asthma = await create(service, "Asthma", ASTHMA)
+
+        assert [hit.knowledge_id for hit in service.search_index.search("insulin")] == [diabetes.knowledge_id]
+        assert service.search_index.search("inhaler")[0].knowledge_id == asthma.knowledge_id
+        assert service.search_index.search("unknownterm") == []
+
+    @pytest.mark.asyncio
+    async def test_title_outweighs_body_mention(self, service):
+        await create(service, "General care", "Some notes mention asthma once among many other words here.")
+        asthma = await create(service, "Asthma", ASTHMA)
+
+        assert service.search_index.search("asthma")[0].knowledge_id == asthma.knowledge_id
+
+    @pytest.mark.asyncio
+    async def test_update_and_delete_keep_index_current(self, service):
+        doc = await create(service, "Diabetes", DIABETES)
+
+        await service.update_knowledge_document(
+            doc.knowledge_id, KnowledgeDocumentUpdate(raw_content="Metformin tablets with meals.")
+        )
+        assert service.search_index.search("insulin") == []
+        assert service.search_index.search("metformin")[0].knowledge_id == doc.knowledge_id
+
+        await service.delete_knowledge_document(doc.knowledge_id)
+        assert service.search_index.search("metformin") == []
+        assert len(service.search_index) == 0
+
+
+class TestSnapshots:
+    """Disk snapshots and startup reconciliation."""
+
+    @pytest.mark.asyncio
+    async def test_save_and_load_round_trip(self, service, tmp_path):
+        doc = await create(service, "Diabetes", DIABETES)
+        service.search_index.snapshot_path = str(tmp_path / "search.json")
+        service.search_index.save()
+
+        restored = KnowledgeSearchIndex(str(tmp_path / "search.json"))
+        assert restored.load()
+
+        assert restored.search("glucose")[0].knowledge_id == doc.knowledge_id
+        assert restored.search("glucose")[0].score == service.search_index.search("glucose")[0].score
+
+    def test_missing_or_corrupt_snapshot_is_ignored(self, tmp_path):
+        path = tmp_path / "search.json"
+        assert not KnowledgeSearchIndex(str(path)).load()
+        path.write_text("{not json")
+        assert not KnowledgeSearchIndex(str(path)).load()
+
+    @pytest.mark.asyncio
+    async def test_sync_only_reindexes_changed_documents(self, service):
+        diabetes = await create(service, "Diabetes", DIABETES)
+        asthma = await create(service, "Asthma", ASTHMA)
+        index = KnowledgeSearchIndex()
+        index.index_document(diabetes)
+        index.index_document(asthma.model_copy(update={"content_hash": "outdated"}))
+        index.index_document(diabetes.model_copy(update={"knowledge_id": "deleted"}))
+
+        reindexed, removed = await sync_search_index(index, await service.get_knowledge_documents())
+
+        assert (reindexed, removed) == (1, 1)
+        assert sorted(index.indexed_ids()) == sorted([diabetes.knowledge_id, asthma.knowledge_id])
+
+
+class TestHighlight:
+    """Snippet building."""
+
+    def test_marks_terms_case_insensitively(self):
+        snippets = highlight(DIABETES, "INSULIN")
+
+        assert len(snippets) == 1
+        assert snippets[0].count("<mark>Insulin</mark>") == 1
+        assert "<mark>insulin</mark>" in snippets[0]
+
+    def test_cjk_terms(self):
+        assert highlight("患者患有糖尿病。", "糖尿病") == ["患者患有<mark>糖尿病</mark>。"]
+
+    def test_first_match_position_uses_word_boundaries(self):
+        content = "Healthcare costs. Daily care matters."
+
+        assert first_match_position(content, "care") == content.index("care matters")
+        assert first_match_position("患者患有糖尿病。", "糖尿病") == 4
+        assert first_match_position(content, "insulin") is None
+
+
+class TestSearchRoute:
+    """GET /api/knowledge/search."""
+
+    @pytest.fixture
+    def client(self, service):
+        app.dependency_overrides[get_data_service] = lambda: service
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_returns_highlights_and_section(self, client, service):
+        doc = await create(service, "Diabetes", DIABETES)
+        await create(service, "Asthma", ASTHMA)
+
+        response = client.get("/api/knowledge/search", params={"q": "glucose", "limit": 5})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total_count"] == 1
+        result = body["results"][0]
+        assert result["knowledge_id"] == doc.knowledge_id
+        assert result["section"] == "Treatment"
+        assert "<mark>glucose</mark>" in result["highlights"][0]
+
+    @pytest.mark.asyncio
+    async def test_loads_hits_in_one_read(self, client, service, monkeypatch):
+        await create(service, "Diabetes", DIABETES)
+        await create(service, "Asthma", ASTHMA)
+
+        async def single_read(knowledge_id):
+            raise AssertionError("hits must be loaded in one batched read")
+
+        monkeypatch.setattr(service, "get_knowledge_document", single_read)
+
+        response = client.get("/api/knowledge/search", params={"q": "insulin inhaler"})
+
+        assert response.status_code == 200
+        assert response.json()["total_count"] == 2
+
+    def test_rejects_empty_query(self, client):
+        assert client.get("/api/knowledge/search", params={"q": ""}).status_code == 422
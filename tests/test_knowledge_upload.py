@@ -0,0 +1,177 @@
+"""Tests for streaming multipart knowledge uploads."""
+
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from hypothesis import given, strategies as st
+
+from backend.main import app
+from backend.models.schemas import KNOWLEDGE_CONTENT_MAX_CHARS
+from backend.services.data_service import MockDataService, get_data_service
+from backend.services.knowledge_search import KnowledgeSearchIndex
+from backend.services.knowledge_sync_tasks import KNOWLEDGE_SYNC
+from backend.services.storage_service import get_storage_service
+from backend.services.task_queue import SQLiteTaskStore, TaskQueue, get_task_queue
+from backend.utils.content_hash import ContentHasher, content_hash
+from backend.utils.section_parser import parse_sections
+from backend.utils.text_extraction import StreamingTextExtractor, upload_content_type
+
+MARKDOWN = "\ufeff# Diabetes\r\nCheck glucose daily.\r\n\r\n## Insulin\r\nCafe\u0301 dosage: 胰岛素.\r\n"
+
+
+def extract(data: bytes, chunk_size: int):
+    extractor = StreamingTextExtractor()
+    pieces = [extractor.feed(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size)]
+    tail, extracted = extractor.close()
+    return "".join(pieces) + tail, extracted
+
+
+class TestStreamingTextExtractor:
+    """Incremental decoding, normalization, sections and hash."""
+
+    def test_normalizes_bom_line_endings_and_composition(self):
+        text, _ = extract(MARKDOWN.encode("utf-8"), 5)
+
+        assert text == "# Diabetes\nCheck glucose daily.\n\n## Insulin\nCaf\u00e9 dosage: 胰岛素.\n"
+
+    @given(
+        st.text(alphabet=st.sampled_from(["a", " ", "\n", "\r", "#", "\u00e9", "\u0301", "胰", "\t"]), max_size=60),
+        st.integers(min_value=1, max_value=9),
+    )
+    def test_chunking_matches_whole_document(self, content, chunk_size):
+        text, extracted = extract(content.encode("utf-8"), chunk_size)
+        whole, _ = extract(content.encode("utf-8"), max(1, len(content.encode("utf-8"))))
+
+        assert text == whole
+        assert extracted.content_hash == content_hash(text)
+        assert (extracted.structured_sections, extracted.section_index) == parse_sections(text)
+
+    def test_invalid_utf8_raises(self):
+        extractor = StreamingTextExtractor()
+        with pytest.raises(UnicodeDecodeError):
+            extractor.feed(b"ok \xff\xfe")
+            extractor.close()
+
+    @given(st.text(max_size=80))
+    def test_content_hasher_matches_content_hash(self, content):
+        hasher = ContentHasher()
+        for line in content.splitlines():
+            hasher.update_line(line)
+        assert hasher.hexdigest() == content_hash(content)
+
+    def test_upload_content_type(self):
+        assert upload_content_type("notes.MD", None) == "text/markdown"
+        assert upload_content_type("notes.txt", "application/octet-stream") == "text/plain"
+        assert upload_content_type("blob", "text/plain; charset=utf-8") == "text/plain"
+        assert upload_content_type("report.pdf", "text/plain") is None
+
+
+class TestUploadRoute:
+    """POST /api/knowledge/upload."""
+
+    @pytest.fixture
+    def data_service(self):
+        service = MockDataService()
+        service.search_index = KnowledgeSearchIndex()
+        return service
+
+    @pytest.fixture
+    def storage(self):
+        storage = MagicMock()
+        storage.uploaded = {}
+
+        def upload_file(data, filename, content_type="application/octet-stream"):
+            storage.uploaded[filename] = (data, content_type)
+            return f"http://storage/{filename}"
+
+        storage.upload_file.side_effect = upload_file
+        return storage
+
+    @pytest.fixture
+    def queue(self):
+        return TaskQueue(SQLiteTaskStore(":memory:"))
+
+    @pytest.fixture
+    def client(self, data_service, storage, queue):
+        app.dependency_overrides[get_data_service] = lambda: data_service
+        app.dependency_overrides[get_storage_service] = lambda: storage
+        app.dependency_overrides[get_task_queue] = lambda: queue
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def post(self, client, data: bytes, filename="diabetes.md", **form):
+        form.setdefault("disease_name", "Diabetes")
+        return client.post(
+            "/api/knowledge/upload",
+            data=form,
+            files={"file": (filename, io.BytesIO(data), "text/markdown")},
+        )
+
+    @pytest.mark.asyncio
+    async def test_creates_document_and_stores_normalized_text(self, client, storage, queue):
+        response = self.post(client, MARKDOWN.encode("utf-8"), tags=["faq", "treatment"])
+
+        assert response.status_code == 201
+        body = response.json()
+        text = "# Diabetes\nCheck glucose daily.\n\n## Insulin\nCaf\u00e9 dosage: 胰岛素.\n"
+        assert body["raw_content"] == text
+        assert body["tags"] == ["faq", "treatment"]
+        assert body["content_hash"] == content_hash(text)
+        assert [entry["title"] for entry in body["section_index"]] == ["Diabetes", "Insulin"]
+        assert body["source_path"].startswith("knowledge/") and body["source_path"].endswith(".md")
+        assert storage.uploaded[body["source_path"]] == (
+            text.encode("utf-8"), "text/markdown; charset=utf-8"
+        )
+        task = await queue.store.lease_next("test", 60)
+        assert task.kind == KNOWLEDGE_SYNC
+
+    def test_accepts_files_over_json_limit_in_bytes(self, client):
+        text = "# Section\n" + "患者应遵循护理计划。\n" * 15000
+        data = text.encode("utf-8")
+        assert len(data) > 300_000 > len(text)
+
+        response = self.post(client, data)
+
+        assert response.status_code == 201
+        assert len(response.json()["raw_content"]) == len(text)
+
+    def test_rejects_text_over_character_limit(self, client, storage):
+        data = ("# Section\n" + "Patients should follow the care plan.\n" * 9000).encode("utf-8")
+        assert len(data) > KNOWLEDGE_CONTENT_MAX_CHARS
+
+        response = self.post(client, data)
+
+        assert response.status_code == 413
+        storage.upload_file.assert_not_called()
+
+    def test_failed_create_deletes_stored_file(self, client, data_service, storage):
+        data_service.create_knowledge_document = AsyncMock(side_effect=RuntimeError("too big"))
+
+        with pytest.raises(RuntimeError):
+            self.post(client, b"# Title\ntext")
+
+        (path,) = storage.uploaded
+        storage.delete_file.assert_called_once_with(path)
+
+    def test_rejects_oversized_file(self, client, storage, monkeypatch):
+        from backend.config import get_settings
+        monkeypatch.setattr(get_settings(), "knowledge_upload_max_bytes", 1024)
+
+        response = self.post(client, b"x" * 2048)
+
+        assert response.status_code == 413
+        storage.upload_file.assert_not_called()
+
+    def test_rejects_unsupported_type(self, client):
+        assert self.post(client, b"%PDF-1.4", filename="report.pdf").status_code == 415
+
+    def test_rejects_invalid_utf8_and_empty_files(self, client, data_service):
+        assert self.post(client, b"caf\xe9").status_code == 400
+        assert self.post(client, b"  \n\n").status_code == 400
+        assert data_service._documents == {}
+
+    def test_rejects_blank_disease_name(self, client, storage):
+        assert self.post(client, b"text", disease_name="   ").status_code == 422
+        storage.upload_file.assert_not_called()
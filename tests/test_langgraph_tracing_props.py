@@ -413,3 +413,104 @@ class TestRunTracedWorkflow:
             )
             
             assert trace.metadata.get("session_id") == "my-session-123"
+
+
+class TestTraceContextIsolation:
+    """Trace state is per execution context, not process-global."""
+
+    def setup_method(self) -> None:
+        """Reset state before each test."""
+        get_settings.cache_clear()
+        set_current_trace(None)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workflows_keep_separate_traces(self) -> None:
+        """Concurrent run_traced_workflow calls never share steps."""
+        with patch.dict(
+            os.environ,
+            {
+                "USE_MOCK_DATA": "true",
+                "LANGSMITH_TRACE_LEVEL": "info",
+            }
+        ):
+            get_settings.cache_clear()
+
+            results = await asyncio.gather(*[
+                run_traced_workflow(
+                    knowledge_content=f"content {i}",
+                    prompt="Generate a script",
+                    model_name="gemini-2.0-flash",
+                    session_id=f"session-{i}",
+                )
+                for i in range(5)
+            ])
+
+        traces = [trace for _, trace in results]
+        assert len({trace.trace_id for trace in traces}) == 5
+        for trace in traces:
+            assert [s.node_name for s in trace.steps] == [
+                "prepare_context_node",
+                "generate_script_node",
+                "post_process_node",
+            ]
+        assert get_current_trace() is None
+
+    @pytest.mark.asyncio
+    async def test_trace_set_in_task_does_not_leak(self) -> None:
+        """A trace set inside one task is invisible to sibling tasks."""
+        seen = {}
+
+        async def worker(name: str) -> None:
+            trace = WorkflowTrace(
+                trace_id=name,
+                workflow_name="test",
+                start_time=datetime.now(timezone.utc),
+            )
+            set_current_trace(trace)
+            await asyncio.sleep(0)
+            seen[name] = get_current_trace().trace_id
+
+        await asyncio.gather(worker("a"), worker("b"))
+
+        assert seen == {"a": "a", "b": "b"}
+        assert get_current_trace() is None
+
+    @pytest.mark.asyncio
+    async def test_trace_node_overhead_within_budget(self) -> None:
+        """Mean per-node tracing overhead stays under the stated budget."""
+        import time
+        from backend.services.langgraph_workflow import (
+            TRACE_NODE_OVERHEAD_BUDGET_MS,
+            reset_current_trace,
+        )
+
+        async def noop(state: dict) -> dict:
+            return {}
+
+        traced = trace_node(noop)
+        trace = WorkflowTrace(
+            trace_id="overhead",
+            workflow_name="test",
+            start_time=datetime.now(timezone.utc),
+        )
+        calls = 2000
+
+        with patch.dict(os.environ, {"LANGSMITH_TRACE_LEVEL": "error"}):
+            get_settings.cache_clear()
+            start = time.perf_counter()
+            for _ in range(calls):
+                await noop({})
+            bare = time.perf_counter() - start
+
+            token = set_current_trace(trace)
+            try:
+                start = time.perf_counter()
+                for _ in range(calls):
+                    await traced({})
+                wrapped = time.perf_counter() - start
+            finally:
+                reset_current_trace(token)
+
+        overhead_ms = (wrapped - bare) / calls * 1000
+        assert len(trace.steps) == calls
+        assert overhead_ms < TRACE_NODE_OVERHEAD_BUDGET_MS
@@ -0,0 +1,107 @@
+"""Tests for map-reduce script generation of large knowledge documents."""
+
+import asyncio
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.config import get_settings
+from backend.services import langgraph_workflow as wf
+from backend.services.langgraph_workflow import (
+    MAP_MAX_CONCURRENCY,
+    MAP_REDUCE_THRESHOLD_CHARS,
+    SECTION_SUMMARY_PROMPT,
+    chunk_knowledge_content,
+    prepare_context_node,
+    run_traced_workflow,
+    set_llm_factory,
+)
+
+
+class FakeLLM:
+    """Records calls and peak concurrency; summaries echo the section header."""
+
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def ainvoke(self, messages):
+        self.calls.append(messages)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        system, human = messages[0].content, messages[1].content
+        if system == SECTION_SUMMARY_PROMPT:
+            return MagicMock(content=f"summary of {human.splitlines()[0]}")
+        return MagicMock(content="```\nFinal script\n```")
+
+
+def _large_sections(count: int = 10, size: int = 15_000) -> dict:
+    return {f"Section {i}": ("Patient guidance sentence. " * (size // 27)) for i in range(count)}
+
+
+def test_chunking_packs_sections_within_limit():
+    sections = {"Intro": "a" * 300, "Risks": "b" * 300, "Care": "c" * 900}
+    chunks = chunk_knowledge_content("ignored", sections, max_chars=1000)
+
+    assert all(len(c) <= 1000 for c in chunks)
+    assert chunks[0].startswith("## Intro") and "## Risks" in chunks[0]
+    assert chunks[1].startswith("## Care")
+
+
+def test_chunking_splits_oversized_section_and_raw_content():
+    body = "\n\n".join(["word " * 100] * 20)
+    sections_chunks = chunk_knowledge_content("", {"Huge": body}, max_chars=2000)
+    raw_chunks = chunk_knowledge_content(body, None, max_chars=2000)
+
+    assert len(sections_chunks) > 1 and len(raw_chunks) > 1
+    assert all(len(c) <= 2000 for c in sections_chunks + raw_chunks)
+    assert sum(c.count("word") for c in raw_chunks) == 2000
+
+
+@pytest.mark.asyncio
+async def test_small_documents_skip_the_map_stage():
+    result = await prepare_context_node({"knowledge_content": "short", "structured_sections": None})
+    assert result == {"context_chunks": []}
+    assert wf.route_after_prepare(result) == "generate_script"
+
+
+@pytest.mark.asyncio
+async def test_large_document_is_mapped_in_parallel_then_reduced():
+    sections = _large_sections()
+    content = "\n".join(f"# {k}\n{v}" for k, v in sections.items())
+    assert len(content) > MAP_REDUCE_THRESHOLD_CHARS
+    fake = FakeLLM()
+
+    set_llm_factory(lambda **kwargs: fake)
+    try:
+        with patch.dict(os.environ, {"LANGSMITH_TRACE_LEVEL": "info"}):
+            get_settings.cache_clear()
+            with patch.object(get_settings(), "google_api_key", "fake"):
+                result, trace = await run_traced_workflow(
+                    content, "Write a script", "gemini-2.5-flash", structured_sections=sections
+                )
+    finally:
+        set_llm_factory(None)
+        get_settings.cache_clear()
+
+    summary_calls = [c for c in fake.calls if c[0].content == SECTION_SUMMARY_PROMPT]
+    reduce_calls = [c for c in fake.calls if c[0].content == "Write a script"]
+    assert len(summary_calls) == len(chunk_knowledge_content(content, sections))
+    assert 1 < fake.peak <= MAP_MAX_CONCURRENCY
+    assert len(reduce_calls) == 1
+    assert "summary of ## Section 0" in reduce_calls[0][1].content
+    assert len(reduce_calls[0][1].content) < len(content)
+    assert result["generated_script"] == "Final script"
+    assert [s.node_name for s in trace.steps] == [
+        "prepare_context_node",
+        "summarize_sections_node",
+        "generate_script_node",
+        "post_process_node",
+    ]
+    assert all(s.duration_ms is not None for s in trace.steps)
@@ -0,0 +1,129 @@
+"""Tests for the script generation result cache."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from hypothesis import given, strategies as st
+
+from backend.models.schemas import KnowledgeDocumentResponse
+from backend.services.audio_service import AudioService
+from backend.services.script_cache import (
+    CachedScript,
+    LocalScriptCache,
+    build_cache_key,
+    iter_replay_chunks,
+)
+
+
+def _make_service(cache, script_service=None):
+    doc = MagicMock(spec=KnowledgeDocumentResponse)
+    doc.raw_content = "Knowledge content"
+    doc.disease_name = "Flu"
+    doc.structured_sections = {}
+    data_service = MagicMock()
+    data_service.get_knowledge_document = AsyncMock(return_value=doc)
+    if script_service is None:
+        script_service = MagicMock()
+        script_service.generate_script = AsyncMock(
+            return_value={"script": "Generated script", "model_used": "gemini-2.5-flash"}
+        )
+    return AudioService(
+        elevenlabs_service=MagicMock(),
+        storage_service=MagicMock(),
+        data_service=data_service,
+        script_service=script_service,
+        script_cache=cache,
+    )
+
+
+def test_cache_key_depends_on_every_field():
+    base = build_cache_key("content", "prompt", "model", 0.7)
+    assert base == build_cache_key("content", "prompt", "model", 0.7)
+    assert base != build_cache_key("content!", "prompt", "model", 0.7)
+    assert base != build_cache_key("content", "prompt!", "model", 0.7)
+    assert base != build_cache_key("content", "prompt", "model-2", 0.7)
+    assert base != build_cache_key("content", "prompt", "model", 0.2)
+    # Field boundaries are unambiguous
+    assert build_cache_key("ab", "c", "m", 0.7) != build_cache_key("a", "bc", "m", 0.7)
+
+
+@given(st.text())
+def test_replay_chunks_reassemble_script(script):
+    joined = "".join(iter_replay_chunks(script))
+    assert joined == (script if script.strip() else "")
+
+
+@pytest.mark.asyncio
+async def test_local_cache_expires_entries():
+    cache = LocalScriptCache()
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await cache.set(CachedScript(cache_key="k", script="s", model_used="m", expires_at=past))
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_generate_script_uses_cache_on_repeat():
+    cache = LocalScriptCache()
+    service = _make_service(cache)
+
+    first = await service.generate_script("kb-1", model_name="gemini-2.5-flash")
+    second = await service.generate_script("kb-1", model_name="gemini-2.5-flash")
+
+    assert first == second == {"script": "Generated script", "model_used": "gemini-2.5-flash"}
+    service.script_service.generate_script.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_generate_script_without_cache_always_generates():
+    service = _make_service(None)
+
+    await service.generate_script("kb-1")
+    await service.generate_script("kb-1")
+
+    assert service.script_service.generate_script.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_cache_hit_replays_tokens():
+    script = "Welcome to your pre-surgery education session. " * 10
+
+    async def fake_stream(**kwargs):
+        for word in script.split(" "):
+            yield {"type": "token", "content": word + " "}
+        yield {"type": "complete", "script": script, "model_used": "gemini-2.5-flash"}
+
+    script_service = MagicMock()
+    script_service.generate_script_stream = MagicMock(side_effect=fake_stream)
+    service = _make_service(LocalScriptCache(), script_service=script_service)
+
+    miss = [e async for e in service.generate_script_stream("kb-1")]
+    hit = [e async for e in service.generate_script_stream("kb-1")]
+
+    assert script_service.generate_script_stream.call_count == 1
+    assert "cached" not in miss[-1]
+    tokens = [e for e in hit if e["type"] == "token"]
+    assert len(tokens) > 1
+    assert "".join(e["content"] for e in tokens) == script
+    assert hit[-1] == {
+        "type": "complete",
+        "script": script,
+        "model_used": "gemini-2.5-flash",
+        "cached": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_stream_error_is_not_cached():
+    async def failing_stream(**kwargs):
+        yield {"type": "error", "message": "boom"}
+
+    script_service = MagicMock()
+    script_service.generate_script_stream = MagicMock(side_effect=failing_stream)
+    cache = LocalScriptCache()
+    service = _make_service(cache, script_service=script_service)
+
+    [e async for e in service.generate_script_stream("kb-1")]
+    [e async for e in service.generate_script_stream("kb-1")]
+
+    assert script_service.generate_script_stream.call_count == 2
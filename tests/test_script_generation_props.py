@@ -2,6 +2,7 @@ import pytest
 from hypothesis import given, strategies as st, settings
 from unittest.mock import AsyncMock, patch, MagicMock
 from backend.services.script_generation_service import ScriptGenerationService
+from backend.services.langgraph_workflow import clear_llm_pool
 import datetime
 
 
@@ -15,6 +16,8 @@ async def test_configuration_passthrough(model_name, prompt, content):
     """Property 2: Configuration Passthrough.
     Verify that model_name and prompt are correctly passed to the LLM.
     """
+    # Clients are pooled per configuration; start each example with an empty pool
+    clear_llm_pool()
     with patch("backend.services.langgraph_workflow.ChatGoogleGenerativeAI") as mock_llm_cls:
         mock_llm = AsyncMock()
         mock_llm.ainvoke.return_value = MagicMock(content="Generated Script")
@@ -54,6 +57,8 @@ async def test_successful_response_format(content, generated_text):
     """Property 3: Successful Response Format.
     Verify that the result contains the script and correct metadata.
     """
+    # Clients are pooled per configuration; start each example with an empty pool
+    clear_llm_pool()
     with patch("backend.services.langgraph_workflow.ChatGoogleGenerativeAI") as mock_llm_cls:
         mock_llm = AsyncMock()
         mock_llm.ainvoke.return_value = MagicMock(content=generated_text)
@@ -80,6 +85,8 @@ async def test_error_propagation(error_msg):
     """Property 4: Error Propagation.
     Verify that exceptions during generation are propagated.
     """
+    # Clients are pooled per configuration; start each example with an empty pool
+    clear_llm_pool()
     with patch("backend.services.langgraph_workflow.ChatGoogleGenerativeAI") as mock_llm_cls:
         mock_llm = AsyncMock()
         mock_llm.ainvoke.side_effect = Exception(error_msg)
@@ -94,3 +101,38 @@ async def test_error_propagation(error_msg):
                 await service.generate_script("content", "model", "prompt")
             
             assert error_msg in str(excinfo.value)
+
+
+def test_llm_client_pool_reuses_clients_per_configuration():
+    """Clients are built once per (model, temperature, tokens, streaming, key)."""
+    from backend.services.langgraph_workflow import get_llm_client, set_llm_factory
+
+    built = []
+
+    def factory(**kwargs):
+        built.append(kwargs)
+        return MagicMock()
+
+    set_llm_factory(factory)
+    try:
+        first = get_llm_client("gemini-2.5-flash-lite", "key")
+        again = get_llm_client("gemini-2.5-flash-lite", "key")
+        streaming = get_llm_client("gemini-2.5-flash-lite", "key", streaming=True)
+        rotated = get_llm_client("gemini-2.5-flash-lite", "other-key")
+    finally:
+        set_llm_factory(None)
+
+    assert first is again
+    assert streaming is not first
+    assert rotated is not first
+    assert len(built) == 3
+
+
+def test_services_share_compiled_graph():
+    """Script services reuse the module-level compiled graph instead of recompiling."""
+    from backend.services.langgraph_workflow import get_script_generation_graph
+    from backend.services.script_generation_service import get_script_generation_service
+
+    assert ScriptGenerationService().workflow is get_script_generation_graph()
+    assert ScriptGenerationService().workflow is ScriptGenerationService().workflow
+    assert get_script_generation_service() is get_script_generation_service()
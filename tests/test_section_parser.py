@@ -0,0 +1,122 @@
+"""Tests for the shared streaming markdown section parser."""
+
+import pytest
+from hypothesis import given, strategies as st
+
+from backend.models.schemas import KnowledgeDocumentCreate, KnowledgeDocumentUpdate
+from backend.services.data_service import MockDataService
+from backend.utils.section_parser import SectionParser, load_sections, parse_sections
+
+MARKDOWN = """Overview of the condition.
+
+# Diabetes
+General information.
+
+## Treatment
+Insulin and diet.
+
+### Insulin
+Dosage guidance: 胰岛素.
+
+# Follow-up
+Visit every three months.
+"""
+
+markdown_lines = st.lists(
+    st.one_of(
+        st.sampled_from(["# Title", "## Sub", "### Deep", "", "  # Indented", "#NoSpace"]),
+        st.text(alphabet=st.characters(blacklist_categories=("Cs",)), max_size=20),
+    ),
+    max_size=30,
+)
+
+
+class TestParseSections:
+    """Sections, header paths and offsets."""
+
+    def test_sections_and_introduction(self):
+        sections, _ = parse_sections(MARKDOWN)
+
+        assert sections == {
+            "Introduction": "Overview of the condition.",
+            "Diabetes": "General information.",
+            "Treatment": "Insulin and diet.",
+            "Insulin": "Dosage guidance: 胰岛素.",
+            "Follow-up": "Visit every three months.",
+        }
+
+    def test_index_header_paths(self):
+        _, index = parse_sections(MARKDOWN)
+
+        assert [entry["path"] for entry in index] == [
+            ["Introduction"],
+            ["Diabetes"],
+            ["Diabetes", "Treatment"],
+            ["Diabetes", "Treatment", "Insulin"],
+            ["Follow-up"],
+        ]
+
+    def test_index_offsets_slice_section_bodies(self):
+        sections, index = parse_sections(MARKDOWN)
+        encoded = MARKDOWN.encode("utf-8")
+
+        for entry in index:
+            assert MARKDOWN[entry["start"]:entry["end"]].strip() == sections[entry["title"]]
+            assert encoded[entry["byte_start"]:entry["byte_end"]].decode("utf-8").strip() == sections[entry["title"]]
+            assert entry["tokens"] > 0
+
+    def test_content_without_headers(self):
+        assert parse_sections("  just text  ")[0] == {"content": "  just text  "}
+        assert parse_sections("   \n") == ({}, [])
+
+    def test_seven_hashes_or_no_space_are_not_headers(self):
+        sections, _ = parse_sections("####### seven\n#tag\n# Real\nbody")
+        assert sections == {"Introduction": "####### seven\n#tag", "Real": "body"}
+
+    def test_only_newline_ends_a_line(self):
+        sections, _ = parse_sections("# Real\nbody\u2028# inline\rmore\x0b# also\n")
+        assert sections == {"Real": "body\u2028# inline\rmore\x0b# also"}
+
+    @given(markdown_lines, st.integers(min_value=1, max_value=17))
+    def test_chunked_feed_matches_whole_parse(self, lines, chunk_size):
+        content = "\n".join(lines)
+        parser = SectionParser()
+        for i in range(0, len(content), chunk_size):
+            parser.feed(content[i:i + chunk_size])
+
+        assert parser.close() == parse_sections(content)
+
+
+class TestLoadSections:
+    """Budgeted section loading."""
+
+    def test_whole_sections_within_budget(self):
+        _, index = parse_sections(MARKDOWN)
+
+        text = load_sections(MARKDOWN, index, max_tokens=12)
+
+        assert text.startswith("Overview of the condition.\n\n# Diabetes\nGeneral information.")
+        assert "Visit every three months." not in text
+
+    def test_title_filter(self):
+        _, index = parse_sections(MARKDOWN)
+
+        assert load_sections(MARKDOWN, index, 1000, titles=["Follow-up"]) == (
+            "# Follow-up\nVisit every three months."
+        )
+
+
+@pytest.mark.asyncio
+async def test_update_reparses_sections():
+    service = MockDataService()
+    doc = await service.create_knowledge_document(
+        KnowledgeDocumentCreate(disease_name="Diabetes", raw_content=MARKDOWN)
+    )
+    assert len(doc.section_index) == 5
+
+    updated = await service.update_knowledge_document(
+        doc.knowledge_id, KnowledgeDocumentUpdate(raw_content="# Only\nOne section")
+    )
+
+    assert updated.structured_sections == {"Only": "One section"}
+    assert [entry["title"] for entry in updated.section_index] == ["Only"]
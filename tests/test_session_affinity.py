@@ -0,0 +1,187 @@
+"""Tests for session affinity across backend instances."""
+
+import base64
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.schemas import (
+    AgentResponse,
+    AnswerStyle,
+    PatientSessionCreate,
+    PatientSessionResponse,
+)
+from backend.services.data_service import MockDataService
+from backend.services.patient_service import PatientService
+from backend.services.session_affinity import (
+    LocalSessionRegistry,
+    SessionForwardError,
+    SessionOwner,
+    get_instance_id,
+)
+from backend.services.websocket_manager import get_connection_manager
+
+
+async def _make_session_store(session_id: str) -> MockDataService:
+    store = MockDataService()
+    await store.save_agent(AgentResponse(
+        agent_id="agent-1",
+        name="Agent",
+        knowledge_ids=[],
+        voice_id="voice",
+        answer_style=AnswerStyle.PROFESSIONAL,
+        elevenlabs_agent_id="el-agent-1",
+        doctor_id="doc",
+        created_at=datetime.now(),
+    ))
+    await store.create_patient_session(PatientSessionResponse(
+        session_id=session_id,
+        patient_id="p1",
+        agent_id="agent-1",
+        signed_url="wss://mock",
+        created_at=datetime.now(),
+    ))
+    return store
+
+
+def _make_service(store, registry, manager=None, elevenlabs=None):
+    if manager is None:
+        manager = MagicMock()
+        manager.has_connection.return_value = False
+        manager.close_connection = AsyncMock()
+    if elevenlabs is None:
+        elevenlabs = MagicMock()
+        elevenlabs.send_text_message = AsyncMock(return_value=("one-shot", None))
+    return PatientService(
+        data_service=store,
+        elevenlabs_service=elevenlabs,
+        conversation_service=MagicMock(save_conversation=AsyncMock()),
+        connection_manager=manager,
+        session_registry=registry,
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_registry_roundtrip():
+    registry = LocalSessionRegistry()
+    await registry.register(SessionOwner(session_id="s1", instance_id="i1", internal_url="http://a"))
+
+    owner = await registry.get_owner("s1")
+    assert owner.instance_id == "i1"
+
+    await registry.release("s1")
+    assert await registry.get_owner("s1") is None
+
+
+@pytest.mark.asyncio
+async def test_create_session_registers_local_owner():
+    store = MockDataService()
+    await store.save_agent(AgentResponse(
+        agent_id="agent-1",
+        name="Agent",
+        knowledge_ids=[],
+        voice_id="voice",
+        answer_style=AnswerStyle.PROFESSIONAL,
+        elevenlabs_agent_id="el-agent-1",
+        doctor_id="doc",
+        created_at=datetime.now(),
+    ))
+    elevenlabs = MagicMock()
+    elevenlabs.get_signed_url.return_value = "wss://mock"
+    manager = MagicMock()
+    manager.create_connection = AsyncMock(return_value=True)
+    registry = LocalSessionRegistry()
+
+    service = _make_service(store, registry, manager=manager, elevenlabs=elevenlabs)
+    session = await service.create_session(PatientSessionCreate(patient_id="p1", agent_id="agent-1"))
+
+    owner = await registry.get_owner(session.session_id)
+    assert owner is not None
+    assert owner.instance_id == get_instance_id()
+
+
+@pytest.mark.asyncio
+async def test_non_owner_forwards_message_to_owner():
+    store = await _make_session_store("s1")
+    registry = LocalSessionRegistry()
+    await registry.register(SessionOwner(session_id="s1", instance_id="other", internal_url="http://other"))
+    service = _make_service(store, registry)
+
+    audio_b64 = base64.b64encode(b"mp3").decode("utf-8")
+    with patch(
+        "backend.services.patient_service.forward_message",
+        new=AsyncMock(return_value=("from owner", audio_b64)),
+    ) as forward:
+        response = await service.send_message("s1", "Hello?", chat_mode=False)
+
+    forward.assert_awaited_once()
+    assert response.response_text == "from owner"
+    assert response.audio_data == audio_b64
+    service.elevenlabs_service.send_text_message.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_forward_failure_falls_back_to_one_shot():
+    store = await _make_session_store("s1")
+    registry = LocalSessionRegistry()
+    await registry.register(SessionOwner(session_id="s1", instance_id="other", internal_url="http://other"))
+    service = _make_service(store, registry)
+
+    with patch(
+        "backend.services.patient_service.forward_message",
+        new=AsyncMock(side_effect=SessionForwardError("unreachable")),
+    ):
+        response = await service.send_message("s1", "Hello?", chat_mode=True)
+
+    assert response.response_text == "one-shot"
+    service.elevenlabs_service.send_text_message.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_end_session_closes_on_owner_and_releases():
+    store = await _make_session_store("s1")
+    registry = LocalSessionRegistry()
+    await registry.register(SessionOwner(session_id="s1", instance_id="other", internal_url="http://other"))
+    service = _make_service(store, registry)
+
+    with patch("backend.services.patient_service.forward_close", new=AsyncMock()) as close:
+        await service.end_session("s1")
+
+    close.assert_awaited_once()
+    assert await registry.get_owner("s1") is None
+
+
+def test_internal_message_endpoint_uses_local_connection():
+    manager = MagicMock()
+    manager.has_connection.return_value = True
+    manager.send_message = AsyncMock(return_value=("owned reply", None))
+    settings = MagicMock(internal_api_token="secret")
+    app.dependency_overrides[get_connection_manager] = lambda: manager
+    try:
+        with patch("backend.api.routes.internal.get_settings", return_value=settings):
+            client = TestClient(app)
+            response = client.post(
+                "/api/internal/sessions/s1/message",
+                json={"message": "Hi", "chat_mode": True},
+                headers={"X-Internal-Token": "secret"},
+            )
+    finally:
+        app.dependency_overrides.pop(get_connection_manager, None)
+
+    assert response.status_code == 200
+    assert response.json()["response_text"] == "owned reply"
+
+
+def test_internal_message_endpoint_rejects_bad_token():
+    settings = MagicMock(internal_api_token="secret")
+    with patch("backend.api.routes.internal.get_settings", return_value=settings):
+        client = TestClient(app)
+        response = client.post(
+            "/api/internal/sessions/s1/message",
+            json={"message": "Hi"},
+            headers={"X-Internal-Token": "wrong"},
+        )
+    assert response.status_code == 403
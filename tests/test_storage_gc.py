@@ -0,0 +1,160 @@
+"""Tests for garbage collection of orphaned storage objects."""
+
+import asyncio
+import os
+import time
+from dataclasses import replace
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import app
+from backend.models.schemas import AudioMetadata, KnowledgeDocumentCreate
+from backend.services.data_service import MockDataService, get_data_service
+from backend.services.firestore_data_service import FirestoreDataService
+from backend.services.knowledge_search import KnowledgeSearchIndex
+from backend.services.session_affinity import INTERNAL_TOKEN_HEADER
+from backend.services.storage_gc import audio_id_from_path, collect_storage_garbage
+from backend.services.storage_service import StorageService, get_storage_service
+from backend.utils.text_extraction import extract_text
+
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def mock_storage(mock_storage, monkeypatch):
+    monkeypatch.setattr(get_settings(), "storage_gc_page_size", 2)
+    return mock_storage
+
+
+def put(root, path, size, age_seconds):
+    file_path = root / path
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(b"x" * size)
+    mtime = time.time() - age_seconds
+    os.utime(file_path, (mtime, mtime))
+
+
+@pytest.fixture
+def data_service(tmp_path):
+    service = MockDataService()
+    service.search_index = KnowledgeSearchIndex()
+    asyncio.run(service.save_audio_metadata(AudioMetadata(
+        audio_id="a1", audio_url="audio/a1.mp3", knowledge_id="k", voice_id="v",
+        duration_seconds=1.0, script="s", created_at=datetime.now(),
+    )))
+    asyncio.run(service.create_knowledge_document(
+        KnowledgeDocumentCreate(disease_name="Flu", raw_content="text"),
+        extracted=replace(extract_text("text"), source_path="knowledge/ref.md"),
+    ))
+    put(tmp_path, "audio/a1.mp3", 100, 2 * DAY)
+    put(tmp_path, "audio/a1.mobile.mp3", 50, 2 * DAY)
+    put(tmp_path, "audio/orphan.mp3", 300, 2 * DAY)
+    put(tmp_path, "audio/orphan.low.mp3", 30, 2 * DAY)
+    put(tmp_path, "audio/fresh.mp3", 10, 60)
+    put(tmp_path, "knowledge/ref.md", 5, 2 * DAY)
+    put(tmp_path, "knowledge/stale.md", 7, 2 * DAY)
+    return service
+
+
+def remaining(root):
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file())
+
+
+class TestCollectStorageGarbage:
+    """Joining listed objects against records."""
+
+    def test_audio_id_from_path(self):
+        assert audio_id_from_path("audio/abc.mobile.mp3") == "abc"
+        assert audio_id_from_path("audio/abc.mp3") == "abc"
+        assert audio_id_from_path("audio/abc.peaks.json") == "abc"
+
+    def test_dry_run_reports_without_deleting(self, data_service, mock_storage, tmp_path):
+        before = remaining(tmp_path)
+
+        report = asyncio.run(collect_storage_garbage(data_service, mock_storage))
+
+        assert report.dry_run
+        assert report.scanned_count == 7
+        assert sorted(e.path for e in report.orphans) == [
+            "audio/orphan.low.mp3", "audio/orphan.mp3", "knowledge/stale.md",
+        ]
+        assert report.orphan_bytes == 337
+        assert report.recent_orphan_count == 1
+        assert report.deleted_count == report.reclaimed_bytes == 0
+        assert remaining(tmp_path) == before
+
+    def test_apply_deletes_old_orphans(self, data_service, mock_storage, tmp_path):
+        report = asyncio.run(collect_storage_garbage(
+            data_service, mock_storage, dry_run=False, deletes_per_minute=0
+        ))
+
+        assert report.deleted_count == 3
+        assert report.reclaimed_bytes == 337
+        assert all(e.deleted for e in report.orphans)
+        assert remaining(tmp_path) == [
+            "audio/a1.mobile.mp3", "audio/a1.mp3", "audio/fresh.mp3", "knowledge/ref.md",
+        ]
+
+    def test_zero_grace_collects_recent_orphans(self, data_service, mock_storage):
+        report = asyncio.run(collect_storage_garbage(data_service, mock_storage, grace_hours=0))
+
+        assert report.orphan_count == 4
+        assert report.recent_orphan_count == 0
+
+    def test_reference_lookup_failure_aborts(self, data_service, mock_storage, tmp_path):
+        data_service.get_audio_file_ids = MagicMock(side_effect=RuntimeError("unavailable"))
+        before = remaining(tmp_path)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(collect_storage_garbage(data_service, mock_storage, dry_run=False))
+        assert remaining(tmp_path) == before
+
+    def test_route_requires_internal_token(self, data_service, mock_storage, monkeypatch):
+        monkeypatch.setattr(get_settings(), "internal_api_token", "secret")
+        app.dependency_overrides[get_data_service] = lambda: data_service
+        app.dependency_overrides[get_storage_service] = lambda: mock_storage
+        try:
+            client = TestClient(app)
+            assert client.post("/api/internal/storage/gc", json={}).status_code == 403
+            response = client.post(
+                "/api/internal/storage/gc", json={}, headers={INTERNAL_TOKEN_HEADER: "secret"}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.json()["orphan_count"] == 3
+
+
+class TestListingAndReferences:
+    """Paged GCS listing and name-only Firestore reads."""
+
+    def test_gcs_pages(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "use_mock_storage", False)
+        storage = object.__new__(StorageService)
+        storage._client = MagicMock()
+        storage._bucket = MagicMock()
+        updated = datetime.now(timezone.utc)
+        storage._client.list_blobs.return_value.pages = iter([
+            [MagicMock(size=3, updated=updated)], [MagicMock(size=None, updated=updated)],
+        ])
+
+        pages = list(storage.iter_object_pages("audio", page_size=1))
+
+        assert [[o.size for o in page] for page in pages] == [[3], [0]]
+        kwargs = storage._client.list_blobs.call_args.kwargs
+        assert kwargs["prefix"] == "audio/"
+        assert kwargs["page_size"] == 1
+
+    def test_firestore_audio_ids_use_projection(self):
+        service = object.__new__(FirestoreDataService)
+        service._db = MagicMock()
+        query = service._db.collection.return_value.select.return_value
+        query.stream.return_value = [MagicMock(id="a1"), MagicMock(id="a2")]
+
+        assert asyncio.run(service.get_audio_file_ids()) == {"a1", "a2"}
+        service._db.collection.return_value.stream.assert_not_called()
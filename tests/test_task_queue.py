@@ -0,0 +1,334 @@
+"""Tests for the durable task queue and queued knowledge syncs."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.config import get_settings
+from backend.models.schemas import KnowledgeDocumentCreate, SyncStatus
+from backend.services.data_service import MockDataService
+from backend.services.elevenlabs_service import ElevenLabsSyncError
+from backend.services.knowledge_sync_tasks import (
+    enqueue_knowledge_resync,
+    enqueue_knowledge_sync,
+    register_knowledge_sync_handlers,
+)
+from backend.services.task_queue import (
+    FAILED,
+    LEASED,
+    PENDING,
+    SUCCEEDED,
+    SQLiteTaskStore,
+    TaskQueue,
+    compute_backoff,
+)
+
+
+@pytest.fixture(autouse=True)
+def immediate_retry():
+    """Retry failed tasks without waiting."""
+    with patch("backend.services.task_queue.compute_backoff", return_value=0.0):
+        yield
+
+
+def make_queue(**kwargs) -> TaskQueue:
+    kwargs.setdefault("poll_interval", 0.01)
+    return TaskQueue(SQLiteTaskStore(":memory:"), **kwargs)
+
+
+class TestTaskQueue:
+    """Leasing, completion and retry behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_task_runs_and_completes(self):
+        queue = make_queue()
+        seen = []
+
+        async def handler(payload):
+            seen.append(payload)
+
+        queue.register("echo", handler)
+        task = await queue.enqueue("echo", {"value": 1})
+
+        assert await queue.run_once() is True
+        assert await queue.run_once() is False
+        assert seen == [{"value": 1}]
+        stored = await queue.store.get(task.task_id)
+        assert stored.status == SUCCEEDED
+        assert stored.attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_retryable_error_is_rescheduled(self):
+        queue = make_queue()
+        calls = 0
+
+        async def flaky(payload):
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise ElevenLabsSyncError("rate limited", "rate_limit", is_retryable=True)
+
+        queue.register("flaky", flaky)
+        task = await queue.enqueue("flaky", {})
+
+        while await queue.run_once():
+            pass
+
+        stored = await queue.store.get(task.task_id)
+        assert calls == 3
+        assert stored.status == SUCCEEDED
+        assert stored.attempts == 3
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_gives_up(self):
+        queue = make_queue()
+        given_up = []
+
+        async def broken(payload):
+            raise ElevenLabsSyncError("bad request", "validation", is_retryable=False)
+
+        async def on_give_up(payload, error):
+            given_up.append((payload, str(error)))
+
+        queue.register("broken", broken, on_give_up=on_give_up)
+        task = await queue.enqueue("broken", {"id": "x"})
+
+        await queue.run_once()
+
+        stored = await queue.store.get(task.task_id)
+        assert stored.status == FAILED
+        assert stored.last_error == "bad request"
+        assert given_up == [({"id": "x"}, "bad request")]
+        assert await queue.run_once() is False
+
+    @pytest.mark.asyncio
+    async def test_retries_stop_at_max_attempts(self):
+        queue = make_queue(max_attempts=2)
+        given_up = []
+
+        async def always_retryable(payload):
+            raise ElevenLabsSyncError("timeout", "timeout", is_retryable=True)
+
+        async def on_give_up(payload, error):
+            given_up.append(payload)
+
+        queue.register("slow", always_retryable, on_give_up=on_give_up)
+        task = await queue.enqueue("slow", {})
+
+        while await queue.run_once():
+            pass
+
+        stored = await queue.store.get(task.task_id)
+        assert stored.status == FAILED
+        assert stored.attempts == 2
+        assert len(given_up) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_lease_is_recovered(self):
+        store = SQLiteTaskStore(":memory:")
+        first = TaskQueue(store, owner="dead-worker")
+        task = await first.enqueue("work", {})
+
+        # A worker leases the task and dies before finishing
+        leased = await store.lease_next("dead-worker", lease_seconds=-1)
+        assert leased.status == LEASED
+        assert await store.lease_next("other", lease_seconds=60) is None
+
+        assert await store.recover_stale_leases() == 1
+        recovered = await store.get(task.task_id)
+        assert recovered.status == PENDING
+
+        ran = []
+
+        async def handler(payload):
+            ran.append(True)
+
+        second = TaskQueue(store, owner="new-worker")
+        second.register("work", handler)
+        assert await second.run_once() is True
+        assert ran == [True]
+        assert (await store.get(task.task_id)).attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_active_lease_is_not_recovered(self):
+        store = SQLiteTaskStore(":memory:")
+        await TaskQueue(store).enqueue("work", {})
+        await store.lease_next("live-worker", lease_seconds=60)
+
+        assert await store.recover_stale_leases() == 0
+
+    @pytest.mark.asyncio
+    async def test_workers_bound_concurrency(self):
+        queue = make_queue(workers=2)
+        in_flight = 0
+        peak = 0
+        done = asyncio.Event()
+        finished = 0
+
+        async def handler(payload):
+            nonlocal in_flight, peak, finished
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            finished += 1
+            if finished == 6:
+                done.set()
+
+        queue.register("work", handler)
+        for i in range(6):
+            await queue.enqueue("work", {"i": i})
+
+        await queue.start()
+        try:
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            await queue.stop()
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_lease_is_renewed_while_handler_runs(self):
+        queue = make_queue(lease_seconds=0.15)
+        recovered = []
+
+        async def long_sync(payload):
+            for _ in range(4):
+                await asyncio.sleep(0.1)
+                recovered.append(await queue.store.recover_stale_leases())
+
+        queue.register("long", long_sync)
+        task = await queue.enqueue("long", {})
+
+        assert await queue.run_once() is True
+        assert recovered == [0, 0, 0, 0]
+        stored = await queue.store.get(task.task_id)
+        assert stored.status == SUCCEEDED
+        assert stored.attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_renewal_requires_current_owner(self):
+        store = SQLiteTaskStore(":memory:")
+        task = await TaskQueue(store).enqueue("work", {})
+        await store.lease_next("owner", lease_seconds=60)
+
+        assert await store.renew_lease(task.task_id, "owner", 120) is True
+        assert await store.renew_lease(task.task_id, "someone-else", 120) is False
+        await store.complete(task.task_id)
+        assert await store.renew_lease(task.task_id, "owner", 120) is False
+
+    @pytest.mark.parametrize(
+        "configured, mock_data, expected",
+        [(None, False, "firestore"), (None, True, "sqlite"), ("sqlite", False, "sqlite")],
+    )
+    def test_backend_follows_data_service(self, configured, mock_data, expected, monkeypatch):
+        settings = get_settings()
+        monkeypatch.setattr(settings, "task_queue_backend", configured)
+        monkeypatch.setattr(settings, "use_mock_data", mock_data)
+
+        assert settings.get_task_queue_backend() == expected
+
+    def test_backoff_grows_and_is_capped(self):
+        assert compute_backoff(1) < compute_backoff(4)
+        assert compute_backoff(50) <= 300.0 * 1.2
+
+
+class TestKnowledgeSyncTasks:
+    """Knowledge sync handlers run through the queue."""
+
+    @pytest.fixture
+    def data_service(self):
+        return MockDataService()
+
+    @pytest.fixture
+    def elevenlabs(self):
+        service = MagicMock()
+        service.create_document.return_value = "el_new"
+        return service
+
+    @pytest.fixture
+    def queue(self, data_service, elevenlabs):
+        queue = make_queue()
+        register_knowledge_sync_handlers(queue)
+        with patch(
+            "backend.services.knowledge_sync_tasks.get_data_service", return_value=data_service
+        ), patch(
+            "backend.services.knowledge_sync_tasks.get_elevenlabs_service", return_value=elevenlabs
+        ):
+            yield queue
+
+    async def _create_doc(self, data_service, content="Diabetes care basics."):
+        return await data_service.create_knowledge_document(
+            KnowledgeDocumentCreate(disease_name="Diabetes", raw_content=content)
+        )
+
+    @pytest.mark.asyncio
+    async def test_sync_reads_content_at_run_time(self, queue, data_service, elevenlabs):
+        doc = await self._create_doc(data_service)
+        await enqueue_knowledge_sync(doc.knowledge_id, "Diabetes_faq", queue=queue)
+
+        await queue.run_once()
+
+        elevenlabs.create_document.assert_called_once_with(
+            text="Diabetes care basics.", name="Diabetes_faq"
+        )
+
+    @pytest.mark.asyncio
+    async def test_sync_creates_document_off_the_event_loop(self, queue, data_service, elevenlabs):
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def create_document(**kwargs):
+            threads.append(threading.get_ident())
+            return "el_new"
+
+        elevenlabs.create_document.side_effect = create_document
+        doc = await self._create_doc(data_service)
+        await enqueue_knowledge_sync(doc.knowledge_id, "Diabetes_faq", queue=queue)
+
+        await queue.run_once()
+
+        assert threads and threads[0] != loop_thread
+        stored = await data_service.get_knowledge_document(doc.knowledge_id)
+        assert stored.sync_status == SyncStatus.COMPLETED
+        assert stored.elevenlabs_document_id == "el_new"
+
+    @pytest.mark.asyncio
+    async def test_permanent_sync_failure_marks_document_failed(
+        self, queue, data_service, elevenlabs
+    ):
+        elevenlabs.create_document.side_effect = ElevenLabsSyncError(
+            "Invalid document", "validation", is_retryable=False
+        )
+        doc = await self._create_doc(data_service)
+        await enqueue_knowledge_sync(doc.knowledge_id, "Diabetes_faq", queue=queue)
+
+        await queue.run_once()
+
+        stored = await data_service.get_knowledge_document(doc.knowledge_id)
+        assert stored.sync_status == SyncStatus.FAILED
+        assert stored.sync_error_message == "Invalid document"
+
+    @pytest.mark.asyncio
+    async def test_sync_of_deleted_document_is_skipped(self, queue, elevenlabs):
+        await enqueue_knowledge_sync("missing", "Gone_faq", queue=queue)
+
+        assert await queue.run_once() is True
+        elevenlabs.create_document.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resync_replaces_document(self, queue, data_service, elevenlabs):
+        doc = await self._create_doc(data_service)
+        await data_service.update_knowledge_sync_status(
+            doc.knowledge_id, SyncStatus.COMPLETED, "el_old"
+        )
+        await enqueue_knowledge_resync(doc.knowledge_id, "el_old", "Diabetes_faq", queue=queue)
+
+        await queue.run_once()
+
+        elevenlabs.delete_document.assert_called_once_with("el_old")
+        stored = await data_service.get_knowledge_document(doc.knowledge_id)
+        assert stored.elevenlabs_document_id == "el_new"
+        assert stored.sync_status == SyncStatus.COMPLETED
@@ -0,0 +1,162 @@
+"""Tests for the cached voice catalog and the voice list ETag."""
+
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services.audio_service import AudioService, get_audio_service
+from backend.services.elevenlabs_service import CURATED_VOICES, ElevenLabsService
+from backend.services.voice_catalog import VoiceCatalog, VoiceCatalogSnapshot
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def voices(*ids):
+    return [{"voice_id": i, "name": f"Voice {i}"} for i in ids]
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_catalog(fetch, clock, fallback=None):
+    return VoiceCatalog(fetch, ttl_seconds=60, max_stale_seconds=3600, fallback=fallback, clock=clock)
+
+
+class TestVoiceCatalog:
+    """Freshness, stale-while-revalidate and failure handling."""
+
+    def test_fresh_snapshot_is_reused(self, clock):
+        fetch = MagicMock(return_value=voices("a"))
+        catalog = make_catalog(fetch, clock)
+
+        first = catalog.get()
+        clock.now += 59
+        assert catalog.get() is first
+        assert fetch.call_count == 1
+
+    def test_stale_snapshot_served_while_refreshing_in_background(self, clock):
+        released = threading.Event()
+        results = iter([voices("a"), voices("a", "b")])
+
+        def fetch():
+            result = next(results)
+            if len(result) == 2:
+                released.wait(5)
+            return result
+
+        catalog = make_catalog(fetch, clock)
+        first = catalog.get()
+        clock.now += 120
+
+        assert catalog.get() is first
+        released.set()
+        catalog._background.join(5)
+        assert [v["voice_id"] for v in catalog.get().voices] == ["a", "b"]
+
+    def test_expired_snapshot_refreshes_synchronously(self, clock):
+        fetch = MagicMock(side_effect=[voices("a"), voices("b")])
+        catalog = make_catalog(fetch, clock)
+        catalog.get()
+        clock.now += 7200
+
+        assert [v["voice_id"] for v in catalog.get().voices] == ["b"]
+
+    def test_failed_refresh_keeps_previous_snapshot(self, clock):
+        fetch = MagicMock(side_effect=[voices("a"), RuntimeError("down")])
+        catalog = make_catalog(fetch, clock)
+        first = catalog.get()
+        clock.now += 7200
+
+        assert catalog.get() is first
+
+    def test_fallback_served_stale_when_nothing_fetched(self, clock):
+        fetch = MagicMock(side_effect=[RuntimeError("down"), voices("live")])
+        catalog = make_catalog(fetch, clock, fallback=lambda: voices("curated"))
+
+        assert [v["voice_id"] for v in catalog.get().voices] == ["curated"]
+        catalog.get()
+        catalog._background.join(5)
+        assert [v["voice_id"] for v in catalog.get().voices] == ["live"]
+
+    def test_failure_without_fallback_raises(self, clock):
+        catalog = make_catalog(MagicMock(side_effect=RuntimeError("down")), clock)
+        with pytest.raises(RuntimeError):
+            catalog.get()
+
+
+class TestVoiceCatalogSnapshot:
+    """Immutability, lookups and versioning."""
+
+    def test_snapshot_is_read_only(self):
+        snapshot = VoiceCatalogSnapshot.build([{"voice_id": "a", "languages": ["en"]}], 0.0)
+
+        with pytest.raises(TypeError):
+            snapshot.voices[0]["name"] = "changed"
+        assert snapshot.voices[0]["languages"] == ("en",)
+
+    def test_lookup_and_version(self):
+        snapshot = VoiceCatalogSnapshot.build(voices("a", "b"), 0.0)
+
+        assert snapshot.get("b")["name"] == "Voice b"
+        assert snapshot.get("missing") is None
+        assert snapshot.version == VoiceCatalogSnapshot.build(voices("a", "b"), 5.0).version
+        assert snapshot.version != VoiceCatalogSnapshot.build(voices("a"), 0.0).version
+
+    def test_fetch_does_not_mutate_curated_voices(self):
+        original = [dict(v) for v in CURATED_VOICES]
+        service = ElevenLabsService.__new__(ElevenLabsService)
+        service.client = MagicMock()
+        library_voice = MagicMock(voice_id=CURATED_VOICES[0]["voice_id"], preview_url="http://p")
+        library_voice.name = "Renamed"
+        service.client.voices.get_all.return_value = MagicMock(voices=[library_voice])
+
+        merged = service._fetch_voices()
+
+        assert merged[0]["name"] == "Renamed"
+        assert [dict(v) for v in CURATED_VOICES] == original
+
+
+class TestVoicesRoute:
+    """GET /api/audio/voices/list conditional requests."""
+
+    @pytest.fixture
+    def elevenlabs(self):
+        service = MagicMock()
+        service.get_voice_catalog.return_value = VoiceCatalogSnapshot.build(voices("a", "b"), 0.0)
+        return service
+
+    @pytest.fixture
+    def client(self, elevenlabs):
+        audio_service = AudioService(
+            elevenlabs_service=elevenlabs, storage_service=MagicMock(), data_service=AsyncMock()
+        )
+        app.dependency_overrides[get_audio_service] = lambda: audio_service
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_etag_and_not_modified(self, client, elevenlabs):
+        response = client.get("/api/audio/voices/list")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert [v["voice_id"] for v in response.json()] == ["a", "b"]
+
+        cached = client.get("/api/audio/voices/list", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        snapshot = VoiceCatalogSnapshot.build(voices("a", "b", "c"), 0.0)
+        elevenlabs.get_voice_catalog.return_value = snapshot
+        changed = client.get("/api/audio/voices/list", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] == snapshot.etag